@@ -6,5 +6,6 @@
 from .dynamodb_helpers import *
 from .lambda_helpers import *
 from .s3_helpers import *
+from .session_helpers import *
 from .sns_helpers import *
 from .sqs_helpers import *
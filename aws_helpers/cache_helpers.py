@@ -0,0 +1,249 @@
+#!/usr/bin/env python3
+"""
+    Purpose:
+        LRU Cache Class. Will provide a thread-safe, bounded,
+        least-recently-used cache with optional per-entry TTLs
+        that is shared by the other helper libraries
+    Examples of Create Object of Class:
+        cache = LRUCache(max_size=128, ttl=300)
+"""
+
+# Python Library Imports
+import threading
+import time
+from collections import OrderedDict
+
+
+class LRUCache(object):
+    """
+        LRUCache Class
+    """
+
+    ###
+    # Class Lifecycle Methods
+    ###
+
+    def __init__(self, max_size=128, ttl=None):
+        """
+        Purpose:
+            Initilize the LRUCache Class.
+        Args:
+            max_size (Int): Max number of entries to hold before evicting the
+                least recently used entry
+            ttl (Float): Default seconds an entry is valid for. None means entries
+                never expire on their own
+        """
+
+        if max_size < 1:
+            raise ValueError(f"max_size must be at least 1, got {max_size}")
+
+        self.max_size = max_size
+        self.ttl = ttl
+
+        self._entries = OrderedDict()
+        self._lock = threading.RLock()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def __len__(self):
+        """
+        Purpose:
+            Return the number of entries in the cache (including entries
+            that have expired but have not been purged yet)
+        Args:
+            N/A
+        Return:
+            size (Int): Number of entries in the cache
+        """
+
+        with self._lock:
+            return len(self._entries)
+
+    def __contains__(self, key):
+        """
+        Purpose:
+            Check if a valid entry exists for a key. Does not update
+            recency or the hit/miss counters
+        Args:
+            key (Hashable): Key of the entry
+        Return:
+            exists (Boolean): Whether or not a valid entry exists
+        """
+
+        with self._lock:
+            entry = self._entries.get(key)
+            return entry is not None and not self._is_expired(entry)
+
+    ###
+    # Cache Access Methods
+    ###
+
+    def get(self, key, default=None):
+        """
+        Purpose:
+            Return the value cached for a key and mark it as recently used
+        Args:
+            key (Hashable): Key of the entry
+            default (Any): Value to return if the key is missing or expired
+        Return:
+            value (Any): Cached value or default
+        """
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return default
+            if self._is_expired(entry):
+                del self._entries[key]
+                self.expirations += 1
+                self.misses += 1
+                return default
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def set(self, key, value, ttl=None):
+        """
+        Purpose:
+            Cache a value for a key, evicting the least recently used entry
+            if the cache is full
+        Args:
+            key (Hashable): Key of the entry
+            value (Any): Value to cache
+            ttl (Float): Seconds the entry is valid for. Defaults to the
+                cache's ttl
+        Return:
+            N/A
+        """
+
+        ttl = ttl if ttl is not None else self.ttl
+        expires_at = time.monotonic() + ttl if ttl is not None else None
+
+        with self._lock:
+            self._entries[key] = (value, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def get_or_set(self, key, factory, ttl=None):
+        """
+        Purpose:
+            Return the value cached for a key, creating and caching it with
+            the factory on a miss. The factory is called while holding the
+            cache lock so concurrent callers never build the same value twice
+        Args:
+            key (Hashable): Key of the entry
+            factory (Function): Function with no args returning the value
+            ttl (Float): Seconds the entry is valid for. Defaults to the
+                cache's ttl
+        Return:
+            value (Any): Cached or newly created value
+        """
+
+        missing = object()
+        with self._lock:
+            value = self.get(key, missing)
+            if value is missing:
+                value = factory()
+                self.set(key, value, ttl=ttl)
+
+        return value
+
+    ###
+    # Invalidation Methods
+    ###
+
+    def invalidate(self, key):
+        """
+        Purpose:
+            Remove an entry from the cache
+        Args:
+            key (Hashable): Key of the entry
+        Return:
+            removed (Boolean): Whether or not an entry was removed
+        """
+
+        with self._lock:
+            return self._entries.pop(key, None) is not None
+
+    def invalidate_where(self, predicate):
+        """
+        Purpose:
+            Remove every entry whose key matches a predicate
+        Args:
+            predicate (Function): Function taking a key and returning True if
+                the entry should be removed
+        Return:
+            removed_count (Int): Number of entries removed
+        """
+
+        with self._lock:
+            keys = [key for key in self._entries if predicate(key)]
+            for key in keys:
+                del self._entries[key]
+
+        return len(keys)
+
+    def clear(self):
+        """
+        Purpose:
+            Remove all entries from the cache. Counters are kept
+        Args:
+            N/A
+        Return:
+            N/A
+        """
+
+        with self._lock:
+            self._entries.clear()
+
+    ###
+    # Stats Methods
+    ###
+
+    def get_stats(self):
+        """
+        Purpose:
+            Return the size and hit/miss counters of the cache
+        Args:
+            N/A
+        Return:
+            stats (Dict): Dict with size, max_size, hits, misses, hit_rate,
+                evictions, and expirations
+        """
+
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+            }
+
+    ###
+    # Helper Methods
+    ###
+
+    @staticmethod
+    def _is_expired(entry):
+        """
+        Purpose:
+            Check if a cache entry has passed its expiry time
+        Args:
+            entry (Tuple): Tuple of value and expiry (monotonic seconds or None)
+        Return:
+            expired (Boolean): Whether or not the entry has expired
+        """
+
+        expires_at = entry[1]
+        return expires_at is not None and time.monotonic() >= expires_at
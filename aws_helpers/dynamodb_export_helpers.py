@@ -0,0 +1,742 @@
+#!/usr/bin/env python3
+"""
+    Purpose:
+        Helper Library for Exporting DynamoDB Tables. Will provide
+        functions for streaming scan/query results into CSV or Parquet
+        part files (optionally uploaded to S3), holding only a row group
+        of items in memory, with checkpoints to resume an interrupted export
+"""
+
+# Python Library Imports
+import base64
+import csv
+import json
+import logging
+import os
+import re
+import time
+
+try:
+    import pyarrow
+    import pyarrow.ipc
+    import pyarrow.parquet
+except ImportError:
+    pyarrow = None
+
+# Local Library Imports
+from aws_helpers import dynamodb_helpers, s3_helpers
+
+###
+# Export Constants
+###
+
+
+FILE_FORMATS = ("csv", "parquet")
+DEFAULT_ROWS_PER_FILE = 1000000
+DEFAULT_ROW_GROUP_SIZE = 50000
+
+
+###
+# Export Writer Functions
+###
+
+
+class ExportFileWriter(object):
+    """
+        ExportFileWriter Class. Writes items to numbered part files
+        (part-00000.parquet, ...), appending a row group whenever
+        row_group_size items are buffered. Parts are written to a temporary
+        file and renamed once closed, so a part file is always complete.
+        Values are never converted lossily: a row group that does not fit
+        the columns of the part raises
+    """
+
+    def __init__(
+        self,
+        output_dir,
+        file_format="parquet",
+        attribute_names=None,
+        schema=None,
+        rows_per_file=DEFAULT_ROWS_PER_FILE,
+        row_group_size=DEFAULT_ROW_GROUP_SIZE,
+        bucket=None,
+        key_prefix="",
+        keep_local_files=True,
+        state=None,
+    ):
+        """
+        Purpose:
+            Initilize the ExportFileWriter Class. The columns are
+            attribute_names (or the schema's names), or else every attribute
+            seen so far. Without a schema, the Parquet types are those of
+            the rows seen so far. A row group with new attributes, or with
+            types only a wider schema holds (int64 widened to double, or an
+            all-missing column given a type), starts a new part with the
+            wider columns
+        Args:
+            output_dir (String): Local directory to write the part files to
+            file_format (String): csv or parquet (requires the pyarrow
+                package)
+            attribute_names (List of Strings): Columns to export
+            schema (pyarrow Schema Object): Schema of every Parquet file.
+                Values are cast to it with safe casts, so a value that would
+                be truncated (e.g. 1.5 in an int64 column) raises
+            rows_per_file (Int): Rows after which a part file is closed
+            row_group_size (Int): Rows buffered before they are written
+            bucket (S3 Bucket Object): Bucket to upload closed parts to
+            key_prefix (String): Prefix of the uploaded parts' keys
+            keep_local_files (Boolean): Whether or not to keep the local part
+                files once uploaded
+            state (Dict): State of an earlier writer (see get_state) to
+                continue from
+        """
+
+        if file_format not in FILE_FORMATS:
+            raise ValueError(f"file_format must be one of {FILE_FORMATS}")
+        if file_format == "parquet" and pyarrow is None:
+            raise Exception("Parquet exports require the pyarrow package")
+        if schema is not None:
+            if attribute_names is None:
+                attribute_names = schema.names
+            elif list(attribute_names) != schema.names:
+                raise ValueError("attribute_names must match the schema's names")
+
+        self.output_dir = output_dir
+        self.file_format = file_format
+        self.attribute_names = attribute_names
+        self.schema = schema
+        self.rows_per_file = rows_per_file
+        self.row_group_size = row_group_size
+        self.bucket = bucket
+        self.key_prefix = key_prefix
+        self.keep_local_files = keep_local_files
+        self._infer_attributes = attribute_names is None
+        self._infer_schema = schema is None
+
+        self.part_number = 0
+        self.files = []
+        self.rows = 0
+        if state:
+            self.part_number = state["part_number"]
+            self.files = list(state["files"])
+            self.rows = state["rows"]
+            self.attribute_names = state["attribute_names"]
+            if state.get("schema"):
+                self.schema = pyarrow.ipc.read_schema(
+                    pyarrow.py_buffer(base64.b64decode(state["schema"]))
+                )
+
+        self._buffer = []
+        self._part_rows = 0
+        self._part_file = None
+        self._part_writer = None
+
+        os.makedirs(output_dir, exist_ok=True)
+        if state:
+            self._remove_stale_parts()
+
+    @property
+    def part_full(self):
+        """
+        Purpose:
+            Whether or not the current part has reached rows_per_file rows
+        Args:
+            N/A
+        Return:
+            part_full (Boolean): Whether or not the part should be closed
+        """
+
+        return self._part_rows + len(self._buffer) >= self.rows_per_file
+
+    def write(self, item):
+        """
+        Purpose:
+            Buffer an item, writing a row group once row_group_size items are
+            buffered
+        Args:
+            item (Dict): Item to export
+        Return:
+            N/A
+        """
+
+        self._buffer.append(item)
+        if len(self._buffer) >= self.row_group_size:
+            self._write_row_group()
+
+    def close_part(self):
+        """
+        Purpose:
+            Write the buffered items and close the current part file,
+            uploading it if a bucket was given
+        Args:
+            N/A
+        Return:
+            part_location (String): Path (or S3 key) of the part, or None if
+                the part was empty
+        """
+
+        if self._buffer:
+            self._write_row_group()
+        if not self._part_rows:
+            return None
+
+        if self.file_format == "csv":
+            self._part_file.close()
+        else:
+            self._part_writer.close()
+
+        part_filename = self._get_part_filename()
+        os.replace(f"{part_filename}.tmp", part_filename)
+        part_location = part_filename
+        if self.bucket is not None:
+            part_location = f"{self.key_prefix}{os.path.basename(part_filename)}"
+            s3_helpers.upload_file(self.bucket, part_location, part_filename)
+            if not self.keep_local_files:
+                os.remove(part_filename)
+        logging.info(f"Exported {self._part_rows} Rows to {part_location}")
+
+        self.files.append(part_location)
+        self.part_number += 1
+        self._part_rows = 0
+        self._part_file = None
+        self._part_writer = None
+
+        return part_location
+
+    def get_state(self):
+        """
+        Purpose:
+            Return the state of the writer after the last closed part, as a
+            JSON-serializable Dict (see the state arg)
+        Args:
+            N/A
+        Return:
+            state (Dict): part_number, files, rows, attribute_names, and schema
+        """
+
+        schema = None
+        if self.schema is not None:
+            schema = base64.b64encode(self.schema.serialize().to_pybytes())
+
+        return {
+            "part_number": self.part_number,
+            "files": list(self.files),
+            "rows": self.rows - self._part_rows,
+            "attribute_names": self.attribute_names,
+            "schema": schema.decode("ascii") if schema else None,
+        }
+
+    ###
+    # Helper Methods
+    ###
+
+    def _get_part_filename(self):
+        """
+        Purpose:
+            Return the path of the current part file
+        Args:
+            N/A
+        Return:
+            part_filename (String): Path of the part file
+        """
+
+        return os.path.join(
+            self.output_dir, f"part-{self.part_number:05d}.{self.file_format}"
+        )
+
+    def _write_row_group(self):
+        """
+        Purpose:
+            Write the buffered items to the current part file (opening it if
+            needed) and clear the buffer
+        Args:
+            N/A
+        Return:
+            N/A
+        """
+
+        rows = self._buffer
+        self._buffer = []
+
+        if self._infer_attributes:
+            known_attributes = set(self.attribute_names or [])
+            new_attributes = [
+                name
+                for name in dict.fromkeys(name for row in rows for name in row)
+                if name not in known_attributes
+            ]
+            if new_attributes and self.attribute_names is not None:
+                logging.info(f"New Attributes {new_attributes}; Starting a New Part")
+                self.close_part()
+            self.attribute_names = (self.attribute_names or []) + new_attributes
+
+        columns = dynamodb_helpers.items_to_columns(rows, self.attribute_names)
+        columns = {
+            name: [_get_export_value(value, self.file_format) for value in values]
+            for name, values in columns.items()
+        }
+
+        if self.file_format == "csv":
+            if self._part_writer is None:
+                self._part_file = open(
+                    f"{self._get_part_filename()}.tmp", "w", newline=""
+                )
+                self._part_writer = csv.writer(self._part_file)
+                self._part_writer.writerow(self.attribute_names)
+            self._part_writer.writerows(zip(*columns.values()))
+        else:
+            # May close the part to widen the schema, so call it first
+            row_group = self._get_row_group(columns)
+            if self._part_writer is None:
+                self._part_writer = pyarrow.parquet.ParquetWriter(
+                    f"{self._get_part_filename()}.tmp", self.schema
+                )
+            self._part_writer.write_table(row_group)
+
+        self._part_rows += len(rows)
+        self.rows += len(rows)
+
+    def _get_row_group(self, columns):
+        """
+        Purpose:
+            Convert columns to a pyarrow Table with the schema of the part.
+            Without a fixed schema, a row group whose types differ from the
+            part's is checked against a widened schema, which starts a new
+            part. Types that cannot be widened (e.g. string and int64) raise
+        Args:
+            columns (Dict): Attribute names to lists of values
+        Return:
+            row_group (pyarrow Table Object): Rows to write
+        """
+
+        try:
+            row_group = pyarrow.Table.from_pydict(columns)
+            if self.schema is None:
+                self.schema = row_group.schema
+            elif self._infer_schema:
+                schema = pyarrow.unify_schemas(
+                    [self.schema, row_group.schema], promote_options="permissive"
+                )
+                if not schema.equals(self.schema):
+                    logging.info("Export Schema Widened; Starting a New Part")
+                    self.close_part()
+                    self.schema = schema
+
+            return row_group.cast(self.schema, safe=True)
+        except (pyarrow.ArrowInvalid, pyarrow.ArrowTypeError) as err:
+            logging.exception(f"Rows Do Not Fit the Export Schema: {err}")
+            raise
+
+    def _remove_stale_parts(self):
+        """
+        Purpose:
+            Remove the part files numbered from part_number on, left by the
+            interrupted export being resumed (the resumed export writes them
+            again, perhaps as fewer parts)
+        Args:
+            N/A
+        Return:
+            N/A
+        """
+
+        part_pattern = re.compile(rf"part-(\d+)\.{self.file_format}(\.tmp)?$")
+
+        def is_stale(filename):
+            match = part_pattern.match(filename)
+            return match is not None and int(match.group(1)) >= self.part_number
+
+        for filename in os.listdir(self.output_dir):
+            if is_stale(filename):
+                os.remove(os.path.join(self.output_dir, filename))
+
+        if self.bucket is not None:
+            for obj in self.bucket.objects.filter(Prefix=f"{self.key_prefix}part-"):
+                if is_stale(obj.key[len(self.key_prefix) :]):
+                    obj.delete()
+
+
+###
+# Export Functions
+###
+
+
+def export_table(
+    table,
+    output_dir,
+    file_format="parquet",
+    segments=4,
+    attribute_names=None,
+    schema=None,
+    filter_expression=None,
+    projection_expression=None,
+    expression_attribute_names=None,
+    expression_attribute_values=None,
+    page_size=None,
+    rows_per_file=DEFAULT_ROWS_PER_FILE,
+    row_group_size=DEFAULT_ROW_GROUP_SIZE,
+    checkpoint_filename=None,
+    bucket=None,
+    key_prefix="",
+    keep_local_files=True,
+    client=None,
+    rate_limiter=None,
+):
+    """
+    Purpose:
+        Export a table to CSV or Parquet part files with a parallel scan
+        (see dynamodb_helpers.parallel_scan), writing row groups as items
+        arrive so memory does not grow with the table. Full parts are only
+        closed between pages, so the checkpoint saved after each records
+        exactly the items exported so far, and an export started again with
+        the same checkpoint_filename resumes after that part (parts closed
+        since, e.g. to widen the columns, are removed and exported again)
+    Args:
+        table (DynamoDB Table Object): Table object for the table in
+            DynamoDB
+        output_dir (String): Local directory to write the part files to
+        file_format (String): csv or parquet (requires the pyarrow package)
+        segments (Int): Number of segments (and threads) to scan with
+        attribute_names (List of Strings): Columns to export (see
+            ExportFileWriter)
+        schema (pyarrow Schema Object): Schema of the Parquet files
+        filter_expression (String/Condition): FilterExpression of the scan
+        projection_expression (String): Attributes to scan
+        expression_attribute_names (Dict): ExpressionAttributeNames
+        expression_attribute_values (Dict): ExpressionAttributeValues (only
+            for string expressions)
+        page_size (Int): Max items evaluated per request (Limit)
+        rows_per_file (Int): Rows after which a part file is closed (at the
+            end of the current page)
+        row_group_size (Int): Rows buffered before they are written
+        checkpoint_filename (String): Path of the JSON checkpoint to resume
+            from and save to
+        bucket (S3 Bucket Object): Bucket to upload closed parts to
+        key_prefix (String): Prefix of the uploaded parts' keys
+        keep_local_files (Boolean): Whether or not to keep the local part
+            files once uploaded
+        client (DynamoDB Client Object): Low-level client to scan with.
+            Defaults to one with the table's credentials and endpoint (see
+            dynamodb_helpers.create_dynamodb_client_for_table)
+        rate_limiter (CapacityRateLimiter Object): Limiter to pace the reads
+    Return:
+        export_summary (Dict): Dict with the rows and files exported (in
+            total, including resumed parts), rows_per_second, and
+            elapsed_seconds
+    """
+    logging.info(f"Exporting {table.name} to {output_dir} ({file_format})")
+
+    start_time = time.monotonic()
+    checkpoint = None
+    if checkpoint_filename:
+        checkpoint = _load_export_checkpoint(
+            checkpoint_filename, table.name, segments, file_format
+        )
+
+    writer = ExportFileWriter(
+        output_dir,
+        file_format=file_format,
+        attribute_names=attribute_names,
+        schema=schema,
+        rows_per_file=rows_per_file,
+        row_group_size=row_group_size,
+        bucket=bucket,
+        key_prefix=key_prefix,
+        keep_local_files=keep_local_files,
+        state=checkpoint["writer"] if checkpoint else None,
+    )
+    start_keys = checkpoint["start_keys"] if checkpoint else {}
+    resumed_rows = writer.rows
+    segment_keys = dict(start_keys)
+
+    def save_checkpoint():
+        if checkpoint_filename:
+            _save_export_checkpoint(
+                checkpoint_filename,
+                table.name,
+                segments,
+                file_format,
+                segment_keys,
+                writer.get_state(),
+            )
+
+    def checkpoint_segment(segment, last_key):
+        segment_keys[segment] = last_key
+        if writer.part_full:
+            writer.close_part()
+            save_checkpoint()
+
+    if client is None:
+        client = dynamodb_helpers.create_dynamodb_client_for_table(table)
+
+    try:
+        for item in dynamodb_helpers.parallel_scan(
+            table,
+            segments=segments,
+            filter_expression=filter_expression,
+            projection_expression=projection_expression,
+            expression_attribute_names=expression_attribute_names,
+            expression_attribute_values=expression_attribute_values,
+            page_size=page_size,
+            start_keys=start_keys,
+            checkpoint_callback=checkpoint_segment,
+            rate_limiter=rate_limiter,
+            client=client,
+        ):
+            writer.write(item)
+
+        writer.close_part()
+        save_checkpoint()
+    except Exception as err:
+        logging.exception(f"Exception Exporting Table: {err}")
+        raise
+
+    return _get_export_summary(writer, writer.rows - resumed_rows, start_time)
+
+
+def export_items(
+    items,
+    output_dir,
+    file_format="parquet",
+    attribute_names=None,
+    schema=None,
+    rows_per_file=DEFAULT_ROWS_PER_FILE,
+    row_group_size=DEFAULT_ROW_GROUP_SIZE,
+    bucket=None,
+    key_prefix="",
+    keep_local_files=True,
+):
+    """
+    Purpose:
+        Export any stream of items (e.g. from dynamodb_helpers.query with a
+        low-level client) to CSV or Parquet part files, writing row groups
+        as items arrive. Not resumable (see export_table)
+    Args:
+        items (Iterable of Dicts): Items to export
+        output_dir (String): Local directory to write the part files to
+        file_format (String): csv or parquet (requires the pyarrow package)
+        attribute_names (List of Strings): Columns to export (see
+            ExportFileWriter)
+        schema (pyarrow Schema Object): Schema of the Parquet files
+        rows_per_file (Int): Rows after which a part file is closed
+        row_group_size (Int): Rows buffered before they are written
+        bucket (S3 Bucket Object): Bucket to upload closed parts to
+        key_prefix (String): Prefix of the uploaded parts' keys
+        keep_local_files (Boolean): Whether or not to keep the local part
+            files once uploaded
+    Return:
+        export_summary (Dict): Dict with the rows and files exported,
+            rows_per_second, and elapsed_seconds
+    """
+    logging.info(f"Exporting Items to {output_dir} ({file_format})")
+
+    start_time = time.monotonic()
+    writer = ExportFileWriter(
+        output_dir,
+        file_format=file_format,
+        attribute_names=attribute_names,
+        schema=schema,
+        rows_per_file=rows_per_file,
+        row_group_size=row_group_size,
+        bucket=bucket,
+        key_prefix=key_prefix,
+        keep_local_files=keep_local_files,
+    )
+
+    try:
+        for item in items:
+            writer.write(item)
+            if writer.part_full:
+                writer.close_part()
+        writer.close_part()
+    except Exception as err:
+        logging.exception(f"Exception Exporting Items: {err}")
+        raise
+
+    return _get_export_summary(writer, writer.rows, start_time)
+
+
+###
+# Helper Functions
+###
+
+
+def _get_export_value(value, file_format):
+    """
+    Purpose:
+        Convert an item value to a value both file formats can hold: maps,
+        lists, and sets become JSON strings, and binary becomes base64 in CSV
+    Args:
+        value (Any): Value of an item attribute
+        file_format (String): csv or parquet
+    Return:
+        value (Any): Value to export
+    """
+
+    if isinstance(value, (dict, list, set)):
+        return json.dumps(value, default=_get_json_value, sort_keys=True)
+    if file_format == "csv" and isinstance(value, bytes):
+        return base64.b64encode(value).decode("ascii")
+
+    return value
+
+
+def _get_json_value(value):
+    """
+    Purpose:
+        Convert values json cannot encode (sets, binary, Decimals from a
+        resource scan) for _get_export_value
+    Args:
+        value (Any): Value json cannot encode
+    Return:
+        value (Any): JSON-serializable value
+    """
+
+    if isinstance(value, set):
+        return sorted(value, key=repr)
+    if isinstance(value, bytes):
+        return base64.b64encode(value).decode("ascii")
+
+    return str(value)
+
+
+def _get_export_summary(writer, exported_rows, start_time):
+    """
+    Purpose:
+        Return the summary of an export
+    Args:
+        writer (ExportFileWriter Object): Writer of the export
+        exported_rows (Int): Rows exported by this run
+        start_time (Float): time.monotonic() when the run started
+    Return:
+        export_summary (Dict): Dict with rows, files, rows_per_second, and
+            elapsed_seconds
+    """
+
+    elapsed_seconds = time.monotonic() - start_time
+    rows_per_second = exported_rows / elapsed_seconds if elapsed_seconds else 0.0
+    logging.info(
+        f"Exported {exported_rows} Rows in {elapsed_seconds:.2f}s "
+        f"({rows_per_second:.0f} rows/s)"
+    )
+
+    return {
+        "rows": writer.rows,
+        "files": writer.files,
+        "rows_per_second": rows_per_second,
+        "elapsed_seconds": elapsed_seconds,
+    }
+
+
+def _load_export_checkpoint(checkpoint_filename, table_name, segments, file_format):
+    """
+    Purpose:
+        Load the checkpoint of an earlier export, if it was an export of the
+        same table with the same segments and format
+    Args:
+        checkpoint_filename (String): Path to the checkpoint file
+        table_name (String): Name of the table
+        segments (Int): Number of segments of the scan
+        file_format (String): csv or parquet
+    Return:
+        checkpoint (Dict): start_keys (segment numbers to low-level keys) and
+            writer state, or None to start over
+    """
+
+    if not os.path.isfile(checkpoint_filename):
+        return None
+
+    try:
+        with open(checkpoint_filename) as checkpoint_file:
+            saved_checkpoint = json.load(checkpoint_file)
+    except (OSError, ValueError) as err:
+        logging.warning(f"Ignoring Unreadable Checkpoint {checkpoint_filename}: {err}")
+        return None
+
+    if (
+        saved_checkpoint.get("table_name") != table_name
+        or saved_checkpoint.get("segments") != segments
+        or saved_checkpoint.get("file_format") != file_format
+    ):
+        logging.info(f"Export Changed Since {checkpoint_filename}; Starting Over")
+        return None
+
+    start_keys = {
+        int(segment): _decode_key(key) if key else None
+        for segment, key in saved_checkpoint["start_keys"].items()
+    }
+    logging.info(
+        f"Resuming Export After {saved_checkpoint['writer']['rows']} Rows "
+        f"({len(start_keys)} of {segments} segments started)"
+    )
+
+    return {"start_keys": start_keys, "writer": saved_checkpoint["writer"]}
+
+
+def _save_export_checkpoint(
+    checkpoint_filename, table_name, segments, file_format, segment_keys, state
+):
+    """
+    Purpose:
+        Save the checkpoint of an export (atomically, so an interrupted save
+        leaves the previous checkpoint)
+    Args:
+        checkpoint_filename (String): Path to the checkpoint file
+        table_name (String): Name of the table
+        segments (Int): Number of segments of the scan
+        file_format (String): csv or parquet
+        segment_keys (Dict): Segment numbers to the low-level key to resume
+            after (None once complete)
+        state (Dict): State of the ExportFileWriter
+    Return:
+        N/A
+    """
+
+    saved_checkpoint = {
+        "table_name": table_name,
+        "segments": segments,
+        "file_format": file_format,
+        "start_keys": {
+            str(segment): _encode_key(key) if key else None
+            for segment, key in segment_keys.items()
+        },
+        "writer": state,
+    }
+
+    temp_checkpoint_filename = f"{checkpoint_filename}.tmp"
+    with open(temp_checkpoint_filename, "w") as checkpoint_file:
+        json.dump(saved_checkpoint, checkpoint_file)
+    os.replace(temp_checkpoint_filename, checkpoint_filename)
+
+
+def _encode_key(key):
+    """
+    Purpose:
+        Make a low-level key JSON-serializable (binary values become base64)
+    Args:
+        key (Dict): Key in the low-level format
+    Return:
+        key (Dict): JSON-serializable key
+    """
+
+    return {
+        name: {"B": base64.b64encode(value["B"]).decode("ascii")}
+        if "B" in value
+        else value
+        for name, value in key.items()
+    }
+
+
+def _decode_key(key):
+    """
+    Purpose:
+        Reverse _encode_key
+    Args:
+        key (Dict): JSON-serializable key
+    Return:
+        key (Dict): Key in the low-level format
+    """
+
+    return {
+        name: {"B": base64.b64decode(value["B"])} if "B" in value else value
+        for name, value in key.items()
+    }
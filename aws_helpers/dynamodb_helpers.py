@@ -8,9 +8,32 @@
 
 # Python Library Imports
 import logging
+import queue
+import threading
+import time
 import boto3
-from boto3.dynamodb.conditions import Key, Attr
+import botocore.credentials
+import botocore.session
+from boto3.dynamodb.conditions import (
+    Attr,
+    ConditionBase,
+    ConditionExpressionBuilder,
+    Key,
+)
+from boto3.dynamodb.types import TypeSerializer
 from botocore.exceptions import ClientError, NoCredentialsError, BotoCoreError
+from collections import OrderedDict
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, as_completed, wait
+from decimal import Decimal
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+# Local Library Imports
+from aws_helpers import retry_helpers, session_helpers
+from aws_helpers.cache_helpers import LRUCache
 
 ###
 # Manage DynamoDB Resource Functions
@@ -20,7 +43,9 @@ from botocore.exceptions import ClientError, NoCredentialsError, BotoCoreError
 def create_dynamodb_resource(region_name=None, access_key=None, secret_key=None):
     """
     Purpose:
-        Return a DynamoDB resource object.
+        Return a DynamoDB resource object. Resources are cached in the shared
+        resource pool (see session_helpers) so repeated calls reuse the same
+        warm connection pool
     Args:
         region_name (String): Name of region to connect to
         access_key (String): access key to use to connect to DynamoDB Resource
@@ -31,22 +56,12 @@ def create_dynamodb_resource(region_name=None, access_key=None, secret_key=None)
 
     dynamodb = None
     try:
-        if region_name:
-            if access_key and secret_key:
-                session = boto3.Session(
-                    aws_access_key_id=access_key, aws_secret_access_key=secret_key
-                )
-                dynamodb = session.resource("dynamodb", region_name)
-            else:
-                dynamodb = boto3.resource("dynamodb", region_name)
-        else:
-            if access_key and secret_key:
-                session = boto3.Session(
-                    aws_access_key_id=access_key, aws_secret_access_key=secret_key
-                )
-                dynamodb = session.resource("dynamodb")
-            else:
-                dynamodb = boto3.resource("dynamodb")
+        dynamodb = session_helpers.get_resource(
+            "dynamodb",
+            region_name=region_name,
+            access_key=access_key,
+            secret_key=secret_key,
+        )
     except NoCredentialsError as err:
         logging.exception("No Credentials Found for AWS")
         raise
@@ -54,6 +69,66 @@ def create_dynamodb_resource(region_name=None, access_key=None, secret_key=None)
     return dynamodb
 
 
+def create_dynamodb_client(region_name=None, access_key=None, secret_key=None):
+    """
+    Purpose:
+        Return a low-level DynamoDB client object (from the shared resource
+        pool). Unlike the client of a resource it does not convert items to
+        Python types, so it can be passed as the client of the read helpers
+        (query, parallel_scan, batch_get) to use their fast deserialization
+    Args:
+        region_name (String): Name of region to connect to
+        access_key (String): access key to use to connect to DynamoDB
+        secret_key (String): secret key to use to connect to DynamoDB
+    Return:
+        client (DynamoDB Client Object): DynamoDB Client Object
+    """
+
+    client = None
+    try:
+        client = session_helpers.get_client(
+            "dynamodb",
+            region_name=region_name,
+            access_key=access_key,
+            secret_key=secret_key,
+        )
+    except NoCredentialsError as err:
+        logging.exception("No Credentials Found for AWS")
+        raise
+
+    return client
+
+
+def create_dynamodb_client_for_table(table):
+    """
+    Purpose:
+        Return a low-level DynamoDB client (see create_dynamodb_client) that
+        connects like a Table resource: with its credentials (refreshed the
+        same way), region, endpoint (e.g. DynamoDB Local), and config
+    Args:
+        table (DynamoDB Table Object): Table object for the table in
+            DynamoDB
+    Return:
+        client (DynamoDB Client Object): DynamoDB Client Object
+    """
+
+    table_client = table.meta.client
+    botocore_session = botocore.session.get_session()
+    botocore_session.register_component(
+        "credential_provider",
+        botocore.credentials.CredentialResolver(
+            [_ClientCredentialProvider(table_client._get_credentials())]
+        ),
+    )
+
+    return boto3.session.Session(botocore_session=botocore_session).client(
+        "dynamodb",
+        region_name=table_client.meta.region_name,
+        endpoint_url=table_client.meta.endpoint_url,
+        config=table_client.meta.config,
+    )
+
+
 ###
 # Table Functions
 ###
@@ -194,12 +269,419 @@ def check_table_exists_and_active(dynamodb, table_name):
     return table_exists, table_active
 
 
+###
+# Rate Limit Functions
+###
+
+
+class CapacityRateLimiter(object):
+    """
+        CapacityRateLimiter Class. Token buckets of read and write capacity
+        units per second, metered by the ConsumedCapacity DynamoDB returns,
+        so requests are paced close to the provisioned throughput instead of
+        being throttled
+    """
+
+    def __init__(self, read_capacity=None, write_capacity=None, burst_seconds=1.0):
+        """
+        Purpose:
+            Initilize the CapacityRateLimiter Class. A request waits until its
+            bucket is not in debt and reserves the average cost of the
+            requests so far, so concurrent requests cannot all be admitted on
+            the same tokens; once it returns, the reservation is settled
+            against the capacity it consumed (the bucket can go into debt for
+            requests larger than the average)
+        Args:
+            read_capacity (Float): Read capacity units per second (None does
+                not limit reads)
+            write_capacity (Float): Write capacity units per second (None does
+                not limit writes)
+            burst_seconds (Float): Seconds of unused capacity that can be
+                saved up for bursts
+        """
+
+        self.burst_seconds = burst_seconds
+        self._lock = threading.Lock()
+        self._buckets = {
+            "read": self._new_bucket(read_capacity),
+            "write": self._new_bucket(write_capacity),
+        }
+
+    @classmethod
+    def from_table(cls, table, utilization=0.9, burst_seconds=1.0):
+        """
+        Purpose:
+            Create a CapacityRateLimiter sized from a table's provisioned
+            throughput (on-demand tables are not limited)
+        Args:
+            table (DynamoDB Table Object): Table object for the table in
+                DynamoDB
+            utilization (Float): Fraction of the provisioned throughput to use
+            burst_seconds (Float): Seconds of unused capacity that can be
+                saved up for bursts
+        Return:
+            rate_limiter (CapacityRateLimiter Object): Rate limiter
+        """
+
+        throughput = table.provisioned_throughput or {}
+        read_capacity = throughput.get("ReadCapacityUnits") or None
+        write_capacity = throughput.get("WriteCapacityUnits") or None
+        logging.info(
+            f"Rate Limiting {table.name} to {utilization:.0%} of "
+            f"RCU={read_capacity} and WCU={write_capacity}"
+        )
+
+        return cls(
+            read_capacity=read_capacity and read_capacity * utilization,
+            write_capacity=write_capacity and write_capacity * utilization,
+            burst_seconds=burst_seconds,
+        )
+
+    def wait(self, kind):
+        """
+        Purpose:
+            Block until a bucket has capacity for another request, then
+            reserve the request's estimated cost (settled by consume)
+        Args:
+            kind (String): "read" or "write"
+        Return:
+            waited_seconds (Float): Seconds spent waiting
+        """
+
+        waited_seconds = 0.0
+        while True:
+            with self._lock:
+                bucket = self._refill(kind)
+                if bucket["rate"] is None:
+                    return waited_seconds
+                if bucket["tokens"] > 0:
+                    estimate = (
+                        bucket["consumed"] / bucket["requests"]
+                        if bucket["requests"]
+                        else 1.0
+                    )
+                    bucket["tokens"] -= estimate
+                    bucket["reserved"] += estimate
+                    bucket["pending"] += 1
+                    bucket["waited_seconds"] += waited_seconds
+                    return waited_seconds
+                wait_seconds = -bucket["tokens"] / bucket["rate"] + 0.001
+
+            time.sleep(wait_seconds)
+            waited_seconds += wait_seconds
+
+    def consume(self, kind, units):
+        """
+        Purpose:
+            Take consumed capacity units out of a bucket, settling the
+            reservation of a request admitted by wait
+        Args:
+            kind (String): "read" or "write"
+            units (Float): Capacity units consumed
+        Return:
+            N/A
+        """
+
+        with self._lock:
+            bucket = self._refill(kind)
+            bucket["consumed"] += units
+            bucket["requests"] += 1
+            if bucket["rate"] is not None:
+                if bucket["pending"]:
+                    reservation = bucket["reserved"] / bucket["pending"]
+                    bucket["tokens"] += reservation
+                    bucket["reserved"] -= reservation
+                    bucket["pending"] -= 1
+                bucket["tokens"] -= units
+
+    def consume_capacity(self, kind, consumed_capacity):
+        """
+        Purpose:
+            Take the ConsumedCapacity of a response out of a bucket
+        Args:
+            kind (String): "read" or "write"
+            consumed_capacity (Dict/List of Dicts): ConsumedCapacity of a
+                response (a List for batch requests)
+        Return:
+            N/A
+        """
+
+        if isinstance(consumed_capacity, dict):
+            consumed_capacity = [consumed_capacity]
+
+        self.consume(
+            kind,
+            sum(
+                capacity.get("CapacityUnits", 0)
+                for capacity in consumed_capacity or []
+            ),
+        )
+
+    def get_stats(self):
+        """
+        Purpose:
+            Return the rate, available tokens, consumed units, requests,
+            reserved units, and time spent waiting of both buckets
+        Args:
+            N/A
+        Return:
+            stats (Dict): Dict of read and write bucket stats
+        """
+
+        with self._lock:
+            return {
+                kind: {
+                    stat: value
+                    for stat, value in self._refill(kind).items()
+                    if stat not in ("pending", "updated")
+                }
+                for kind in self._buckets
+            }
+
+    def _new_bucket(self, rate):
+        """
+        Purpose:
+            Return a full bucket for a rate
+        Args:
+            rate (Float): Capacity units per second
+        Return:
+            bucket (Dict): Bucket state
+        """
+
+        return {
+            "rate": rate,
+            "tokens": rate * self.burst_seconds if rate else 0.0,
+            "consumed": 0.0,
+            "requests": 0,
+            "reserved": 0.0,
+            "pending": 0,
+            "waited_seconds": 0.0,
+            "updated": time.monotonic(),
+        }
+
+    def _refill(self, kind):
+        """
+        Purpose:
+            Add the tokens earned since the last update to a bucket (called
+            with the lock held)
+        Args:
+            kind (String): "read" or "write"
+        Return:
+            bucket (Dict): Refilled bucket state
+        """
+
+        bucket = self._buckets[kind]
+        now = time.monotonic()
+        if bucket["rate"] is not None:
+            bucket["tokens"] = min(
+                bucket["tokens"] + (now - bucket["updated"]) * bucket["rate"],
+                bucket["rate"] * self.burst_seconds,
+            )
+        bucket["updated"] = now
+
+        return bucket
+
+
+###
+# Item Cache Functions
+###
+
+
+_ITEM_NOT_CACHED = object()
+
+
+class ItemCache(LRUCache):
+    """
+        ItemCache Class. Read-through LRU cache of DynamoDB items (see
+        get_record), invalidated by the writes made through the record
+        functions of this library. Writes made elsewhere are only picked up
+        once the cached entry's ttl expires
+    """
+
+    def __init__(self, max_size=10000, ttl=60):
+        """
+        Purpose:
+            Initilize the ItemCache Class. Missing items are cached too, so
+            repeated lookups of a missing key do not reach the table. Each
+            key (and table) has its own generation, so a write only stops
+            in-flight reads of the same item from being cached
+        Args:
+            max_size (Int): Max number of items to cache
+            ttl (Float): Seconds an item is cached for
+        """
+
+        super().__init__(max_size=max_size, ttl=ttl)
+        self._key_names = {}
+        self._generation = 0
+        self._table_generations = {}
+        # Generations of the most recently invalidated keys. Keys dropped
+        # from it fall back to the floor (the newest generation dropped)
+        self._key_generations = OrderedDict()
+        self._key_generation_floor = 0
+
+    def get_item(self, table, key):
+        """
+        Purpose:
+            Return the cached item for a key
+        Args:
+            table (DynamoDB Table Object): Table of the item
+            key (Dict): Primary key of the item
+        Return:
+            item (Dict): Cached item (None for a cached missing item), or
+                _ITEM_NOT_CACHED on a miss
+        """
+
+        return self.get(self._get_cache_key(table.name, key), _ITEM_NOT_CACHED)
+
+    def get_generation(self, table, key):
+        """
+        Purpose:
+            Return the generation of a key, to pass to set_item after reading
+            the item from the table
+        Args:
+            table (DynamoDB Table Object): Table of the item
+            key (Dict): Primary key of the item
+        Return:
+            generation (Tuple): Generations of the table and the key
+        """
+
+        cache_key = self._get_cache_key(table.name, key)
+        with self._lock:
+            return (
+                self._table_generations.get(table.name, 0),
+                self._key_generations.get(cache_key, self._key_generation_floor),
+            )
+
+    def set_item(self, table, key, item, generation):
+        """
+        Purpose:
+            Cache an item read from the table, unless the key (or table) was
+            invalidated since the read started (the item may be stale)
+        Args:
+            table (DynamoDB Table Object): Table of the item
+            key (Dict): Primary key of the item
+            item (Dict): Item read (None if missing)
+            generation (Tuple): generation of the key when the read started
+                (see get_generation)
+        Return:
+            N/A
+        """
+
+        with self._lock:
+            if generation == self.get_generation(table, key):
+                self.set(self._get_cache_key(table.name, key), item)
+
+    def invalidate_record(self, table, record):
+        """
+        Purpose:
+            Remove the cached item with the primary key of a record. Records
+            missing a key attribute cannot have been written, so are ignored
+        Args:
+            table (DynamoDB Table Object): Table of the item
+            record (Dict): Record (or key) of the item
+        Return:
+            N/A
+        """
+
+        key_names = self._key_names.get(table.name)
+        if key_names is None:
+            key_names = [key["AttributeName"] for key in table.key_schema]
+            self._key_names[table.name] = key_names
+
+        key = {key_name: record.get(key_name) for key_name in key_names}
+        if None in key.values():
+            return
+
+        cache_key = self._get_cache_key(table.name, key)
+        with self._lock:
+            self._generation += 1
+            self._key_generations.pop(cache_key, None)
+            self._key_generations[cache_key] = self._generation
+            while len(self._key_generations) > self.max_size:
+                _, dropped_generation = self._key_generations.popitem(last=False)
+                self._key_generation_floor = dropped_generation
+            self.invalidate(cache_key)
+
+    def invalidate_table(self, table_name):
+        """
+        Purpose:
+            Remove every cached item of a table
+        Args:
+            table_name (String): Name of the table
+        Return:
+            N/A
+        """
+
+        with self._lock:
+            self._generation += 1
+            self._table_generations[table_name] = self._generation
+            self.invalidate_where(lambda cache_key: cache_key[0] == table_name)
+
+    @staticmethod
+    def _get_cache_key(table_name, key):
+        """
+        Purpose:
+            Return the cache key of an item
+        Args:
+            table_name (String): Name of the table
+            key (Dict): Primary key of the item
+        Return:
+            cache_key (Tuple): Table name and sorted key attributes
+        """
+
+        return (table_name, tuple(sorted(key.items())))
+
+
+def get_record(table, key, cache=None, consistent_read=False, rate_limiter=None):
+    """
+    Purpose:
+        Return a single record by primary key, reading through an ItemCache
+        if one is given. Cached records are shared, so do not modify them
+    Args:
+        table (DynamoDB Table Object): Table object for the table in
+            DynamoDB
+        key (Dict): Primary key of the record
+        cache (ItemCache Object): Cache to read through
+        consistent_read (Boolean): Whether or not to use a strongly
+            consistent read (on a cache miss)
+        rate_limiter (CapacityRateLimiter Object): Limiter to pace the read
+    Return:
+        record (Dict): Record, or None if no record has the key
+    """
+
+    if cache is not None:
+        record = cache.get_item(table, key)
+        if record is not _ITEM_NOT_CACHED:
+            return record
+        generation = cache.get_generation(table, key)
+
+    get_args = {"Key": key, "ConsistentRead": consistent_read}
+    if rate_limiter:
+        get_args["ReturnConsumedCapacity"] = "TOTAL"
+
+    try:
+        if rate_limiter:
+            rate_limiter.wait("read")
+        response = table.get_item(**get_args)
+        if rate_limiter:
+            rate_limiter.consume_capacity("read", response.get("ConsumedCapacity"))
+    except Exception as err:
+        logging.exception(f"Exception Getting Record From Table: {err}")
+        raise
+
+    record = response.get("Item")
+    if cache is not None:
+        cache.set_item(table, key, record, generation)
+
+    return record
+
+
 ###
 # Record Functions
 ###
 
 
-def insert_record(table, record):
+def insert_record(table, record, rate_limiter=None, cache=None):
     """
     Purpose:
         Insert single record into DynamoDB table
@@ -207,82 +689,999 @@ def insert_record(table, record):
         table (DynamoDB Table Object): Table object for the table in
             DynamoDB
         record (Dict): Single to insert/update in the table
+        rate_limiter (CapacityRateLimiter Object): Limiter to pace the write
+        cache (ItemCache Object): Cache to invalidate the record in
     Return:
         N/A
     """
 
     try:
-        table.put_item(Item=record)
+        if rate_limiter:
+            rate_limiter.wait("write")
+            response = table.put_item(Item=record, ReturnConsumedCapacity="TOTAL")
+            rate_limiter.consume_capacity("write", response.get("ConsumedCapacity"))
+        else:
+            table.put_item(Item=record)
     except Exception as err:
         logging.exception(f"Exception Inserting Record Into Table: {err}")
         raise
+    finally:
+        if cache is not None:
+            cache.invalidate_record(table, record)
 
 
-def insert_records(table, records):
+def insert_records(
+    table, records, overwrite_by_pkeys=None, rate_limiter=None, cache=None
+):
     """
     Purpose:
-        Batch insert records into database
+        Batch insert records into database (see bulk_insert_records for
+        large loads)
     Args:
         table (DynamoDB Table Object): Table object for the table in
             DynamoDB
         records (List of Dict): List of records to insert/update in the
             table
+        overwrite_by_pkeys (List of Strings): Primary key names. Records with
+            the same key in a batch are deduplicated (the last one wins)
+        rate_limiter (CapacityRateLimiter Object): Limiter to pace the writes
+        cache (ItemCache Object): Cache to invalidate the records in
     Return:
         N/A
     """
 
+    if cache is not None:
+        records = list(records)
+
     try:
-        with table.batch_writer() as batch:
+        _insert_records(table, records, overwrite_by_pkeys, rate_limiter)
+    finally:
+        if cache is not None:
             for record in records:
-                batch.put_item(Item=record)
+                cache.invalidate_record(table, record)
+
+
+def bulk_insert_records(
+    table,
+    records,
+    num_workers=8,
+    overwrite_by_pkeys=None,
+    max_retries=8,
+    rate_limiter=None,
+):
+    """
+    Purpose:
+        Insert a large number of records with BatchWriteItem (25 records per
+        request), sending requests from several threads at once.
+        UnprocessedItems are retried with jittered exponential backoff.
+        Records are read lazily, so memory is bounded for any iterable
+    Args:
+        table (DynamoDB Table Object): Table object for the table in
+            DynamoDB
+        records (Iterable of Dicts): Records to insert/update in the table
+        num_workers (Int): Number of threads sending requests
+        overwrite_by_pkeys (List of Strings): Primary key names. Records with
+            the same key in a batch are deduplicated (the last one wins);
+            without it such a batch is rejected by DynamoDB
+        max_retries (Int): Max times to retry the unprocessed items of a
+            request
+        rate_limiter (CapacityRateLimiter Object): Limiter to pace the writes
+    Return:
+        insert_summary (Dict): Dict with the number of records inserted, the
+            records that failed, consumed_wcu, items_per_second, and
+            elapsed_seconds
+    """
+    logging.info(f"Bulk Inserting Records Into {table.name} ({num_workers} workers)")
+
+    start_time = time.monotonic()
+    inserted_count = 0
+    consumed_wcu = 0.0
+    failed = []
+    client = table.meta.client
+
+    try:
+        with ThreadPoolExecutor(max_workers=num_workers) as executor:
+            pending = set()
+            finished = set()
+            for batch in _get_write_batches(records, overwrite_by_pkeys):
+                if len(pending) >= num_workers * 2:
+                    finished, pending = wait(pending, return_when=FIRST_COMPLETED)
+                pending.add(
+                    executor.submit(
+                        _batch_write_records,
+                        client,
+                        table.name,
+                        batch,
+                        max_retries,
+                        rate_limiter,
+                    )
+                )
+
+                for future in finished:
+                    batch_inserted, batch_wcu, batch_failed = future.result()
+                    inserted_count += batch_inserted
+                    consumed_wcu += batch_wcu
+                    failed.extend(batch_failed)
+                finished = set()
+
+            for future in as_completed(pending):
+                batch_inserted, batch_wcu, batch_failed = future.result()
+                inserted_count += batch_inserted
+                consumed_wcu += batch_wcu
+                failed.extend(batch_failed)
     except Exception as err:
-        logging.exception(f"Exception Batch Inserting Records Into Table: {err}")
+        logging.exception(f"Exception Bulk Inserting Records Into Table: {err}")
         raise
 
+    elapsed_seconds = time.monotonic() - start_time
+    items_per_second = inserted_count / elapsed_seconds if elapsed_seconds else 0.0
+    logging.info(
+        f"Inserted {inserted_count} Records ({len(failed)} failed) in "
+        f"{elapsed_seconds:.2f}s ({items_per_second:.0f} items/s, "
+        f"{consumed_wcu:.0f} WCU)"
+    )
+
+    return {
+        "inserted": inserted_count,
+        "failed": failed,
+        "consumed_wcu": consumed_wcu,
+        "items_per_second": items_per_second,
+        "elapsed_seconds": elapsed_seconds,
+    }
+
 
-def delete_record(table, query):
+def delete_record(table, query, cache=None):
     """
     Purpose:
         Delete single record into DynamoDB table
     Args:
         table (DynamoDB Table Object): Table object for the table in
             DynamoDB
-        query (Dict): Delete specifications (field and values to match
-            record and delete)
+        query (Dict): Delete specifications (primary key of the record to
+            delete)
+        cache (ItemCache Object): Cache to invalidate the record in
     Return:
         N/A
     """
 
     try:
-        table.delete_item(Item=record)
+        table.delete_item(Key=query)
     except Exception as err:
         logging.exception(f"Exception Deleting Record From Table: {err}")
         raise
+    finally:
+        if cache is not None:
+            cache.invalidate_record(table, query)
 
 
-def get_records(table, query):
+def get_records(table, key_condition, index_name=None, limit=None, client=None):
     """
     Purpose:
-        Return Records from a Table
+        Return Records from a Table (or an Index) matching a key condition
+        (see query to stream large result sets instead)
     Args:
         table (DynamoDB Table Object): Table object for the table in
             DynamoDB
+        key_condition (String/Condition): KeyConditionExpression of the query
+            (e.g. Key("userId").eq("testuser"))
+        index_name (String): Name of a GSI/LSI to query instead of the table
+        limit (Int): Max records to return
+        client (DynamoDB Client Object): Low-level client to query with (see
+            query)
     Return:
-        ?
+        records (List of Dicts): Matching records
     """
 
-    # table.query(KeyConditionExpression=Key('userId').eq("testuser"))
-    # table.query(
-    #     IndexName=gsi_name,
-    #     KeyConditionExpression=Key("City").eq(city)
-    # )
+    return list(
+        query(table, key_condition, index_name=index_name, limit=limit, client=client)
+    )
+
+
+###
+# Batch Constants
+###
+
+
+MAX_BATCH_GET_KEYS = 100
+MAX_BATCH_WRITE_ITEMS = 25
+
+
+###
+# Batch Get Functions
+###
+
+
+def batch_get(
+    table,
+    keys,
+    projection_expression=None,
+    expression_attribute_names=None,
+    consistent_read=False,
+    max_workers=8,
+    max_retries=8,
+    rate_limiter=None,
+    client=None,
+):
+    """
+    Purpose:
+        Lazily get many records by key with BatchGetItem. Keys are split into
+        requests of 100, the requests are sent concurrently, UnprocessedKeys
+        are retried with jittered exponential backoff, and records are
+        yielded as each request completes (not in key order). Keys without a
+        record are skipped
+    Args:
+        table (DynamoDB Table Object): Table object for the table in
+            DynamoDB
+        keys (Iterable of Dicts): Primary keys of the records to get
+        projection_expression (String): Attributes to return
+        expression_attribute_names (Dict): ExpressionAttributeNames
+        consistent_read (Boolean): Whether or not to use strongly consistent
+            reads
+        max_workers (Int): Max requests to send at once
+        max_retries (Int): Max times to retry the unprocessed keys of a
+            request before raising
+        rate_limiter (CapacityRateLimiter Object): Limiter to pace the reads
+        client (DynamoDB Client Object): Low-level client (see
+            create_dynamodb_client) to get the records with instead of the
+            table's. Records are converted with deserialize_item
+    Yield:
+        record (Dict): Next record found
+    """
+
+    request_args = {"ConsistentRead": consistent_read}
+    if projection_expression:
+        request_args["ProjectionExpression"] = projection_expression
+    if expression_attribute_names:
+        request_args["ExpressionAttributeNames"] = expression_attribute_names
+
+    deserialize = client is not None
+    if not deserialize:
+        client = table.meta.client
+    serializer = TypeSerializer()
 
     try:
-        for record in records:
-            response = table.get_item(Key=record)
-            item = response["Item"]
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            pending = set()
+            for key_batch in _get_key_batches(keys, MAX_BATCH_GET_KEYS):
+                if deserialize:
+                    key_batch = [
+                        {
+                            name: serializer.serialize(value)
+                            for name, value in key.items()
+                        }
+                        for key in key_batch
+                    ]
+                if len(pending) >= max_workers * 2:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        yield from future.result()
+                pending.add(
+                    executor.submit(
+                        _batch_get_keys,
+                        client,
+                        table.name,
+                        key_batch,
+                        request_args,
+                        max_retries,
+                        rate_limiter,
+                        deserialize,
+                    )
+                )
+
+            for future in as_completed(pending):
+                yield from future.result()
     except Exception as err:
-        logging.exception(f"Exception Inserting Records Into Table: {err}")
+        logging.exception(f"Exception Batch Getting Records: {err}")
         raise
 
-    return records
+
+###
+# Query Functions
+###
+
+
+def query(
+    table,
+    key_condition,
+    index_name=None,
+    filter_expression=None,
+    projection_expression=None,
+    expression_attribute_names=None,
+    expression_attribute_values=None,
+    consistent_read=False,
+    scan_forward=True,
+    limit=None,
+    page_size=None,
+    exclusive_start_key=None,
+    capacity_callback=None,
+    rate_limiter=None,
+    client=None,
+):
+    """
+    Purpose:
+        Lazily query a table (or an index), following LastEvaluatedKey so
+        only a page at a time is held in memory
+    Args:
+        table (DynamoDB Table Object): Table object for the table in
+            DynamoDB
+        key_condition (String/Condition): KeyConditionExpression of the query
+            (e.g. Key("userId").eq("testuser"))
+        index_name (String): Name of a GSI/LSI to query instead of the table
+        filter_expression (String/Condition): FilterExpression of the query
+        projection_expression (String): Attributes to return
+        expression_attribute_names (Dict): ExpressionAttributeNames
+        expression_attribute_values (Dict): ExpressionAttributeValues (only
+            for string expressions)
+        consistent_read (Boolean): Whether or not to use strongly consistent
+            reads (not supported on GSIs)
+        scan_forward (Boolean): Whether to return items in ascending (True)
+            or descending (False) sort key order
+        limit (Int): Max items to yield
+        page_size (Int): Max items evaluated per request
+        exclusive_start_key (Dict): Key to resume the query after (in the
+            low-level format if client is given)
+        capacity_callback (Function): Called with the ConsumedCapacity of
+            every page
+        rate_limiter (CapacityRateLimiter Object): Limiter to pace the reads
+        client (DynamoDB Client Object): Low-level client (see
+            create_dynamodb_client) to query with instead of the table.
+            Items are converted with deserialize_item (int/float instead of
+            Decimal)
+    Yield:
+        item (Dict): Next matching item
+    """
+    logging.info(f"Querying {table.name}" + (f" ({index_name})" if index_name else ""))
+
+    query_args = {
+        "KeyConditionExpression": key_condition,
+        "ConsistentRead": consistent_read,
+        "ScanIndexForward": scan_forward,
+    }
+    if index_name:
+        query_args["IndexName"] = index_name
+    if filter_expression is not None:
+        query_args["FilterExpression"] = filter_expression
+    if projection_expression:
+        query_args["ProjectionExpression"] = projection_expression
+    if expression_attribute_names:
+        query_args["ExpressionAttributeNames"] = expression_attribute_names
+    if expression_attribute_values:
+        query_args["ExpressionAttributeValues"] = expression_attribute_values
+    if capacity_callback or rate_limiter:
+        query_args["ReturnConsumedCapacity"] = "INDEXES"
+    if client:
+        query_args = _get_client_args(query_args)
+
+    last_key = exclusive_start_key
+    item_count = 0
+    try:
+        while True:
+            request_size = page_size
+            if limit and filter_expression is None:
+                # Without a filter every evaluated item is returned
+                request_size = min(page_size or limit, limit - item_count)
+            if request_size:
+                query_args["Limit"] = request_size
+            if last_key:
+                query_args["ExclusiveStartKey"] = last_key
+
+            if rate_limiter:
+                rate_limiter.wait("read")
+            if client:
+                response = client.query(TableName=table.name, **query_args)
+            else:
+                response = table.query(**query_args)
+            if rate_limiter:
+                rate_limiter.consume_capacity("read", response.get("ConsumedCapacity"))
+            if capacity_callback:
+                capacity_callback(response.get("ConsumedCapacity"))
+
+            for item in response.get("Items", []):
+                yield deserialize_item(item) if client else item
+                item_count += 1
+                if limit and item_count >= limit:
+                    return
+
+            last_key = response.get("LastEvaluatedKey")
+            if not last_key:
+                return
+    except Exception as err:
+        logging.exception(f"Exception Querying Table: {err}")
+        raise
+
+
+###
+# Scan Functions
+###
+
+
+def parallel_scan(
+    table,
+    segments=4,
+    filter_expression=None,
+    projection_expression=None,
+    expression_attribute_names=None,
+    expression_attribute_values=None,
+    page_size=None,
+    consistent_read=False,
+    start_keys=None,
+    checkpoint_callback=None,
+    max_buffered_pages=None,
+    rate_limiter=None,
+    client=None,
+):
+    """
+    Purpose:
+        Lazily scan a table, running a Segment/TotalSegments scan of every
+        segment concurrently and streaming the items through a bounded
+        queue, so only a few pages are held in memory. Items are not yielded
+        in any order
+    Args:
+        table (DynamoDB Table Object): Table object for the table in
+            DynamoDB
+        segments (Int): Number of segments (and threads) to scan with
+        filter_expression (String/Condition): FilterExpression of the scan
+            (e.g. Attr("status").eq("active"))
+        projection_expression (String): Attributes to return
+        expression_attribute_names (Dict): ExpressionAttributeNames
+        expression_attribute_values (Dict): ExpressionAttributeValues (only
+            for string expressions)
+        page_size (Int): Max items evaluated per request (Limit)
+        consistent_read (Boolean): Whether or not to use strongly consistent
+            reads
+        start_keys (Dict): Segment numbers to the key to resume the segment
+            after, as passed to checkpoint_callback by an earlier scan with
+            the same number of segments. Segments mapped to None are
+            complete and skipped
+        checkpoint_callback (Function): Called with (segment, last_key) after
+            every item of a page was yielded. last_key is None once the
+            segment is complete
+        max_buffered_pages (Int): Max scanned pages waiting to be consumed.
+            Defaults to twice the segments
+        rate_limiter (CapacityRateLimiter Object): Limiter to pace the reads
+        client (DynamoDB Client Object): Low-level client (see
+            create_dynamodb_client) to scan with instead of the table. Items
+            are converted with deserialize_item (int/float instead of
+            Decimal) by the scanning threads, and start/checkpoint keys are
+            in the low-level format
+    Yield:
+        item (Dict): Next item of the table
+    """
+    logging.info(f"Scanning {table.name} with {segments} Segments")
+
+    start_keys = start_keys or {}
+    scan_segments = [
+        segment
+        for segment in range(segments)
+        if not (segment in start_keys and start_keys[segment] is None)
+    ]
+    if not scan_segments:
+        return
+
+    scan_args = {"TotalSegments": segments, "ConsistentRead": consistent_read}
+    if filter_expression is not None:
+        scan_args["FilterExpression"] = filter_expression
+    if projection_expression:
+        scan_args["ProjectionExpression"] = projection_expression
+    if expression_attribute_names:
+        scan_args["ExpressionAttributeNames"] = expression_attribute_names
+    if expression_attribute_values:
+        scan_args["ExpressionAttributeValues"] = expression_attribute_values
+    if page_size:
+        scan_args["Limit"] = page_size
+    if rate_limiter:
+        scan_args["ReturnConsumedCapacity"] = "TOTAL"
+    if client:
+        scan_args = _get_client_args(scan_args)
+
+    pages = queue.Queue(maxsize=max_buffered_pages or 2 * segments)
+    stop_event = threading.Event()
+
+    def put_page(page):
+        while not stop_event.is_set():
+            try:
+                pages.put(page, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def scan_segment(segment):
+        segment_args = dict(scan_args, Segment=segment)
+        last_key = start_keys.get(segment)
+        try:
+            while True:
+                if last_key:
+                    segment_args["ExclusiveStartKey"] = last_key
+                if rate_limiter:
+                    rate_limiter.wait("read")
+                if client:
+                    response = client.scan(TableName=table.name, **segment_args)
+                else:
+                    response = table.scan(**segment_args)
+                if rate_limiter:
+                    rate_limiter.consume_capacity(
+                        "read", response.get("ConsumedCapacity")
+                    )
+                items = response.get("Items", [])
+                if client:
+                    items = [deserialize_item(item) for item in items]
+                last_key = response.get("LastEvaluatedKey")
+                if not put_page((segment, items, last_key)):
+                    return
+                if last_key is None:
+                    return
+        except Exception as err:
+            logging.exception(f"Exception Scanning Segment {segment}: {err}")
+            put_page(err)
+
+    with ThreadPoolExecutor(max_workers=len(scan_segments)) as executor:
+        futures = [executor.submit(scan_segment, segment) for segment in scan_segments]
+        try:
+            remaining_segments = len(scan_segments)
+            while remaining_segments:
+                page = pages.get()
+                if isinstance(page, Exception):
+                    raise page
+
+                segment, items, last_key = page
+                yield from items
+                if checkpoint_callback:
+                    checkpoint_callback(segment, last_key)
+                if last_key is None:
+                    remaining_segments -= 1
+        finally:
+            stop_event.set()
+            for future in futures:
+                future.cancel()
+
+
+###
+# Deserialization Functions
+###
+
+
+def deserialize_item(item):
+    """
+    Purpose:
+        Convert an item in the low-level format of the DynamoDB client (e.g.
+        {"id": {"N": "1"}}) to a Dict of Python values. Much cheaper than
+        boto3's TypeDeserializer: numbers become int (float if they have a
+        fraction or exponent) instead of Decimal. Floats keep ~15 significant
+        digits, where DynamoDB numbers keep up to 38
+    Args:
+        item (Dict): Item in the low-level format
+    Return:
+        item (Dict): Item with Python values
+    """
+
+    return {name: _deserialize_value(value) for name, value in item.items()}
+
+
+def items_to_columns(items, attribute_names=None, as_numpy=False):
+    """
+    Purpose:
+        Convert items to columns (attribute name to the list of its values),
+        e.g. to build a DataFrame. Attributes missing from an item are None
+    Args:
+        items (Iterable of Dicts): Items (e.g. from a scan or query)
+        attribute_names (List of Strings): Attributes to include. Defaults to
+            every attribute of any item
+        as_numpy (Boolean): Whether or not to return NumPy arrays (requires
+            the numpy package). Int columns become int64 (object, with None,
+            when values are missing), other numeric columns float64 (NaN for
+            missing values), boolean columns bool, and others object
+    Return:
+        columns (Dict): Attribute names to lists (or arrays) of values
+    """
+
+    if as_numpy and numpy is None:
+        raise Exception("as_numpy requires the numpy package")
+
+    columns = {name: [] for name in attribute_names or []}
+    row_count = 0
+    for item in items:
+        if attribute_names is None:
+            for name in item:
+                if name not in columns:
+                    columns[name] = [None] * row_count
+        for name, values in columns.items():
+            values.append(item.get(name))
+        row_count += 1
+
+    if as_numpy:
+        columns = {name: _get_column_array(values) for name, values in columns.items()}
+
+    return columns
+
+
+###
+# Helper Functions
+###
+
+
+class _ClientCredentialProvider(botocore.credentials.CredentialProvider):
+    """
+        _ClientCredentialProvider Class. Provides the credentials of an
+        existing client to a new session (see
+        create_dynamodb_client_for_table)
+    """
+
+    METHOD = "existing-client"
+
+    def __init__(self, credentials):
+        """
+        Purpose:
+            Initilize the _ClientCredentialProvider Class.
+        Args:
+            credentials (botocore Credentials Object): Credentials to provide
+                (None for unsigned requests)
+        """
+
+        super().__init__()
+        self.credentials = credentials
+
+    def load(self):
+        """
+        Purpose:
+            Return the credentials
+        Args:
+            N/A
+        Return:
+            credentials (botocore Credentials Object): Credentials
+        """
+
+        return self.credentials
+
+
+def _insert_records(table, records, overwrite_by_pkeys, rate_limiter):
+    """
+    Purpose:
+        Batch insert records into database (see insert_records)
+    Args:
+        table (DynamoDB Table Object): Table object for the table in
+            DynamoDB
+        records (List of Dict): List of records to insert/update in the
+            table
+        overwrite_by_pkeys (List of Strings): Primary key names
+        rate_limiter (CapacityRateLimiter Object): Limiter to pace the writes
+    Return:
+        N/A
+    """
+
+    if rate_limiter:
+        # batch_writer does not report consumed capacity to meter
+        insert_summary = bulk_insert_records(
+            table,
+            records,
+            num_workers=1,
+            overwrite_by_pkeys=overwrite_by_pkeys,
+            rate_limiter=rate_limiter,
+        )
+        if insert_summary["failed"]:
+            raise Exception(
+                f"Failed to Insert {len(insert_summary['failed'])} Records"
+            )
+        return
+
+    try:
+        with table.batch_writer(overwrite_by_pkeys=overwrite_by_pkeys) as batch:
+            for record in records:
+                batch.put_item(Item=record)
+    except Exception as err:
+        logging.exception(f"Exception Batch Inserting Records Into Table: {err}")
+        raise
+
+
+def _get_key_batches(keys, batch_size):
+    """
+    Purpose:
+        Split keys into batches, dropping duplicate keys (BatchGetItem
+        rejects a request with the same key twice). Keys are compared as
+        DynamoDB compares them, so 1 and Decimal("1.0") are the same key
+    Args:
+        keys (Iterable of Dicts): Primary keys
+        batch_size (Int): Max keys per batch
+    Yield:
+        key_batch (List of Dicts): Keys of the batch
+    """
+
+    serializer = TypeSerializer()
+    seen_keys = set()
+    key_batch = []
+    for key in keys:
+        key_id = _get_key_id(key, serializer)
+        if key_id in seen_keys:
+            continue
+        seen_keys.add(key_id)
+
+        key_batch.append(key)
+        if len(key_batch) == batch_size:
+            yield key_batch
+            key_batch = []
+
+    if key_batch:
+        yield key_batch
+
+
+def _get_key_id(key, serializer):
+    """
+    Purpose:
+        Return a hashable id of a primary key that is equal for keys DynamoDB
+        considers equal: values are serialized with TypeSerializer and
+        numbers normalized (so 1, Decimal("1"), and Decimal("1.0") match)
+    Args:
+        key (Dict): Primary key (attribute names to Python values)
+        serializer (TypeSerializer Object): Serializer of the values
+    Return:
+        key_id (Tuple): Sorted (name, type, value) of the key attributes
+    """
+
+    key_id = []
+    for name, value in key.items():
+        ((value_type, value),) = serializer.serialize(value).items()
+        if value_type == "N":
+            value = str(Decimal(value).normalize())
+        key_id.append((name, value_type, value))
+
+    return tuple(sorted(key_id))
+
+
+def _batch_get_keys(
+    client,
+    table_name,
+    keys,
+    request_args,
+    max_retries,
+    rate_limiter=None,
+    deserialize=False,
+):
+    """
+    Purpose:
+        Get a batch of keys with BatchGetItem, retrying UnprocessedKeys with
+        jittered exponential backoff
+    Args:
+        client (DynamoDB Client Object): Client of the Table resource
+        table_name (String): Name of the table
+        keys (List of Dicts): Keys (max 100)
+        request_args (Dict): Other KeysAndAttributes fields of the request
+        max_retries (Int): Max times to retry unprocessed keys
+        rate_limiter (CapacityRateLimiter Object): Limiter to pace the reads
+        deserialize (Boolean): Whether or not to convert the records with
+            deserialize_item (for a low-level client)
+    Return:
+        records (List of Dicts): Records found
+    """
+
+    records = []
+    for attempt in range(max_retries + 1):
+        if attempt:
+            retry_helpers.sleep_with_backoff(attempt - 1)
+        if rate_limiter:
+            rate_limiter.wait("read")
+
+        response = client.batch_get_item(
+            RequestItems={table_name: dict(request_args, Keys=keys)},
+            ReturnConsumedCapacity="TOTAL" if rate_limiter else "NONE",
+        )
+        if rate_limiter:
+            rate_limiter.consume_capacity("read", response.get("ConsumedCapacity"))
+        records.extend(response.get("Responses", {}).get(table_name, []))
+        keys = response.get("UnprocessedKeys", {}).get(table_name, {}).get("Keys")
+        if not keys:
+            if deserialize:
+                records = [deserialize_item(record) for record in records]
+            return records
+        logging.warning(f"{len(keys)} Keys Unprocessed (attempt {attempt + 1})")
+
+    raise Exception(f"{len(keys)} Keys Still Unprocessed After {max_retries} Retries")
+
+
+def _get_write_batches(records, overwrite_by_pkeys=None):
+    """
+    Purpose:
+        Split records into BatchWriteItem batches of 25, replacing earlier
+        records with the same primary key in a batch when overwrite_by_pkeys
+        is given. Keys are compared as DynamoDB compares them (see
+        _get_key_id)
+    Args:
+        records (Iterable of Dicts): Records to write
+        overwrite_by_pkeys (List of Strings): Primary key names
+    Yield:
+        batch (List of Dicts): Records of the batch
+    """
+
+    serializer = TypeSerializer()
+    batch = {}
+    for record in records:
+        if overwrite_by_pkeys:
+            batch_key = _get_key_id(
+                {name: record.get(name) for name in overwrite_by_pkeys}, serializer
+            )
+        else:
+            batch_key = len(batch)
+        batch[batch_key] = record
+
+        if len(batch) == MAX_BATCH_WRITE_ITEMS:
+            yield list(batch.values())
+            batch = {}
+
+    if batch:
+        yield list(batch.values())
+
+
+def _batch_write_records(client, table_name, records, max_retries, rate_limiter=None):
+    """
+    Purpose:
+        Put a batch of records with BatchWriteItem, retrying UnprocessedItems
+        with jittered exponential backoff
+    Args:
+        client (DynamoDB Client Object): Client of the Table resource
+        table_name (String): Name of the table
+        records (List of Dicts): Records (max 25)
+        max_retries (Int): Max times to retry unprocessed items
+        rate_limiter (CapacityRateLimiter Object): Limiter to pace the writes
+    Return:
+        inserted_count (Int): Number of records written
+        consumed_wcu (Float): Write capacity consumed
+        failed (List of Dicts): Records still unprocessed after the retries
+    """
+
+    requests = [{"PutRequest": {"Item": record}} for record in records]
+    consumed_wcu = 0.0
+    for attempt in range(max_retries + 1):
+        if attempt:
+            retry_helpers.sleep_with_backoff(attempt - 1)
+        if rate_limiter:
+            rate_limiter.wait("write")
+
+        response = client.batch_write_item(
+            RequestItems={table_name: requests}, ReturnConsumedCapacity="TOTAL"
+        )
+        batch_wcu = sum(
+            capacity.get("CapacityUnits", 0)
+            for capacity in response.get("ConsumedCapacity", [])
+        )
+        consumed_wcu += batch_wcu
+        if rate_limiter:
+            rate_limiter.consume("write", batch_wcu)
+        requests = response.get("UnprocessedItems", {}).get(table_name)
+        if not requests:
+            return len(records), consumed_wcu, []
+        logging.warning(f"{len(requests)} Records Unprocessed (attempt {attempt + 1})")
+
+    logging.error(
+        f"{len(requests)} Records Still Unprocessed After {max_retries} Retries"
+    )
+
+    return (
+        len(records) - len(requests),
+        consumed_wcu,
+        [request["PutRequest"]["Item"] for request in requests],
+    )
+
+
+def _get_client_args(request_args):
+    """
+    Purpose:
+        Convert the arguments of a Table request to the arguments of a
+        low-level client request: condition objects are built into
+        expressions, and ExpressionAttributeValues are serialized
+    Args:
+        request_args (Dict): Arguments of the Table request
+    Return:
+        client_args (Dict): Arguments of the client request
+    """
+
+    client_args = dict(request_args)
+    names = dict(client_args.get("ExpressionAttributeNames", {}))
+    values = dict(client_args.get("ExpressionAttributeValues", {}))
+
+    builder = ConditionExpressionBuilder()
+    for arg_name in ("KeyConditionExpression", "FilterExpression"):
+        condition = client_args.get(arg_name)
+        if isinstance(condition, ConditionBase):
+            expression = builder.build_expression(
+                condition, is_key_condition=arg_name == "KeyConditionExpression"
+            )
+            client_args[arg_name] = expression.condition_expression
+            names.update(expression.attribute_name_placeholders)
+            values.update(expression.attribute_value_placeholders)
+
+    if names:
+        client_args["ExpressionAttributeNames"] = names
+    if values:
+        serializer = TypeSerializer()
+        client_args["ExpressionAttributeValues"] = {
+            placeholder: serializer.serialize(value)
+            for placeholder, value in values.items()
+        }
+
+    return client_args
+
+
+def _deserialize_value(value):
+    """
+    Purpose:
+        Convert an attribute value in the low-level format to a Python value
+        (see deserialize_item)
+    Args:
+        value (Dict): Attribute value (e.g. {"N": "1"})
+    Return:
+        value (Any): Python value
+    """
+
+    if "S" in value:
+        return value["S"]
+    if "N" in value:
+        return _deserialize_number(value["N"])
+    if "M" in value:
+        return {name: _deserialize_value(item) for name, item in value["M"].items()}
+    if "L" in value:
+        return [_deserialize_value(item) for item in value["L"]]
+    if "BOOL" in value:
+        return value["BOOL"]
+    if "NULL" in value:
+        return None
+    if "B" in value:
+        return value["B"]
+    if "SS" in value:
+        return set(value["SS"])
+    if "NS" in value:
+        return {_deserialize_number(number) for number in value["NS"]}
+    if "BS" in value:
+        return set(value["BS"])
+
+    raise TypeError(f"Unknown DynamoDB Attribute Value: {value}")
+
+
+def _deserialize_number(number):
+    """
+    Purpose:
+        Convert a DynamoDB number string to an int, or a float if it has a
+        fraction or exponent
+    Args:
+        number (String): Number string
+    Return:
+        number (Int/Float): Number
+    """
+
+    if "." in number or "E" in number or "e" in number:
+        return float(number)
+    return int(number)
+
+
+def _get_column_array(values):
+    """
+    Purpose:
+        Convert the values of a column to a NumPy array (see items_to_columns)
+    Args:
+        values (List): Values of the column
+    Return:
+        array (NumPy Array): Array of the values
+    """
+
+    value_types = {type(value) for value in values}
+    number_types = value_types - {type(None)}
+    if number_types and number_types <= {int, float}:
+        if value_types == {int}:
+            try:
+                return numpy.array(values, dtype=numpy.int64)
+            except OverflowError:
+                # Beyond int64, so keep the Python ints
+                return numpy.fromiter(values, dtype=object, count=len(values))
+        if int in number_types and (
+            type(None) in value_types
+            or any(abs(value) > 2**53 for value in values if type(value) is int)
+        ):
+            # float64 would round ints beyond 2**53, so keep the Python ints
+            # (and None for missing values)
+            return numpy.fromiter(values, dtype=object, count=len(values))
+        return numpy.array(
+            [numpy.nan if value is None else value for value in values],
+            dtype=numpy.float64,
+        )
+    if value_types == {bool}:
+        return numpy.array(values, dtype=bool)
+
+    return numpy.fromiter(values, dtype=object, count=len(values))
@@ -0,0 +1,523 @@
+#!/usr/bin/env python3
+"""
+    Purpose:
+        Helper Library for Large SQS/SNS Payloads. Will provide functions
+        that offload message bodies over the 256 KB SQS/SNS limit to S3
+        and send a small pointer message instead (in the same pointer
+        format as the AWS extended client libraries), and functions for
+        consumers to resolve the pointers lazily. Pointers are recognized
+        from the body alone, so messages do not need to be received with
+        their message attributes. Offloaded bodies are only deleted when
+        handled messages are deleted with delete_messages (pass it to the
+        consumers as delete_messages), not sqs_helpers.delete_messages
+"""
+
+# Python Library Imports
+import itertools
+import json
+import logging
+import uuid
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+# Local Library Imports
+from aws_helpers import message_batch_helpers, s3_helpers, sns_helpers, sqs_helpers
+
+###
+# Extended Payload Constants
+###
+
+
+DEFAULT_PAYLOAD_THRESHOLD = message_batch_helpers.MAX_BATCH_BYTES
+DEFAULT_KEY_PREFIX = "extended-payloads/"
+POINTER_CLASS = "software.amazon.payloadoffloading.PayloadS3Pointer"
+SIZE_ATTRIBUTE = "ExtendedPayloadSize"
+COMPRESSIONS = ("zlib", "zstd")
+
+
+###
+# Payload Offload Functions
+###
+
+
+def offload_payload(
+    bucket,
+    msg,
+    threshold=DEFAULT_PAYLOAD_THRESHOLD,
+    compression=None,
+    key_prefix=DEFAULT_KEY_PREFIX,
+    encryption=None,
+):
+    """
+    Purpose:
+        Write a message body to S3 and replace it with a pointer if the
+        message is larger than the threshold. Smaller messages are returned
+        unchanged
+    Args:
+        bucket (S3 Bucket Object): Bucket to store large bodies in
+        msg (String/Dict): Message body, or a Dict of SendMessageBatch entry
+            fields with MessageBody and (optionally) MessageAttributes
+        threshold (Int): Max size in bytes (body plus attributes) to send
+            without offloading
+        compression (String): None, "zlib", or "zstd" (requires the
+            zstandard package) to compress offloaded bodies
+        key_prefix (String): Prefix of the keys offloaded bodies are stored at
+        encryption (String): Server Side Encryption Method
+    Return:
+        entry (Dict): Entry with MessageBody (the body or the pointer) and
+            MessageAttributes
+    """
+
+    entry = {"MessageBody": msg} if isinstance(msg, str) else dict(msg)
+    if message_batch_helpers.get_message_size(entry) <= threshold:
+        return entry
+
+    body = entry["MessageBody"].encode("utf-8")
+    key = f"{key_prefix}{uuid.uuid4()}"
+    logging.info(f"Offloading Payload of {len(body)} bytes to {bucket.name}/{key}")
+
+    try:
+        s3_helpers.upload_stream(
+            bucket, key, [_compress(body, compression)], encryption=encryption
+        )
+    except Exception as err:
+        logging.exception(f"Exception Offloading Payload: {err}")
+        raise
+
+    message_attributes = dict(entry.get("MessageAttributes", {}))
+    message_attributes[SIZE_ATTRIBUTE] = {
+        "DataType": "Number",
+        "StringValue": str(len(body)),
+    }
+    entry["MessageAttributes"] = message_attributes
+
+    location = {"s3BucketName": bucket.name, "s3Key": key}
+    if compression:
+        location["compression"] = compression
+    entry["MessageBody"] = json.dumps([POINTER_CLASS, location])
+
+    return entry
+
+
+def send_messages(
+    queue,
+    msgs,
+    bucket,
+    threshold=DEFAULT_PAYLOAD_THRESHOLD,
+    compression=None,
+    key_prefix=DEFAULT_KEY_PREFIX,
+    encryption=None,
+    max_workers=4,
+    max_retries=3,
+):
+    """
+    Purpose:
+        Send Messages to an SQS Queue (see sqs_helpers.send_messages),
+        offloading bodies over the threshold to S3. Messages are offloaded in
+        bounded chunks as they are sent, so msgs can be a generator of any
+        length. Messages that fail to offload are returned as failed, and
+        bodies offloaded by this call for messages that fail to send are
+        deleted (pointers passed in, e.g. forwarded messages, are kept)
+    Args:
+        queue (SQS Queue Object): Queue object for the queue in
+            SQS
+        msgs (Iterable of Strings/Dicts): Messages to send
+        bucket (S3 Bucket Object): Bucket to store large bodies in
+        threshold (Int): Max size in bytes to send without offloading
+        compression (String): None, "zlib", or "zstd"
+        key_prefix (String): Prefix of the keys offloaded bodies are stored at
+        encryption (String): Server Side Encryption Method
+        max_workers (Int): Max bodies to offload (and batches to send) at once
+        max_retries (Int): Max times to retry the failed entries of a batch
+    Return:
+        send_summary (Dict): Dict with the number of messages sent, the
+            entries that failed (offload failures have the Code
+            PayloadOffloadFailed), and elapsed_seconds
+    """
+
+    offloaded_pointers = set()
+
+    def offload(msg):
+        try:
+            entry = offload_payload(
+                bucket,
+                msg,
+                threshold=threshold,
+                compression=compression,
+                key_prefix=key_prefix,
+                encryption=encryption,
+            )
+            if entry["MessageBody"] != _get_body(msg):
+                offloaded_pointers.add(_get_pointer(entry))
+            return entry, None
+        except Exception as err:
+            # offload_payload logs the exception
+            return {"MessageBody": msg} if isinstance(msg, str) else dict(msg), err
+
+    offload_failed = []
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        send_summary = sqs_helpers.send_messages(
+            queue,
+            _offload_in_chunks(
+                executor,
+                offload,
+                msgs,
+                offload_failed,
+                max_workers * message_batch_helpers.MAX_BATCH_ENTRIES,
+            ),
+            max_workers=max_workers,
+            max_retries=max_retries,
+        )
+    send_summary["failed"].extend(offload_failed)
+
+    orphaned_pointers = [
+        pointer
+        for pointer in map(_get_pointer, send_summary["failed"])
+        if pointer in offloaded_pointers
+    ]
+    if orphaned_pointers:
+        _delete_payloads(bucket.meta.client, orphaned_pointers)
+
+    return send_summary
+
+
+def publish_message(
+    topic,
+    msg,
+    bucket,
+    subject=None,
+    message_attributes=None,
+    threshold=DEFAULT_PAYLOAD_THRESHOLD,
+    compression=None,
+    key_prefix=DEFAULT_KEY_PREFIX,
+    encryption=None,
+):
+    """
+    Purpose:
+        Publish a Message to an SNS Topic, offloading a body over the
+        threshold to S3. Subscribed queues should use raw message delivery
+        so consumers receive the pointer as the message body
+    Args:
+        topic (SNS Topic Object): Topic object for the topic in
+            SNS
+        msg (String): Message body
+        bucket (S3 Bucket Object): Bucket to store large bodies in
+        subject (String): Subject of the message
+        message_attributes (Dict): SNS MessageAttributes of the message
+        threshold (Int): Max size in bytes to publish without offloading
+        compression (String): None, "zlib", or "zstd"
+        key_prefix (String): Prefix of the keys offloaded bodies are stored at
+        encryption (String): Server Side Encryption Method
+    Return:
+        message_id (String): Id of the published message
+    """
+
+    entry = offload_payload(
+        bucket,
+        {"MessageBody": msg, "MessageAttributes": message_attributes or {}},
+        threshold=threshold,
+        compression=compression,
+        key_prefix=key_prefix,
+        encryption=encryption,
+    )
+
+    try:
+        return sns_helpers.publish_message(
+            topic,
+            entry["MessageBody"],
+            subject=subject,
+            message_attributes=entry["MessageAttributes"],
+        )
+    except Exception:
+        # publish_message logs the exception; do not leave the body behind
+        # (unless msg was already a pointer this call did not upload)
+        if entry["MessageBody"] != msg:
+            _delete_payloads(bucket.meta.client, [_get_pointer(entry)])
+        raise
+
+
+###
+# Payload Resolve Functions
+###
+
+
+class ExtendedPayload(object):
+    """
+        ExtendedPayload Class. Body of a received message that resolves an
+        S3 pointer lazily, only reading the object when the body is accessed
+    """
+
+    def __init__(self, s3, msg):
+        """
+        Purpose:
+            Initilize the ExtendedPayload Class.
+        Args:
+            s3 (S3 Resource Object): S3 Resource Object to read bodies with
+            msg (SQS Message Object/Dict): Received message (or a Dict with
+                MessageBody and MessageAttributes)
+        """
+
+        self.s3 = s3
+        self.msg = msg
+        self.pointer = _get_pointer(msg)
+        self._body = None
+
+    @property
+    def is_offloaded(self):
+        """
+        Purpose:
+            Return whether or not the body is stored in S3
+        """
+
+        return self.pointer is not None
+
+    @property
+    def body(self):
+        """
+        Purpose:
+            Return the full body (read from S3 on first access if offloaded)
+        """
+
+        if self._body is None:
+            if self.is_offloaded:
+                self._body = b"".join(self.iter_chunks()).decode("utf-8")
+            else:
+                self._body = _get_body(self.msg)
+
+        return self._body
+
+    def iter_chunks(self, chunk_size=1024 * 1024):
+        """
+        Purpose:
+            Stream the body from S3 in chunks, decompressing as it is read,
+            without holding the whole object in memory
+        Args:
+            chunk_size (Int): Bytes to read from S3 per chunk
+        Yield:
+            chunk (Bytes): Next chunk of the (decompressed) body
+        """
+
+        if not self.is_offloaded:
+            yield _get_body(self.msg).encode("utf-8")
+            return
+
+        bucket_name, key, compression = self.pointer
+        decompressor = _get_decompressor(compression)
+        with s3_helpers.open_object(
+            self.s3.Bucket(bucket_name), key, "rb", read_ahead_size=chunk_size
+        ) as reader:
+            while True:
+                chunk = reader.read(chunk_size)
+                if not chunk:
+                    break
+                yield decompressor.decompress(chunk) if decompressor else chunk
+        if decompressor and hasattr(decompressor, "flush"):
+            yield decompressor.flush()
+
+
+def get_payload(s3, msg):
+    """
+    Purpose:
+        Return the body of a received message, resolving an S3 pointer
+        lazily (nothing is read until the body is accessed)
+    Args:
+        s3 (S3 Resource Object): S3 Resource Object to read bodies with
+        msg (SQS Message Object/Dict): Received message
+    Return:
+        payload (ExtendedPayload Object): Payload with body and iter_chunks
+    """
+
+    return ExtendedPayload(s3, msg)
+
+
+def delete_messages(queue, msgs, s3, max_retries=3):
+    """
+    Purpose:
+        Delete handled Messages from an SQS Queue (see
+        sqs_helpers.delete_messages), then delete the offloaded bodies of
+        the messages that were deleted
+    Args:
+        queue (SQS Queue Object): Queue object for the queue in
+            SQS
+        msgs (List of SQS Message Objects): Messages to delete
+        s3 (S3 Resource Object): S3 Resource Object to delete bodies with
+        max_retries (Int): Max times to retry the failed entries of a batch
+    Return:
+        failed_msgs (List of SQS Message Objects): Messages that could not be
+            deleted (their bodies are kept)
+    """
+
+    failed_msgs = sqs_helpers.delete_messages(queue, msgs, max_retries=max_retries)
+    failed_handles = {msg.receipt_handle for msg in failed_msgs}
+
+    pointers = [
+        _get_pointer(msg)
+        for msg in msgs
+        if msg.receipt_handle not in failed_handles and _get_pointer(msg)
+    ]
+    if pointers:
+        _delete_payloads(s3.meta.client, pointers)
+
+    return failed_msgs
+
+
+###
+# Helper Functions
+###
+
+
+def _offload_in_chunks(executor, offload, msgs, failed, chunk_size):
+    """
+    Purpose:
+        Offload messages chunk_size at a time, so only one chunk of
+        messages is read ahead of the batches being sent
+    Args:
+        executor (ThreadPoolExecutor Object): Pool to offload bodies in
+        offload (Function): Function taking a message and returning the
+            entry and the exception raised offloading it (or None)
+        msgs (Iterable of Strings/Dicts): Messages to offload
+        failed (List of Dicts): List to add entries that failed to offload to
+        chunk_size (Int): Max messages to offload at once
+    Yield:
+        entry (Dict): Entry to send
+    """
+
+    msgs = iter(msgs)
+    while True:
+        chunk = list(itertools.islice(msgs, chunk_size))
+        if not chunk:
+            return
+
+        for entry, err in executor.map(offload, chunk):
+            if err is None:
+                yield entry
+            else:
+                failed.append(
+                    dict(entry, Code="PayloadOffloadFailed", Message=str(err))
+                )
+
+
+def _compress(data, compression):
+    """
+    Purpose:
+        Compress bytes with the given compression
+    Args:
+        data (Bytes): Bytes to compress
+        compression (String): None, "zlib", or "zstd"
+    Return:
+        compressed (Bytes): Compressed bytes
+    """
+
+    if not compression:
+        return data
+    elif compression == "zlib":
+        return zlib.compress(data)
+    elif compression == "zstd":
+        if zstandard is None:
+            raise Exception("zstd compression requires the zstandard package")
+        return zstandard.ZstdCompressor().compress(data)
+
+    raise ValueError(f"Invalid compression ({compression}); expected {COMPRESSIONS}")
+
+
+def _get_decompressor(compression):
+    """
+    Purpose:
+        Return a streaming decompressor for the given compression
+    Args:
+        compression (String): None, "zlib", or "zstd"
+    Return:
+        decompressor (Decompress Object): Object with decompress(chunk), or
+            None for uncompressed bodies
+    """
+
+    if not compression:
+        return None
+    elif compression == "zlib":
+        return zlib.decompressobj()
+    elif compression == "zstd":
+        if zstandard is None:
+            raise Exception("zstd compression requires the zstandard package")
+        return zstandard.ZstdDecompressor().decompressobj()
+
+    raise ValueError(f"Invalid compression ({compression}); expected {COMPRESSIONS}")
+
+
+def _get_body(msg):
+    """
+    Purpose:
+        Return the body of a message object, entry, or body
+    Args:
+        msg (SQS Message Object/Dict/String): Message
+    Return:
+        body (String): Body of the message
+    """
+
+    if isinstance(msg, str):
+        return msg
+
+    return msg["MessageBody"] if isinstance(msg, dict) else msg.body
+
+
+def _get_pointer(msg):
+    """
+    Purpose:
+        Return the S3 location an offloaded message body points to
+    Args:
+        msg (SQS Message Object/Dict): Message
+    Return:
+        pointer (Tuple): Bucket name, key, and compression, or None if the
+            body is not a pointer
+    """
+
+    body = _get_body(msg)
+    if not body.startswith(f'["{POINTER_CLASS}"'):
+        return None
+
+    try:
+        _, location = json.loads(body)
+        return (
+            location["s3BucketName"],
+            location["s3Key"],
+            location.get("compression"),
+        )
+    except (KeyError, TypeError, ValueError):
+        return None
+
+
+def _delete_payloads(client, pointers):
+    """
+    Purpose:
+        Delete offloaded bodies from S3 with DeleteObjects (1000 keys per
+        request). Failures are logged, not raised, as the message itself has
+        already been handled
+    Args:
+        client (S3 Client Object): S3 Client Object
+        pointers (List of Tuples): Pointers of the bodies to delete
+    Return:
+        N/A
+    """
+
+    keys_by_bucket = {}
+    for bucket_name, key, _ in pointers:
+        keys_by_bucket.setdefault(bucket_name, []).append(key)
+
+    for bucket_name, keys in keys_by_bucket.items():
+        for batch_start in range(0, len(keys), 1000):
+            batch = keys[batch_start:batch_start + 1000]
+            try:
+                response = client.delete_objects(
+                    Bucket=bucket_name,
+                    Delete={"Objects": [{"Key": key} for key in batch], "Quiet": True},
+                )
+                for error in response.get("Errors", []):
+                    logging.error(
+                        f"Failed to Delete Payload {error['Key']}: {error['Code']}"
+                    )
+            except Exception as err:
+                logging.exception(f"Exception Deleting Payloads: {err}")
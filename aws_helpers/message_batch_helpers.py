@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+"""
+    Purpose:
+        Helper Library for the SQS and SNS Batch APIs. Will provide the
+        functions shared by SendMessageBatch and PublishBatch: sizing
+        entries, packing them into batches of up to 10 entries and 256 KB,
+        sending a batch while retrying failed entries and throttled
+        requests, and sending many batches concurrently
+"""
+
+# Python Library Imports
+import logging
+import threading
+from botocore.exceptions import ClientError
+from concurrent.futures import ThreadPoolExecutor
+
+# Local Library Imports
+from aws_helpers import retry_helpers
+
+###
+# Batch Constants
+###
+
+
+MAX_BATCH_ENTRIES = 10
+MAX_BATCH_BYTES = 256 * 1024
+
+
+###
+# Batch Functions
+###
+
+
+def get_message_size(entry, body_field="MessageBody"):
+    """
+    Purpose:
+        Return the size SQS/SNS count against the payload limit for an entry
+        (the body plus each attribute's name, type, and value)
+    Args:
+        entry (Dict): SendMessageBatch/PublishBatch entry
+        body_field (String): Field of the body ("MessageBody" for SQS,
+            "Message" for SNS)
+    Return:
+        size (Int): Size of the entry in bytes
+    """
+
+    size = len(entry[body_field].encode("utf-8"))
+    for name, attribute in entry.get("MessageAttributes", {}).items():
+        size += len(name.encode("utf-8"))
+        size += len(attribute["DataType"].encode("utf-8"))
+        if "StringValue" in attribute:
+            size += len(attribute["StringValue"].encode("utf-8"))
+        if "BinaryValue" in attribute:
+            size += len(attribute["BinaryValue"])
+
+    return size
+
+
+def pack_message_batches(msgs, failed, body_field="MessageBody", error_field="Message"):
+    """
+    Purpose:
+        Pack messages into batches of up to 10 entries and 256 KB. Messages
+        too large to send are added to failed
+    Args:
+        msgs (Iterable of Strings/Dicts): Messages to send. Each is either a
+            body or a Dict of batch entry fields without an Id
+        failed (List of Dicts): List to add oversized entries to
+        body_field (String): Field of the body ("MessageBody" for SQS,
+            "Message" for SNS)
+        error_field (String): Field to put the failure message in
+    Yield:
+        batch (List of Dicts): Batch entries (without Ids)
+    """
+
+    batch = []
+    batch_bytes = 0
+    for msg in msgs:
+        entry = {body_field: msg} if isinstance(msg, str) else dict(msg)
+        entry_bytes = get_message_size(entry, body_field=body_field)
+        if entry_bytes > MAX_BATCH_BYTES:
+            logging.error(f"Message of {entry_bytes} bytes exceeds the 256 KB limit")
+            failed.append(
+                dict(
+                    entry,
+                    **{"Code": "MessageTooLong", error_field: "Message exceeds 256 KB"},
+                )
+            )
+            continue
+
+        batch_full = len(batch) == MAX_BATCH_ENTRIES
+        if batch_full or batch_bytes + entry_bytes > MAX_BATCH_BYTES:
+            yield batch
+            batch = []
+            batch_bytes = 0
+        batch.append(entry)
+        batch_bytes += entry_bytes
+
+    if batch:
+        yield batch
+
+
+def send_batch(
+    send_entries, batch, max_retries, error_field="Message", failure_fields=None
+):
+    """
+    Purpose:
+        Send a batch, retrying (with backoff) only the entries that failed
+        without a sender fault, and the whole batch if the request was
+        throttled. The failed entries are retried together in a new batch.
+        Entries of a request that failed are returned as failed rather than
+        raised
+    Args:
+        send_entries (Function): Function taking the batch entries (with
+            Ids) and returning the SendMessageBatch/PublishBatch response
+        batch (List of Dicts): Batch entries (without Ids)
+        max_retries (Int): Max times to retry the failed entries
+        error_field (String): Field to put the failure message in
+        failure_fields (Dict): Extra fields added to every failed entry
+    Return:
+        sent_count (Int): Number of entries sent
+        failed (List of Dicts): Entries that could not be sent, with Code and
+            the message of the last failure
+    """
+
+    failure_fields = failure_fields or {}
+    sent_count = 0
+    failed = []
+    for attempt in range(max_retries + 1):
+        if attempt:
+            retry_helpers.sleep_with_backoff(attempt - 1)
+
+        try:
+            response = send_entries(
+                [dict(entry, Id=str(index)) for index, entry in enumerate(batch)]
+            )
+        except ClientError as err:
+            error = err.response.get("Error", {})
+            if retry_helpers.is_retryable_error(err) and attempt < max_retries:
+                logging.warning(
+                    f"Batch Request Failed (attempt {attempt + 1}): {error.get('Code')}"
+                )
+                continue
+            logging.error(f"Batch Request Failed for {len(batch)} Entries: {err}")
+            failed.extend(
+                dict(
+                    entry,
+                    **failure_fields,
+                    **{"Code": error.get("Code"), error_field: error.get("Message")},
+                )
+                for entry in batch
+            )
+            break
+
+        sent_count += len(response.get("Successful", []))
+        failures = response.get("Failed", [])
+        if not failures:
+            break
+
+        logging.warning(
+            f"{len(failures)} of {len(batch)} Batch Entries Failed "
+            f"(attempt {attempt + 1}): {failures[0].get('Code')}"
+        )
+        retry_batch = []
+        for failure in failures:
+            entry = batch[int(failure["Id"])]
+            if failure.get("SenderFault") or attempt == max_retries:
+                failed.append(
+                    dict(
+                        entry,
+                        **failure_fields,
+                        **{
+                            "Code": failure.get("Code"),
+                            error_field: failure.get("Message"),
+                        },
+                    )
+                )
+            else:
+                retry_batch.append(entry)
+        if not retry_batch:
+            break
+        batch = retry_batch
+
+    return sent_count, failed
+
+
+def send_batches(batch_sends, max_workers):
+    """
+    Purpose:
+        Run batch sends concurrently. Only max_workers * 2 sends are queued
+        at once, so batch_sends can be a generator of any length
+    Args:
+        batch_sends (Iterable of Functions): Functions taking no args and
+            returning the sent count and failed entries of a batch (see
+            send_batch)
+        max_workers (Int): Max batches to send at once
+    Return:
+        sent_count (Int): Number of entries sent
+        failed (List of Dicts): Entries that could not be sent
+    """
+
+    sent_count = 0
+    failed = []
+    in_flight = threading.BoundedSemaphore(max_workers * 2)
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = []
+        for batch_send in batch_sends:
+            in_flight.acquire()
+            future = executor.submit(batch_send)
+            future.add_done_callback(lambda _: in_flight.release())
+            futures.append(future)
+
+        for future in futures:
+            batch_sent_count, batch_failed = future.result()
+            sent_count += batch_sent_count
+            failed.extend(batch_failed)
+
+    return sent_count, failed
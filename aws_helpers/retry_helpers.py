@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+    Purpose:
+        Helper Library for retrying AWS calls. Will provide exponential
+        backoff with full jitter for retrying the failed entries of batch
+        APIs (DeleteObjects, SendMessageBatch, BatchWriteItem, etc.)
+"""
+
+# Python Library Imports
+import logging
+import random
+import time
+
+###
+# Retry Constants
+###
+
+
+RETRYABLE_ERROR_CODES = {
+    "InternalError",
+    "InternalFailure",
+    "KMSThrottlingException",
+    "ProvisionedThroughputExceededException",
+    "RequestLimitExceeded",
+    "RequestThrottled",
+    "RequestThrottledException",
+    "ServiceUnavailable",
+    "SlowDown",
+    "Throttling",
+    "ThrottlingException",
+    "TooManyRequestsException",
+}
+
+
+###
+# Backoff Functions
+###
+
+
+def get_backoff_delay(attempt, base_delay=0.05, max_delay=5.0):
+    """
+    Purpose:
+        Return how long to wait before a retry, using exponential backoff
+        with full jitter (a random delay between 0 and the exponential cap)
+    Args:
+        attempt (Int): Number of the retry (0 for the first retry)
+        base_delay (Float): Seconds to cap the first retry's delay at
+        max_delay (Float): Max seconds to wait for any retry
+    Return:
+        delay (Float): Seconds to wait
+    """
+
+    return random.uniform(0, min(max_delay, base_delay * (2 ** attempt)))
+
+
+def sleep_with_backoff(attempt, base_delay=0.05, max_delay=5.0):
+    """
+    Purpose:
+        Sleep before a retry, using exponential backoff with full jitter
+    Args:
+        attempt (Int): Number of the retry (0 for the first retry)
+        base_delay (Float): Seconds to cap the first retry's delay at
+        max_delay (Float): Max seconds to wait for any retry
+    Return:
+        delay (Float): Seconds slept
+    """
+
+    delay = get_backoff_delay(attempt, base_delay=base_delay, max_delay=max_delay)
+    logging.debug(f"Retry {attempt + 1}: Sleeping {delay:.3f}s Before Retrying")
+    time.sleep(delay)
+
+    return delay
+
+
+###
+# Error Classification Functions
+###
+
+
+def is_retryable_error(err):
+    """
+    Purpose:
+        Return whether or not a failed request is worth retrying: throttling,
+        and server-side errors (5xx) that botocore's own retries did not
+        clear. Client mistakes (validation, access denied, missing
+        resources) are not
+    Args:
+        err (Exception): Exception raised by a Boto3 call
+    Return:
+        retryable (Boolean): Whether or not to retry the request
+    """
+
+    response = getattr(err, "response", None)
+    if not isinstance(response, dict):
+        return False
+
+    error_code = response.get("Error", {}).get("Code", "")
+    status_code = response.get("ResponseMetadata", {}).get("HTTPStatusCode", 0)
+    # SQS error codes carry a prefix (e.g. AWS.SimpleQueueService.Throttled)
+    if error_code.rsplit(".", 1)[-1] in RETRYABLE_ERROR_CODES:
+        return True
+    if "Throttl" in error_code:
+        return True
+
+    return status_code == 429 or status_code >= 500
@@ -7,10 +7,23 @@
 """
 
 # Python Library Imports
+import hashlib
+import json
 import logging
+import os
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 import boto3
+from boto3.s3.transfer import TransferConfig
 from botocore.exceptions import ClientError, NoCredentialsError, BotoCoreError
 
+# Local Library Imports
+from aws_helpers import retry_helpers, session_helpers
+from aws_helpers.cache_helpers import LRUCache
+from aws_helpers.s3_stream import S3ObjectReader, S3ObjectWriter
+
 ###
 # Manage S3 Resource Functions
 ###
@@ -19,7 +32,9 @@ from botocore.exceptions import ClientError, NoCredentialsError, BotoCoreError
 def create_s3_resource(region_name=None, access_key=None, secret_key=None):
     """
     Purpose:
-        Return a S3 resource object.
+        Return a S3 resource object. Resources are cached in the shared
+        resource pool (see session_helpers) so repeated calls reuse the same
+        warm connection pool
     Args:
         region_name (String): Name of region to connect to
         access_key (String): access key to use to connect to S3 Resource
@@ -30,22 +45,12 @@ def create_s3_resource(region_name=None, access_key=None, secret_key=None):
 
     s3 = None
     try:
-        if region_name:
-            if access_key and secret_key:
-                session = boto3.Session(
-                    aws_access_key_id=access_key, aws_secret_access_key=secret_key
-                )
-                s3 = session.resource("s3", region_name)
-            else:
-                s3 = boto3.resource("s3", region_name)
-        else:
-            if access_key and secret_key:
-                session = boto3.Session(
-                    aws_access_key_id=access_key, aws_secret_access_key=secret_key
-                )
-                s3 = session.resource("s3")
-            else:
-                s3 = boto3.resource("s3")
+        s3 = session_helpers.get_resource(
+            "s3",
+            region_name=region_name,
+            access_key=access_key,
+            secret_key=secret_key,
+        )
     except NoCredentialsError as err:
         logging.exception("No Credentials Found for AWS")
         raise
@@ -134,19 +139,268 @@ def delete_bucket(bucket, force=True):
 
     try:
         if force:
-            response = bucket.delete_objects()
+            delete_summary = delete_all_files_in_bucket(bucket)
+            if delete_summary["failed"]:
+                raise Exception(
+                    f"Failed to delete {len(delete_summary['failed'])} objects in "
+                    f"{bucket.name}; cannot delete bucket"
+                )
         response = bucket.delete()
     except Exception as err:
         logging.exception(f"Exception Deleting Bucket: {err}")
         raise
 
 
+###
+# Object Listing Functions
+###
+
+
+def list_objects(
+    bucket,
+    prefix="",
+    delimiter=None,
+    page_size=1000,
+    parallel=False,
+    fan_out_depth=1,
+    max_workers=8,
+    max_buffered_pages=16,
+):
+    """
+    Purpose:
+        Lazily list the objects in a bucket, streaming pages from
+        ListObjectsV2 so only a page at a time is held in memory. In
+        parallel mode, the listing is split on the "/" common prefixes under
+        the prefix (fan_out_depth levels deep) and the prefixes are listed
+        concurrently; objects are then not yielded in key order
+    Args:
+        bucket (S3 Bucket Object): Bucket to list
+        prefix (String): Only list keys starting with the prefix
+        delimiter (String): Do not list keys below this delimiter after the
+            prefix (see list_prefixes for the "folders"). Serial mode only
+        page_size (Int): Max keys per ListObjectsV2 request (max 1000)
+        parallel (Boolean): Whether or not to list common prefixes concurrently
+        fan_out_depth (Int): Levels of common prefixes to split the listing on
+        max_workers (Int): Max prefixes to list at once in parallel mode
+        max_buffered_pages (Int): Max listed pages waiting to be consumed in
+            parallel mode (bounds memory)
+    Yield:
+        s3_object (Dict): Object summary with Key, Size, LastModified, ETag,
+            and StorageClass
+    """
+    logging.info(f"Listing Objects in {bucket.name}/{prefix}")
+
+    client = bucket.meta.client
+
+    if not parallel:
+        yield from _list_objects_serial(
+            client, bucket.name, prefix, delimiter=delimiter, page_size=page_size
+        )
+        return
+
+    if delimiter:
+        raise ValueError("delimiter is not supported when listing in parallel")
+
+    fan_out_prefixes = [prefix]
+    for _ in range(fan_out_depth):
+        next_fan_out_prefixes = []
+        for fan_out_prefix in fan_out_prefixes:
+            for page in _paginate_objects(
+                client, bucket.name, fan_out_prefix, delimiter="/", page_size=page_size
+            ):
+                yield from page.get("Contents", [])
+                next_fan_out_prefixes.extend(
+                    common_prefix["Prefix"]
+                    for common_prefix in page.get("CommonPrefixes", [])
+                )
+        fan_out_prefixes = next_fan_out_prefixes
+
+    logging.info(f"Listing {len(fan_out_prefixes)} Prefixes in Parallel")
+    yield from _list_objects_parallel(
+        client,
+        bucket.name,
+        fan_out_prefixes,
+        page_size,
+        max_workers,
+        max_buffered_pages,
+    )
+
+
+def list_prefixes(bucket, prefix="", delimiter="/"):
+    """
+    Purpose:
+        Lazily list the common prefixes ("folders") directly under a prefix
+    Args:
+        bucket (S3 Bucket Object): Bucket to list
+        prefix (String): Prefix to list the common prefixes under
+        delimiter (String): Delimiter separating the "folders" in keys
+    Yield:
+        common_prefix (String): Common prefix, ending with the delimiter
+    """
+
+    for page in _paginate_objects(
+        bucket.meta.client, bucket.name, prefix, delimiter=delimiter
+    ):
+        for common_prefix in page.get("CommonPrefixes", []):
+            yield common_prefix["Prefix"]
+
+
+###
+# Transfer Tuning Functions
+###
+
+
+def create_transfer_config(
+    multipart_threshold=8 * 1024 * 1024,
+    multipart_chunksize=8 * 1024 * 1024,
+    max_concurrency=10,
+    use_threads=True,
+    max_bandwidth=None,
+):
+    """
+    Purpose:
+        Return a Boto3 TransferConfig for tuning multipart uploads and
+        downloads (e.g. larger chunks and more threads for multi-GB files)
+    Args:
+        multipart_threshold (Int): Size in bytes at which transfers switch to
+            multipart. Defaults to 8 MB
+        multipart_chunksize (Int): Size in bytes of each part. Defaults to 8 MB
+            (S3 requires at least 5 MB per part)
+        max_concurrency (Int): Max threads transferring parts at once
+        use_threads (Boolean): Whether or not to transfer parts in threads. If
+            False, parts are transferred serially in the calling thread
+        max_bandwidth (Int): Max bytes/s for the transfer. None is uncapped
+    Return:
+        transfer_config (TransferConfig Object): Config to pass to upload_file
+            and download_file
+    """
+
+    if multipart_chunksize < 5 * 1024 * 1024:
+        raise ValueError(
+            f"multipart_chunksize must be at least 5 MB, got {multipart_chunksize}"
+        )
+
+    return TransferConfig(
+        multipart_threshold=multipart_threshold,
+        multipart_chunksize=multipart_chunksize,
+        max_concurrency=max_concurrency,
+        use_threads=use_threads,
+        max_bandwidth=max_bandwidth,
+    )
+
+
+class TransferProgress(object):
+    """
+        TransferProgress Class. Callback for Boto3 transfers that tracks
+        bytes moved and throughput (bytes/s) of a single transfer
+    """
+
+    def __init__(self, key, total_bytes=None, callback=None, report_interval=1.0):
+        """
+        Purpose:
+            Initilize the TransferProgress Class.
+        Args:
+            key (String): Name of the object being transferred
+            total_bytes (Int): Size of the transfer, if known
+            callback (Function): Function called with the transfer's stats at
+                most once every report_interval seconds and once on finish
+            report_interval (Float): Min seconds between callback calls
+        """
+
+        self.key = key
+        self.total_bytes = total_bytes
+        self.callback = callback
+        self.report_interval = report_interval
+
+        self.bytes_transferred = 0
+        self.start_time = time.monotonic()
+        self.end_time = None
+
+        self._last_report_time = self.start_time
+        self._lock = threading.Lock()
+
+    def __call__(self, bytes_amount):
+        """
+        Purpose:
+            Record bytes moved by the transfer. Called by Boto3 from the
+            transfer threads
+        Args:
+            bytes_amount (Int): Bytes moved since the last call
+        Return:
+            N/A
+        """
+
+        report = False
+        with self._lock:
+            self.bytes_transferred += bytes_amount
+            now = time.monotonic()
+            if self.callback and now - self._last_report_time >= self.report_interval:
+                self._last_report_time = now
+                report = True
+
+        if report:
+            self.callback(self.get_stats())
+
+    def finish(self):
+        """
+        Purpose:
+            Mark the transfer as complete and report the final stats
+        Args:
+            N/A
+        Return:
+            transfer_stats (Dict): Final stats of the transfer
+        """
+
+        self.end_time = time.monotonic()
+        stats = self.get_stats()
+        logging.info(
+            f"Transferred {stats['bytes_transferred']} bytes of {self.key} in "
+            f"{stats['elapsed_seconds']:.2f}s ({stats['bytes_per_second']:.0f} bytes/s)"
+        )
+        if self.callback:
+            self.callback(stats)
+
+        return stats
+
+    def get_stats(self):
+        """
+        Purpose:
+            Return the current stats of the transfer
+        Args:
+            N/A
+        Return:
+            transfer_stats (Dict): Dict with key, bytes_transferred, total_bytes,
+                percent_complete, elapsed_seconds, and bytes_per_second
+        """
+
+        with self._lock:
+            bytes_transferred = self.bytes_transferred
+        elapsed_seconds = (self.end_time or time.monotonic()) - self.start_time
+
+        percent_complete = None
+        if self.total_bytes:
+            percent_complete = 100.0 * bytes_transferred / self.total_bytes
+
+        return {
+            "key": self.key,
+            "bytes_transferred": bytes_transferred,
+            "total_bytes": self.total_bytes,
+            "percent_complete": percent_complete,
+            "elapsed_seconds": elapsed_seconds,
+            "bytes_per_second": (
+                bytes_transferred / elapsed_seconds if elapsed_seconds > 0 else 0.0
+            ),
+        }
+
+
 ###
 # Object Management Functions
 ###
 
 
-def download_file(bucket, key, filename=None):
+def download_file(
+    bucket, key, filename=None, transfer_config=None, progress_callback=None
+):
     """
     Purpose:
         Download a File to an S3 bucket
@@ -154,21 +408,33 @@ def download_file(bucket, key, filename=None):
         bucket (S3 Bucket Object): Bucket to download file from
         key (String): Name of the object in S3
         filename (String): Path to the file on the local host
+        transfer_config (TransferConfig Object): Multipart/concurrency settings
+            for the transfer (see create_transfer_config). Defaults to Boto3's
+        progress_callback (Function): Function called with the transfer's stats
+            (see TransferProgress) as the download progresses
     Return:
-        N/A
+        transfer_stats (Dict): Bytes moved, seconds elapsed, and bytes/s of the
+            download
     """
     if not filename:
         filename = f"./{key}"
     logging.info(f"Downloading File {key} to {filename}")
 
     try:
-        bucket.download_file(key, filename)
+        total_bytes = None
+        if progress_callback:
+            total_bytes = bucket.Object(key).content_length
+        progress = TransferProgress(
+            key, total_bytes=total_bytes, callback=progress_callback
+        )
+
+        bucket.download_file(key, filename, Config=transfer_config, Callback=progress)
     except ClientError as client_err:
         error_code = client_err.response.get("Error", {}).get("Code", None)
         if not error_code:
             logging.exception(f"ClientError with no code found: {client_err}")
             raise client_err
-        elif int(error_code) == 404:
+        elif error_code in ("404", "NoSuchKey"):
             error_msg = f"{key} Does Not Exist in Bucket {bucket.name}"
             logging.exception(error_msg)
             raise Exception(error_msg) from client_err
@@ -181,8 +447,12 @@ def download_file(bucket, key, filename=None):
         logging.exception(f"General Exception downloading file: {err}")
         raise
 
+    return progress.finish()
+
 
-def upload_file(bucket, key, filename, encryption=None):
+def upload_file(
+    bucket, key, filename, encryption=None, transfer_config=None, progress_callback=None
+):
     """
     Purpose:
         Upload a File to an S3 bucket
@@ -191,36 +461,484 @@ def upload_file(bucket, key, filename, encryption=None):
         key (String): Desired name of the object in S3
         filename (String): Path to the file on the local host
         encryption (String): Server Side Encryption Method
+        transfer_config (TransferConfig Object): Multipart/concurrency settings
+            for the transfer (see create_transfer_config). Defaults to Boto3's
+        progress_callback (Function): Function called with the transfer's stats
+            (see TransferProgress) as the upload progresses
     Return:
-        N/A
+        transfer_stats (Dict): Bytes moved, seconds elapsed, and bytes/s of the
+            upload
     """
     logging.info(f"Uploading File {filename} to {key}")
 
+    extra_args = None
+    if encryption:
+        extra_args = {"ServerSideEncryption": encryption}
+
     try:
-        if encryption:
-            bucket.upload_file(
-                filename, key, ExtraArgs={"ServerSideEncryption": encryption}
-            )
-        else:
-            bucket.upload_file(filename, key)
+        progress = TransferProgress(
+            key, total_bytes=os.path.getsize(filename), callback=progress_callback
+        )
+
+        bucket.upload_file(
+            filename,
+            key,
+            ExtraArgs=extra_args,
+            Config=transfer_config,
+            Callback=progress,
+        )
     except Exception as err:
         logging.exception(f"Exception uploading file: {err}")
         raise
 
+    return progress.finish()
+
+
+def download_file_parallel(
+    bucket,
+    key,
+    filename=None,
+    part_size=8 * 1024 * 1024,
+    max_workers=10,
+    verify=True,
+    resume=True,
+):
+    """
+    Purpose:
+        Download a large object by splitting it into byte ranges, fetching
+        the ranges concurrently, and writing each one at its offset in a
+        preallocated file (positioned writes, no reassembly). Completed
+        ranges are tracked in a "{filename}.parts" state file so a failed
+        download resumes with only the missing ranges
+    Args:
+        bucket (S3 Bucket Object): Bucket to download file from
+        key (String): Name of the object in S3
+        filename (String): Path to the file on the local host
+        part_size (Int): Bytes per ranged GET
+        max_workers (Int): Max ranges to fetch at once
+        verify (Boolean): Whether or not to check the downloaded file against
+            the object's ETag (skipped for SSE-KMS and SSE-C objects, whose
+            ETags are not MD5s)
+        resume (Boolean): Whether or not to resume from a previous attempt's
+            state file (only if the object's ETag has not changed)
+    Return:
+        transfer_stats (Dict): Dict with key, bytes_transferred, total_bytes,
+            parts, resumed_parts, elapsed_seconds, and bytes_per_second
+    """
+    if not filename:
+        filename = f"./{key}"
+    logging.info(f"Downloading File {key} to {filename} in Parallel Ranges")
+
+    start_time = time.monotonic()
+    client = bucket.meta.client
+    state_filename = f"{filename}.parts"
+
+    try:
+        head = client.head_object(Bucket=bucket.name, Key=key)
+        total_bytes = head["ContentLength"]
+        etag = head["ETag"]
+        ranges = [
+            (start, min(start + part_size, total_bytes) - 1)
+            for start in range(0, total_bytes, part_size)
+        ]
+
+        completed = set()
+        if resume:
+            completed = _load_range_state(
+                state_filename, filename, etag, total_bytes, part_size
+            )
+        if not completed:
+            with open(filename, "wb") as file_obj:
+                file_obj.truncate(total_bytes)
+        resumed_ranges = set(completed)
+
+        state = {
+            "etag": etag,
+            "total_bytes": total_bytes,
+            "part_size": part_size,
+            "completed": completed,
+            "lock": threading.Lock(),
+            "last_saved": time.monotonic(),
+        }
+        file_descriptor = os.open(filename, os.O_RDWR | getattr(os, "O_BINARY", 0))
+        try:
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                futures = [
+                    executor.submit(
+                        _download_range,
+                        client,
+                        bucket.name,
+                        key,
+                        etag,
+                        part_start,
+                        part_end,
+                        file_descriptor,
+                    )
+                    for part_start, part_end in ranges
+                    if part_start not in completed
+                ]
+                # On a failure, cancel the queued ranges but keep recording the
+                # in-flight ones so a resume only fetches what is missing
+                range_error = None
+                for future in as_completed(futures):
+                    if future.cancelled():
+                        continue
+                    try:
+                        _record_completed_range(state, state_filename, future.result())
+                    except Exception as err:
+                        range_error = range_error or err
+                        for pending_future in futures:
+                            pending_future.cancel()
+                if range_error:
+                    raise range_error
+        finally:
+            os.close(file_descriptor)
+            _save_range_state(state, state_filename)
+
+        if verify and not _verify_download(client, bucket.name, key, head, filename):
+            # The state file is kept, so the download can be inspected or
+            # resumed without verify instead of fetched again
+            raise Exception(f"Downloaded {filename} does not match the ETag of {key}")
+        os.remove(state_filename)
+    except Exception as err:
+        logging.exception(f"Exception downloading file in parallel: {err}")
+        raise
+
+    elapsed_seconds = time.monotonic() - start_time
+    bytes_transferred = sum(
+        part_end - part_start + 1
+        for part_start, part_end in ranges
+        if part_start not in resumed_ranges
+    )
+    logging.info(
+        f"Downloaded {total_bytes} bytes of {key} in {elapsed_seconds:.2f}s "
+        f"({len(ranges) - len(resumed_ranges)} of {len(ranges)} ranges fetched)"
+    )
+
+    return {
+        "key": key,
+        "bytes_transferred": bytes_transferred,
+        "total_bytes": total_bytes,
+        "parts": len(ranges),
+        "resumed_parts": len(resumed_ranges),
+        "elapsed_seconds": elapsed_seconds,
+        "bytes_per_second": (
+            bytes_transferred / elapsed_seconds if elapsed_seconds > 0 else 0.0
+        ),
+    }
+
+
+def calculate_etag(filename, chunk_size=None):
+    """
+    Purpose:
+        Calculate the S3 ETag of a local file. Single part uploads have the
+        MD5 of the file as the ETag, while multipart uploads have the MD5 of
+        the concatenated part MD5s followed by "-{number_of_parts}" (even for
+        a single part). Note: objects encrypted with SSE-KMS or SSE-C do not
+        have MD5 ETags
+    Args:
+        filename (String): Path to the file on the local host
+        chunk_size (Int): Multipart chunk size the object was uploaded with.
+            None calculates a single part (non-multipart) ETag
+    Return:
+        etag (String): ETag of the file (without quotes)
+    """
+
+    block_size = 1024 * 1024
+    part_digests = []
+    with open(filename, "rb") as file_obj:
+        if not chunk_size:
+            file_md5 = hashlib.md5()
+            for block in iter(lambda: file_obj.read(block_size), b""):
+                file_md5.update(block)
+            return file_md5.hexdigest()
 
-def delete_all_files_in_bucket(bucket):
+        while True:
+            part_md5 = hashlib.md5()
+            part_bytes = 0
+            while part_bytes < chunk_size:
+                block = file_obj.read(min(block_size, chunk_size - part_bytes))
+                if not block:
+                    break
+                part_md5.update(block)
+                part_bytes += len(block)
+            if not part_bytes:
+                break
+            part_digests.append(part_md5.digest())
+
+    if not part_digests:
+        # Empty files are never uploaded as multipart
+        return hashlib.md5().hexdigest()
+
+    return f"{hashlib.md5(b''.join(part_digests)).hexdigest()}-{len(part_digests)}"
+
+
+def delete_all_files_in_bucket(
+    bucket, include_versions=None, max_workers=8, max_retries=5, parallel_listing=False
+):
     """
     Purpose:
-        Delete all files in a Bucket
+        Delete all files in a Bucket. Keys are listed page by page and sent
+        in batches of 1000 (the DeleteObjects max) to a worker pool, so
+        listing and deleting overlap and memory stays bounded. Only the keys
+        reported in a batch's Errors are retried (with backoff)
     Args:
         bucket (S3 Bucket Object): Bucket to delete files from
+        include_versions (Boolean): Whether or not to delete every object
+            version and delete marker (required to empty a versioned bucket).
+            Defaults to checking if versioning was ever enabled on the bucket
+        max_workers (Int): Max DeleteObjects batches to send at once
+        max_retries (Int): Max times to retry the failed keys of a batch
+        parallel_listing (Boolean): Whether or not to list the keys with
+            list_objects in parallel mode (unversioned listing only)
     Return:
-        N/A
+        delete_summary (Dict): Dict with the number of objects deleted, the
+            objects that failed to delete (with their error), and
+            elapsed_seconds
     """
+    logging.info(f"Deleting All Files in Bucket {bucket.name}")
+
+    start_time = time.monotonic()
+    client = bucket.meta.client
+
+    if include_versions is None:
+        versioning = client.get_bucket_versioning(Bucket=bucket.name)
+        include_versions = versioning.get("Status") in ("Enabled", "Suspended")
+
+    deleted_count = 0
+    failed = []
+    in_flight = threading.BoundedSemaphore(max_workers * 2)
+
+    try:
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = []
+            for batch in _get_delete_batches(
+                bucket, include_versions, parallel_listing
+            ):
+                in_flight.acquire()
+                future = executor.submit(
+                    _delete_objects_batch, client, bucket.name, batch, max_retries
+                )
+                future.add_done_callback(lambda _: in_flight.release())
+                futures.append(future)
+
+            for future in as_completed(futures):
+                batch_deleted_count, batch_failed = future.result()
+                deleted_count += batch_deleted_count
+                failed.extend(batch_failed)
+    except Exception as err:
+        logging.exception(f"Exception Deleting All Files in Bucket: {err}")
+        raise
 
-    logging.info("Not Yet Implemented")
+    elapsed_seconds = time.monotonic() - start_time
+    logging.info(
+        f"Deleted {deleted_count} objects from {bucket.name} ({len(failed)} failed) "
+        f"in {elapsed_seconds:.2f}s"
+    )
 
-    pass
+    return {
+        "deleted": deleted_count,
+        "failed": failed,
+        "elapsed_seconds": elapsed_seconds,
+    }
+
+
+###
+# Object Streaming Functions
+###
+
+
+def open_object(bucket, key, mode="rb", **kwargs):
+    """
+    Purpose:
+        Open an S3 object as a file-like stream without staging it on local
+        disk. Reads use ranged GETs with read-ahead and writes use a
+        multipart upload, so memory is bounded regardless of object size.
+        Use in a with block (a failed write block aborts the upload)
+    Args:
+        bucket (S3 Bucket Object): Bucket with the object
+        key (String): Name of the object in S3
+        mode (String): "rb" to read or "wb" to write
+        kwargs (Dict): Options passed to S3ObjectReader (read_ahead_size,
+            prefetch, version_id) or S3ObjectWriter (part_size,
+            max_concurrency, encryption)
+    Return:
+        stream (S3ObjectReader/S3ObjectWriter Object): File-like object
+    """
+    logging.info(f"Opening Stream ({mode}) to {bucket.name}/{key}")
+
+    try:
+        if mode == "rb":
+            return S3ObjectReader(bucket, key, **kwargs)
+        elif mode == "wb":
+            return S3ObjectWriter(bucket, key, **kwargs)
+    except Exception as err:
+        logging.exception(f"Exception Opening Stream to {key}: {err}")
+        raise
+
+    raise ValueError(f"Invalid mode ({mode}); expected rb or wb")
+
+
+def upload_stream(bucket, key, chunks, part_size=8 * 1024 * 1024, encryption=None):
+    """
+    Purpose:
+        Upload an object from an iterable of bytes (e.g. a generator) as a
+        streaming multipart upload, without staging it on local disk
+    Args:
+        bucket (S3 Bucket Object): Bucket to upload the object to
+        key (String): Desired name of the object in S3
+        chunks (Iterable of Bytes): Bytes of the object, in order
+        part_size (Int): Bytes per uploaded part (5 MB to 5 GB)
+        encryption (String): Server Side Encryption Method
+    Return:
+        bytes_written (Int): Size of the uploaded object
+    """
+    logging.info(f"Streaming Upload to {bucket.name}/{key}")
+
+    with S3ObjectWriter(
+        bucket, key, part_size=part_size, encryption=encryption
+    ) as writer:
+        for chunk in chunks:
+            writer.write(chunk)
+
+    return writer.bytes_written
+
+
+###
+# Directory Sync Functions
+###
+
+
+def sync_directory(
+    bucket,
+    local_dir,
+    prefix="",
+    max_workers=10,
+    compare_etag=False,
+    encryption=None,
+    transfer_config=None,
+):
+    """
+    Purpose:
+        Upload the files in a local directory (recursively) to S3 under a
+        prefix, only transferring files that are missing or have changed.
+        Files are compared by size and then by ETag (if compare_etag) or by
+        modified time, and are uploaded concurrently across a worker pool
+    Args:
+        bucket (S3 Bucket Object): Bucket to upload files to
+        local_dir (String): Path to the directory on the local host
+        prefix (String): Prefix (folder) in S3 to upload the files under
+        max_workers (Int): Max files to upload at once
+        compare_etag (Boolean): Whether or not to compare file contents by
+            ETag (MD5) when sizes match. Slower, but ignores modified times
+        encryption (String): Server Side Encryption Method
+        transfer_config (TransferConfig Object): Multipart/concurrency settings
+            for each transfer (see create_transfer_config)
+    Return:
+        sync_summary (Dict): Dict with transferred, skipped, and failed keys,
+            bytes_transferred, and elapsed_seconds
+    """
+    logging.info(f"Syncing Directory {local_dir} to {bucket.name}/{prefix}")
+
+    start_time = time.monotonic()
+    remote_objects = _get_remote_objects(bucket, prefix)
+    chunk_size = _get_chunk_size(transfer_config)
+
+    extra_args = None
+    if encryption:
+        extra_args = {"ServerSideEncryption": encryption}
+
+    transfers = []
+    skipped = []
+    for filename in _walk_local_files(local_dir):
+        relative_path = os.path.relpath(filename, local_dir).replace(os.sep, "/")
+        key = _join_key(prefix, relative_path)
+        remote_object = remote_objects.get(key)
+        if remote_object and not _local_file_changed(
+            filename, remote_object, compare_etag, chunk_size
+        ):
+            skipped.append(key)
+            continue
+        transfers.append((key, filename))
+
+    def upload(key, filename):
+        bucket.meta.client.upload_file(
+            filename,
+            bucket.name,
+            key,
+            ExtraArgs=extra_args,
+            Config=transfer_config,
+        )
+        return os.path.getsize(filename)
+
+    return _run_transfers(upload, transfers, skipped, max_workers, start_time)
+
+
+def download_prefix(
+    bucket,
+    prefix,
+    local_dir,
+    max_workers=10,
+    compare_etag=False,
+    transfer_config=None,
+):
+    """
+    Purpose:
+        Download all objects under a prefix in S3 to a local directory, only
+        transferring objects that are missing locally or have changed.
+        Objects are compared by size and then by ETag (if compare_etag) or
+        by modified time, and are downloaded concurrently across a worker pool
+    Args:
+        bucket (S3 Bucket Object): Bucket to download files from
+        prefix (String): Prefix (folder) in S3 to download. A "/" is added
+            if missing, so "data" does not also download "data-old/..."
+        local_dir (String): Path to the directory on the local host
+        max_workers (Int): Max files to download at once
+        compare_etag (Boolean): Whether or not to compare file contents by
+            ETag (MD5) when sizes match. Slower, but ignores modified times
+        transfer_config (TransferConfig Object): Multipart/concurrency settings
+            for each transfer (see create_transfer_config)
+    Return:
+        sync_summary (Dict): Dict with transferred, skipped, and failed keys,
+            bytes_transferred, and elapsed_seconds
+    """
+    if prefix and not prefix.endswith("/"):
+        prefix += "/"
+    logging.info(f"Downloading Prefix {bucket.name}/{prefix} to {local_dir}")
+
+    start_time = time.monotonic()
+    remote_objects = _get_remote_objects(bucket, prefix)
+    chunk_size = _get_chunk_size(transfer_config)
+    local_root = os.path.abspath(local_dir)
+
+    transfers = []
+    skipped = []
+    for key, remote_object in remote_objects.items():
+        if key.endswith("/"):
+            continue
+        relative_key = key[len(prefix):].lstrip("/")
+        filename = os.path.abspath(os.path.join(local_root, *relative_key.split("/")))
+        if not filename.startswith(local_root + os.sep):
+            logging.warning(f"Skipping {key}; it would be written outside {local_dir}")
+            continue
+        if os.path.isfile(filename) and not _local_file_changed(
+            filename, remote_object, compare_etag, chunk_size, remote_is_source=True
+        ):
+            skipped.append(key)
+            continue
+        transfers.append((key, filename))
+
+    def download(key, filename):
+        os.makedirs(os.path.dirname(filename), exist_ok=True)
+        bucket.meta.client.download_file(
+            bucket.name, key, filename, Config=transfer_config
+        )
+        # Match the local modified time to S3 so later syncs can compare them
+        last_modified = remote_objects[key]["last_modified"].timestamp()
+        os.utime(filename, (last_modified, last_modified))
+        return remote_objects[key]["size"]
+
+    return _run_transfers(download, transfers, skipped, max_workers, start_time)
 
 
 ###
@@ -228,7 +946,65 @@ def delete_all_files_in_bucket(bucket):
 ###
 
 
-def generate_presigned_url(s3, bucket_name, key, url_expire=900):
+class PresignedUrlCache(LRUCache):
+    """
+        PresignedUrlCache Class. LRU cache of presigned URLs that returns a
+        URL until safety_margin seconds before it expires
+    """
+
+    def __init__(self, max_size=10000, safety_margin=60):
+        """
+        Purpose:
+            Initilize the PresignedUrlCache Class.
+        Args:
+            max_size (Int): Max number of URLs to cache
+            safety_margin (Float): Seconds before a URL expires to stop
+                returning it, so callers always get time to use the URL
+        """
+
+        super().__init__(max_size=max_size)
+        self.safety_margin = safety_margin
+
+    def get_url(self, bucket_name, key, url_expire, client_method="get_object"):
+        """
+        Purpose:
+            Return a cached presigned URL that is still valid for longer than
+            the safety margin
+        Args:
+            bucket_name (String): Name of bucket in S3 with Object
+            key (String): Name of the object in S3
+            url_expire (int): Number of seconds the URL was signed for
+            client_method (String): S3 Client method the URL was signed for
+        Return:
+            presigned_url (String): Presigned URL, or None on a miss
+        """
+
+        return self.get((client_method, bucket_name, key, url_expire))
+
+    def set_url(
+        self, bucket_name, key, url_expire, presigned_url, client_method="get_object"
+    ):
+        """
+        Purpose:
+            Cache a newly signed URL until the safety margin before it expires
+        Args:
+            bucket_name (String): Name of bucket in S3 with Object
+            key (String): Name of the object in S3
+            url_expire (int): Number of seconds the URL was signed for
+            presigned_url (String): Presigned URL
+            client_method (String): S3 Client method the URL was signed for
+        Return:
+            N/A
+        """
+
+        ttl = url_expire - self.safety_margin
+        if ttl > 0:
+            self.set(
+                (client_method, bucket_name, key, url_expire), presigned_url, ttl=ttl
+            )
+
+
+def generate_presigned_url(s3, bucket_name, key, url_expire=900, cache=None):
     """
     Purpose:
         Return a presigned URL to a file
@@ -237,17 +1013,599 @@ def generate_presigned_url(s3, bucket_name, key, url_expire=900):
         bucket_name (String): Name of bucket in S3 with Object
         key (String): Name of the object in S3
         url_expire (int): Number of seconds for the URL to live
+        cache (PresignedUrlCache Object): Cache to reuse still-valid URLs from
     Returns:
         presigned_url (String): Presigned URL
     """
-    logging.info(f"Generating Presigned URL For {bucket_name} - {key}")
 
+    return generate_presigned_urls(
+        s3, bucket_name, [key], url_expire=url_expire, cache=cache
+    )[key]
+
+
+def generate_presigned_urls(s3, bucket_name, keys, url_expire=900, cache=None):
+    """
+    Purpose:
+        Return presigned URLs for many files, signing them all with the S3
+        Resource's (pooled) client. URLs found in the cache are reused
+    Args:
+        s3 (S3 Resource Object): S3 Resource Object
+        bucket_name (String): Name of bucket in S3 with the Objects
+        keys (List of Strings): Names of the objects in S3
+        url_expire (int): Number of seconds for the URLs to live
+        cache (PresignedUrlCache Object): Cache to reuse still-valid URLs from
+    Returns:
+        presigned_urls (Dict): Dict of key to Presigned URL
+    """
+    logging.info(f"Generating Presigned URLs For {len(keys)} Keys in {bucket_name}")
+
+    client = s3.meta.client
+    presigned_urls = {}
     try:
-        return s3.meta.client.generate_presigned_url(
-            "get_object",
-            Params={"Bucket": bucket_name, "Key": key},
-            ExpiresIn=url_expire,
-        )
+        for key in keys:
+            presigned_url = None
+            if cache is not None:
+                presigned_url = cache.get_url(bucket_name, key, url_expire)
+            if presigned_url is None:
+                presigned_url = client.generate_presigned_url(
+                    "get_object",
+                    Params={"Bucket": bucket_name, "Key": key},
+                    ExpiresIn=url_expire,
+                )
+                if cache is not None:
+                    cache.set_url(bucket_name, key, url_expire, presigned_url)
+            presigned_urls[key] = presigned_url
     except Exception as err:
         logging.exception(f"Exception generating Presigned URL: {err}")
         raise
+
+    return presigned_urls
+
+
+###
+# Helper Functions
+###
+
+
+def _get_remote_objects(bucket, prefix):
+    """
+    Purpose:
+        Return the size, modified time, and ETag of every object under a prefix
+    Args:
+        bucket (S3 Bucket Object): Bucket to list
+        prefix (String): Prefix (folder) in S3 to list
+    Return:
+        remote_objects (Dict): Dict of key to a Dict with size, last_modified,
+            and etag
+    """
+
+    return {
+        s3_object["Key"]: {
+            "size": s3_object["Size"],
+            "last_modified": s3_object["LastModified"],
+            "etag": s3_object["ETag"].strip('"'),
+        }
+        for s3_object in list_objects(bucket, prefix)
+    }
+
+
+def _walk_local_files(local_dir):
+    """
+    Purpose:
+        Yield the path of every file under a local directory
+    Args:
+        local_dir (String): Path to the directory on the local host
+    Yield:
+        filename (String): Path to a file in the directory
+    """
+
+    for dir_path, _, filenames in os.walk(local_dir):
+        for filename in filenames:
+            yield os.path.join(dir_path, filename)
+
+
+def _join_key(prefix, relative_key):
+    """
+    Purpose:
+        Join an S3 prefix and a relative key with a single "/"
+    Args:
+        prefix (String): Prefix (folder) in S3
+        relative_key (String): Key relative to the prefix
+    Return:
+        key (String): Full key in S3
+    """
+
+    if not prefix:
+        return relative_key
+    if prefix.endswith("/"):
+        return f"{prefix}{relative_key}"
+
+    return f"{prefix}/{relative_key}"
+
+
+def _get_chunk_size(transfer_config):
+    """
+    Purpose:
+        Return the multipart chunk size used for a transfer config, used to
+        recompute multipart ETags
+    Args:
+        transfer_config (TransferConfig Object): Config of the transfers
+    Return:
+        chunk_size (Int): Multipart chunk size in bytes
+    """
+
+    if transfer_config and transfer_config.multipart_chunksize:
+        return transfer_config.multipart_chunksize
+
+    return 8 * 1024 * 1024
+
+
+def _local_file_changed(
+    filename, remote_object, compare_etag, chunk_size, remote_is_source=False
+):
+    """
+    Purpose:
+        Check if a local file differs from an object in S3
+    Args:
+        filename (String): Path to the file on the local host
+        remote_object (Dict): Dict with size, last_modified, and etag of the
+            object in S3
+        compare_etag (Boolean): Whether or not to compare by ETag when the
+            sizes match (otherwise modified times are compared)
+        chunk_size (Int): Multipart chunk size to recompute multipart ETags
+        remote_is_source (Boolean): Whether S3 is the source of the sync
+            (download) or the destination (upload)
+    Return:
+        changed (Boolean): Whether or not the file needs to be transferred
+    """
+
+    if os.path.getsize(filename) != remote_object["size"]:
+        return True
+
+    if compare_etag:
+        if "-" not in remote_object["etag"]:
+            chunk_size = None
+        elif remote_object["etag"].endswith("-1"):
+            # A single part holds the whole file, whatever the chunk size
+            chunk_size = max(remote_object["size"], 1)
+        return calculate_etag(filename, chunk_size=chunk_size) != remote_object["etag"]
+
+    # S3 modified times only have second precision
+    local_mtime = int(os.path.getmtime(filename))
+    remote_mtime = int(remote_object["last_modified"].timestamp())
+    if remote_is_source:
+        return remote_mtime > local_mtime
+
+    return local_mtime > remote_mtime
+
+
+def _run_transfers(transfer, transfers, skipped, max_workers, start_time):
+    """
+    Purpose:
+        Run transfers across a worker pool and summarize the results
+    Args:
+        transfer (Function): Function taking a key and filename, returning
+            the bytes moved
+        transfers (List of Tuples): Key and filename of each transfer to run
+        skipped (List of Strings): Keys that did not need to be transferred
+        max_workers (Int): Max transfers to run at once
+        start_time (Float): Monotonic time the sync started
+    Return:
+        sync_summary (Dict): Dict with transferred, skipped, and failed keys,
+            bytes_transferred, and elapsed_seconds
+    """
+
+    transferred = []
+    failed = {}
+    bytes_transferred = 0
+
+    if transfers:
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = {
+                executor.submit(transfer, key, filename): key
+                for key, filename in transfers
+            }
+            for future in as_completed(futures):
+                key = futures[future]
+                try:
+                    bytes_transferred += future.result()
+                    transferred.append(key)
+                except Exception as err:
+                    logging.exception(f"Exception transferring {key}: {err}")
+                    failed[key] = str(err)
+
+    elapsed_seconds = time.monotonic() - start_time
+    logging.info(
+        f"Transferred {len(transferred)} files ({bytes_transferred} bytes), "
+        f"skipped {len(skipped)}, failed {len(failed)} in {elapsed_seconds:.2f}s"
+    )
+
+    return {
+        "transferred": transferred,
+        "skipped": skipped,
+        "failed": failed,
+        "bytes_transferred": bytes_transferred,
+        "elapsed_seconds": elapsed_seconds,
+    }
+
+
+def _get_delete_batches(bucket, include_versions, parallel_listing, batch_size=1000):
+    """
+    Purpose:
+        Page through the objects (or object versions) in a bucket and yield
+        them in DeleteObjects sized batches
+    Args:
+        bucket (S3 Bucket Object): Bucket to list
+        include_versions (Boolean): Whether or not to list every object
+            version and delete marker instead of only the current objects
+        parallel_listing (Boolean): Whether or not to list the current
+            objects in parallel (see list_objects)
+        batch_size (Int): Max objects per batch (1000 is the S3 max)
+    Yield:
+        batch (List of Dicts): Objects to delete, with Key (and VersionId)
+    """
+
+    batch = []
+    if include_versions:
+        paginator = bucket.meta.client.get_paginator("list_object_versions")
+        for page in paginator.paginate(Bucket=bucket.name):
+            for version in page.get("Versions", []) + page.get("DeleteMarkers", []):
+                batch.append({"Key": version["Key"], "VersionId": version["VersionId"]})
+                if len(batch) == batch_size:
+                    yield batch
+                    batch = []
+    else:
+        for s3_object in list_objects(bucket, parallel=parallel_listing):
+            batch.append({"Key": s3_object["Key"]})
+            if len(batch) == batch_size:
+                yield batch
+                batch = []
+
+    if batch:
+        yield batch
+
+
+def _delete_objects_batch(client, bucket_name, objects, max_retries):
+    """
+    Purpose:
+        Delete a batch of objects with DeleteObjects, retrying only the
+        objects reported in the response's Errors
+    Args:
+        client (S3 Client Object): Client of the bucket
+        bucket_name (String): Name of bucket to delete from
+        objects (List of Dicts): Objects to delete, with Key (and VersionId)
+        max_retries (Int): Max times to retry the failed objects
+    Return:
+        deleted_count (Int): Number of objects deleted
+        failed (List of Dicts): Objects that could not be deleted, with Key,
+            VersionId, Code, and Message from the last attempt
+    """
+
+    deleted_count = 0
+    errors = []
+    for attempt in range(max_retries + 1):
+        if attempt:
+            retry_helpers.sleep_with_backoff(attempt - 1)
+
+        response = client.delete_objects(
+            Bucket=bucket_name, Delete={"Objects": objects, "Quiet": True}
+        )
+        errors = response.get("Errors", [])
+        deleted_count += len(objects) - len(errors)
+        if not errors:
+            break
+
+        logging.warning(
+            f"{len(errors)} of {len(objects)} Objects Failed to Delete "
+            f"(attempt {attempt + 1}): {errors[0].get('Code')}"
+        )
+        objects = [
+            {"Key": error["Key"], "VersionId": error["VersionId"]}
+            if error.get("VersionId")
+            else {"Key": error["Key"]}
+            for error in errors
+        ]
+
+    return deleted_count, errors
+
+
+def _download_range(client, bucket_name, key, etag, start, end, file_descriptor):
+    """
+    Purpose:
+        GET a byte range of an object and write it at its offset in a file
+    Args:
+        client (S3 Client Object): Client of the bucket
+        bucket_name (String): Name of bucket with the object
+        key (String): Name of the object in S3
+        etag (String): ETag the object must still have
+        start (Int): First byte of the range
+        end (Int): Last byte of the range (inclusive)
+        file_descriptor (Int): Descriptor of the preallocated file
+    Return:
+        start (Int): First byte of the downloaded range
+    """
+
+    response = client.get_object(
+        Bucket=bucket_name, Key=key, Range=f"bytes={start}-{end}", IfMatch=etag
+    )
+
+    offset = start
+    for chunk in response["Body"].iter_chunks(chunk_size=1024 * 1024):
+        _write_at(file_descriptor, chunk, offset)
+        offset += len(chunk)
+
+    if offset != end + 1:
+        raise Exception(f"Range {start}-{end} of {key} ended early at {offset}")
+
+    return start
+
+
+_write_lock = threading.Lock()
+
+
+def _write_at(file_descriptor, data, offset):
+    """
+    Purpose:
+        Write bytes at an offset in a file without moving a shared position
+        (os.pwrite), falling back to a locked seek and write where pwrite is
+        not available
+    Args:
+        file_descriptor (Int): Descriptor of the file
+        data (Bytes): Bytes to write
+        offset (Int): Offset in the file to write at
+    Return:
+        N/A
+    """
+
+    if hasattr(os, "pwrite"):
+        view = memoryview(data)
+        while view:
+            bytes_written = os.pwrite(file_descriptor, view, offset)
+            view = view[bytes_written:]
+            offset += bytes_written
+        return
+
+    with _write_lock:
+        os.lseek(file_descriptor, offset, os.SEEK_SET)
+        os.write(file_descriptor, data)
+
+
+def _load_range_state(state_filename, filename, etag, total_bytes, part_size):
+    """
+    Purpose:
+        Load the completed ranges of a previous parallel download, if it was
+        for the same version of the object with the same part size
+    Args:
+        state_filename (String): Path to the state file
+        filename (String): Path to the partially downloaded file
+        etag (String): ETag of the object
+        total_bytes (Int): Size of the object
+        part_size (Int): Bytes per range
+    Return:
+        completed (Set of Ints): Start offsets of the completed ranges
+    """
+
+    if not (os.path.isfile(state_filename) and os.path.isfile(filename)):
+        return set()
+
+    try:
+        with open(state_filename) as state_file:
+            saved_state = json.load(state_file)
+    except (OSError, ValueError) as err:
+        logging.warning(f"Ignoring Unreadable Download State {state_filename}: {err}")
+        return set()
+
+    if (
+        saved_state.get("etag") != etag
+        or saved_state.get("total_bytes") != total_bytes
+        or saved_state.get("part_size") != part_size
+        or os.path.getsize(filename) != total_bytes
+    ):
+        logging.info(f"Object Changed Since {state_filename}; Restarting Download")
+        return set()
+
+    completed = set(saved_state.get("completed", []))
+    logging.info(f"Resuming Download With {len(completed)} Completed Ranges")
+
+    return completed
+
+
+def _record_completed_range(state, state_filename, start, save_interval=1.0):
+    """
+    Purpose:
+        Mark a range as completed, saving the state file at most once per
+        save_interval seconds
+    Args:
+        state (Dict): State of the parallel download
+        state_filename (String): Path to the state file
+        start (Int): Start offset of the completed range
+        save_interval (Float): Min seconds between state file saves
+    Return:
+        N/A
+    """
+
+    with state["lock"]:
+        state["completed"].add(start)
+        if time.monotonic() - state["last_saved"] < save_interval:
+            return
+
+    _save_range_state(state, state_filename)
+
+
+def _save_range_state(state, state_filename):
+    """
+    Purpose:
+        Save the completed ranges of a parallel download to its state file
+    Args:
+        state (Dict): State of the parallel download
+        state_filename (String): Path to the state file
+    Return:
+        N/A
+    """
+
+    with state["lock"]:
+        saved_state = {
+            "etag": state["etag"],
+            "total_bytes": state["total_bytes"],
+            "part_size": state["part_size"],
+            "completed": sorted(state["completed"]),
+        }
+        state["last_saved"] = time.monotonic()
+
+        temp_state_filename = f"{state_filename}.tmp"
+        with open(temp_state_filename, "w") as state_file:
+            json.dump(saved_state, state_file)
+        os.replace(temp_state_filename, state_filename)
+
+
+def _verify_download(client, bucket_name, key, head, filename):
+    """
+    Purpose:
+        Check a downloaded file against the object's ETag. For multipart
+        objects, the original part size is read from the object's first part.
+        Objects encrypted with SSE-KMS or SSE-C are not checked, as their
+        ETags are not MD5s of the data
+    Args:
+        client (S3 Client Object): Client of the bucket
+        bucket_name (String): Name of bucket with the object
+        key (String): Name of the object in S3
+        head (Dict): HeadObject response of the object
+        filename (String): Path to the downloaded file
+    Return:
+        matches (Boolean): Whether or not the file matches the ETag (True if
+            the ETag cannot be checked)
+    """
+
+    if head.get("SSECustomerAlgorithm") or head.get(
+        "ServerSideEncryption", ""
+    ).startswith("aws:kms"):
+        logging.info(f"Not Verifying {filename}; the ETag of {key} is not an MD5")
+        return True
+
+    etag = head["ETag"].strip('"')
+    chunk_size = None
+    if etag.endswith("-1"):
+        # A single part holds the whole object
+        chunk_size = max(head["ContentLength"], 1)
+    elif "-" in etag:
+        first_part = client.head_object(Bucket=bucket_name, Key=key, PartNumber=1)
+        chunk_size = first_part["ContentLength"]
+
+    local_etag = calculate_etag(filename, chunk_size=chunk_size)
+    if local_etag != etag:
+        logging.error(f"ETag of {filename} ({local_etag}) != ETag of {key} ({etag})")
+        return False
+
+    return True
+
+
+def _paginate_objects(client, bucket_name, prefix, delimiter=None, page_size=1000):
+    """
+    Purpose:
+        Yield the pages of a ListObjectsV2 listing
+    Args:
+        client (S3 Client Object): Client of the bucket
+        bucket_name (String): Name of bucket to list
+        prefix (String): Only list keys starting with the prefix
+        delimiter (String): Group keys below this delimiter as CommonPrefixes
+        page_size (Int): Max keys per request
+    Yield:
+        page (Dict): ListObjectsV2 response
+    """
+
+    list_args = {"Bucket": bucket_name, "Prefix": prefix}
+    if delimiter:
+        list_args["Delimiter"] = delimiter
+
+    paginator = client.get_paginator("list_objects_v2")
+    yield from paginator.paginate(
+        **list_args, PaginationConfig={"PageSize": page_size}
+    )
+
+
+def _list_objects_serial(client, bucket_name, prefix, delimiter=None, page_size=1000):
+    """
+    Purpose:
+        Yield the objects of a ListObjectsV2 listing, one page at a time
+    Args:
+        client (S3 Client Object): Client of the bucket
+        bucket_name (String): Name of bucket to list
+        prefix (String): Only list keys starting with the prefix
+        delimiter (String): Do not list keys below this delimiter
+        page_size (Int): Max keys per request
+    Yield:
+        s3_object (Dict): Object summary
+    """
+
+    for page in _paginate_objects(
+        client, bucket_name, prefix, delimiter=delimiter, page_size=page_size
+    ):
+        yield from page.get("Contents", [])
+
+
+_LISTING_DONE = object()
+
+
+def _list_objects_parallel(
+    client, bucket_name, prefixes, page_size, max_workers, max_buffered_pages
+):
+    """
+    Purpose:
+        List several prefixes concurrently, handing pages to the caller
+        through a bounded queue. Workers stop if the caller stops iterating
+    Args:
+        client (S3 Client Object): Client of the bucket
+        bucket_name (String): Name of bucket to list
+        prefixes (List of Strings): Prefixes to list (recursively)
+        page_size (Int): Max keys per request
+        max_workers (Int): Max prefixes to list at once
+        max_buffered_pages (Int): Max pages waiting to be consumed
+    Yield:
+        s3_object (Dict): Object summary
+    """
+
+    if not prefixes:
+        return
+
+    pages = queue.Queue(maxsize=max_buffered_pages)
+    stop_event = threading.Event()
+
+    def put_page(item):
+        while not stop_event.is_set():
+            try:
+                pages.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def list_prefix(prefix):
+        try:
+            for page in _paginate_objects(
+                client, bucket_name, prefix, page_size=page_size
+            ):
+                contents = page.get("Contents", [])
+                if contents and not put_page(contents):
+                    return
+        except Exception as err:
+            logging.exception(f"Exception Listing Prefix {prefix}: {err}")
+            put_page(err)
+        finally:
+            put_page(_LISTING_DONE)
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = [executor.submit(list_prefix, prefix) for prefix in prefixes]
+        try:
+            remaining_prefixes = len(prefixes)
+            while remaining_prefixes:
+                page = pages.get()
+                if page is _LISTING_DONE:
+                    remaining_prefixes -= 1
+                elif isinstance(page, Exception):
+                    raise page
+                else:
+                    yield from page
+        finally:
+            stop_event.set()
+            for future in futures:
+                future.cancel()
@@ -0,0 +1,493 @@
+#!/usr/bin/env python3
+"""
+    Purpose:
+        S3 Stream Classes. Will provide file-like objects for reading
+        and writing S3 objects without staging them on local disk, using
+        ranged GETs with read-ahead for reads and multipart uploads for
+        writes so memory stays bounded regardless of object size
+    Examples of Create Object of Class:
+        with S3ObjectReader(bucket, "path/to/key") as reader:
+            header = reader.read(1024)
+        with S3ObjectWriter(bucket, "path/to/key") as writer:
+            writer.write(b"data")
+"""
+
+# Python Library Imports
+import io
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+###
+# Stream Constants
+###
+
+
+MIN_PART_SIZE = 5 * 1024 * 1024
+MAX_PART_SIZE = 5 * 1024 * 1024 * 1024
+MAX_PARTS = 10000
+PART_SIZE_GROWTH_INTERVAL = 1000
+DEFAULT_BLOCK_SIZE = 8 * 1024 * 1024
+
+
+class S3ObjectReader(io.RawIOBase):
+    """
+        S3ObjectReader Class. Read-only, seekable file-like object over an
+        S3 object
+    """
+
+    ###
+    # Class Lifecycle Methods
+    ###
+
+    def __init__(
+        self,
+        bucket,
+        key,
+        read_ahead_size=DEFAULT_BLOCK_SIZE,
+        prefetch=True,
+        version_id=None,
+    ):
+        """
+        Purpose:
+            Initilize the S3ObjectReader Class. HEADs the object to get its
+            size and ETag; reads are pinned to that ETag so a concurrent
+            overwrite fails the read instead of mixing two versions
+        Args:
+            bucket (S3 Bucket Object): Bucket with the object
+            key (String): Name of the object in S3
+            read_ahead_size (Int): Bytes fetched per ranged GET
+            prefetch (Boolean): Whether or not to fetch the next block in the
+                background while the current one is read (sequential reads)
+            version_id (String): Version of the object to read
+        """
+
+        super().__init__()
+
+        self.bucket = bucket
+        self.key = key
+        self.read_ahead_size = read_ahead_size
+        self.version_id = version_id
+
+        self._client = bucket.meta.client
+        head_args = {"Bucket": bucket.name, "Key": key}
+        if version_id:
+            head_args["VersionId"] = version_id
+        head = self._client.head_object(**head_args)
+        self.content_length = head["ContentLength"]
+        self.etag = head["ETag"]
+
+        self._position = 0
+        self._block = b""
+        self._block_start = 0
+
+        self._prefetch_executor = None
+        self._prefetch_future = None
+        self._prefetch_start = None
+        if prefetch:
+            self._prefetch_executor = ThreadPoolExecutor(max_workers=1)
+
+    def close(self):
+        """
+        Purpose:
+            Close the reader and release its buffers
+        Args:
+            N/A
+        Return:
+            N/A
+        """
+
+        if self._prefetch_executor:
+            self._prefetch_executor.shutdown(wait=False)
+            self._prefetch_executor = None
+        self._prefetch_future = None
+        self._block = b""
+
+        super().close()
+
+    ###
+    # File-Like Methods
+    ###
+
+    def readable(self):
+        return True
+
+    def seekable(self):
+        return True
+
+    def tell(self):
+        return self._position
+
+    def seek(self, offset, whence=io.SEEK_SET):
+        """
+        Purpose:
+            Move the read position. No request is made until the next read
+        Args:
+            offset (Int): Offset to move to, relative to whence
+            whence (Int): io.SEEK_SET, io.SEEK_CUR, or io.SEEK_END
+        Return:
+            position (Int): New read position
+        """
+
+        if whence == io.SEEK_SET:
+            position = offset
+        elif whence == io.SEEK_CUR:
+            position = self._position + offset
+        elif whence == io.SEEK_END:
+            position = self.content_length + offset
+        else:
+            raise ValueError(f"Invalid whence ({whence})")
+
+        if position < 0:
+            raise ValueError(f"Negative seek position {position}")
+        self._position = position
+
+        return self._position
+
+    def read(self, size=-1):
+        """
+        Purpose:
+            Read up to size bytes from the current position. Unlike raw reads,
+            only returns fewer bytes than requested at the end of the object
+        Args:
+            size (Int): Max bytes to read. Negative reads to the end
+        Return:
+            data (Bytes): Bytes read
+        """
+
+        # Cap the size before allocating, so large requests near the end of
+        # the object only allocate what is left
+        remaining = max(self.content_length - self._position, 0)
+        if size is None or size < 0 or size > remaining:
+            size = remaining
+
+        data = bytearray(size)
+        view = memoryview(data)
+        bytes_read = 0
+        while bytes_read < size:
+            chunk_size = self.readinto(view[bytes_read:])
+            if not chunk_size:
+                break
+            bytes_read += chunk_size
+
+        return bytes(data[:bytes_read])
+
+    def readinto(self, buffer):
+        """
+        Purpose:
+            Read bytes from the current position into a buffer, fetching the
+            next block from S3 if the position is outside the current block
+        Args:
+            buffer (Writable Buffer): Buffer to read into
+        Return:
+            bytes_read (Int): Number of bytes read (0 at end of object)
+        """
+
+        if self._position >= self.content_length:
+            return 0
+
+        block_offset = self._position - self._block_start
+        if not 0 <= block_offset < len(self._block):
+            self._load_block(self._position)
+            block_offset = 0
+
+        view = memoryview(buffer).cast("B")
+        bytes_read = min(len(view), len(self._block) - block_offset)
+        view[:bytes_read] = self._block[block_offset:block_offset + bytes_read]
+        self._position += bytes_read
+
+        return bytes_read
+
+    ###
+    # Helper Methods
+    ###
+
+    def _load_block(self, start):
+        """
+        Purpose:
+            Make the block starting at an offset the current block, using the
+            prefetched block if it matches, and start prefetching the next one
+        Args:
+            start (Int): Offset of the block in the object
+        Return:
+            N/A
+        """
+
+        if self._prefetch_future and self._prefetch_start == start:
+            block = self._prefetch_future.result()
+        else:
+            block = self._get_range(start)
+        self._prefetch_future = None
+
+        self._block = block
+        self._block_start = start
+
+        next_start = start + len(block)
+        if self._prefetch_executor and next_start < self.content_length:
+            self._prefetch_start = next_start
+            self._prefetch_future = self._prefetch_executor.submit(
+                self._get_range, next_start
+            )
+
+    def _get_range(self, start):
+        """
+        Purpose:
+            GET a block of the object with a ranged request
+        Args:
+            start (Int): Offset of the block in the object
+        Return:
+            block (Bytes): Bytes of the block
+        """
+
+        end = min(start + self.read_ahead_size, self.content_length) - 1
+        get_args = {
+            "Bucket": self.bucket.name,
+            "Key": self.key,
+            "Range": f"bytes={start}-{end}",
+            "IfMatch": self.etag,
+        }
+        if self.version_id:
+            get_args["VersionId"] = self.version_id
+
+        response = self._client.get_object(**get_args)
+
+        return response["Body"].read()
+
+
+class S3ObjectWriter(io.RawIOBase):
+    """
+        S3ObjectWriter Class. Write-only file-like object that streams to
+        an S3 object with a multipart upload
+    """
+
+    ###
+    # Class Lifecycle Methods
+    ###
+
+    def __init__(
+        self,
+        bucket,
+        key,
+        part_size=DEFAULT_BLOCK_SIZE,
+        max_concurrency=4,
+        encryption=None,
+    ):
+        """
+        Purpose:
+            Initilize the S3ObjectWriter Class. Nothing is sent until a full
+            part is buffered; objects smaller than one part are sent with a
+            single PutObject on close. Memory is bounded by
+            part_size * (max_concurrency + 1); part_size doubles every 1,000
+            parts (up to 5 GB) so large streams fit in S3's 10,000 parts
+        Args:
+            bucket (S3 Bucket Object): Bucket to write the object to
+            key (String): Name of the object in S3
+            part_size (Int): Bytes per uploaded part (5 MB to 5 GB) for the
+                first 1,000 parts
+            max_concurrency (Int): Max parts to upload at once
+            encryption (String): Server Side Encryption Method
+        """
+
+        super().__init__()
+
+        if not MIN_PART_SIZE <= part_size <= MAX_PART_SIZE:
+            raise ValueError(f"part_size must be 5 MB to 5 GB, got {part_size}")
+
+        self.bucket = bucket
+        self.key = key
+        self.part_size = part_size
+        self.bytes_written = 0
+
+        self._client = bucket.meta.client
+        self._extra_args = {}
+        if encryption:
+            self._extra_args["ServerSideEncryption"] = encryption
+
+        self._buffer = bytearray()
+        self._upload_id = None
+        self._part_futures = []
+        self._part_slots = threading.BoundedSemaphore(max_concurrency)
+        self._executor = ThreadPoolExecutor(max_workers=max_concurrency)
+
+    def __del__(self):
+        """
+        Purpose:
+            Abort the upload of a writer that was never closed, instead of
+            completing it with whatever was written so far
+        """
+
+        if self.closed or not hasattr(self, "_executor"):
+            return
+
+        logging.warning(f"Stream to {self.key} was not closed, aborting it")
+        try:
+            # Without waiting, as the collection may run on an upload thread
+            self.abort(wait=False)
+        except Exception as err:
+            logging.exception(f"Exception Aborting Stream to {self.key}: {err}")
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        """
+        Purpose:
+            Complete the upload when the with block succeeds and abort it
+            when the block raises
+        """
+
+        if exc_type:
+            self.abort()
+        else:
+            self.close()
+
+    def close(self):
+        """
+        Purpose:
+            Upload the remaining buffered bytes and complete the upload
+        Args:
+            N/A
+        Return:
+            N/A
+        """
+
+        if self.closed:
+            return
+
+        try:
+            if self._upload_id is None:
+                self._client.put_object(
+                    Bucket=self.bucket.name,
+                    Key=self.key,
+                    Body=bytes(self._buffer),
+                    **self._extra_args,
+                )
+            else:
+                if self._buffer:
+                    self._submit_part()
+                parts = [future.result() for future in self._part_futures]
+                self._client.complete_multipart_upload(
+                    Bucket=self.bucket.name,
+                    Key=self.key,
+                    UploadId=self._upload_id,
+                    MultipartUpload={"Parts": parts},
+                )
+            logging.info(f"Streamed {self.bytes_written} bytes to {self.key}")
+        except Exception as err:
+            logging.exception(f"Exception Completing Stream to {self.key}: {err}")
+            self.abort()
+            raise
+        finally:
+            self._executor.shutdown(wait=True)
+            self._buffer = bytearray()
+            super().close()
+
+    def abort(self, wait=True):
+        """
+        Purpose:
+            Abort the upload, discarding any uploaded parts
+        Args:
+            wait (Boolean): Whether or not to wait for the parts being
+                uploaded before aborting (otherwise queued parts are dropped)
+        Return:
+            N/A
+        """
+
+        if self.closed:
+            return
+
+        self._executor.shutdown(wait=wait, cancel_futures=not wait)
+        if self._upload_id is not None:
+            logging.info(f"Aborting Stream to {self.key}")
+            self._client.abort_multipart_upload(
+                Bucket=self.bucket.name, Key=self.key, UploadId=self._upload_id
+            )
+            self._upload_id = None
+        self._buffer = bytearray()
+        super().close()
+
+    ###
+    # File-Like Methods
+    ###
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        """
+        Purpose:
+            Buffer bytes for the object, uploading each full part as it fills
+        Args:
+            data (Bytes-Like): Bytes to write
+        Return:
+            bytes_written (Int): Number of bytes written
+        """
+
+        if self.closed:
+            raise ValueError("write to closed S3ObjectWriter")
+
+        self._buffer.extend(data)
+        self.bytes_written += len(data)
+        while len(self._buffer) >= self.part_size:
+            self._submit_part()
+
+        return len(data)
+
+    ###
+    # Helper Methods
+    ###
+
+    def _submit_part(self):
+        """
+        Purpose:
+            Upload the next part from the buffer in the background, waiting
+            for a free upload slot so memory stays bounded. The part size
+            doubles every PART_SIZE_GROWTH_INTERVAL parts so the upload fits
+            in S3's MAX_PARTS
+        Args:
+            N/A
+        Return:
+            N/A
+        """
+
+        part_number = len(self._part_futures) + 1
+        if part_number > MAX_PARTS:
+            raise ValueError(
+                f"Stream to {self.key} needs more than {MAX_PARTS} parts, "
+                f"use a larger part_size"
+            )
+
+        if self._upload_id is None:
+            response = self._client.create_multipart_upload(
+                Bucket=self.bucket.name, Key=self.key, **self._extra_args
+            )
+            self._upload_id = response["UploadId"]
+
+        part_data = bytes(self._buffer[:self.part_size])
+        del self._buffer[:self.part_size]
+
+        self._part_slots.acquire()
+        future = self._executor.submit(self._upload_part, part_number, part_data)
+        future.add_done_callback(lambda _: self._part_slots.release())
+        self._part_futures.append(future)
+
+        if part_number % PART_SIZE_GROWTH_INTERVAL == 0:
+            self.part_size = min(self.part_size * 2, MAX_PART_SIZE)
+
+    def _upload_part(self, part_number, part_data):
+        """
+        Purpose:
+            Upload a single part of the multipart upload
+        Args:
+            part_number (Int): Number of the part (starting at 1)
+            part_data (Bytes): Bytes of the part
+        Return:
+            part (Dict): ETag and PartNumber of the uploaded part
+        """
+
+        response = self._client.upload_part(
+            Bucket=self.bucket.name,
+            Key=self.key,
+            UploadId=self._upload_id,
+            PartNumber=part_number,
+            Body=part_data,
+        )
+
+        return {"ETag": response["ETag"], "PartNumber": part_number}
@@ -0,0 +1,368 @@
+#!/usr/bin/env python3
+"""
+    Purpose:
+        Helper Library for Boto3 Sessions. Will provide a process-wide,
+        thread-safe pool of Sessions and Clients (and a per-thread pool of
+        Resources, which Boto3 does not make thread-safe) so every helper
+        library reuses warm service models and HTTP connection pools
+        instead of building new ones per call
+"""
+
+# Python Library Imports
+import hashlib
+import logging
+import threading
+import boto3
+from botocore.config import Config
+
+# Local Library Imports
+from aws_helpers.cache_helpers import LRUCache
+
+###
+# Resource Pool State
+###
+
+
+DEFAULT_POOL_SETTINGS = {
+    "max_size": 32,
+    "max_pool_connections": 50,
+    "tcp_keepalive": True,
+    "connect_timeout": None,
+    "read_timeout": None,
+    "max_attempts": None,
+    "retry_mode": None,
+}
+
+_pool_settings = dict(DEFAULT_POOL_SETTINGS)
+_pool_lock = threading.RLock()
+_sessions = LRUCache(max_size=DEFAULT_POOL_SETTINGS["max_size"])
+_clients = LRUCache(max_size=DEFAULT_POOL_SETTINGS["max_size"])
+
+# Resources are cached per thread. Bumping the generation drops the
+# Resources of every thread the next time the thread asks for one
+_thread_state = threading.local()
+_resource_generation = 0
+
+
+###
+# Pool Configuration Functions
+###
+
+
+def configure_resource_pool(
+    max_size=None,
+    max_pool_connections=None,
+    tcp_keepalive=None,
+    connect_timeout=None,
+    read_timeout=None,
+    max_attempts=None,
+    retry_mode=None,
+):
+    """
+    Purpose:
+        Update the settings of the shared resource pool. Any cached Sessions,
+        Resources (of every thread), and Clients are dropped so the next call
+        builds them with the new settings. Args left as None keep their
+        current value
+    Args:
+        max_size (Int): Max number of Resources/Clients (and Sessions) to keep
+            before evicting the least recently used one
+        max_pool_connections (Int): Max HTTP connections kept open per Client
+        tcp_keepalive (Boolean): Whether or not to enable TCP Keep-Alive on
+            pooled connections
+        connect_timeout (Float): Seconds to wait when opening a connection
+        read_timeout (Float): Seconds to wait when reading from a connection
+        max_attempts (Int): Max attempts per request (botocore retries)
+        retry_mode (String): botocore retry mode (legacy, standard, adaptive)
+    Return:
+        pool_settings (Dict): The settings now in use by the pool
+    """
+
+    global _sessions, _clients, _resource_generation
+
+    new_settings = {
+        "max_size": max_size,
+        "max_pool_connections": max_pool_connections,
+        "tcp_keepalive": tcp_keepalive,
+        "connect_timeout": connect_timeout,
+        "read_timeout": read_timeout,
+        "max_attempts": max_attempts,
+        "retry_mode": retry_mode,
+    }
+
+    with _pool_lock:
+        for setting, value in new_settings.items():
+            if value is not None:
+                _pool_settings[setting] = value
+        logging.info(f"Configuring Resource Pool: {_pool_settings}")
+
+        _sessions = LRUCache(max_size=_pool_settings["max_size"])
+        _clients = LRUCache(max_size=_pool_settings["max_size"])
+        _resource_generation += 1
+
+        return dict(_pool_settings)
+
+
+def get_resource_pool_settings():
+    """
+    Purpose:
+        Return the settings in use by the shared resource pool
+    Args:
+        N/A
+    Return:
+        pool_settings (Dict): The settings in use by the pool
+    """
+
+    with _pool_lock:
+        return dict(_pool_settings)
+
+
+def get_resource_pool_stats():
+    """
+    Purpose:
+        Return the size and hit/miss counters of the shared resource pool
+    Args:
+        N/A
+    Return:
+        pool_stats (Dict): Dict with the stats of the "sessions" cache, the
+            shared "clients" cache, and the calling thread's "resources" cache
+    """
+
+    with _pool_lock:
+        return {
+            "sessions": _sessions.get_stats(),
+            "clients": _clients.get_stats(),
+            "resources": _get_thread_resources().get_stats(),
+        }
+
+
+###
+# Session, Resource, and Client Functions
+###
+
+
+def get_session(region_name=None, access_key=None, secret_key=None):
+    """
+    Purpose:
+        Return a cached Boto3 Session for a region and set of credentials,
+        creating it on first use. Credentials are only used if both the
+        access key and secret key are passed, otherwise the default
+        credential chain is used
+    Args:
+        region_name (String): Name of region to connect to
+        access_key (String): access key to use to connect to AWS
+        secret_key (String): secret key to use to connect to AWS
+    Return:
+        session (Boto3 Session Object): Boto3 Session Object
+    """
+
+    if not (access_key and secret_key):
+        access_key, secret_key = None, None
+
+    session_key = (region_name, access_key, _get_secret_fingerprint(secret_key))
+
+    def create_session():
+        logging.info(f"Creating Boto3 Session (region={region_name})")
+        return boto3.Session(
+            aws_access_key_id=access_key,
+            aws_secret_access_key=secret_key,
+            region_name=region_name,
+        )
+
+    with _pool_lock:
+        return _sessions.get_or_set(session_key, create_session)
+
+
+def get_resource(service_name, region_name=None, access_key=None, secret_key=None):
+    """
+    Purpose:
+        Return a cached Boto3 Resource for a service, region, and set of
+        credentials, creating it on first use with the pool's connection
+        settings. Resources are not thread-safe, so each thread gets its own
+    Args:
+        service_name (String): Name of the AWS service (s3, sqs, sns, dynamodb)
+        region_name (String): Name of region to connect to
+        access_key (String): access key to use to connect to AWS
+        secret_key (String): secret key to use to connect to AWS
+    Return:
+        resource (Boto3 Resource Object): Resource Object for the service
+    """
+
+    return _get_pooled_object(
+        "resource", service_name, region_name, access_key, secret_key
+    )
+
+
+def get_client(service_name, region_name=None, access_key=None, secret_key=None):
+    """
+    Purpose:
+        Return a cached low-level Boto3 Client for a service, region, and set
+        of credentials, creating it on first use with the pool's connection
+        settings. Clients are thread-safe and shared by every thread
+    Args:
+        service_name (String): Name of the AWS service (s3, sqs, sns, dynamodb)
+        region_name (String): Name of region to connect to
+        access_key (String): access key to use to connect to AWS
+        secret_key (String): secret key to use to connect to AWS
+    Return:
+        client (Boto3 Client Object): Client Object for the service
+    """
+
+    return _get_pooled_object(
+        "client", service_name, region_name, access_key, secret_key
+    )
+
+
+def invalidate_resources(service_name=None, region_name=None):
+    """
+    Purpose:
+        Drop cached Resources and Clients from the pool so the next call
+        builds new ones (e.g. after rotating credentials). With no args,
+        everything (including Sessions) is dropped. The Resources of other
+        threads are all dropped the next time those threads ask for one
+    Args:
+        service_name (String): Only drop objects for this service
+        region_name (String): Only drop objects for this region
+    Return:
+        invalidated_count (Int): Number of Clients (and Resources of the
+            calling thread) dropped
+    """
+
+    global _resource_generation
+
+    def matches(pool_key):
+        pool_service_name, _, pool_region_name = pool_key[:3]
+        if service_name and pool_service_name != service_name:
+            return False
+        if region_name and pool_region_name != region_name:
+            return False
+        return True
+
+    with _pool_lock:
+        invalidated_count = _clients.invalidate_where(matches)
+        invalidated_count += _get_thread_resources().invalidate_where(matches)
+        _resource_generation += 1
+        if not service_name and not region_name:
+            _sessions.clear()
+
+    logging.info(
+        f"Invalidated {invalidated_count} Pooled Resources/Clients "
+        f"(service={service_name}, region={region_name})"
+    )
+
+    return invalidated_count
+
+
+###
+# Helper Functions
+###
+
+
+def _get_pooled_object(kind, service_name, region_name, access_key, secret_key):
+    """
+    Purpose:
+        Return a cached Resource or Client, creating it on first use
+    Args:
+        kind (String): "resource" or "client"
+        service_name (String): Name of the AWS service
+        region_name (String): Name of region to connect to
+        access_key (String): access key to use to connect to AWS
+        secret_key (String): secret key to use to connect to AWS
+    Return:
+        pooled_object (Boto3 Resource/Client Object): Resource or Client
+    """
+
+    if not (access_key and secret_key):
+        access_key, secret_key = None, None
+
+    pool_key = (
+        service_name,
+        kind,
+        region_name,
+        access_key,
+        _get_secret_fingerprint(secret_key),
+    )
+
+    def create_pooled_object():
+        logging.info(f"Creating Boto3 {kind} for {service_name} (region={region_name})")
+        session = get_session(
+            region_name=region_name, access_key=access_key, secret_key=secret_key
+        )
+        config = _build_config()
+        if kind == "resource":
+            return session.resource(service_name, config=config)
+        return session.client(service_name, config=config)
+
+    # Boto3 Sessions are not thread-safe, so creation is serialized by the
+    # pool lock. Clients are then shared across threads, Resources are not
+    with _pool_lock:
+        if kind == "resource":
+            return _get_thread_resources().get_or_set(pool_key, create_pooled_object)
+        return _clients.get_or_set(pool_key, create_pooled_object)
+
+
+def _get_thread_resources():
+    """
+    Purpose:
+        Return the Resource cache of the calling thread, replacing it if the
+        pool was reconfigured or invalidated since it was created
+    Args:
+        N/A
+    Return:
+        thread_resources (LRUCache Object): Resource cache of the thread
+    """
+
+    with _pool_lock:
+        if getattr(_thread_state, "generation", None) != _resource_generation:
+            _thread_state.resources = LRUCache(max_size=_pool_settings["max_size"])
+            _thread_state.generation = _resource_generation
+
+        return _thread_state.resources
+
+
+def _build_config():
+    """
+    Purpose:
+        Build the botocore Config for new Resources and Clients from the
+        pool's settings
+    Args:
+        N/A
+    Return:
+        config (botocore Config Object): Config for the connection pool
+    """
+
+    config_args = {
+        "max_pool_connections": _pool_settings["max_pool_connections"],
+        "tcp_keepalive": _pool_settings["tcp_keepalive"],
+    }
+    if _pool_settings["connect_timeout"] is not None:
+        config_args["connect_timeout"] = _pool_settings["connect_timeout"]
+    if _pool_settings["read_timeout"] is not None:
+        config_args["read_timeout"] = _pool_settings["read_timeout"]
+
+    retries = {}
+    if _pool_settings["max_attempts"] is not None:
+        retries["max_attempts"] = _pool_settings["max_attempts"]
+    if _pool_settings["retry_mode"] is not None:
+        retries["mode"] = _pool_settings["retry_mode"]
+    if retries:
+        config_args["retries"] = retries
+
+    return Config(**config_args)
+
+
+def _get_secret_fingerprint(secret_key):
+    """
+    Purpose:
+        Return a fingerprint of a secret key so the raw secret is not used as
+        part of a cache key
+    Args:
+        secret_key (String): secret key to fingerprint
+    Return:
+        fingerprint (String): SHA-256 hex digest of the secret (or None)
+    """
+
+    if not secret_key:
+        return None
+
+    return hashlib.sha256(secret_key.encode("utf-8")).hexdigest()
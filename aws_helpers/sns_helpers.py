@@ -7,10 +7,17 @@
 """
 
 # Python Library Imports
+import functools
 import logging
+import threading
+import time
 import boto3
 from botocore.exceptions import ClientError, NoCredentialsError, BotoCoreError
 
+# Local Library Imports
+from aws_helpers import message_batch_helpers, session_helpers
+from aws_helpers.cache_helpers import LRUCache
+
 ###
 # Manage SNS Resource Functions
 ###
@@ -19,7 +26,9 @@ from botocore.exceptions import ClientError, NoCredentialsError, BotoCoreError
 def create_sns_resource(region_name=None, access_key=None, secret_key=None):
     """
     Purpose:
-        Return a SNS resource object.
+        Return a SNS resource object. Resources are cached in the shared
+        resource pool (see session_helpers) so repeated calls reuse the same
+        warm connection pool
     Args:
         region_name (String): Name of region to connect to
         access_key (String): access key to use to connect to SNS Resource
@@ -30,22 +39,12 @@ def create_sns_resource(region_name=None, access_key=None, secret_key=None):
 
     sns = None
     try:
-        if region_name:
-            if access_key and secret_key:
-                session = boto3.Session(
-                    aws_access_key_id=access_key, aws_secret_access_key=secret_key
-                )
-                sns = session.resource("sns", region_name)
-            else:
-                sns = boto3.resource("sns", region_name)
-        else:
-            if access_key and secret_key:
-                session = boto3.Session(
-                    aws_access_key_id=access_key, aws_secret_access_key=secret_key
-                )
-                sns = session.resource("sns")
-            else:
-                sns = boto3.resource("sns")
+        sns = session_helpers.get_resource(
+            "sns",
+            region_name=region_name,
+            access_key=access_key,
+            secret_key=secret_key,
+        )
     except NoCredentialsError as err:
         logging.exception("No Credentials Found for AWS")
         raise
@@ -53,6 +52,20 @@ def create_sns_resource(region_name=None, access_key=None, secret_key=None):
     return sns
 
 
+###
+# Topic Management Constants
+###
+
+
+TOPIC_ARN_TTL = 300
+# Min seconds between full reloads triggered by a name missing from the cache
+TOPIC_ARN_MISS_INTERVAL = 10
+
+_topic_arns = LRUCache(max_size=32)
+_topic_arn_refreshes = set()
+_topic_arn_refresh_lock = threading.Lock()
+
+
 ###
 # Topic Management Function
 ###
@@ -77,6 +90,194 @@ def get_topic(sns, topic_arn):
         raise
 
 
+def get_topic_arn(sns, topic_name, ttl=TOPIC_ARN_TTL):
+    """
+    Purpose:
+        Return the ARN of an SNS Topic by Topic Name. Every page of
+        ListTopics is read once and the name to ARN mapping is cached per
+        region, endpoint, and access key (so clients of different accounts
+        do not share a mapping); after ttl seconds the stale mapping keeps
+        being served while it is refreshed in the background
+    Args:
+        sns (SNS Resource Object): SNS Object owning the Topic
+        topic_name (String): Name of the Topic
+        ttl (Int): Seconds before the cached mapping is refreshed
+    Return:
+        topic_arn (String): ARN of the Topic
+    """
+
+    client = sns.meta.client
+    cache_key = _get_topic_arns_key(client)
+
+    try:
+        topic_arns = _topic_arns.get(cache_key)
+        if topic_arns is None:
+            # Loaded outside the cache lock so a slow ListTopics does not
+            # block lookups of other mappings
+            topic_arns = _list_topic_arns(client)
+            _topic_arns.set(cache_key, topic_arns)
+        cache_age = time.monotonic() - topic_arns["loaded_at"]
+
+        topic_arn = topic_arns["arns"].get(topic_name)
+        if topic_arn is None and cache_age > TOPIC_ARN_MISS_INTERVAL:
+            # The topic may have been created since the mapping was loaded
+            topic_arns = _list_topic_arns(client)
+            _topic_arns.set(cache_key, topic_arns)
+            topic_arn = topic_arns["arns"].get(topic_name)
+        elif cache_age > ttl:
+            _refresh_topic_arns(client, cache_key)
+    except Exception as err:
+        logging.exception(f"Exception Getting Topic ARN: {err}")
+        raise
+
+    if topic_arn is None:
+        raise Exception(f"Topic {topic_name} Not Found")
+
+    return topic_arn
+
+
+def get_topic_by_name(sns, topic_name, ttl=TOPIC_ARN_TTL):
+    """
+    Purpose:
+        Return an SNS Topic by Topic Name (see get_topic_arn)
+    Args:
+        sns (SNS Resource Object): SNS Object owning the Topic
+        topic_name (String): Name of the Topic
+        ttl (Int): Seconds before the cached name to ARN mapping is refreshed
+    Return:
+        topic (SNS Topic Object): Topic object for the topic in
+            SNS
+    """
+
+    return get_topic(sns, get_topic_arn(sns, topic_name, ttl=ttl))
+
+
+def invalidate_topic_arns():
+    """
+    Purpose:
+        Clear the cached Topic Name to ARN mappings (e.g. after deleting
+        topics)
+    Args:
+        N/A
+    Return:
+        N/A
+    """
+
+    _topic_arns.clear()
+
+
+###
+# Publish Constants
+###
+
+
+MAX_BATCH_ENTRIES = message_batch_helpers.MAX_BATCH_ENTRIES
+MAX_BATCH_BYTES = message_batch_helpers.MAX_BATCH_BYTES
+
+
+###
+# Publish Functions
+###
+
+
+def publish_message(
+    topic,
+    msg,
+    subject=None,
+    message_attributes=None,
+    message_group_id=None,
+    message_deduplication_id=None,
+):
+    """
+    Purpose:
+        Publish a single Message to an SNS Topic
+    Args:
+        topic (SNS Topic Object): Topic object for the topic in
+            SNS
+        msg (String): Message body
+        subject (String): Subject of the message (email subscriptions)
+        message_attributes (Dict): SNS MessageAttributes of the message
+        message_group_id (String): Message group (FIFO topics)
+        message_deduplication_id (String): Deduplication Id (FIFO topics)
+    Return:
+        message_id (String): Id of the published message
+    """
+
+    publish_args = {"Message": msg}
+    if subject:
+        publish_args["Subject"] = subject
+    if message_attributes:
+        publish_args["MessageAttributes"] = message_attributes
+    if message_group_id:
+        publish_args["MessageGroupId"] = message_group_id
+    if message_deduplication_id:
+        publish_args["MessageDeduplicationId"] = message_deduplication_id
+
+    try:
+        return topic.publish(**publish_args)["MessageId"]
+    except Exception as err:
+        logging.exception(f"Exception Publishing Message: {err}")
+        raise
+
+
+def publish_messages(topic, msgs, max_workers=4, max_retries=3):
+    """
+    Purpose:
+        Publish Messages to an SNS Topic with PublishBatch. Messages are
+        packed into batches of up to 10 entries and 256 KB of payload, the
+        batches are published concurrently, and only the entries that failed
+        are retried (with backoff, as are throttled requests)
+    Args:
+        topic (SNS Topic Object): Topic object for the topic in
+            SNS
+        msgs (Iterable of Strings/Dicts): Messages to publish. Each is either
+            a message body or a Dict of PublishBatch entry fields (Message,
+            Subject, MessageAttributes, MessageStructure, MessageGroupId,
+            MessageDeduplicationId) without an Id
+        max_workers (Int): Max batches to publish at once
+        max_retries (Int): Max times to retry the failed entries of a batch
+    Return:
+        publish_summary (Dict): Dict with the number of messages published,
+            the entries that failed (with TopicArn, Code, and ErrorMessage of
+            the failure), and elapsed_seconds
+    """
+
+    return _publish_to_topics(
+        topic.meta.client,
+        [topic.arn],
+        msgs,
+        max_workers=max_workers,
+        max_retries=max_retries,
+    )
+
+
+def publish_to_topics(sns, topic_arns, msgs, max_workers=16, max_retries=3):
+    """
+    Purpose:
+        Publish the same Messages to many SNS Topics (fan-out) with
+        PublishBatch, publishing the batches of every topic concurrently
+    Args:
+        sns (SNS Resource Object): SNS Object owning the Topics
+        topic_arns (List of Strings): ARNs of the Topics
+        msgs (Iterable of Strings/Dicts): Messages to publish to every Topic
+            (see publish_messages)
+        max_workers (Int): Max batches to publish at once
+        max_retries (Int): Max times to retry the failed entries of a batch
+    Return:
+        publish_summary (Dict): Dict with the number of messages published,
+            the entries that failed (with TopicArn, Code, and ErrorMessage of
+            the failure), and elapsed_seconds
+    """
+
+    return _publish_to_topics(
+        sns.meta.client,
+        topic_arns,
+        msgs,
+        max_workers=max_workers,
+        max_retries=max_retries,
+    )
+
+
 ###
 # Email Topic Functions
 ###
@@ -100,3 +301,145 @@ def send_email_notification(topic, email_subject, email_msg):
     except Exception as err:
         logging.exception(f"Exception Publising Email Notification: {err}")
         raise
+
+
+###
+# Helper Functions
+###
+
+
+def _publish_to_topics(client, topic_arns, msgs, max_workers, max_retries):
+    """
+    Purpose:
+        Publish Messages to SNS Topics with PublishBatch, publishing the
+        batches of every topic concurrently
+    Args:
+        client (SNS Client Object): SNS Client Object
+        topic_arns (List of Strings): ARNs of the Topics
+        msgs (Iterable of Strings/Dicts): Messages to publish to every Topic
+        max_workers (Int): Max batches to publish at once
+        max_retries (Int): Max times to retry the failed entries of a batch
+    Return:
+        publish_summary (Dict): Dict with the number of messages published,
+            the entries that failed, and elapsed_seconds
+    """
+
+    start_time = time.monotonic()
+    failed = []
+
+    def publish_batch(topic_arn, batch):
+        return message_batch_helpers.send_batch(
+            lambda entries: client.publish_batch(
+                TopicArn=topic_arn, PublishBatchRequestEntries=entries
+            ),
+            batch,
+            max_retries,
+            error_field="ErrorMessage",
+            failure_fields={"TopicArn": topic_arn},
+        )
+
+    try:
+        oversized = []
+        batches = list(
+            message_batch_helpers.pack_message_batches(
+                msgs, oversized, body_field="Message", error_field="ErrorMessage"
+            )
+        )
+        # Every topic misses the messages too large to publish
+        for topic_arn in topic_arns:
+            failed.extend(dict(entry, TopicArn=topic_arn) for entry in oversized)
+
+        published_count, publish_failed = message_batch_helpers.send_batches(
+            (
+                functools.partial(publish_batch, topic_arn, batch)
+                for topic_arn in topic_arns
+                for batch in batches
+            ),
+            max_workers,
+        )
+        failed.extend(publish_failed)
+    except Exception as err:
+        logging.exception(f"Exception Publishing Messages: {err}")
+        raise
+
+    elapsed_seconds = time.monotonic() - start_time
+    logging.info(
+        f"Published {published_count} Messages to {len(topic_arns)} Topics "
+        f"({len(failed)} failed) in {elapsed_seconds:.2f}s"
+    )
+
+    return {
+        "published": published_count,
+        "failed": failed,
+        "elapsed_seconds": elapsed_seconds,
+    }
+
+
+def _get_topic_arns_key(client):
+    """
+    Purpose:
+        Return the key a client's Topic Name to ARN mapping is cached under.
+        Topic names are only unique per account, so the access key the
+        client signs with is part of the key (as in the session cache)
+    Args:
+        client (SNS Client Object): SNS Client Object
+    Return:
+        cache_key (Tuple): Region, endpoint, and access key of the client
+    """
+
+    credentials = client._get_credentials()
+    access_key = credentials.access_key if credentials else None
+
+    return (client.meta.region_name, client.meta.endpoint_url, access_key)
+
+
+def _list_topic_arns(client):
+    """
+    Purpose:
+        Page through ListTopics and map every Topic Name to its ARN
+    Args:
+        client (SNS Client Object): SNS Client Object
+    Return:
+        topic_arns (Dict): Dict with arns (Topic Names to ARNs) and loaded_at
+            (time.monotonic() of the load)
+    """
+
+    start_time = time.monotonic()
+    arns = {}
+    for page in client.get_paginator("list_topics").paginate():
+        for topic in page.get("Topics", []):
+            arns[topic["TopicArn"].split(":")[-1]] = topic["TopicArn"]
+    logging.info(
+        f"Loaded {len(arns)} Topic ARNs in {time.monotonic() - start_time:.2f}s"
+    )
+
+    return {"arns": arns, "loaded_at": time.monotonic()}
+
+
+def _refresh_topic_arns(client, cache_key):
+    """
+    Purpose:
+        Reload a cached Topic Name to ARN mapping in a background thread,
+        unless a refresh of it is already running
+    Args:
+        client (SNS Client Object): SNS Client Object
+        cache_key (Tuple): Region, endpoint, and access key of the mapping
+    Return:
+        N/A
+    """
+
+    with _topic_arn_refresh_lock:
+        if cache_key in _topic_arn_refreshes:
+            return
+        _topic_arn_refreshes.add(cache_key)
+
+    def refresh():
+        try:
+            _topic_arns.set(cache_key, _list_topic_arns(client))
+        except Exception as err:
+            logging.exception(f"Exception Refreshing Topic ARNs: {err}")
+        finally:
+            with _topic_arn_refresh_lock:
+                _topic_arn_refreshes.discard(cache_key)
+
+    threading.Thread(target=refresh, name="sns-topic-arn-refresh", daemon=True).start()
@@ -0,0 +1,509 @@
+#!/usr/bin/env python3
+"""
+    Purpose:
+        Async SQS Consumer Class. Will provide asyncio-native
+        functionality to consume from SQS Queues in AWS. Blocking Boto3
+        calls run in a dedicated thread pool so long polls never stall the
+        event loop
+    Examples of Create Object of Class:
+        async with AsyncSQSConsumer(queue) as consumer:
+            async for msg in consumer:
+                await consumer.ack(msg)
+"""
+
+# Python Library Imports
+import asyncio
+import functools
+import logging
+import signal
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+# Local Library Imports
+from aws_helpers import sqs_helpers
+
+###
+# Consumer Constants
+###
+
+
+_STOP = object()
+
+
+class AsyncSQSConsumer(object):
+    """
+        AsyncSQSConsumer Class
+    """
+
+    ###
+    # Class Lifecycle Methods
+    ###
+
+    def __init__(
+        self,
+        queue,
+        num_pollers=1,
+        max_msgs=10,
+        wait_time=20,
+        attr_names=["All"],
+        max_buffered_msgs=100,
+        ack_interval=1.0,
+        delete_messages=None,
+    ):
+        """
+        Purpose:
+            Initilize the AsyncSQSConsumer Class. Poller tasks long-poll the
+            queue (in a thread pool) into a bounded buffer that is consumed
+            with "async for". Acknowledged messages are deleted in batches
+            of 10
+        Args:
+            queue (SQS Queue Object): Queue object for the queue in
+                SQS
+            num_pollers (Int): Number of concurrent long polls
+            max_msgs (Int): Max messages to pull per poll (max 10)
+            wait_time (Int): Seconds to long-poll for messages (max 20). Stopping
+                the consumer can take up to this long
+            attr_names (List of Strings): Message attributes to pull
+            max_buffered_msgs (Int): Max polled messages waiting to be consumed.
+                Pollers wait when the buffer is full
+            ack_interval (Float): Max seconds an acknowledged message waits to
+                be deleted with a partial batch
+            delete_messages (Function): Function taking the queue and a List
+                of handled messages, deleting them, and returning the ones
+                that failed. Defaults to sqs_helpers.delete_messages (pass
+                extended_payload_helpers.delete_messages with functools.partial
+                to also delete offloaded bodies)
+        """
+
+        self.queue = queue
+        self.num_pollers = num_pollers
+        self.max_msgs = max_msgs
+        self.wait_time = wait_time
+        self.attr_names = attr_names
+        self.max_buffered_msgs = max_buffered_msgs
+        self.ack_interval = ack_interval
+        self.delete_messages = delete_messages or sqs_helpers.delete_messages
+
+        self._executor = None
+        self._msgs = None
+        self._stop_event = None
+        self._pollers = []
+        self._active_pollers = 0
+        self._acker = None
+        self._pending_acks = []
+        self._running = False
+
+        self._start_time = time.monotonic()
+        self._stats = self._new_stats()
+
+    async def __aenter__(self):
+        await self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.stop()
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        """
+        Purpose:
+            Return the next polled message, waiting for one if the buffer is
+            empty. Iteration ends once the consumer is stopped and the buffer
+            is drained
+        Args:
+            N/A
+        Return:
+            msg (SQS Message Object): Next message
+        """
+
+        if self._msgs is None:
+            raise StopAsyncIteration
+
+        msg = await self._msgs.get()
+        if msg is _STOP:
+            # Leave the marker for any other iterators
+            self._msgs.put_nowait(_STOP)
+            raise StopAsyncIteration
+
+        return msg
+
+    ###
+    # Consumer Control Methods
+    ###
+
+    async def start(self):
+        """
+        Purpose:
+            Start the poller and acknowledgement tasks
+        Args:
+            N/A
+        Return:
+            N/A
+        """
+
+        if self._running:
+            raise Exception("AsyncSQSConsumer is already running")
+        logging.info(f"Starting AsyncSQSConsumer ({self.num_pollers} pollers)")
+
+        # Long polls hold a thread each, so acks get their own threads
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.num_pollers + 2, thread_name_prefix="async-sqs-consumer"
+        )
+        self._msgs = asyncio.Queue(maxsize=self.max_buffered_msgs)
+        self._stop_event = asyncio.Event()
+        self._pending_acks = []
+        self._running = True
+        self._start_time = time.monotonic()
+        self._stats = self._new_stats()
+
+        self._active_pollers = self.num_pollers
+        self._pollers = [
+            asyncio.ensure_future(self._poll_loop()) for _ in range(self.num_pollers)
+        ]
+        self._acker = asyncio.ensure_future(self._ack_loop())
+
+    def request_stop(self):
+        """
+        Purpose:
+            Ask the consumer to stop polling without waiting for it (safe to
+            call from signal handlers and handlers)
+        Args:
+            N/A
+        Return:
+            N/A
+        """
+
+        if self._stop_event:
+            self._stop_event.set()
+
+    async def stop(self):
+        """
+        Purpose:
+            Gracefully stop the consumer. Polling stops (after the current
+            long polls return, without waiting for room in a full buffer),
+            iteration ends once the buffer is drained, and pending
+            acknowledgements are flushed. Messages acknowledged after
+            stopping are deleted immediately
+        Args:
+            N/A
+        Return:
+            N/A
+        """
+
+        if not self._running:
+            return
+        logging.info("Stopping AsyncSQSConsumer")
+
+        self.request_stop()
+        await asyncio.gather(*self._pollers)
+
+        self._acker.cancel()
+        try:
+            await self._acker
+        except asyncio.CancelledError:
+            pass
+        await self._flush_acks()
+
+        self._running = False
+        self._executor.shutdown(wait=False)
+        logging.info(f"Stopped AsyncSQSConsumer: {self.get_stats()}")
+
+    async def ack(self, msg):
+        """
+        Purpose:
+            Acknowledge a handled message so it is deleted from the queue in
+            the next batch
+        Args:
+            msg (SQS Message Object): Handled message
+        Return:
+            N/A
+        """
+
+        self._pending_acks.append(msg)
+        if len(self._pending_acks) >= 10 or not self._running:
+            await self._flush_acks()
+
+    async def consume(self, handler, max_concurrency=100):
+        """
+        Purpose:
+            Run an async handler on every message until the consumer is
+            stopped, with at most max_concurrency handlers running at once.
+            Messages are acknowledged when their handler does not raise
+        Args:
+            handler (Coroutine Function): Async function taking a single SQS
+                Message Object
+            max_concurrency (Int): Max handlers running at once
+        Return:
+            N/A
+        """
+
+        semaphore = asyncio.Semaphore(max_concurrency)
+        handler_tasks = set()
+
+        async for msg in self:
+            await semaphore.acquire()
+            handler_task = asyncio.ensure_future(self._handle(handler, msg, semaphore))
+            handler_tasks.add(handler_task)
+            handler_task.add_done_callback(handler_tasks.discard)
+
+        if handler_tasks:
+            await asyncio.gather(*handler_tasks)
+
+    async def run(self, handler, max_concurrency=100, install_signal_handlers=True):
+        """
+        Purpose:
+            Start the consumer, run the handler on every message until
+            SIGINT/SIGTERM (or request_stop), and stop gracefully
+        Args:
+            handler (Coroutine Function): Async function taking a single SQS
+                Message Object
+            max_concurrency (Int): Max handlers running at once
+            install_signal_handlers (Boolean): Whether or not to handle SIGINT
+                and SIGTERM on the event loop (Unix only)
+        Return:
+            N/A
+        """
+
+        loop = asyncio.get_event_loop()
+        signal_numbers = []
+        if install_signal_handlers:
+            for signal_number in (signal.SIGINT, signal.SIGTERM):
+                try:
+                    loop.add_signal_handler(signal_number, self.request_stop)
+                    signal_numbers.append(signal_number)
+                except (NotImplementedError, RuntimeError):
+                    logging.warning(f"Cannot Handle Signal {signal_number} on Loop")
+
+        try:
+            await self.start()
+            await self.consume(handler, max_concurrency=max_concurrency)
+        finally:
+            await self.stop()
+            for signal_number in signal_numbers:
+                loop.remove_signal_handler(signal_number)
+
+    ###
+    # Stats Methods
+    ###
+
+    def get_stats(self):
+        """
+        Purpose:
+            Return the throughput, handler latency, and in-flight counts of
+            the consumer
+        Args:
+            N/A
+        Return:
+            stats (Dict): Dict with received, handled, failed, deleted,
+                delete_failed, in_flight (handlers running in consume),
+                buffered, pending_acks, msgs_per_second (handled),
+                avg_handler_seconds, max_handler_seconds, and uptime_seconds
+        """
+
+        stats = dict(self._stats)
+        uptime_seconds = time.monotonic() - self._start_time
+        finished = stats["handled"] + stats["failed"]
+        handler_seconds = stats.pop("total_handler_seconds")
+
+        stats["buffered"] = self._msgs.qsize() if self._msgs else 0
+        stats["pending_acks"] = len(self._pending_acks)
+        stats["uptime_seconds"] = uptime_seconds
+        stats["msgs_per_second"] = (
+            stats["handled"] / uptime_seconds if uptime_seconds > 0 else 0.0
+        )
+        stats["avg_handler_seconds"] = handler_seconds / finished if finished else 0.0
+
+        return stats
+
+    ###
+    # Task Loop Methods
+    ###
+
+    async def _poll_loop(self):
+        """
+        Purpose:
+            Long-poll the queue and buffer the messages until the consumer is
+            stopped. The last poller to exit ends iteration
+        Args:
+            N/A
+        Return:
+            N/A
+        """
+
+        try:
+            while not self._stop_event.is_set():
+                try:
+                    msgs = await self._run_blocking(
+                        sqs_helpers.get_messages,
+                        self.queue,
+                        max_msgs=self.max_msgs,
+                        wait_time=self.wait_time,
+                        attr_names=self.attr_names,
+                    )
+                except Exception:
+                    # get_messages logs the exception; back off before polling
+                    await asyncio.sleep(1.0)
+                    continue
+
+                self._stats["received"] += len(msgs)
+                for msg in msgs:
+                    if not await self._buffer_msg(msg):
+                        # Unbuffered messages reappear after their visibility
+                        # timeout
+                        break
+        finally:
+            self._active_pollers -= 1
+            if not self._active_pollers:
+                # Do not block stop() on a full buffer nobody is consuming
+                try:
+                    self._msgs.put_nowait(_STOP)
+                except asyncio.QueueFull:
+                    asyncio.ensure_future(self._msgs.put(_STOP))
+
+    async def _ack_loop(self):
+        """
+        Purpose:
+            Flush partial acknowledgement batches every ack_interval seconds
+        Args:
+            N/A
+        Return:
+            N/A
+        """
+
+        while True:
+            await asyncio.sleep(self.ack_interval)
+            await self._flush_acks()
+
+    ###
+    # Helper Methods
+    ###
+
+    async def _handle(self, handler, msg, semaphore):
+        """
+        Purpose:
+            Run the handler on a message and acknowledge it on success
+        Args:
+            handler (Coroutine Function): Async function taking the message
+            msg (SQS Message Object): Message to handle
+            semaphore (Semaphore Object): Semaphore to release when done
+        Return:
+            N/A
+        """
+
+        self._stats["in_flight"] += 1
+        start_time = time.monotonic()
+        try:
+            await handler(msg)
+            succeeded = True
+        except Exception as err:
+            logging.exception(f"Exception Handling Message {msg.message_id}: {err}")
+            succeeded = False
+        finally:
+            handler_seconds = time.monotonic() - start_time
+            self._stats["in_flight"] -= 1
+            self._stats["total_handler_seconds"] += handler_seconds
+            self._stats["max_handler_seconds"] = max(
+                self._stats["max_handler_seconds"], handler_seconds
+            )
+            semaphore.release()
+
+        self._stats["handled" if succeeded else "failed"] += 1
+        if succeeded:
+            await self.ack(msg)
+
+    async def _buffer_msg(self, msg):
+        """
+        Purpose:
+            Put a polled message in the buffer, waiting for room unless the
+            consumer is stopped first (so stop() never waits on a full buffer)
+        Args:
+            msg (SQS Message Object): Polled message
+        Return:
+            buffered (Boolean): Whether or not the message was buffered
+        """
+
+        try:
+            self._msgs.put_nowait(msg)
+            return True
+        except asyncio.QueueFull:
+            pass
+
+        put_task = asyncio.ensure_future(self._msgs.put(msg))
+        stop_task = asyncio.ensure_future(self._stop_event.wait())
+        done, pending = await asyncio.wait(
+            {put_task, stop_task}, return_when=asyncio.FIRST_COMPLETED
+        )
+        for task in pending:
+            task.cancel()
+
+        return put_task in done
+
+    async def _flush_acks(self):
+        """
+        Purpose:
+            Delete the pending acknowledged messages in batches of 10
+        Args:
+            N/A
+        Return:
+            N/A
+        """
+
+        if not self._pending_acks:
+            return
+
+        msgs = self._pending_acks
+        self._pending_acks = []
+        try:
+            failed_msgs = await self._run_blocking(
+                self.delete_messages, self.queue, msgs
+            )
+        except Exception:
+            failed_msgs = msgs
+
+        self._stats["deleted"] += len(msgs) - len(failed_msgs)
+        self._stats["delete_failed"] += len(failed_msgs)
+
+    async def _run_blocking(self, function, *args, **kwargs):
+        """
+        Purpose:
+            Run a blocking function in the consumer's thread pool
+        Args:
+            function (Function): Blocking function to run
+            args (List): Positional args for the function
+            kwargs (Dict): Keyword args for the function
+        Return:
+            result (Any): Return value of the function
+        """
+
+        loop = asyncio.get_event_loop()
+        executor = self._executor
+        if executor is None or not self._running:
+            executor = None
+
+        return await loop.run_in_executor(
+            executor, functools.partial(function, *args, **kwargs)
+        )
+
+    @staticmethod
+    def _new_stats():
+        """
+        Purpose:
+            Return zeroed counters for the consumer
+        Args:
+            N/A
+        Return:
+            stats (Dict): Counters of the consumer
+        """
+
+        return {
+            "received": 0,
+            "handled": 0,
+            "failed": 0,
+            "deleted": 0,
+            "delete_failed": 0,
+            "in_flight": 0,
+            "total_handler_seconds": 0.0,
+            "max_handler_seconds": 0.0,
+        }
@@ -4,13 +4,30 @@
         SQS Consumer Class. Will provide functionality to
         consume from SQS Queues in AWS
     Examples of Create Object of Class:
-        sqs_consumer_obj = SQSConsumer()
+        sqs_consumer_obj = SQSConsumer(queue, handler)
+        sqs_consumer_obj.run()
 """
 
 # Python Library Imports
 import logging
+import queue as queue_lib
+import signal
+import threading
+import time
 import wrapt
 
+# Local Library Imports
+from aws_helpers import sqs_helpers
+from aws_helpers.sqs_poller_scaler import SQSPollerScaler
+from aws_helpers.sqs_visibility_heartbeat import VisibilityHeartbeat
+
+###
+# Consumer Constants
+###
+
+
+_STOP = object()
+
 
 class SQSConsumer(object):
     """
@@ -21,15 +38,103 @@ class SQSConsumer(object):
     # Class Lifecycle Methods
     ###
 
-    def __init__(self):
+    def __init__(
+        self,
+        queue,
+        handler,
+        num_pollers=1,
+        num_workers=10,
+        max_msgs=10,
+        wait_time=20,
+        attr_names=["All"],
+        max_buffered_msgs=None,
+        ack_interval=1.0,
+        extend_visibility=False,
+        visibility_timeout=None,
+        min_pollers=None,
+        max_pollers=None,
+        scale_interval=30.0,
+        delete_messages=None,
+    ):
         """
         Purpose:
-            Initilize the SQSConsumer Class.
+            Initilize the SQSConsumer Class. Poller threads long-poll the
+            queue and hand messages to a bounded buffer, handler workers
+            process them, and successfully handled messages are deleted in
+            batches of 10. Messages whose handler raises are left on the
+            queue to be redelivered after their visibility timeout
         Args:
-            N/A
+            queue (SQS Queue Object): Queue object for the queue in
+                SQS
+            handler (Function): Function taking a single SQS Message Object.
+                The message is deleted if the handler does not raise
+            num_pollers (Int): Number of threads polling the queue
+            num_workers (Int): Number of threads running the handler
+            max_msgs (Int): Max messages to pull per poll (max 10)
+            wait_time (Int): Seconds to long-poll for messages (max 20). Stopping
+                the consumer can take up to this long
+            attr_names (List of Strings): Message attributes to pull
+            max_buffered_msgs (Int): Max polled messages waiting for a worker.
+                Pollers block when the buffer is full. Defaults to num_workers
+            ack_interval (Float): Max seconds a handled message waits to be
+                deleted with a partial batch
+            extend_visibility (Boolean): Whether or not to run a
+                VisibilityHeartbeat that keeps extending the visibility of
+                buffered and in-flight messages until they are handled
+            visibility_timeout (Int): Visibility timeout (seconds) of received
+                messages. Defaults to the queue's VisibilityTimeout attribute
+            min_pollers (Int): Min number of pollers when scaling (defaults
+                to 1)
+            max_pollers (Int): Max number of pollers. When set, an
+                SQSPollerScaler adds or removes pollers every scale_interval
+                seconds, starting from num_pollers
+            scale_interval (Float): Seconds between scaling decisions
+            delete_messages (Function): Function taking the queue and a List
+                of handled messages, deleting them, and returning the ones
+                that failed. Defaults to sqs_helpers.delete_messages (pass
+                extended_payload_helpers.delete_messages with functools.partial
+                to also delete offloaded bodies)
         """
 
-        pass
+        self.queue = queue
+        self.handler = handler
+        self.num_pollers = num_pollers
+        self.num_workers = num_workers
+        self.max_msgs = max_msgs
+        self.wait_time = wait_time
+        self.attr_names = attr_names
+        self.ack_interval = ack_interval
+        self.extend_visibility = extend_visibility
+        self.visibility_timeout = visibility_timeout
+        self.scale_interval = scale_interval
+        self.delete_messages = delete_messages or sqs_helpers.delete_messages
+
+        self._scaler = None
+        if max_pollers:
+            self._scaler = SQSPollerScaler(
+                min_pollers=min_pollers or 1, max_pollers=max_pollers
+            )
+            self.num_pollers = max(
+                self._scaler.min_pollers, min(self._scaler.max_pollers, num_pollers)
+            )
+
+        self._msgs = queue_lib.Queue(maxsize=max_buffered_msgs or num_workers)
+        self._acks = queue_lib.Queue()
+        self._stop_polling = threading.Event()
+        self._stopped = threading.Event()
+        self._stopped.set()
+
+        self._pollers = []
+        self._poller_stops = []
+        self._retired_pollers = []
+        self._poller_count = 0
+        self._workers = []
+        self._acker = None
+        self._heartbeat = None
+        self._scaler_thread = None
+
+        self._stats_lock = threading.Lock()
+        self._reset_stats()
 
     def __del__(self):
         """
@@ -39,4 +144,456 @@ class SQSConsumer(object):
             N/A
         """
 
-        pass
+        self._stop_polling.set()
+
+    ###
+    # Consumer Control Methods
+    ###
+
+    def start(self):
+        """
+        Purpose:
+            Start the poller, worker, and acknowledgement threads
+        Args:
+            N/A
+        Return:
+            N/A
+        """
+
+        if not self._stopped.is_set():
+            raise Exception("SQSConsumer is already running")
+        logging.info(
+            f"Starting SQSConsumer ({self.num_pollers} pollers, "
+            f"{self.num_workers} workers)"
+        )
+
+        self._stop_polling.clear()
+        self._stopped.clear()
+        self._reset_stats()
+
+        if self.extend_visibility:
+            visibility_timeout = self.visibility_timeout or int(
+                self.queue.attributes["VisibilityTimeout"]
+            )
+            self._heartbeat = VisibilityHeartbeat(
+                self.queue, visibility_timeout=visibility_timeout
+            )
+            self._heartbeat.start()
+
+        self._acker = self._start_thread(self._ack_loop, "sqs-consumer-acker")
+        self._workers = [
+            self._start_thread(self._work_loop, f"sqs-consumer-worker-{index}")
+            for index in range(self.num_workers)
+        ]
+        self._pollers = []
+        self._poller_stops = []
+        self._retired_pollers = []
+        for _ in range(self.num_pollers):
+            self._add_poller()
+
+        if self._scaler:
+            self._scaler_thread = self._start_thread(
+                self._scale_loop, "sqs-consumer-scaler"
+            )
+
+    def stop(self):
+        """
+        Purpose:
+            Gracefully stop the consumer. Polling stops (after the current
+            long polls return), buffered and in-flight messages are handled,
+            and their acknowledgements are flushed
+        Args:
+            N/A
+        Return:
+            N/A
+        """
+
+        if self._stopped.is_set():
+            return
+        logging.info("Stopping SQSConsumer")
+
+        self._stop_polling.set()
+        if self._scaler_thread:
+            self._scaler_thread.join()
+            self._scaler_thread = None
+        for poller in self._pollers + self._retired_pollers:
+            poller.join()
+
+        for _ in self._workers:
+            self._msgs.put(_STOP)
+        for worker in self._workers:
+            worker.join()
+
+        self._acks.put(_STOP)
+        self._acker.join()
+
+        if self._heartbeat:
+            self._heartbeat.stop()
+            self._heartbeat = None
+
+        self._stopped.set()
+        logging.info(f"Stopped SQSConsumer: {self.get_stats()}")
+
+    def run(self, install_signal_handlers=True):
+        """
+        Purpose:
+            Start the consumer and block until it is stopped by SIGINT/SIGTERM
+            (or another thread calling request_stop), then stop gracefully
+        Args:
+            install_signal_handlers (Boolean): Whether or not to handle SIGINT
+                and SIGTERM (only possible from the main thread)
+        Return:
+            N/A
+        """
+
+        original_handlers = {}
+        if install_signal_handlers and (
+            threading.current_thread() is threading.main_thread()
+        ):
+            for signal_number in (signal.SIGINT, signal.SIGTERM):
+                original_handlers[signal_number] = signal.signal(
+                    signal_number, self._handle_signal
+                )
+
+        try:
+            self.start()
+            while not self._stop_polling.wait(timeout=1.0):
+                pass
+        finally:
+            self.stop()
+            for signal_number, original_handler in original_handlers.items():
+                signal.signal(signal_number, original_handler)
+
+    def request_stop(self):
+        """
+        Purpose:
+            Ask a running consumer to stop without waiting for it (safe to
+            call from signal handlers and handler threads)
+        Args:
+            N/A
+        Return:
+            N/A
+        """
+
+        self._stop_polling.set()
+
+    ###
+    # Stats Methods
+    ###
+
+    def get_stats(self):
+        """
+        Purpose:
+            Return the throughput, handler latency, and in-flight counts of
+            the consumer
+        Args:
+            N/A
+        Return:
+            stats (Dict): Dict with received, receives, empty_receives,
+                handled, failed, deleted, delete_failed, in_flight (being
+                handled), buffered (waiting for a worker), pollers,
+                msgs_per_second (handled), avg_handler_seconds,
+                max_handler_seconds, and uptime_seconds
+        """
+
+        with self._stats_lock:
+            stats = dict(self._stats)
+
+        uptime_seconds = time.monotonic() - self._start_time
+        finished = stats["handled"] + stats["failed"]
+        handler_seconds = stats.pop("total_handler_seconds")
+
+        stats["buffered"] = self._msgs.qsize()
+        stats["pollers"] = len(self._pollers)
+        stats["uptime_seconds"] = uptime_seconds
+        stats["msgs_per_second"] = (
+            stats["handled"] / uptime_seconds if uptime_seconds > 0 else 0.0
+        )
+        stats["avg_handler_seconds"] = handler_seconds / finished if finished else 0.0
+
+        return stats
+
+    ###
+    # Thread Loop Methods
+    ###
+
+    def _poll_loop(self, retire_event):
+        """
+        Purpose:
+            Long-poll the queue and buffer the messages for the workers until
+            the consumer is stopped or the poller is retired
+        Args:
+            retire_event (Event Object): Event set to retire this poller
+        Return:
+            N/A
+        """
+
+        while not (self._stop_polling.is_set() or retire_event.is_set()):
+            try:
+                msgs = sqs_helpers.get_messages(
+                    self.queue,
+                    max_msgs=self.max_msgs,
+                    wait_time=self.wait_time,
+                    attr_names=self.attr_names,
+                )
+            except Exception:
+                # get_messages logs the exception; back off before polling again
+                self._stop_polling.wait(timeout=1.0)
+                continue
+
+            self._increment_stats(
+                received=len(msgs), receives=1, empty_receives=int(not msgs)
+            )
+            if self._scaler:
+                self._scaler.record_poll(len(msgs))
+            for msg in msgs:
+                if self._heartbeat:
+                    self._heartbeat.track(msg)
+                self._msgs.put(msg)
+
+    def _work_loop(self):
+        """
+        Purpose:
+            Run the handler on buffered messages, queueing successes to be
+            deleted, until a stop marker is received
+        Args:
+            N/A
+        Return:
+            N/A
+        """
+
+        while True:
+            msg = self._msgs.get()
+            if msg is _STOP:
+                return
+
+            self._increment_stats(in_flight=1)
+            start_time = time.monotonic()
+            try:
+                self.handler(msg)
+                succeeded = True
+            except Exception as err:
+                logging.exception(f"Exception Handling Message {msg.message_id}: {err}")
+                succeeded = False
+            handler_seconds = time.monotonic() - start_time
+            if self._heartbeat:
+                self._heartbeat.release(msg)
+
+            with self._stats_lock:
+                self._stats["in_flight"] -= 1
+                self._stats["handled" if succeeded else "failed"] += 1
+                self._stats["total_handler_seconds"] += handler_seconds
+                self._stats["max_handler_seconds"] = max(
+                    self._stats["max_handler_seconds"], handler_seconds
+                )
+
+            if succeeded:
+                self._acks.put(msg)
+
+    def _ack_loop(self):
+        """
+        Purpose:
+            Delete handled messages in batches of 10, flushing partial batches
+            every ack_interval seconds, until a stop marker is received
+        Args:
+            N/A
+        Return:
+            N/A
+        """
+
+        pending_msgs = []
+        flush_time = time.monotonic() + self.ack_interval
+        while True:
+            try:
+                msg = self._acks.get(timeout=max(flush_time - time.monotonic(), 0))
+            except queue_lib.Empty:
+                msg = None
+
+            if msg is _STOP:
+                self._delete_msgs(pending_msgs)
+                return
+            if msg is not None:
+                pending_msgs.append(msg)
+
+            if len(pending_msgs) >= 10 or time.monotonic() >= flush_time:
+                self._delete_msgs(pending_msgs)
+                pending_msgs = []
+                flush_time = time.monotonic() + self.ack_interval
+
+    def _scale_loop(self):
+        """
+        Purpose:
+            Resize the pollers every scale_interval seconds until the consumer
+            is stopped
+        Args:
+            N/A
+        Return:
+            N/A
+        """
+
+        last_finished = 0
+        last_handler_seconds = 0.0
+        while not self._stop_polling.wait(timeout=self.scale_interval):
+            with self._stats_lock:
+                finished = self._stats["handled"] + self._stats["failed"]
+                handler_seconds = self._stats["total_handler_seconds"]
+            window_finished = finished - last_finished
+            avg_handler_seconds = (
+                (handler_seconds - last_handler_seconds) / window_finished
+                if window_finished
+                else None
+            )
+            last_finished, last_handler_seconds = finished, handler_seconds
+
+            try:
+                # Through the queue's (thread-safe) client, without reloading
+                # the queue the pollers use
+                queue_depth = sqs_helpers.get_queue_depth(self.queue)
+            except Exception:
+                # get_queue_depth logs the exception; keep the current pollers
+                continue
+
+            target_pollers = self._scaler.evaluate(
+                len(self._pollers),
+                queue_depth,
+                avg_handler_seconds=avg_handler_seconds,
+                num_workers=self.num_workers,
+            )
+            while len(self._pollers) < target_pollers:
+                self._add_poller()
+            while len(self._pollers) > target_pollers:
+                self._retire_poller()
+
+    ###
+    # Helper Methods
+    ###
+
+    def _add_poller(self):
+        """
+        Purpose:
+            Start another poller thread
+        Args:
+            N/A
+        Return:
+            N/A
+        """
+
+        retire_event = threading.Event()
+        poller = threading.Thread(
+            target=self._poll_loop,
+            args=(retire_event,),
+            name=f"sqs-consumer-poller-{self._poller_count}",
+            daemon=True,
+        )
+        poller.start()
+        self._poller_count += 1
+
+        self._pollers.append(poller)
+        self._poller_stops.append(retire_event)
+
+    def _retire_poller(self):
+        """
+        Purpose:
+            Stop the newest poller thread after its current long poll returns
+        Args:
+            N/A
+        Return:
+            N/A
+        """
+
+        self._poller_stops.pop().set()
+        self._retired_pollers = [
+            poller for poller in self._retired_pollers if poller.is_alive()
+        ] + [self._pollers.pop()]
+
+    def _delete_msgs(self, msgs):
+        """
+        Purpose:
+            Delete handled messages and record the results
+        Args:
+            msgs (List of SQS Message Objects): Messages to delete
+        Return:
+            N/A
+        """
+
+        if not msgs:
+            return
+
+        try:
+            failed_msgs = self.delete_messages(self.queue, msgs)
+        except Exception:
+            failed_msgs = msgs
+
+        self._increment_stats(
+            deleted=len(msgs) - len(failed_msgs), delete_failed=len(failed_msgs)
+        )
+
+    def _handle_signal(self, signal_number, frame):
+        """
+        Purpose:
+            Stop the consumer when a signal is received
+        Args:
+            signal_number (Int): Number of the signal
+            frame (Frame Object): Current stack frame
+        Return:
+            N/A
+        """
+
+        logging.info(f"Received Signal {signal_number}; Stopping SQSConsumer")
+        self.request_stop()
+
+    def _increment_stats(self, **increments):
+        """
+        Purpose:
+            Add to the consumer's counters
+        Args:
+            increments (Dict): Counter names and amounts to add
+        Return:
+            N/A
+        """
+
+        with self._stats_lock:
+            for stat, increment in increments.items():
+                self._stats[stat] += increment
+
+    def _reset_stats(self):
+        """
+        Purpose:
+            Reset the consumer's counters
+        Args:
+            N/A
+        Return:
+            N/A
+        """
+
+        with self._stats_lock:
+            self._start_time = time.monotonic()
+            self._stats = {
+                "received": 0,
+                "receives": 0,
+                "empty_receives": 0,
+                "handled": 0,
+                "failed": 0,
+                "deleted": 0,
+                "delete_failed": 0,
+                "in_flight": 0,
+                "total_handler_seconds": 0.0,
+                "max_handler_seconds": 0.0,
+            }
+
+    @staticmethod
+    def _start_thread(target, name):
+        """
+        Purpose:
+            Start a daemon thread
+        Args:
+            target (Function): Function for the thread to run
+            name (String): Name of the thread
+        Return:
+            thread (Thread Object): Started thread
+        """
+
+        thread = threading.Thread(target=target, name=name, daemon=True)
+        thread.start()
+
+        return thread
@@ -7,10 +7,15 @@
 """
 
 # Python Library Imports
+import functools
 import logging
+import time
 import boto3
 from botocore.exceptions import ClientError, NoCredentialsError, BotoCoreError
 
+# Local Library Imports
+from aws_helpers import message_batch_helpers, retry_helpers, session_helpers
+
 ###
 # Manage SQS Resource Functions
 ###
@@ -19,7 +24,9 @@ from botocore.exceptions import ClientError, NoCredentialsError, BotoCoreError
 def create_sqs_resource(region_name=None, access_key=None, secret_key=None):
     """
     Purpose:
-        Return a SQS resource object.
+        Return a SQS resource object. Resources are cached in the shared
+        resource pool (see session_helpers) so repeated calls reuse the same
+        warm connection pool
     Args:
         region_name (String): Name of region to connect to
         access_key (String): access key to use to connect to SQS Resource
@@ -30,22 +37,12 @@ def create_sqs_resource(region_name=None, access_key=None, secret_key=None):
 
     sqs = None
     try:
-        if region_name:
-            if access_key and secret_key:
-                session = boto3.Session(
-                    aws_access_key_id=access_key, aws_secret_access_key=secret_key
-                )
-                sqs = session.resource("sqs", region_name)
-            else:
-                sqs = boto3.resource("sqs", region_name)
-        else:
-            if access_key and secret_key:
-                session = boto3.Session(
-                    aws_access_key_id=access_key, aws_secret_access_key=secret_key
-                )
-                sqs = session.resource("sqs")
-            else:
-                sqs = boto3.resource("sqs")
+        sqs = session_helpers.get_resource(
+            "sqs",
+            region_name=region_name,
+            access_key=access_key,
+            secret_key=secret_key,
+        )
     except NoCredentialsError as err:
         logging.exception("No Credentials Found for AWS")
         raise
@@ -77,6 +74,41 @@ def get_queue(sqs, queue_name):
         raise
 
 
+def get_queue_depth(queue, sqs_client=None):
+    """
+    Purpose:
+        Return the approximate number of visible messages in an SQS Queue.
+        The Queue Object is not reloaded, so it is safe to call while other
+        threads use the queue
+    Args:
+        queue (SQS Queue Object): Queue object for the queue in
+            SQS
+        sqs_client (SQS Client Object): Client to call GetQueueAttributes
+            with. Defaults to the queue's own client
+    Return:
+        queue_depth (Int): ApproximateNumberOfMessages of the queue
+    """
+
+    sqs_client = sqs_client or queue.meta.client
+    try:
+        response = sqs_client.get_queue_attributes(
+            QueueUrl=queue.url, AttributeNames=["ApproximateNumberOfMessages"]
+        )
+        return int(response["Attributes"]["ApproximateNumberOfMessages"])
+    except Exception as err:
+        logging.exception(f"Exception Getting Queue Depth: {err}")
+        raise
+
+
+###
+# Message Management Constants
+###
+
+
+MAX_BATCH_ENTRIES = message_batch_helpers.MAX_BATCH_ENTRIES
+MAX_BATCH_BYTES = message_batch_helpers.MAX_BATCH_BYTES
+
+
 ###
 # Message Management Functions
 ###
@@ -93,13 +125,13 @@ def get_messages(queue, max_msgs=10, wait_time=20, attr_names=["All"]):
         wait_time (Int): Seconds to wait for a message if queues are empty
         attr_names (List of Strings): Filter for messages to pull (if applicable)
     Return:
-        messages ()
+        messages (List of SQS Message Objects): Messages pulled from the queue
     """
 
     try:
         return queue.receive_messages(
             MaxNumberOfMessages=max_msgs,
-            WaitTimeSeconds=max_msgs,
+            WaitTimeSeconds=wait_time,
             AttributeNames=attr_names,
         )
     except Exception as err:
@@ -122,3 +154,154 @@ def delete_message(msg):
     except Exception as err:
         logging.exception(f"Exception Deleting Messages: {err}")
         raise
+
+
+def delete_messages(queue, msgs, max_retries=3):
+    """
+    Purpose:
+        Delete Messages from an SQS Queue with DeleteMessageBatch (10 messages
+        per request), retrying only the entries that failed
+    Args:
+        queue (SQS Queue Object): Queue object for the queue in
+            SQS
+        msgs (List of SQS Message Objects): Messages to delete
+        max_retries (Int): Max times to retry the failed entries of a batch
+    Return:
+        failed_msgs (List of SQS Message Objects): Messages that could not be
+            deleted
+    """
+
+    failed_msgs = []
+    try:
+        for batch_start in range(0, len(msgs), 10):
+            batch = msgs[batch_start:batch_start + 10]
+            for attempt in range(max_retries + 1):
+                if attempt:
+                    retry_helpers.sleep_with_backoff(attempt - 1)
+                response = queue.delete_messages(
+                    Entries=[
+                        {"Id": str(index), "ReceiptHandle": msg.receipt_handle}
+                        for index, msg in enumerate(batch)
+                    ]
+                )
+                failures = response.get("Failed", [])
+                if not failures:
+                    break
+                logging.warning(
+                    f"{len(failures)} of {len(batch)} Messages Failed to Delete "
+                    f"(attempt {attempt + 1}): {failures[0].get('Code')}"
+                )
+                # Sender faults (e.g. an expired receipt handle) will not
+                # succeed on a retry
+                failed_msgs.extend(
+                    batch[int(failure["Id"])]
+                    for failure in failures
+                    if failure.get("SenderFault")
+                )
+                batch = [
+                    batch[int(failure["Id"])]
+                    for failure in failures
+                    if not failure.get("SenderFault")
+                ]
+                if not batch:
+                    break
+            else:
+                failed_msgs.extend(batch)
+    except Exception as err:
+        logging.exception(f"Exception Deleting Messages: {err}")
+        raise
+
+    return failed_msgs
+
+
+def change_messages_visibility(queue, msgs, visibility_timeout):
+    """
+    Purpose:
+        Change the visibility timeout of Messages in an SQS Queue with
+        ChangeMessageVisibilityBatch (10 messages per request)
+    Args:
+        queue (SQS Queue Object): Queue object for the queue in
+            SQS
+        msgs (List of SQS Message Objects): Messages to change
+        visibility_timeout (Int): Seconds from now until the messages become
+            visible again (0 makes them visible immediately)
+    Return:
+        failed_msgs (List of SQS Message Objects): Messages whose visibility
+            could not be changed (e.g. already deleted)
+    """
+
+    failed_msgs = []
+    try:
+        for batch_start in range(0, len(msgs), 10):
+            batch = msgs[batch_start:batch_start + 10]
+            response = queue.change_message_visibility_batch(
+                Entries=[
+                    {
+                        "Id": str(index),
+                        "ReceiptHandle": msg.receipt_handle,
+                        "VisibilityTimeout": visibility_timeout,
+                    }
+                    for index, msg in enumerate(batch)
+                ]
+            )
+            failed_msgs.extend(
+                batch[int(failure["Id"])] for failure in response.get("Failed", [])
+            )
+    except Exception as err:
+        logging.exception(f"Exception Changing Message Visibility: {err}")
+        raise
+
+    return failed_msgs
+
+
+def send_messages(queue, msgs, max_workers=4, max_retries=3):
+    """
+    Purpose:
+        Send Messages to an SQS Queue with SendMessageBatch. Messages are
+        packed into batches of up to 10 entries and 256 KB of payload, the
+        batches are sent concurrently, and only the entries that failed are
+        retried (with backoff, as are throttled requests)
+    Args:
+        queue (SQS Queue Object): Queue object for the queue in
+            SQS
+        msgs (Iterable of Strings/Dicts): Messages to send. Each is either a
+            message body or a Dict of SendMessageBatch entry fields
+            (MessageBody, MessageAttributes, DelaySeconds, MessageGroupId,
+            MessageDeduplicationId, etc.) without an Id
+        max_workers (Int): Max batches to send at once
+        max_retries (Int): Max times to retry the failed entries of a batch
+    Return:
+        send_summary (Dict): Dict with the number of messages sent, the
+            entries that failed (with Code and Message of the failure), and
+            elapsed_seconds
+    """
+
+    start_time = time.monotonic()
+    failed = []
+
+    def send_entries(entries):
+        return queue.send_messages(Entries=entries)
+
+    try:
+        sent_count, send_failed = message_batch_helpers.send_batches(
+            (
+                functools.partial(
+                    message_batch_helpers.send_batch, send_entries, batch, max_retries
+                )
+                for batch in message_batch_helpers.pack_message_batches(msgs, failed)
+            ),
+            max_workers,
+        )
+        failed.extend(send_failed)
+    except Exception as err:
+        logging.exception(f"Exception Sending Messages: {err}")
+        raise
+
+    elapsed_seconds = time.monotonic() - start_time
+    logging.info(
+        f"Sent {sent_count} Messages ({len(failed)} failed) in {elapsed_seconds:.2f}s"
+    )
+
+    return {"sent": sent_count, "failed": failed, "elapsed_seconds": elapsed_seconds}
+
+
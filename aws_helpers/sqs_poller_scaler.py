@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+"""
+    Purpose:
+        SQS Poller Scaler Class. Will provide an adaptive controller that
+        decides how many threads should poll an SQS Queue, based on the
+        queue's depth, the ratio of empty receives, and how fast handlers
+        can process messages
+    Examples of Create Object of Class:
+        scaler = SQSPollerScaler(min_pollers=1, max_pollers=8)
+        scaler.record_poll(msg_count)
+        target_pollers = scaler.evaluate(current_pollers, queue_depth)
+"""
+
+# Python Library Imports
+import logging
+import threading
+import time
+
+
+class SQSPollerScaler(object):
+    """
+        SQSPollerScaler Class
+    """
+
+    ###
+    # Class Lifecycle Methods
+    ###
+
+    def __init__(
+        self,
+        min_pollers=1,
+        max_pollers=10,
+        backlog_per_poller=100,
+        max_empty_receive_ratio=0.5,
+        handler_saturation=0.9,
+    ):
+        """
+        Purpose:
+            Initilize the SQSPollerScaler Class. Each evaluation moves the
+            poller count by at most one, within [min_pollers, max_pollers]:
+                - down when the share of empty receives is above
+                  max_empty_receive_ratio (paying for polls that return
+                  nothing)
+                - up when the backlog per poller is above backlog_per_poller,
+                  unless handlers are already saturated (more pollers would
+                  only fill the buffer)
+        Args:
+            min_pollers (Int): Min number of pollers
+            max_pollers (Int): Max number of pollers
+            backlog_per_poller (Int): Visible messages per poller above which
+                another poller is added
+            max_empty_receive_ratio (Float): Share of empty receives above
+                which a poller is removed
+            handler_saturation (Float): Share of the handlers' capacity
+                (msgs/s) above which the receive rate counts as saturated
+        """
+
+        if not 1 <= min_pollers <= max_pollers:
+            raise ValueError(
+                f"Expected 1 <= min_pollers <= max_pollers, got "
+                f"{min_pollers} and {max_pollers}"
+            )
+
+        self.min_pollers = min_pollers
+        self.max_pollers = max_pollers
+        self.backlog_per_poller = backlog_per_poller
+        self.max_empty_receive_ratio = max_empty_receive_ratio
+        self.handler_saturation = handler_saturation
+
+        self._lock = threading.Lock()
+        self._reset_window()
+
+        self.decisions = []
+
+    ###
+    # Metric Methods
+    ###
+
+    def record_poll(self, msg_count):
+        """
+        Purpose:
+            Record the result of a single receive (called by the pollers)
+        Args:
+            msg_count (Int): Number of messages received
+        Return:
+            N/A
+        """
+
+        with self._lock:
+            self._polls += 1
+            self._msgs += msg_count
+            if not msg_count:
+                self._empty_polls += 1
+
+    ###
+    # Decision Methods
+    ###
+
+    def evaluate(
+        self, current_pollers, queue_depth, avg_handler_seconds=None, num_workers=None
+    ):
+        """
+        Purpose:
+            Decide the number of pollers from the metrics recorded since the
+            last evaluation, log the decision, and start a new window
+        Args:
+            current_pollers (Int): Number of pollers running
+            queue_depth (Int): ApproximateNumberOfMessages of the queue
+            avg_handler_seconds (Float): Average handler latency in the window
+            num_workers (Int): Number of handler workers
+        Return:
+            target_pollers (Int): Number of pollers that should run
+        """
+
+        with self._lock:
+            window_seconds = time.monotonic() - self._window_start
+            polls = self._polls
+            empty_polls = self._empty_polls
+            msgs = self._msgs
+            self._reset_window()
+
+        empty_receive_ratio = empty_polls / polls if polls else 0.0
+        receive_rate = msgs / window_seconds if window_seconds > 0 else 0.0
+        handler_capacity = None
+        if avg_handler_seconds and num_workers:
+            handler_capacity = num_workers / avg_handler_seconds
+
+        target_pollers = current_pollers
+        if not polls:
+            reason = "no receives in window"
+        elif empty_receive_ratio > self.max_empty_receive_ratio:
+            target_pollers = current_pollers - 1
+            reason = "mostly empty receives"
+        elif queue_depth > current_pollers * self.backlog_per_poller:
+            if handler_capacity and (
+                receive_rate >= handler_capacity * self.handler_saturation
+            ):
+                reason = (
+                    f"backlog of {queue_depth} but handlers saturated "
+                    f"({receive_rate:.1f} of {handler_capacity:.1f} msgs/s)"
+                )
+            else:
+                target_pollers = current_pollers + 1
+                reason = f"backlog of {queue_depth}"
+        else:
+            reason = f"backlog of {queue_depth} within target"
+
+        target_pollers = max(self.min_pollers, min(self.max_pollers, target_pollers))
+        decision = {
+            "current_pollers": current_pollers,
+            "target_pollers": target_pollers,
+            "queue_depth": queue_depth,
+            "empty_receive_ratio": empty_receive_ratio,
+            "receive_rate": receive_rate,
+            "handler_capacity": handler_capacity,
+            "reason": reason,
+        }
+        self.decisions = (self.decisions + [decision])[-100:]
+
+        log_message = (
+            f"Poller Scaling: {current_pollers} -> {target_pollers} ({reason}; "
+            f"empty ratio={empty_receive_ratio:.2f}, "
+            f"receive rate={receive_rate:.1f} msgs/s)"
+        )
+        if target_pollers != current_pollers:
+            logging.info(log_message)
+        else:
+            logging.debug(log_message)
+
+        return target_pollers
+
+    ###
+    # Helper Methods
+    ###
+
+    def _reset_window(self):
+        """
+        Purpose:
+            Start a new metrics window
+        Args:
+            N/A
+        Return:
+            N/A
+        """
+
+        self._window_start = time.monotonic()
+        self._polls = 0
+        self._empty_polls = 0
+        self._msgs = 0
@@ -0,0 +1,320 @@
+#!/usr/bin/env python3
+"""
+    Purpose:
+        SQS Prefetch Buffer Class. Will provide a receive buffer that
+        keeps SQS Messages ready ahead of demand, so handlers do not wait
+        on a long poll between batches of 10. Prefetching stops when the
+        buffer is full, and messages held too long are released back to
+        the queue instead of being handed out close to their visibility
+        timeout
+    Examples of Create Object of Class:
+        with SQSPrefetchBuffer(queue, capacity=100) as buffer:
+            msg = buffer.get(timeout=5)
+"""
+
+# Python Library Imports
+import collections
+import logging
+import threading
+import time
+
+# Local Library Imports
+from aws_helpers import sqs_helpers
+
+
+class SQSPrefetchBuffer(object):
+    """
+        SQSPrefetchBuffer Class
+    """
+
+    ###
+    # Class Lifecycle Methods
+    ###
+
+    def __init__(
+        self,
+        queue,
+        capacity=100,
+        num_pollers=1,
+        max_msgs=10,
+        wait_time=20,
+        attr_names=["All"],
+        visibility_timeout=None,
+        max_hold_fraction=0.5,
+    ):
+        """
+        Purpose:
+            Initilize the SQSPrefetchBuffer Class. Pollers only request as
+            many messages as there is free space for, so the buffer never
+            holds more than capacity messages
+        Args:
+            queue (SQS Queue Object): Queue object for the queue in
+                SQS
+            capacity (Int): Max messages buffered (and requested) at once
+            num_pollers (Int): Number of threads polling the queue
+            max_msgs (Int): Max messages to pull per poll (max 10)
+            wait_time (Int): Seconds to long-poll for messages (max 20)
+            attr_names (List of Strings): Message attributes to pull
+            visibility_timeout (Int): Visibility timeout (seconds) of received
+                messages. Defaults to the queue's VisibilityTimeout attribute
+            max_hold_fraction (Float): Fraction of the visibility timeout a
+                message may wait in the buffer before it is released back to
+                the queue instead of handed out
+        """
+
+        self.queue = queue
+        self.capacity = capacity
+        self.num_pollers = num_pollers
+        self.max_msgs = max_msgs
+        self.wait_time = wait_time
+        self.attr_names = attr_names
+        self.visibility_timeout = visibility_timeout
+        self.max_hold_fraction = max_hold_fraction
+
+        self._buffer = collections.deque()
+        self._reserved = 0
+        self._condition = threading.Condition()
+        self._stop_event = threading.Event()
+        self._pollers = []
+        self._max_hold_seconds = None
+
+        self.received = 0
+        self.delivered = 0
+        self.expired = 0
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+    ###
+    # Buffer Control Methods
+    ###
+
+    def start(self):
+        """
+        Purpose:
+            Start the poller threads
+        Args:
+            N/A
+        Return:
+            N/A
+        """
+
+        if self._pollers:
+            raise Exception("SQSPrefetchBuffer is already running")
+
+        visibility_timeout = self.visibility_timeout or int(
+            self.queue.attributes["VisibilityTimeout"]
+        )
+        self._max_hold_seconds = visibility_timeout * self.max_hold_fraction
+        logging.info(
+            f"Starting SQS Prefetch Buffer (capacity={self.capacity}, "
+            f"max hold={self._max_hold_seconds}s)"
+        )
+
+        self._stop_event.clear()
+        for index in range(self.num_pollers):
+            poller = threading.Thread(
+                target=self._poll_loop, name=f"sqs-prefetch-{index}", daemon=True
+            )
+            poller.start()
+            self._pollers.append(poller)
+
+    def stop(self, release=True):
+        """
+        Purpose:
+            Stop the pollers (after their current long polls return)
+        Args:
+            release (Boolean): Whether or not to make buffered messages visible
+                immediately so they are redelivered right away
+        Return:
+            N/A
+        """
+
+        self._stop_event.set()
+        with self._condition:
+            self._condition.notify_all()
+        for poller in self._pollers:
+            poller.join()
+        self._pollers = []
+
+        with self._condition:
+            msgs = [msg for _, msg in self._buffer]
+            self._buffer.clear()
+
+        if msgs and release:
+            logging.info(f"Releasing {len(msgs)} Buffered Messages Back to the Queue")
+            self._release(msgs)
+
+    ###
+    # Message Methods
+    ###
+
+    def get(self, timeout=None):
+        """
+        Purpose:
+            Return the oldest buffered message, waiting for one if the
+            buffer is empty
+        Args:
+            timeout (Float): Max seconds to wait. None waits until a message
+                arrives or the buffer is stopped
+        Return:
+            msg (SQS Message Object): Next message, or None if none arrived
+                in time
+        """
+
+        msgs = self.get_messages(max_msgs=1, timeout=timeout)
+
+        return msgs[0] if msgs else None
+
+    def get_messages(self, max_msgs=10, timeout=None):
+        """
+        Purpose:
+            Return up to max_msgs buffered messages (oldest first), waiting
+            for at least one if the buffer is empty. The buffer must have been
+            started
+        Args:
+            max_msgs (Int): Max messages to return
+            timeout (Float): Max seconds to wait. None waits until a message
+                arrives or the buffer is stopped
+        Return:
+            msgs (List of SQS Message Objects): Messages (empty if none
+                arrived in time)
+        """
+
+        if self._max_hold_seconds is None:
+            raise Exception("SQSPrefetchBuffer is not started; call start() first")
+
+        deadline = None if timeout is None else time.monotonic() + timeout
+        msgs = []
+        stale_msgs = []
+        with self._condition:
+            while True:
+                stale_msgs.extend(self._pop_stale())
+                if self._buffer or self._stop_event.is_set():
+                    break
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    break
+                self._condition.wait(timeout=remaining)
+
+            while self._buffer and len(msgs) < max_msgs:
+                msgs.append(self._buffer.popleft()[1])
+            self.delivered += len(msgs)
+            if msgs:
+                # Free space for the pollers
+                self._condition.notify_all()
+
+        if stale_msgs:
+            self._release(stale_msgs)
+
+        return msgs
+
+    def get_stats(self):
+        """
+        Purpose:
+            Return the counters of the buffer
+        Args:
+            N/A
+        Return:
+            stats (Dict): Dict with buffered, received, delivered, and expired
+                (released after being held too long)
+        """
+
+        with self._condition:
+            return {
+                "buffered": len(self._buffer),
+                "received": self.received,
+                "delivered": self.delivered,
+                "expired": self.expired,
+            }
+
+    ###
+    # Helper Methods
+    ###
+
+    def _poll_loop(self):
+        """
+        Purpose:
+            Fill the buffer from the queue until stopped, only polling when
+            there is free space
+        Args:
+            N/A
+        Return:
+            N/A
+        """
+
+        while not self._stop_event.is_set():
+            with self._condition:
+                stale_msgs = self._pop_stale()
+                free_space = self.capacity - len(self._buffer) - self._reserved
+                if free_space <= 0 and not stale_msgs:
+                    # Wake up periodically to release messages held too long
+                    self._condition.wait(timeout=min(self._max_hold_seconds, 1.0))
+                    continue
+                request_size = max(min(self.max_msgs, free_space), 0)
+                self._reserved += request_size
+
+            if stale_msgs:
+                self._release(stale_msgs)
+            if not request_size:
+                continue
+
+            try:
+                msgs = sqs_helpers.get_messages(
+                    self.queue,
+                    max_msgs=request_size,
+                    wait_time=self.wait_time,
+                    attr_names=self.attr_names,
+                )
+            except Exception:
+                # get_messages logs the exception; back off before polling again
+                msgs = []
+                self._stop_event.wait(timeout=1.0)
+
+            received_time = time.monotonic()
+            with self._condition:
+                self._reserved -= request_size
+                self._buffer.extend((received_time, msg) for msg in msgs)
+                self.received += len(msgs)
+                if msgs:
+                    self._condition.notify_all()
+
+    def _pop_stale(self):
+        """
+        Purpose:
+            Remove messages held longer than the max hold time from the
+            buffer (called with the condition held)
+        Args:
+            N/A
+        Return:
+            stale_msgs (List of SQS Message Objects): Removed messages
+        """
+
+        stale_before = time.monotonic() - self._max_hold_seconds
+        stale_msgs = []
+        while self._buffer and self._buffer[0][0] < stale_before:
+            stale_msgs.append(self._buffer.popleft()[1])
+        self.expired += len(stale_msgs)
+
+        return stale_msgs
+
+    def _release(self, msgs):
+        """
+        Purpose:
+            Make messages visible on the queue again immediately
+        Args:
+            msgs (List of SQS Message Objects): Messages to release
+        Return:
+            N/A
+        """
+
+        try:
+            sqs_helpers.change_messages_visibility(self.queue, msgs, 0)
+        except Exception:
+            # change_messages_visibility logs the exception; the messages will
+            # still reappear once their visibility timeout expires
+            pass
@@ -0,0 +1,275 @@
+#!/usr/bin/env python3
+"""
+    Purpose:
+        SQS Visibility Heartbeat Class. Will provide a background
+        heartbeat that extends the visibility timeout of in-flight SQS
+        Messages before it expires, so long-running handlers do not cause
+        the messages to be redelivered
+    Examples of Create Object of Class:
+        with VisibilityHeartbeat(queue, visibility_timeout=30) as heartbeat:
+            heartbeat.track(msg)
+            handle(msg)
+            heartbeat.release(msg)
+"""
+
+# Python Library Imports
+import logging
+import threading
+import time
+
+# Local Library Imports
+from aws_helpers import sqs_helpers
+
+###
+# Heartbeat Constants
+###
+
+
+# SQS does not allow a message to stay invisible longer than 12 hours after
+# it was received
+MAX_VISIBILITY_SECONDS = 12 * 60 * 60
+
+
+class VisibilityHeartbeat(object):
+    """
+        VisibilityHeartbeat Class
+    """
+
+    ###
+    # Class Lifecycle Methods
+    ###
+
+    def __init__(
+        self,
+        queue,
+        visibility_timeout=30,
+        extension=None,
+        heartbeat_interval=None,
+        release_on_stop=True,
+    ):
+        """
+        Purpose:
+            Initilize the VisibilityHeartbeat Class.
+        Args:
+            queue (SQS Queue Object): Queue object for the queue in
+                SQS
+            visibility_timeout (Int): Visibility timeout (seconds) the
+                messages were received with
+            extension (Int): Seconds of visibility to add per heartbeat.
+                Defaults to visibility_timeout
+            heartbeat_interval (Float): Seconds between heartbeats. Messages
+                expiring within two intervals are extended. Defaults to a
+                third of the visibility timeout
+            release_on_stop (Boolean): Whether or not to make messages that
+                are still tracked visible immediately when stopped (so they
+                are redelivered right away instead of after their timeout)
+        """
+
+        self.queue = queue
+        self.visibility_timeout = visibility_timeout
+        self.extension = extension or visibility_timeout
+        self.heartbeat_interval = heartbeat_interval or max(visibility_timeout / 3, 1)
+        self.release_on_stop = release_on_stop
+
+        self._tracked = {}
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread = None
+
+        self.extended = 0
+        self.extend_failed = 0
+        self.expired = 0
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+    ###
+    # Heartbeat Control Methods
+    ###
+
+    def start(self):
+        """
+        Purpose:
+            Start the heartbeat thread
+        Args:
+            N/A
+        Return:
+            N/A
+        """
+
+        if self._thread and self._thread.is_alive():
+            return
+        logging.info(
+            f"Starting Visibility Heartbeat (timeout={self.visibility_timeout}s, "
+            f"interval={self.heartbeat_interval}s)"
+        )
+
+        self._stop_event.clear()
+        self._thread = threading.Thread(
+            target=self._heartbeat_loop, name="sqs-visibility-heartbeat", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self):
+        """
+        Purpose:
+            Stop the heartbeat thread and release every tracked message
+        Args:
+            N/A
+        Return:
+            N/A
+        """
+
+        self._stop_event.set()
+        if self._thread:
+            self._thread.join()
+            self._thread = None
+
+        with self._lock:
+            msgs = [tracked["msg"] for tracked in self._tracked.values()]
+            self._tracked.clear()
+
+        if msgs and self.release_on_stop:
+            logging.info(f"Releasing {len(msgs)} Tracked Messages Back to the Queue")
+            try:
+                sqs_helpers.change_messages_visibility(self.queue, msgs, 0)
+            except Exception:
+                # change_messages_visibility logs the exception; the messages
+                # will still reappear once their visibility timeout expires
+                pass
+
+    ###
+    # Tracking Methods
+    ###
+
+    def track(self, msg, received_time=None):
+        """
+        Purpose:
+            Start extending a message's visibility until it is released
+        Args:
+            msg (SQS Message Object): Message returned by get_messages
+            received_time (Float): time.monotonic() when the message was
+                received. Defaults to now
+        Return:
+            N/A
+        """
+
+        received_time = received_time or time.monotonic()
+        with self._lock:
+            self._tracked[msg.receipt_handle] = {
+                "msg": msg,
+                "received_time": received_time,
+                "visible_at": received_time + self.visibility_timeout,
+            }
+
+    def release(self, msg):
+        """
+        Purpose:
+            Stop extending a message's visibility (after it is handled)
+        Args:
+            msg (SQS Message Object): Tracked message
+        Return:
+            N/A
+        """
+
+        with self._lock:
+            self._tracked.pop(msg.receipt_handle, None)
+
+    def get_stats(self):
+        """
+        Purpose:
+            Return the counters of the heartbeat
+        Args:
+            N/A
+        Return:
+            stats (Dict): Dict with tracked, extended, extend_failed, and
+                expired (messages that hit the 12 hour limit)
+        """
+
+        with self._lock:
+            return {
+                "tracked": len(self._tracked),
+                "extended": self.extended,
+                "extend_failed": self.extend_failed,
+                "expired": self.expired,
+            }
+
+    ###
+    # Helper Methods
+    ###
+
+    def _heartbeat_loop(self):
+        """
+        Purpose:
+            Extend the visibility of tracked messages close to expiring every
+            heartbeat_interval seconds until stopped
+        Args:
+            N/A
+        Return:
+            N/A
+        """
+
+        while not self._stop_event.wait(timeout=self.heartbeat_interval):
+            try:
+                self._extend_expiring()
+            except Exception as err:
+                logging.exception(f"Exception in Visibility Heartbeat: {err}")
+
+    def _extend_expiring(self):
+        """
+        Purpose:
+            Extend the visibility of tracked messages that would become
+            visible before the heartbeat after next
+        Args:
+            N/A
+        Return:
+            N/A
+        """
+
+        now = time.monotonic()
+        extend_before = now + 2 * self.heartbeat_interval
+        with self._lock:
+            expiring = [
+                tracked
+                for tracked in self._tracked.values()
+                if tracked["visible_at"] <= extend_before
+            ]
+
+        msgs = []
+        for tracked in expiring:
+            if now + self.extension - tracked["received_time"] > MAX_VISIBILITY_SECONDS:
+                logging.warning(
+                    f"Message {tracked['msg'].message_id} Reached the 12 Hour "
+                    "Visibility Limit; No Longer Extending"
+                )
+                self.release(tracked["msg"])
+                self.expired += 1
+                continue
+            msgs.append(tracked["msg"])
+
+        if not msgs:
+            return
+
+        failed_msgs = sqs_helpers.change_messages_visibility(
+            self.queue, msgs, self.extension
+        )
+        failed_handles = {msg.receipt_handle for msg in failed_msgs}
+
+        with self._lock:
+            for msg in msgs:
+                tracked = self._tracked.get(msg.receipt_handle)
+                if not tracked:
+                    continue
+                if msg.receipt_handle in failed_handles:
+                    # Usually already deleted; nothing more to extend
+                    del self._tracked[msg.receipt_handle]
+                else:
+                    tracked["visible_at"] = now + self.extension
+            self.extended += len(msgs) - len(failed_msgs)
+            self.extend_failed += len(failed_msgs)
+
+        logging.debug(f"Extended Visibility of {len(msgs) - len(failed_msgs)} Messages")
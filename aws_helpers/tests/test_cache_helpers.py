@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+"""
+    Purpose:
+        Test File for cache_helpers.py
+"""
+
+# Python Library Imports
+import os
+import sys
+import pytest
+from unittest import mock
+
+# Import File to Test
+from aws_helpers import cache_helpers
+from aws_helpers.cache_helpers import LRUCache
+
+
+###
+# Fixtures
+###
+
+
+@pytest.fixture
+def mock_clock():
+    """
+    Purpose:
+        Replace the monotonic clock of cache_helpers with one the test moves
+    Args:
+        N/A
+    Return:
+        clock (List of Floats): Single-item list holding the current time
+    """
+
+    clock = [1000.0]
+    with mock.patch.object(cache_helpers.time, "monotonic", lambda: clock[0]):
+        yield clock
+
+
+###
+# Mocked Functions
+###
+
+
+# None at the Moment
+
+
+###
+# Test Payload
+###
+
+
+def test_get_and_set():
+    """
+    Purpose:
+        Test caching values and counting hits and misses
+    Args:
+        N/A
+    Return:
+        N/A
+    """
+
+    cache = LRUCache(max_size=2)
+    cache.set("a", 1)
+
+    assert cache.get("a") == 1
+    assert cache.get("b", "missing") == "missing"
+    assert "a" in cache and "b" not in cache
+    assert len(cache) == 1
+    assert cache.get_stats() == {
+        "size": 1,
+        "max_size": 2,
+        "hits": 1,
+        "misses": 1,
+        "hit_rate": 0.5,
+        "evictions": 0,
+        "expirations": 0,
+    }
+
+
+def test_least_recently_used_entry_is_evicted():
+    """
+    Purpose:
+        Test that the least recently used entry is evicted when the cache is
+        full
+    Args:
+        N/A
+    Return:
+        N/A
+    """
+
+    cache = LRUCache(max_size=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+
+    assert "a" in cache and "c" in cache
+    assert "b" not in cache
+    assert cache.evictions == 1
+
+
+def test_entries_expire(mock_clock):
+    """
+    Purpose:
+        Test the default and per-entry ttls
+    Args:
+        mock_clock (List of Floats): Clock of the cache
+    Return:
+        N/A
+    """
+
+    cache = LRUCache(ttl=10)
+    cache.set("default", 1)
+    cache.set("short", 2, ttl=1)
+
+    mock_clock[0] += 5
+    assert cache.get("short") is None
+    assert cache.get("default") == 1
+
+    mock_clock[0] += 5
+    assert cache.get("default") is None
+    assert cache.expirations == 2
+
+
+def test_get_or_set_calls_factory_once():
+    """
+    Purpose:
+        Test that get_or_set only builds a value on a miss
+    Args:
+        N/A
+    Return:
+        N/A
+    """
+
+    cache = LRUCache()
+    factory = mock.Mock(return_value="value")
+
+    assert cache.get_or_set("key", factory) == "value"
+    assert cache.get_or_set("key", factory) == "value"
+    factory.assert_called_once_with()
+
+
+def test_invalidation():
+    """
+    Purpose:
+        Test removing a single entry, entries matching a predicate, and all
+        entries
+    Args:
+        N/A
+    Return:
+        N/A
+    """
+
+    cache = LRUCache()
+    for key in [("a", 1), ("a", 2), ("b", 1)]:
+        cache.set(key, True)
+
+    assert cache.invalidate(("b", 1)) is True
+    assert cache.invalidate(("b", 1)) is False
+    assert cache.invalidate_where(lambda key: key[0] == "a") == 2
+    assert len(cache) == 0
+
+    cache.set("c", 1)
+    cache.clear()
+    assert "c" not in cache
+
+
+def test_max_size_must_be_positive():
+    """
+    Purpose:
+        Test that a cache cannot be created without room for an entry
+    Args:
+        N/A
+    Return:
+        N/A
+    """
+
+    with pytest.raises(ValueError):
+        LRUCache(max_size=0)
@@ -0,0 +1,312 @@
+#!/usr/bin/env python3
+"""
+    Purpose:
+        Test File for dynamodb_export_helpers.py
+"""
+
+# Python Library Imports
+import csv
+import json
+import os
+import sys
+import boto3
+import pytest
+from moto import mock_aws
+from unittest import mock
+
+# Import File to Test
+from aws_helpers import dynamodb_export_helpers, dynamodb_helpers
+
+
+###
+# Fixtures
+###
+
+
+@pytest.fixture
+def parquet():
+    """
+    Purpose:
+        Return pyarrow.parquet, skipping the test without pyarrow
+    Args:
+        N/A
+    Return:
+        parquet (Module): pyarrow.parquet
+    """
+
+    return pytest.importorskip("pyarrow.parquet")
+
+
+@pytest.fixture
+def aws(monkeypatch):
+    """
+    Purpose:
+        Return a mocked table holding 50 records and a mocked bucket
+    Args:
+        monkeypatch (Fixture): pytest monkeypatch fixture
+    Return:
+        aws (Dict): Dict with table and bucket
+    """
+
+    monkeypatch.setenv("AWS_ACCESS_KEY_ID", "testing")
+    monkeypatch.setenv("AWS_SECRET_ACCESS_KEY", "testing")
+    monkeypatch.setenv("AWS_DEFAULT_REGION", "us-east-1")
+
+    with mock_aws():
+        dynamodb = boto3.resource("dynamodb", region_name="us-east-1")
+        table = dynamodb_helpers.create_table(
+            dynamodb, "export-table", {"name": "id", "type": "N"}
+        )
+        with table.batch_writer() as batch:
+            for index in range(50):
+                batch.put_item(
+                    Item={"id": index, "name": f"item {index}", "tags": ["a", "b"]}
+                )
+        s3 = boto3.resource("s3", region_name="us-east-1")
+        yield {"table": table, "bucket": s3.create_bucket(Bucket="export-bucket")}
+
+
+###
+# Mocked Functions
+###
+
+
+def read_parquet_rows(parquet, filenames):
+    """
+    Purpose:
+        Read the rows of Parquet part files
+    Args:
+        parquet (Module): pyarrow.parquet
+        filenames (List of Strings): Part files to read
+    Return:
+        rows (List of Dicts): Rows of every part, in order
+    """
+
+    return [
+        row
+        for filename in filenames
+        for row in parquet.read_table(filename).to_pylist()
+    ]
+
+
+###
+# Test Payload
+###
+
+
+def test_export_items_csv(tmp_path):
+    """
+    Purpose:
+        Test that items are exported to CSV parts, with nested and binary
+        values encoded, and that new attributes start a new part with them
+        instead of being dropped
+    Args:
+        tmp_path (Fixture): Temporary directory
+    Return:
+        N/A
+    """
+
+    items = [{"id": 1, "tags": {"a", "b"}, "data": b"\x00"}, {"id": 2}]
+    items += [{"id": 3, "late": "value"}]
+    export_summary = dynamodb_export_helpers.export_items(
+        items, str(tmp_path), file_format="csv", row_group_size=2
+    )
+
+    assert export_summary["rows"] == 3
+    assert [os.path.basename(part) for part in export_summary["files"]] == [
+        "part-00000.csv",
+        "part-00001.csv",
+    ]
+    with open(export_summary["files"][0], newline="") as part_file:
+        assert list(csv.reader(part_file)) == [
+            ["id", "tags", "data"],
+            ["1", '["a", "b"]', "AA=="],
+            ["2", "", ""],
+        ]
+    with open(export_summary["files"][1], newline="") as part_file:
+        assert list(csv.reader(part_file)) == [
+            ["id", "tags", "data", "late"],
+            ["3", "", "", "value"],
+        ]
+    with pytest.raises(ValueError):
+        dynamodb_export_helpers.export_items(items, str(tmp_path), file_format="xml")
+
+
+def test_export_items_parquet_widens_schema(parquet, tmp_path):
+    """
+    Purpose:
+        Test that a row group only a wider schema holds (int64 to double, a
+        null column to int64, a new attribute) starts a new part instead of
+        truncating values or dropping columns
+    Args:
+        parquet (Fixture): pyarrow.parquet
+        tmp_path (Fixture): Temporary directory
+    Return:
+        N/A
+    """
+
+    items = [
+        {"id": 1, "value": 1, "extra": None},
+        {"id": 2, "value": 2},
+        {"id": 3, "value": 2.5, "extra": 5},
+        {"id": 4, "value": 3},
+        {"id": 5, "value": 4, "late": "x"},
+    ]
+    export_summary = dynamodb_export_helpers.export_items(
+        items, str(tmp_path), row_group_size=2
+    )
+
+    assert len(export_summary["files"]) == 3
+    schemas = [parquet.read_schema(part) for part in export_summary["files"]]
+    assert [str(schema.field("value").type) for schema in schemas] == [
+        "int64",
+        "double",
+        "double",
+    ]
+    assert [str(schema.field("extra").type) for schema in schemas] == [
+        "null",
+        "int64",
+        "int64",
+    ]
+    assert schemas[2].names == ["id", "value", "extra", "late"]
+    rows = read_parquet_rows(parquet, export_summary["files"])
+    assert [row["value"] for row in rows] == [1, 2, 2.5, 3, 4]
+    assert rows[4]["late"] == "x"
+
+
+def test_export_items_parquet_never_truncates(parquet, tmp_path):
+    """
+    Purpose:
+        Test that values that do not fit the schema raise, both with a fixed
+        schema and with types that cannot be widened
+    Args:
+        parquet (Fixture): pyarrow.parquet
+        tmp_path (Fixture): Temporary directory
+    Return:
+        N/A
+    """
+
+    pyarrow = pytest.importorskip("pyarrow")
+    schema = pyarrow.schema([("id", pyarrow.int64()), ("value", pyarrow.int64())])
+
+    with pytest.raises(pyarrow.ArrowInvalid):
+        dynamodb_export_helpers.export_items(
+            [{"id": 1, "value": 1.5}], str(tmp_path / "fixed"), schema=schema
+        )
+    with pytest.raises((pyarrow.ArrowInvalid, pyarrow.ArrowTypeError)):
+        dynamodb_export_helpers.export_items(
+            [{"value": 1}, {"value": "a"}], str(tmp_path / "inferred"), row_group_size=1
+        )
+    with pytest.raises(ValueError):
+        dynamodb_export_helpers.ExportFileWriter(
+            str(tmp_path), attribute_names=["value"], schema=schema
+        )
+
+    export_summary = dynamodb_export_helpers.export_items(
+        [{"id": 1, "value": 2, "other": "dropped"}, {"id": 2}],
+        str(tmp_path / "schema"),
+        schema=schema,
+    )
+    assert read_parquet_rows(parquet, export_summary["files"]) == [
+        {"id": 1, "value": 2},
+        {"id": 2, "value": None},
+    ]
+
+
+def test_export_table_round_trip(aws, parquet, tmp_path):
+    """
+    Purpose:
+        Test that an exported table reads back as the table's items, and
+        that the parts are uploaded to S3
+    Args:
+        aws (Fixture): Mocked table and bucket
+        parquet (Fixture): pyarrow.parquet
+        tmp_path (Fixture): Temporary directory
+    Return:
+        N/A
+    """
+
+    export_summary = dynamodb_export_helpers.export_table(
+        aws["table"],
+        str(tmp_path),
+        segments=2,
+        page_size=10,
+        rows_per_file=20,
+        row_group_size=5,
+        bucket=aws["bucket"],
+        key_prefix="exports/",
+        keep_local_files=False,
+    )
+
+    assert export_summary["rows"] == 50
+    assert all(part.startswith("exports/part-") for part in export_summary["files"])
+    assert os.listdir(tmp_path) == []
+    filenames = []
+    for part in export_summary["files"]:
+        filenames.append(str(tmp_path / os.path.basename(part)))
+        aws["bucket"].download_file(part, filenames[-1])
+
+    rows = sorted(read_parquet_rows(parquet, filenames), key=lambda row: row["id"])
+    assert rows == [
+        {"id": index, "name": f"item {index}", "tags": '["a", "b"]'}
+        for index in range(50)
+    ]
+
+
+def test_export_table_resumes_from_checkpoint(aws, parquet, tmp_path):
+    """
+    Purpose:
+        Test that an interrupted export resumes after its last checkpoint,
+        exporting every item exactly once and removing parts written after
+        the checkpoint
+    Args:
+        aws (Fixture): Mocked table and bucket
+        parquet (Fixture): pyarrow.parquet
+        tmp_path (Fixture): Temporary directory
+    Return:
+        N/A
+    """
+
+    output_dir = str(tmp_path / "export")
+    checkpoint_filename = str(tmp_path / "checkpoint.json")
+    export_args = {
+        "segments": 2,
+        "page_size": 5,
+        "rows_per_file": 10,
+        "row_group_size": 5,
+        "checkpoint_filename": checkpoint_filename,
+    }
+    write = dynamodb_export_helpers.ExportFileWriter.write
+    written = []
+
+    def interrupted_write(writer, item):
+        if len(written) == 32:
+            raise Exception("Interrupted")
+        written.append(item)
+        write(writer, item)
+
+    with mock.patch.object(
+        dynamodb_export_helpers.ExportFileWriter, "write", interrupted_write
+    ):
+        with pytest.raises(Exception, match="Interrupted"):
+            dynamodb_export_helpers.export_table(
+                aws["table"], output_dir, **export_args
+            )
+    with open(checkpoint_filename) as checkpoint_file:
+        checkpoint = json.load(checkpoint_file)
+    assert 0 < checkpoint["writer"]["rows"] <= 32
+    # A part closed after the checkpoint must not survive the resume
+    stale_part = os.path.join(output_dir, "part-00009.parquet")
+    open(stale_part, "w").close()
+
+    export_summary = dynamodb_export_helpers.export_table(
+        aws["table"], output_dir, **export_args
+    )
+
+    assert export_summary["rows"] == 50
+    assert not os.path.exists(stale_part)
+    assert sorted(os.listdir(output_dir)) == sorted(
+        os.path.basename(part) for part in export_summary["files"]
+    )
+    rows = read_parquet_rows(parquet, export_summary["files"])
+    assert sorted(row["id"] for row in rows) == list(range(50))
@@ -7,7 +7,12 @@
 # Python Library Imports
 import os
 import sys
+import boto3
 import pytest
+from boto3.dynamodb.conditions import Attr, Key
+from botocore.exceptions import ClientError
+from decimal import Decimal
+from moto import mock_aws
 from unittest import mock
 
 # Import File to Test
@@ -19,7 +24,87 @@ from aws_helpers import dynamodb_helpers
 ###
 
 
-# None at the Moment (Empty Test Suite)
+@pytest.fixture
+def dynamodb(monkeypatch):
+    """
+    Purpose:
+        Return a mocked DynamoDB Resource
+    Args:
+        monkeypatch (Fixture): pytest monkeypatch fixture
+    Return:
+        dynamodb (DynamoDB Resource Object): Mocked DynamoDB Resource
+    """
+
+    monkeypatch.setenv("AWS_ACCESS_KEY_ID", "testing")
+    monkeypatch.setenv("AWS_SECRET_ACCESS_KEY", "testing")
+    monkeypatch.setenv("AWS_DEFAULT_REGION", "us-east-1")
+
+    with mock_aws():
+        yield boto3.resource("dynamodb", region_name="us-east-1")
+
+
+@pytest.fixture
+def table(dynamodb):
+    """
+    Purpose:
+        Return a mocked table holding 50 records
+    Args:
+        dynamodb (Fixture): Mocked DynamoDB Resource
+    Return:
+        table (DynamoDB Table Object): Mocked table
+    """
+
+    table = dynamodb_helpers.create_table(
+        dynamodb, "test-table", {"name": "id", "type": "S"}
+    )
+    with table.batch_writer() as batch:
+        for index in range(50):
+            batch.put_item(Item={"id": str(index), "number": index})
+
+    return table
+
+
+@pytest.fixture
+def events(dynamodb):
+    """
+    Purpose:
+        Return a mocked table with a sort key, holding 30 events of user "a"
+        and 5 of user "b"
+    Args:
+        dynamodb (Fixture): Mocked DynamoDB Resource
+    Return:
+        events (DynamoDB Table Object): Mocked table
+    """
+
+    events = dynamodb_helpers.create_table(
+        dynamodb,
+        "events",
+        {"name": "user", "type": "S"},
+        sort_key={"name": "ts", "type": "N"},
+    )
+    with events.batch_writer() as batch:
+        for user, event_count in (("a", 30), ("b", 5)):
+            for ts in range(event_count):
+                batch.put_item(Item={"user": user, "ts": ts})
+
+    return events
+
+
+@pytest.fixture
+def fake_clock():
+    """
+    Purpose:
+        Replace the clock the rate limiter reads and sleeps with by a fake
+        one that only advances when slept on
+    Args:
+        N/A
+    Return:
+        fake_clock (FakeClock Object): Patched clock
+    """
+
+    fake_clock = FakeClock()
+    with mock.patch.object(dynamodb_helpers, "time", fake_clock):
+        yield fake_clock
 
 
 ###
@@ -27,7 +112,42 @@ from aws_helpers import dynamodb_helpers
 ###
 
 
-# None at the Moment (Empty Test Suite)
+class FakeClock(object):
+    """
+        FakeClock Class. Stands in for the time module, advancing only when
+        sleep is called
+    """
+
+    def __init__(self):
+        """
+        Purpose:
+            Initilize the FakeClock Class
+        Args:
+            N/A
+        """
+
+        self.now = 1000.0
+        self.sleeps = []
+
+    def monotonic(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+def get_ids(items):
+    """
+    Purpose:
+        Return the sorted ids of items
+    Args:
+        items (Iterable of Dicts): Items with an id
+    Return:
+        ids (List of Ints): Sorted ids as ints
+    """
+
+    return sorted(int(item["id"]) for item in items)
 
 
 ###
@@ -35,4 +155,844 @@ from aws_helpers import dynamodb_helpers
 ###
 
 
-# None at the Moment (Empty Test Suite)
+def test_parallel_scan(table):
+    """
+    Purpose:
+        Test that every segment is scanned and each item yielded once
+    Args:
+        table (Fixture): Mocked table
+    Return:
+        N/A
+    """
+
+    checkpoints = []
+    items = list(
+        dynamodb_helpers.parallel_scan(
+            table,
+            segments=4,
+            page_size=5,
+            checkpoint_callback=lambda *checkpoint: checkpoints.append(checkpoint),
+        )
+    )
+
+    assert get_ids(items) == list(range(50))
+    assert sorted(
+        segment for segment, last_key in checkpoints if last_key is None
+    ) == [0, 1, 2, 3]
+
+
+def test_parallel_scan_filter_and_client(table):
+    """
+    Purpose:
+        Test that a filter is applied and that scanning with a low-level
+        client yields deserialized items
+    Args:
+        table (Fixture): Mocked table
+    Return:
+        N/A
+    """
+
+    items = list(
+        dynamodb_helpers.parallel_scan(
+            table,
+            segments=2,
+            filter_expression=Attr("number").lt(10),
+            client=dynamodb_helpers.create_dynamodb_client(region_name="us-east-1"),
+        )
+    )
+
+    assert get_ids(items) == list(range(10))
+    assert all(type(item["number"]) is int for item in items)
+
+
+def test_parallel_scan_resumes_from_checkpoints(table):
+    """
+    Purpose:
+        Test that a scan stopped part way through resumes from the last
+        checkpoint of each segment, skipping completed segments, without
+        missing an item
+    Args:
+        table (Fixture): Mocked table
+    Return:
+        N/A
+    """
+
+    start_keys = {}
+    yielded = []
+    checkpointed = [0]
+
+    def checkpoint(segment, last_key):
+        start_keys[segment] = last_key
+        checkpointed[0] = len(yielded)
+
+    scan = dynamodb_helpers.parallel_scan(
+        table,
+        segments=4,
+        page_size=3,
+        checkpoint_callback=checkpoint,
+        max_buffered_pages=1,
+    )
+    for item in scan:
+        yielded.append(item)
+        if len(yielded) == 20:
+            break
+    scan.close()
+
+    with mock.patch.object(table, "scan", wraps=table.scan) as table_scan:
+        resumed = list(
+            dynamodb_helpers.parallel_scan(table, segments=4, start_keys=start_keys)
+        )
+
+    assert set(get_ids(yielded + resumed)) == set(range(50))
+    # Only the items yielded after the last checkpoint are yielded again
+    assert len(resumed) == 50 - checkpointed[0]
+    scanned_segments = {call[1]["Segment"] for call in table_scan.call_args_list}
+    assert scanned_segments == {
+        segment for segment in range(4) if start_keys.get(segment, {}) is not None
+    }
+
+
+def test_parallel_scan_raises_segment_errors(table):
+    """
+    Purpose:
+        Test that an error scanning a segment is raised to the consumer, and
+        that a scan with every segment complete yields nothing
+    Args:
+        table (Fixture): Mocked table
+    Return:
+        N/A
+    """
+
+    with mock.patch.object(table, "scan", side_effect=Exception("Scan Failed")):
+        with pytest.raises(Exception, match="Scan Failed"):
+            list(dynamodb_helpers.parallel_scan(table, segments=2))
+
+    segments = {0: None, 1: None}
+    assert list(dynamodb_helpers.parallel_scan(table, 2, start_keys=segments)) == []
+
+
+def test_batch_get(table):
+    """
+    Purpose:
+        Test that records are got in batches, keys without a record are
+        skipped, and a low-level client yields deserialized records
+    Args:
+        table (Fixture): Mocked table
+    Return:
+        N/A
+    """
+
+    keys = [{"id": str(index)} for index in range(0, 60, 2)]
+
+    records = list(dynamodb_helpers.batch_get(table, iter(keys), max_workers=2))
+    assert get_ids(records) == list(range(0, 50, 2))
+    assert records[0]["number"] == Decimal(records[0]["id"])
+
+    client = dynamodb_helpers.create_dynamodb_client(region_name="us-east-1")
+    records = list(dynamodb_helpers.batch_get(table, keys, client=client))
+    assert get_ids(records) == list(range(0, 50, 2))
+    assert all(type(record["number"]) is int for record in records)
+
+
+def test_batch_get_drops_equal_keys(dynamodb):
+    """
+    Purpose:
+        Test that keys DynamoDB considers equal (1, Decimal("1"), and
+        Decimal("1.0")) are only requested once
+    Args:
+        dynamodb (Fixture): Mocked DynamoDB Resource
+    Return:
+        N/A
+    """
+
+    table = dynamodb_helpers.create_table(
+        dynamodb, "number-table", {"name": "id", "type": "N"}
+    )
+    table.put_item(Item={"id": 1})
+    keys = [{"id": 1}, {"id": Decimal("1")}, {"id": Decimal("1.0")}, {"id": 2}]
+
+    assert [len(batch) for batch in dynamodb_helpers._get_key_batches(keys, 3)] == [2]
+    assert list(dynamodb_helpers.batch_get(table, keys)) == [{"id": Decimal("1")}]
+    client = dynamodb_helpers.create_dynamodb_client(region_name="us-east-1")
+    assert list(dynamodb_helpers.batch_get(table, keys, client=client)) == [{"id": 1}]
+
+
+def test_batch_get_retries_unprocessed_keys():
+    """
+    Purpose:
+        Test that UnprocessedKeys are retried until processed, and raised
+        once the retries run out
+    Args:
+        N/A
+    Return:
+        N/A
+    """
+
+    table = mock.Mock()
+    table.name = "test-table"
+    table.meta.client.batch_get_item.side_effect = [
+        {
+            "Responses": {"test-table": [{"id": "a"}]},
+            "UnprocessedKeys": {"test-table": {"Keys": [{"id": "b"}]}},
+        },
+        {"Responses": {"test-table": [{"id": "b"}]}},
+    ]
+
+    with mock.patch.object(dynamodb_helpers.retry_helpers, "sleep_with_backoff"):
+        records = list(dynamodb_helpers.batch_get(table, [{"id": "a"}, {"id": "b"}]))
+        assert records == [{"id": "a"}, {"id": "b"}]
+
+        table.meta.client.batch_get_item.side_effect = None
+        table.meta.client.batch_get_item.return_value = {
+            "UnprocessedKeys": {"test-table": {"Keys": [{"id": "a"}]}}
+        }
+        with pytest.raises(Exception, match="Still Unprocessed"):
+            list(dynamodb_helpers.batch_get(table, [{"id": "a"}], max_retries=2))
+
+
+def test_bulk_insert_records(dynamodb):
+    """
+    Purpose:
+        Test that records are written in batches and records with keys
+        DynamoDB considers equal are deduplicated (the last one wins)
+    Args:
+        dynamodb (Fixture): Mocked DynamoDB Resource
+    Return:
+        N/A
+    """
+
+    table = dynamodb_helpers.create_table(
+        dynamodb, "number-table", {"name": "id", "type": "N"}
+    )
+    records = [{"id": index, "value": "first"} for index in range(60)]
+    insert_summary = dynamodb_helpers.bulk_insert_records(
+        table, iter(records), num_workers=2, overwrite_by_pkeys=["id"]
+    )
+    assert insert_summary["inserted"] == 60
+    assert insert_summary["failed"] == []
+    assert len(list(dynamodb_helpers.parallel_scan(table, segments=2))) == 60
+
+    records = [{"id": index, "value": "first"} for index in range(10)]
+    records += [
+        {"id": Decimal("1.0"), "value": "last"},
+        {"id": Decimal("2"), "value": "last"},
+    ]
+    batches = list(dynamodb_helpers._get_write_batches(records, ["id"]))
+    assert [len(batch) for batch in batches] == [10]
+
+    insert_summary = dynamodb_helpers.bulk_insert_records(
+        table, records, overwrite_by_pkeys=["id"]
+    )
+    assert insert_summary["failed"] == []
+    assert table.get_item(Key={"id": 1})["Item"]["value"] == "last"
+    assert table.get_item(Key={"id": 2})["Item"]["value"] == "last"
+    assert table.get_item(Key={"id": 3})["Item"]["value"] == "first"
+
+
+def test_bulk_insert_records_retries_unprocessed_items():
+    """
+    Purpose:
+        Test that UnprocessedItems are retried, and returned as failed once
+        the retries run out
+    Args:
+        N/A
+    Return:
+        N/A
+    """
+
+    table = mock.Mock()
+    table.name = "test-table"
+    unprocessed = {"test-table": [{"PutRequest": {"Item": {"id": "b"}}}]}
+    table.meta.client.batch_write_item.side_effect = [
+        {"UnprocessedItems": unprocessed, "ConsumedCapacity": [{"CapacityUnits": 1}]},
+        {"ConsumedCapacity": [{"CapacityUnits": 1}]},
+    ]
+
+    with mock.patch.object(dynamodb_helpers.retry_helpers, "sleep_with_backoff"):
+        insert_summary = dynamodb_helpers.bulk_insert_records(
+            table, [{"id": "a"}, {"id": "b"}]
+        )
+        assert insert_summary["inserted"] == 2
+        assert insert_summary["consumed_wcu"] == 2
+
+        table.meta.client.batch_write_item.side_effect = None
+        table.meta.client.batch_write_item.return_value = {
+            "UnprocessedItems": unprocessed
+        }
+        insert_summary = dynamodb_helpers.bulk_insert_records(
+            table, [{"id": "a"}, {"id": "b"}], max_retries=2
+        )
+        assert insert_summary["inserted"] == 1
+        assert insert_summary["failed"] == [{"id": "b"}]
+
+
+def test_get_record_reads_through_cache(table):
+    """
+    Purpose:
+        Test that records (and missing records) are cached, and that writes
+        through the record functions invalidate them
+    Args:
+        table (Fixture): Mocked table
+    Return:
+        N/A
+    """
+
+    cache = dynamodb_helpers.ItemCache()
+
+    def get(key_id):
+        return dynamodb_helpers.get_record(table, {"id": key_id}, cache=cache)
+
+    with mock.patch.object(table, "get_item", wraps=table.get_item) as get_item:
+        assert get("1")["number"] == 1
+        assert get("1")["number"] == 1
+        assert get("missing") is None
+        assert get("missing") is None
+        assert get_item.call_count == 2
+
+        dynamodb_helpers.insert_record(table, {"id": "1", "number": 100}, cache=cache)
+        dynamodb_helpers.insert_records(table, [{"id": "missing"}], cache=cache)
+        assert get("1")["number"] == 100
+        assert get("missing") == {"id": "missing"}
+        assert get_item.call_count == 4
+
+        dynamodb_helpers.delete_record(table, {"id": "1"}, cache=cache)
+        assert get("1") is None
+        cache.invalidate_table(table.name)
+        assert get("missing") == {"id": "missing"}
+        assert get_item.call_count == 6
+
+
+def test_item_cache_generations_are_per_key(table):
+    """
+    Purpose:
+        Test that a write only stops in-flight reads of the same key (or
+        table) from being cached
+    Args:
+        table (Fixture): Mocked table
+    Return:
+        N/A
+    """
+
+    cache = dynamodb_helpers.ItemCache(max_size=2)
+    generation = cache.get_generation(table, {"id": "1"})
+    cache.invalidate_record(table, {"id": "2"})
+    cache.set_item(table, {"id": "1"}, {"id": "1"}, generation)
+    assert cache.get_item(table, {"id": "1"}) == {"id": "1"}
+
+    generation = cache.get_generation(table, {"id": "1"})
+    cache.invalidate_record(table, {"id": "1"})
+    cache.set_item(table, {"id": "1"}, {"id": "1"}, generation)
+    assert cache.get_item(table, {"id": "1"}) is dynamodb_helpers._ITEM_NOT_CACHED
+
+    # A write is still seen once its generation is dropped from the history
+    generation = cache.get_generation(table, {"id": "3"})
+    for index in range(3, 6):
+        cache.invalidate_record(table, {"id": str(index)})
+    cache.set_item(table, {"id": "3"}, {"id": "3"}, generation)
+    assert cache.get_item(table, {"id": "3"}) is dynamodb_helpers._ITEM_NOT_CACHED
+
+    generation = cache.get_generation(table, {"id": "1"})
+    cache.invalidate_table(table.name)
+    cache.set_item(table, {"id": "1"}, {"id": "1"}, generation)
+    assert cache.get_item(table, {"id": "1"}) is dynamodb_helpers._ITEM_NOT_CACHED
+
+
+def test_failed_write_raises_original_error(table):
+    """
+    Purpose:
+        Test that invalidating the cache after a failed write of a record
+        without its key does not hide the error of the write
+    Args:
+        table (Fixture): Mocked table
+    Return:
+        N/A
+    """
+
+    cache = dynamodb_helpers.ItemCache()
+
+    with pytest.raises(ClientError):
+        dynamodb_helpers.insert_record(table, {"number": 1}, cache=cache)
+
+
+def test_create_dynamodb_client_for_table(table):
+    """
+    Purpose:
+        Test that the client for a table is low-level and connects with the
+        table's credentials, region, and endpoint
+    Args:
+        table (Fixture): Mocked table
+    Return:
+        N/A
+    """
+
+    client = dynamodb_helpers.create_dynamodb_client_for_table(table)
+    item = client.get_item(TableName=table.name, Key={"id": {"S": "1"}})["Item"]
+    assert item == {"id": {"S": "1"}, "number": {"N": "1"}}
+
+    local_table = boto3.resource(
+        "dynamodb",
+        region_name="eu-west-1",
+        endpoint_url="http://localhost:8000",
+        aws_access_key_id="local-key",
+        aws_secret_access_key="local-secret",
+    ).Table("local-table")
+    client = dynamodb_helpers.create_dynamodb_client_for_table(local_table)
+    assert client.meta.region_name == "eu-west-1"
+    assert client.meta.endpoint_url == "http://localhost:8000"
+    assert client._get_credentials().access_key == "local-key"
+
+
+def test_rate_limiter_from_table(dynamodb, fake_clock):
+    """
+    Purpose:
+        Test that a limiter is sized from a provisioned table's throughput,
+        and that an on-demand table is not limited
+    Args:
+        dynamodb (Fixture): Mocked DynamoDB Resource
+        fake_clock (Fixture): Patched clock
+    Return:
+        N/A
+    """
+
+    provisioned = dynamodb_helpers.create_table(
+        dynamodb, "provisioned", {"name": "id", "type": "S"}, rcu=20, wcu=10
+    )
+    on_demand = dynamodb.create_table(
+        TableName="on-demand",
+        KeySchema=[{"AttributeName": "id", "KeyType": "HASH"}],
+        AttributeDefinitions=[{"AttributeName": "id", "AttributeType": "S"}],
+        BillingMode="PAY_PER_REQUEST",
+    )
+
+    rate_limiter = dynamodb_helpers.CapacityRateLimiter.from_table(
+        provisioned, utilization=0.5
+    )
+    stats = rate_limiter.get_stats()
+    assert (stats["read"]["rate"], stats["read"]["tokens"]) == (10, 10)
+    assert (stats["write"]["rate"], stats["write"]["tokens"]) == (5, 5)
+
+    rate_limiter = dynamodb_helpers.CapacityRateLimiter.from_table(on_demand)
+    for _ in range(100):
+        assert rate_limiter.wait("read") == 0
+        rate_limiter.consume("read", 10)
+    stats = rate_limiter.get_stats()
+    assert stats["read"]["rate"] is None
+    assert stats["read"]["consumed"] == 1000
+    assert fake_clock.sleeps == []
+
+
+def test_rate_limiter_carries_debt(fake_clock):
+    """
+    Purpose:
+        Test that a request consuming more than the available tokens puts
+        the bucket into debt, and the next request waits until it is paid
+    Args:
+        fake_clock (Fixture): Patched clock
+    Return:
+        N/A
+    """
+
+    rate_limiter = dynamodb_helpers.CapacityRateLimiter(read_capacity=10)
+
+    assert rate_limiter.wait("read") == 0
+    rate_limiter.consume("read", 25)
+    assert rate_limiter.get_stats()["read"]["tokens"] == -15
+
+    waited_seconds = rate_limiter.wait("read")
+
+    assert waited_seconds == pytest.approx(1.501)
+    assert fake_clock.now == pytest.approx(1001.501)
+    stats = rate_limiter.get_stats()["read"]
+    assert stats["waited_seconds"] == pytest.approx(1.501)
+    # The second request reserved the average cost of the first
+    assert stats["reserved"] == 25
+    assert stats["tokens"] == pytest.approx(-24.99)
+
+
+def test_rate_limiter_reserves_estimated_cost(fake_clock):
+    """
+    Purpose:
+        Test that requests admitted before any of them consume reserve their
+        estimated cost, so concurrent requests cannot all be admitted on the
+        same tokens, and that consume settles each reservation
+    Args:
+        fake_clock (Fixture): Patched clock
+    Return:
+        N/A
+    """
+
+    rate_limiter = dynamodb_helpers.CapacityRateLimiter(write_capacity=5)
+
+    # With nothing consumed yet, every request is estimated at 1 unit
+    for _ in range(5):
+        assert rate_limiter.wait("write") == 0
+    stats = rate_limiter.get_stats()["write"]
+    assert (stats["tokens"], stats["reserved"]) == (0, 5)
+    # The sixth request waits until the bucket refills instead of piling on
+    assert rate_limiter.wait("write") == pytest.approx(0.001)
+    assert fake_clock.sleeps == [pytest.approx(0.001)]
+
+    for _ in range(6):
+        rate_limiter.consume("write", 2)
+    stats = rate_limiter.get_stats()["write"]
+    assert stats["reserved"] == pytest.approx(0)
+    # 5 units of burst and 0.005 earned while waiting, less the 12 consumed
+    assert stats["tokens"] == pytest.approx(5 + 0.005 - 12)
+    assert (stats["requests"], stats["consumed"]) == (6, 12)
+
+    # Requests are now estimated at the average of 2 units
+    rate_limiter.wait("write")
+    assert rate_limiter.get_stats()["write"]["reserved"] == 2
+
+
+def test_rate_limiter_meters_requests(table):
+    """
+    Purpose:
+        Test that insert_record, query, parallel_scan, and batch_get pace
+        their requests and take the ConsumedCapacity of every response out
+        of the limiter
+    Args:
+        table (Fixture): Mocked table
+    Return:
+        N/A
+    """
+
+    rate_limiter = dynamodb_helpers.CapacityRateLimiter(
+        read_capacity=1000, write_capacity=1000
+    )
+
+    dynamodb_helpers.insert_record(
+        table, {"id": "50", "number": 50}, rate_limiter=rate_limiter
+    )
+    stats = rate_limiter.get_stats()
+    assert (stats["write"]["requests"], stats["write"]["consumed"]) == (1, 1)
+
+    items = list(
+        dynamodb_helpers.query(
+            table, Key("id").eq("1"), rate_limiter=rate_limiter
+        )
+    )
+    assert get_ids(items) == [1]
+    stats = rate_limiter.get_stats()
+    assert (stats["read"]["requests"], stats["read"]["consumed"]) == (1, 1)
+
+    scan = mock.Mock(wraps=table.scan)
+    with mock.patch.object(table, "scan", scan):
+        items = list(
+            dynamodb_helpers.parallel_scan(
+                table, segments=2, page_size=10, rate_limiter=rate_limiter
+            )
+        )
+    assert get_ids(items) == list(range(51))
+    stats = rate_limiter.get_stats()
+    assert stats["read"]["requests"] == 1 + scan.call_count
+    scan_consumed = stats["read"]["consumed"] - 1
+    assert scan_consumed > 0
+
+    keys = [{"id": str(index)} for index in range(51)]
+    items = list(dynamodb_helpers.batch_get(table, keys, rate_limiter=rate_limiter))
+    assert get_ids(items) == list(range(51))
+    stats = rate_limiter.get_stats()["read"]
+    assert stats["requests"] == 2 + scan.call_count
+    assert stats["consumed"] > 1 + scan_consumed
+    assert stats["reserved"] == pytest.approx(0)
+
+
+def test_deserialize_item():
+    """
+    Purpose:
+        Test that every attribute type of the low-level format is converted
+        to its Python value
+    Args:
+        N/A
+    Return:
+        N/A
+    """
+
+    item = {
+        "string": {"S": "text"},
+        "int": {"N": "12345678901234567890"},
+        "float": {"N": "1.5"},
+        "exponent": {"N": "1E+3"},
+        "numbers": {"NS": ["1", "2.5"]},
+        "binary": {"B": b"\x00\x01"},
+        "binaries": {"BS": [b"\x00", b"\x01"]},
+        "strings": {"SS": ["a", "b"]},
+        "bool": {"BOOL": True},
+        "null": {"NULL": True},
+        "map": {"M": {"nested": {"L": [{"N": "1"}, {"S": "a"}]}}},
+        "list": {"L": [{"M": {"n": {"N": "-2"}}}, {"NULL": True}]},
+    }
+
+    assert dynamodb_helpers.deserialize_item(item) == {
+        "string": "text",
+        "int": 12345678901234567890,
+        "float": 1.5,
+        "exponent": 1000.0,
+        "numbers": {1, 2.5},
+        "binary": b"\x00\x01",
+        "binaries": {b"\x00", b"\x01"},
+        "strings": {"a", "b"},
+        "bool": True,
+        "null": None,
+        "map": {"nested": [1, "a"]},
+        "list": [{"n": -2}, None],
+    }
+    assert type(dynamodb_helpers.deserialize_item(item)["int"]) is int
+
+
+def test_items_to_columns():
+    """
+    Purpose:
+        Test that items become columns with None for missing attributes, in
+        the order attributes are first seen or the order asked for
+    Args:
+        N/A
+    Return:
+        N/A
+    """
+
+    items = [{"id": 1, "name": "a"}, {"id": 2}, {"id": 3, "late": True}]
+
+    assert dynamodb_helpers.items_to_columns(iter(items)) == {
+        "id": [1, 2, 3],
+        "name": ["a", None, None],
+        "late": [None, None, True],
+    }
+    assert dynamodb_helpers.items_to_columns(items, ["late", "missing"]) == {
+        "late": [None, None, True],
+        "missing": [None, None, None],
+    }
+    assert dynamodb_helpers.items_to_columns([]) == {}
+
+
+def test_items_to_columns_as_numpy():
+    """
+    Purpose:
+        Test the dtypes of NumPy columns, and that ints mixed with missing
+        values (or floats) are never rounded through float64
+    Args:
+        N/A
+    Return:
+        N/A
+    """
+
+    numpy = pytest.importorskip("numpy")
+    large = 2**53 + 1
+    items = [
+        {"int": 1, "sparse": large, "float": 1.5, "mixed": 1, "bool": True},
+        {"int": 2, "float": None, "mixed": 2.5, "bool": False, "big": 2**64},
+        {"int": 3, "sparse": 3, "mixed": large, "bool": True, "big": 1},
+    ]
+
+    columns = dynamodb_helpers.items_to_columns(items, as_numpy=True)
+
+    assert columns["int"].dtype == numpy.int64
+    assert columns["int"].tolist() == [1, 2, 3]
+    assert columns["sparse"].dtype == object
+    assert columns["sparse"].tolist() == [large, None, 3]
+    assert columns["float"].dtype == numpy.float64
+    assert columns["float"][0] == 1.5
+    assert numpy.isnan(columns["float"][1:]).all()
+    assert columns["mixed"].dtype == object
+    assert columns["mixed"].tolist() == [1, 2.5, large]
+    assert columns["bool"].dtype == bool
+    assert columns["big"].dtype == object
+    assert columns["big"].tolist() == [None, 2**64, 1]
+
+    columns = dynamodb_helpers.items_to_columns(
+        [{"value": 1}, {"value": 2.5}], as_numpy=True
+    )
+    assert columns["value"].dtype == numpy.float64
+    with mock.patch.object(dynamodb_helpers, "numpy", None):
+        with pytest.raises(Exception, match="numpy"):
+            dynamodb_helpers.items_to_columns(items, as_numpy=True)
+
+
+def test_create_dynamodb_client(table):
+    """
+    Purpose:
+        Test that a pooled low-level client is returned for the region and
+        credentials asked for, and that it reads items in the low-level
+        format
+    Args:
+        table (Fixture): Mocked table
+    Return:
+        N/A
+    """
+
+    dynamodb_helpers.session_helpers.invalidate_resources("dynamodb")
+    try:
+        client = dynamodb_helpers.create_dynamodb_client(region_name="us-east-1")
+        assert client is dynamodb_helpers.create_dynamodb_client(
+            region_name="us-east-1"
+        )
+        assert client.meta.region_name == "us-east-1"
+        response = client.get_item(TableName=table.name, Key={"id": {"S": "1"}})
+        assert response["Item"] == {"id": {"S": "1"}, "number": {"N": "1"}}
+
+        other_client = dynamodb_helpers.create_dynamodb_client(
+            region_name="us-west-2", access_key="other", secret_key="other"
+        )
+        assert other_client is not client
+        assert other_client.meta.region_name == "us-west-2"
+        assert other_client._get_credentials().access_key == "other"
+    finally:
+        dynamodb_helpers.session_helpers.invalidate_resources("dynamodb")
+
+
+def test_query_limit_and_page_size(events):
+    """
+    Purpose:
+        Test that page_size caps the items evaluated per request and limit
+        the items yielded, with the last request shrunk to what is left
+        unless a filter may drop items
+    Args:
+        events (Fixture): Mocked table with a sort key
+    Return:
+        N/A
+    """
+
+    def query(**query_args):
+        query_spy = mock.Mock(wraps=events.query)
+        with mock.patch.object(events, "query", query_spy):
+            items = list(
+                dynamodb_helpers.query(events, Key("user").eq("a"), **query_args)
+            )
+        limits = [call.kwargs.get("Limit") for call in query_spy.call_args_list]
+        return [int(item["ts"]) for item in items], limits
+
+    assert query(limit=7, page_size=3) == (list(range(7)), [3, 3, 1])
+    assert query(limit=5) == (list(range(5)), [5])
+    items, limits = query(page_size=10)
+    assert items == list(range(30))
+    assert set(limits) == {10}
+    assert query() == (list(range(30)), [None])
+
+    # A filter may drop evaluated items, so every request keeps page_size
+    items, limits = query(
+        limit=3, page_size=4, filter_expression=Attr("ts").between(5, 9)
+    )
+    assert items == [5, 6, 7]
+    assert limits == [4, 4]
+
+
+def test_query_filter_and_resume(events):
+    """
+    Purpose:
+        Test that a filter is applied, that a query resumes after
+        exclusive_start_key, and that items come in either sort key order
+    Args:
+        events (Fixture): Mocked table with a sort key
+    Return:
+        N/A
+    """
+
+    items = dynamodb_helpers.query(
+        events, Key("user").eq("a"), filter_expression=Attr("ts").gte(25)
+    )
+    assert [int(item["ts"]) for item in items] == [25, 26, 27, 28, 29]
+
+    items = dynamodb_helpers.query(
+        events,
+        Key("user").eq("a"),
+        exclusive_start_key={"user": "a", "ts": 9},
+        page_size=7,
+    )
+    assert [int(item["ts"]) for item in items] == list(range(10, 30))
+
+    items = dynamodb_helpers.query(
+        events,
+        "#user = :user AND ts < :ts",
+        expression_attribute_names={"#user": "user"},
+        expression_attribute_values={":user": "b", ":ts": 3},
+        scan_forward=False,
+    )
+    assert [int(item["ts"]) for item in items] == [2, 1, 0]
+
+
+def test_query_capacity_callback(events):
+    """
+    Purpose:
+        Test that the capacity callback is called with the ConsumedCapacity
+        of every page
+    Args:
+        events (Fixture): Mocked table with a sort key
+    Return:
+        N/A
+    """
+
+    consumed_capacities = []
+    query_spy = mock.Mock(wraps=events.query)
+    with mock.patch.object(events, "query", query_spy):
+        items = list(
+            dynamodb_helpers.query(
+                events,
+                Key("user").eq("a"),
+                page_size=10,
+                capacity_callback=consumed_capacities.append,
+            )
+        )
+
+    assert len(items) == 30
+    assert len(consumed_capacities) == query_spy.call_count
+    assert all(
+        call.kwargs["ReturnConsumedCapacity"] == "INDEXES"
+        for call in query_spy.call_args_list
+    )
+    assert all(
+        capacity["TableName"] == events.name and capacity["CapacityUnits"] > 0
+        for capacity in consumed_capacities
+    )
+
+
+def test_query_with_client(events):
+    """
+    Purpose:
+        Test that a query through a low-level client builds condition
+        objects into expressions, serializes the values, resumes after a
+        low-level key, and yields deserialized items
+    Args:
+        events (Fixture): Mocked table with a sort key
+    Return:
+        N/A
+    """
+
+    client = dynamodb_helpers.create_dynamodb_client_for_table(events)
+    query_spy = mock.Mock(wraps=client.query)
+    with mock.patch.object(client, "query", query_spy):
+        items = list(
+            dynamodb_helpers.query(
+                events,
+                Key("user").eq("a") & Key("ts").gt(20),
+                filter_expression=Attr("ts").lt(25),
+                exclusive_start_key={"user": {"S": "a"}, "ts": {"N": "21"}},
+                limit=10,
+                client=client,
+            )
+        )
+
+    assert items == [{"user": "a", "ts": ts} for ts in range(22, 25)]
+    assert all(type(item["ts"]) is int for item in items)
+    query_args = query_spy.call_args.kwargs
+    assert query_args["TableName"] == events.name
+    assert isinstance(query_args["KeyConditionExpression"], str)
+    assert isinstance(query_args["FilterExpression"], str)
+    assert sorted(query_args["ExpressionAttributeNames"].values()) == [
+        "ts",
+        "ts",
+        "user",
+    ]
+    assert sorted(
+        list(value.items())[0]
+        for value in query_args["ExpressionAttributeValues"].values()
+    ) == [("N", "20"), ("N", "25"), ("S", "a")]
+
+    items = dynamodb_helpers.query(
+        events,
+        "#user = :user AND ts < :ts",
+        expression_attribute_names={"#user": "user"},
+        expression_attribute_values={":user": "b", ":ts": 2},
+        client=client,
+    )
+    assert list(items) == [{"user": "b", "ts": 0}, {"user": "b", "ts": 1}]
@@ -0,0 +1,361 @@
+#!/usr/bin/env python3
+"""
+    Purpose:
+        Test File for extended_payload_helpers.py
+"""
+
+# Python Library Imports
+import functools
+import json
+import os
+import sys
+import time
+import boto3
+import pytest
+from botocore.exceptions import ClientError
+from moto import mock_aws
+from unittest import mock
+
+# Import File to Test
+from aws_helpers import extended_payload_helpers, sqs_helpers
+from aws_helpers.sqs_consumer import SQSConsumer
+
+
+###
+# Fixtures
+###
+
+
+@pytest.fixture
+def aws(monkeypatch):
+    """
+    Purpose:
+        Return a mocked S3 Resource, bucket, and SQS queue
+    Args:
+        monkeypatch (Fixture): pytest monkeypatch fixture
+    Return:
+        aws (Dict): Dict with s3, bucket, and queue
+    """
+
+    monkeypatch.setenv("AWS_ACCESS_KEY_ID", "testing")
+    monkeypatch.setenv("AWS_SECRET_ACCESS_KEY", "testing")
+    monkeypatch.setenv("AWS_DEFAULT_REGION", "us-east-1")
+
+    with mock_aws():
+        s3 = boto3.resource("s3", region_name="us-east-1")
+        sqs = boto3.resource("sqs", region_name="us-east-1")
+        yield {
+            "s3": s3,
+            "bucket": s3.create_bucket(Bucket="payload-bucket"),
+            "queue": sqs.create_queue(QueueName="test-queue"),
+        }
+
+
+###
+# Mocked Functions
+###
+
+
+LARGE_BODY = "large payload " * 1000
+THRESHOLD = 1024
+
+
+def get_keys(bucket):
+    """
+    Purpose:
+        Return the keys stored in a bucket
+    Args:
+        bucket (S3 Bucket Object): Bucket to list
+    Return:
+        keys (List of Strings): Keys in the bucket
+    """
+
+    return [obj.key for obj in bucket.objects.all()]
+
+
+def receive_all(queue):
+    """
+    Purpose:
+        Receive every visible message in a queue
+    Args:
+        queue (SQS Queue Object): Queue to drain
+    Return:
+        msgs (List of SQS Message Objects): Received messages
+    """
+
+    msgs = []
+    while True:
+        batch = sqs_helpers.get_messages(queue, wait_time=0)
+        if not batch:
+            return msgs
+        msgs.extend(batch)
+
+
+###
+# Test Payload
+###
+
+
+def test_offload_payload_under_threshold(aws):
+    """
+    Purpose:
+        Test that small messages are returned unchanged and not offloaded
+    Args:
+        aws (Fixture): Mocked AWS resources
+    Return:
+        N/A
+    """
+
+    entry = extended_payload_helpers.offload_payload(
+        aws["bucket"], "small", threshold=THRESHOLD
+    )
+
+    assert entry == {"MessageBody": "small"}
+    assert get_keys(aws["bucket"]) == []
+
+
+@pytest.mark.parametrize("compression", [None, "zlib"])
+def test_offload_payload_round_trip(aws, compression):
+    """
+    Purpose:
+        Test that large messages are offloaded to S3 and resolved lazily
+    Args:
+        aws (Fixture): Mocked AWS resources
+        compression (String): Compression of the offloaded body
+    Return:
+        N/A
+    """
+
+    entry = extended_payload_helpers.offload_payload(
+        aws["bucket"],
+        {
+            "MessageBody": LARGE_BODY,
+            "MessageAttributes": {"kind": {"DataType": "String", "StringValue": "x"}},
+        },
+        threshold=THRESHOLD,
+        compression=compression,
+    )
+    pointer_class, location = json.loads(entry["MessageBody"])
+
+    assert pointer_class == extended_payload_helpers.POINTER_CLASS
+    assert location["s3BucketName"] == "payload-bucket"
+    assert get_keys(aws["bucket"]) == [location["s3Key"]]
+    assert entry["MessageAttributes"]["kind"]["StringValue"] == "x"
+    assert entry["MessageAttributes"]["ExtendedPayloadSize"]["StringValue"] == str(
+        len(LARGE_BODY)
+    )
+
+    payload = extended_payload_helpers.get_payload(aws["s3"], entry)
+    assert payload.is_offloaded
+    assert payload.body == LARGE_BODY
+    assert b"".join(payload.iter_chunks(chunk_size=100)) == LARGE_BODY.encode()
+
+
+def test_invalid_compression(aws):
+    """
+    Purpose:
+        Test that an unknown compression raises
+    Args:
+        aws (Fixture): Mocked AWS resources
+    Return:
+        N/A
+    """
+
+    with pytest.raises(ValueError):
+        extended_payload_helpers.offload_payload(
+            aws["bucket"], LARGE_BODY, threshold=THRESHOLD, compression="lz4"
+        )
+
+
+def test_send_and_delete_messages(aws):
+    """
+    Purpose:
+        Test that sent messages resolve to their bodies and that deleting
+        them deletes the offloaded bodies
+    Args:
+        aws (Fixture): Mocked AWS resources
+    Return:
+        N/A
+    """
+
+    msgs = [f"{index} {LARGE_BODY}" for index in range(5)] + ["small"] * 5
+    send_summary = extended_payload_helpers.send_messages(
+        aws["queue"], iter(msgs), aws["bucket"], threshold=THRESHOLD
+    )
+
+    assert send_summary["sent"] == 10
+    assert send_summary["failed"] == []
+    assert len(get_keys(aws["bucket"])) == 5
+
+    received = receive_all(aws["queue"])
+    bodies = [
+        extended_payload_helpers.get_payload(aws["s3"], msg).body for msg in received
+    ]
+    assert sorted(bodies) == sorted(msgs)
+
+    failed_msgs = extended_payload_helpers.delete_messages(
+        aws["queue"], received, aws["s3"]
+    )
+    assert failed_msgs == []
+    assert get_keys(aws["bucket"]) == []
+
+
+def test_send_messages_streams_in_chunks(aws):
+    """
+    Purpose:
+        Test that messages are offloaded a chunk at a time instead of reading
+        the whole input up front
+    Args:
+        aws (Fixture): Mocked AWS resources
+    Return:
+        N/A
+    """
+
+    pulled = []
+
+    def generate_msgs():
+        for index in range(100):
+            pulled.append(index)
+            yield f"msg {index}"
+
+    def offload(msg):
+        return {"MessageBody": msg}, None
+
+    with extended_payload_helpers.ThreadPoolExecutor(max_workers=2) as executor:
+        entries = extended_payload_helpers._offload_in_chunks(
+            executor, offload, generate_msgs(), [], 20
+        )
+        assert next(entries) == {"MessageBody": "msg 0"}
+        assert len(pulled) == 20
+        assert len(list(entries)) == 99
+
+
+def test_send_messages_deletes_orphaned_payloads(aws):
+    """
+    Purpose:
+        Test that bodies of messages that fail to send are deleted
+    Args:
+        aws (Fixture): Mocked AWS resources
+    Return:
+        N/A
+    """
+
+    queue = mock.Mock()
+    queue.send_messages.side_effect = ClientError(
+        {"Error": {"Code": "AccessDenied", "Message": "Denied"}}, "SendMessageBatch"
+    )
+    send_summary = extended_payload_helpers.send_messages(
+        queue, [LARGE_BODY, LARGE_BODY], aws["bucket"], threshold=THRESHOLD
+    )
+
+    assert send_summary["sent"] == 0
+    assert [entry["Code"] for entry in send_summary["failed"]] == ["AccessDenied"] * 2
+    assert get_keys(aws["bucket"]) == []
+
+
+def test_send_messages_records_offload_failures(aws):
+    """
+    Purpose:
+        Test that a message that fails to offload is returned as failed while
+        the rest are sent
+    Args:
+        aws (Fixture): Mocked AWS resources
+    Return:
+        N/A
+    """
+
+    upload_stream = extended_payload_helpers.s3_helpers.upload_stream
+
+    def flaky_upload_stream(bucket, key, chunks, **kwargs):
+        chunks = list(chunks)
+        if chunks[0].startswith(b"bad"):
+            raise Exception("Upload Failed")
+        return upload_stream(bucket, key, chunks, **kwargs)
+
+    with mock.patch.object(
+        extended_payload_helpers.s3_helpers, "upload_stream", flaky_upload_stream
+    ):
+        send_summary = extended_payload_helpers.send_messages(
+            aws["queue"],
+            ["bad " + LARGE_BODY, "good " + LARGE_BODY, "small"],
+            aws["bucket"],
+            threshold=THRESHOLD,
+        )
+
+    assert send_summary["sent"] == 2
+    assert len(send_summary["failed"]) == 1
+    assert send_summary["failed"][0]["Code"] == "PayloadOffloadFailed"
+    assert send_summary["failed"][0]["MessageBody"].startswith("bad ")
+    assert len(get_keys(aws["bucket"])) == 1
+
+
+def test_consumer_deletes_payloads(aws):
+    """
+    Purpose:
+        Test that a consumer acking with delete_messages deletes the
+        offloaded bodies of handled messages
+    Args:
+        aws (Fixture): Mocked AWS resources
+    Return:
+        N/A
+    """
+
+    extended_payload_helpers.send_messages(
+        aws["queue"], [LARGE_BODY] * 3, aws["bucket"], threshold=THRESHOLD
+    )
+    bodies = []
+    consumer = SQSConsumer(
+        aws["queue"],
+        lambda msg: bodies.append(
+            extended_payload_helpers.get_payload(aws["s3"], msg).body
+        ),
+        wait_time=1,
+        ack_interval=0.1,
+        delete_messages=functools.partial(
+            extended_payload_helpers.delete_messages, s3=aws["s3"]
+        ),
+    )
+    consumer.start()
+    deadline = time.monotonic() + 10
+    while consumer.get_stats()["deleted"] < 3 and time.monotonic() < deadline:
+        time.sleep(0.05)
+    consumer.stop()
+
+    assert bodies == [LARGE_BODY] * 3
+    assert get_keys(aws["bucket"]) == []
+
+
+def test_failed_forward_keeps_existing_payloads(aws):
+    """
+    Purpose:
+        Test that forwarding an already offloaded message that fails to send
+        or publish keeps its body, while bodies offloaded by the failed call
+        are deleted
+    Args:
+        aws (Fixture): Mocked AWS resources
+    Return:
+        N/A
+    """
+
+    forwarded = extended_payload_helpers.offload_payload(
+        aws["bucket"], LARGE_BODY, threshold=THRESHOLD
+    )
+    forwarded_key = get_keys(aws["bucket"])
+
+    queue = mock.Mock()
+    queue.send_messages.side_effect = ClientError(
+        {"Error": {"Code": "AccessDenied", "Message": "Denied"}}, "SendMessageBatch"
+    )
+    send_summary = extended_payload_helpers.send_messages(
+        queue, [forwarded, LARGE_BODY], aws["bucket"], threshold=THRESHOLD
+    )
+    assert len(send_summary["failed"]) == 2
+    assert get_keys(aws["bucket"]) == forwarded_key
+
+    topic = mock.Mock()
+    topic.publish.side_effect = Exception("Publish Failed")
+    with pytest.raises(Exception, match="Publish Failed"):
+        extended_payload_helpers.publish_message(
+            topic, forwarded["MessageBody"], aws["bucket"], threshold=THRESHOLD
+        )
+    assert get_keys(aws["bucket"]) == forwarded_key
@@ -0,0 +1,267 @@
+#!/usr/bin/env python3
+"""
+    Purpose:
+        Test File for message_batch_helpers.py
+"""
+
+# Python Library Imports
+import os
+import sys
+import threading
+import time
+import pytest
+from botocore.exceptions import ClientError
+from unittest import mock
+
+# Import File to Test
+from aws_helpers import message_batch_helpers
+
+
+###
+# Fixtures
+###
+
+
+@pytest.fixture
+def no_backoff():
+    """
+    Purpose:
+        Skip the backoff sleeps between retries
+    Args:
+        N/A
+    Return:
+        sleep_with_backoff (Mock): Patched sleep
+    """
+
+    with mock.patch.object(
+        message_batch_helpers.retry_helpers, "sleep_with_backoff"
+    ) as sleep_with_backoff:
+        yield sleep_with_backoff
+
+
+###
+# Mocked Functions
+###
+
+
+def get_client_error(code, status_code=400):
+    """
+    Purpose:
+        Return a ClientError with an error code and HTTP status
+    Args:
+        code (String): Error code
+        status_code (Int): HTTP status code
+    Return:
+        err (ClientError): Client error
+    """
+
+    return ClientError(
+        {
+            "Error": {"Code": code, "Message": code},
+            "ResponseMetadata": {"HTTPStatusCode": status_code},
+        },
+        "PublishBatch",
+    )
+
+
+###
+# Test Payload
+###
+
+
+def test_pack_message_batches_entry_limit():
+    """
+    Purpose:
+        Test that batches hold at most 10 entries
+    Args:
+        N/A
+    Return:
+        N/A
+    """
+
+    failed = []
+    batches = list(
+        message_batch_helpers.pack_message_batches(
+            [str(index) for index in range(25)], failed
+        )
+    )
+
+    assert [len(batch) for batch in batches] == [10, 10, 5]
+    assert batches[0][0] == {"MessageBody": "0"}
+    assert failed == []
+
+
+def test_pack_message_batches_byte_limit():
+    """
+    Purpose:
+        Test that batches stay under 256 KB and oversized messages are failed
+    Args:
+        N/A
+    Return:
+        N/A
+    """
+
+    failed = []
+    body = "x" * (100 * 1024)
+    msgs = [
+        body,
+        {
+            "Message": body,
+            "MessageAttributes": {
+                "key": {"DataType": "String", "StringValue": "value"}
+            },
+        },
+        "x" * (message_batch_helpers.MAX_BATCH_BYTES + 1),
+        body,
+    ]
+    batches = list(
+        message_batch_helpers.pack_message_batches(
+            msgs, failed, body_field="Message", error_field="ErrorMessage"
+        )
+    )
+
+    assert [len(batch) for batch in batches] == [2, 1]
+    for batch in batches:
+        assert (
+            sum(
+                message_batch_helpers.get_message_size(entry, body_field="Message")
+                for entry in batch
+            )
+            <= message_batch_helpers.MAX_BATCH_BYTES
+        )
+    assert len(failed) == 1
+    assert failed[0]["Code"] == "MessageTooLong"
+    assert failed[0]["ErrorMessage"] == "Message exceeds 256 KB"
+
+
+def test_get_message_size_counts_attributes():
+    """
+    Purpose:
+        Test that attribute names, types, and values count toward the size
+    Args:
+        N/A
+    Return:
+        N/A
+    """
+
+    entry = {
+        "MessageBody": "héllo",
+        "MessageAttributes": {
+            "name": {"DataType": "String", "StringValue": "abc"},
+            "blob": {"DataType": "Binary", "BinaryValue": b"\x00\x01"},
+        },
+    }
+
+    assert message_batch_helpers.get_message_size(entry) == (
+        6 + (4 + 6 + 3) + (4 + 6 + 2)
+    )
+
+
+def test_send_batch_retries_failed_entries_together(no_backoff):
+    """
+    Purpose:
+        Test that entries failed without a sender fault are retried together
+        in one new batch, and failures carry the failure fields
+    Args:
+        no_backoff (Fixture): Patched backoff sleep
+    Return:
+        N/A
+    """
+
+    send_entries = mock.Mock(
+        side_effect=[
+            {
+                "Successful": [{"Id": "0"}],
+                "Failed": [
+                    {"Id": "1", "Code": "InternalError", "SenderFault": False},
+                    {"Id": "2", "Code": "InternalError", "SenderFault": False},
+                    {"Id": "3", "Code": "InvalidParameter", "SenderFault": True},
+                ],
+            },
+            {"Successful": [{"Id": "0"}, {"Id": "1"}]},
+        ]
+    )
+    batch = [{"Message": body} for body in "abcd"]
+    sent_count, failed = message_batch_helpers.send_batch(
+        send_entries,
+        batch,
+        3,
+        error_field="ErrorMessage",
+        failure_fields={"TopicArn": "arn"},
+    )
+
+    assert sent_count == 3
+    assert send_entries.call_args_list[1][0][0] == [
+        {"Message": "b", "Id": "0"},
+        {"Message": "c", "Id": "1"},
+    ]
+    assert failed == [
+        {
+            "Message": "d",
+            "TopicArn": "arn",
+            "Code": "InvalidParameter",
+            "ErrorMessage": None,
+        }
+    ]
+
+
+def test_send_batch_retries_throttled_requests(no_backoff):
+    """
+    Purpose:
+        Test that throttled requests are retried and requests that keep
+        failing record every entry as failed
+    Args:
+        no_backoff (Fixture): Patched backoff sleep
+    Return:
+        N/A
+    """
+
+    send_entries = mock.Mock(
+        side_effect=[get_client_error("Throttling"), {"Successful": [{"Id": "0"}]}]
+    )
+    assert message_batch_helpers.send_batch(send_entries, [{"Message": "a"}], 3) == (
+        1,
+        [],
+    )
+
+    send_entries = mock.Mock(side_effect=get_client_error("Throttling"))
+    sent_count, failed = message_batch_helpers.send_batch(
+        send_entries, [{"Message": "a"}, {"Message": "b"}], 2
+    )
+    assert sent_count == 0
+    assert [entry["Code"] for entry in failed] == ["Throttling", "Throttling"]
+    assert send_entries.call_count == 3
+
+
+def test_send_batches_bounds_in_flight():
+    """
+    Purpose:
+        Test that batch sends run concurrently, at most max_workers at once,
+        and their results are combined
+    Args:
+        N/A
+    Return:
+        N/A
+    """
+
+    lock = threading.Lock()
+    running = [0, 0]
+
+    def batch_send():
+        with lock:
+            running[0] += 1
+            running[1] = max(running[1], running[0])
+        time.sleep(0.01)
+        with lock:
+            running[0] -= 1
+        return 10, [{"Code": "Failed"}]
+
+    def generate_batch_sends():
+        for _ in range(20):
+            yield batch_send
+
+    sent_count, failed = message_batch_helpers.send_batches(generate_batch_sends(), 2)
+
+    assert sent_count == 200
+    assert len(failed) == 20
+    assert 1 < running[1] <= 2
@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+    Purpose:
+        Test File for retry_helpers.py
+"""
+
+# Python Library Imports
+import os
+import sys
+import pytest
+from botocore.exceptions import ClientError
+from unittest import mock
+
+# Import File to Test
+from aws_helpers import retry_helpers
+
+
+###
+# Fixtures
+###
+
+
+# None at the Moment
+
+
+###
+# Mocked Functions
+###
+
+
+# None at the Moment
+
+
+###
+# Test Payload
+###
+
+
+@pytest.mark.parametrize(
+    "attempt,expected_cap", [(0, 0.05), (1, 0.1), (3, 0.4), (20, 5.0)]
+)
+def test_get_backoff_delay_is_capped(attempt, expected_cap):
+    """
+    Purpose:
+        Test that the jittered delay is drawn between 0 and the exponential
+        cap, which never exceeds max_delay
+    Args:
+        attempt (Int): Number of the retry
+        expected_cap (Float): Expected upper bound of the delay
+    Return:
+        N/A
+    """
+
+    with mock.patch.object(retry_helpers.random, "uniform") as mock_uniform:
+        mock_uniform.side_effect = lambda low, high: high
+        delay = retry_helpers.get_backoff_delay(attempt)
+
+    mock_uniform.assert_called_once()
+    assert mock_uniform.call_args[0][0] == 0
+    assert delay == pytest.approx(expected_cap)
+
+
+def test_get_backoff_delay_is_random():
+    """
+    Purpose:
+        Test that delays stay within the cap
+    Args:
+        N/A
+    Return:
+        N/A
+    """
+
+    delays = [retry_helpers.get_backoff_delay(2, base_delay=1.0) for _ in range(50)]
+
+    assert all(0 <= delay <= 4.0 for delay in delays)
+    assert len(set(delays)) > 1
+
+
+def test_sleep_with_backoff_sleeps_for_the_delay():
+    """
+    Purpose:
+        Test that sleep_with_backoff sleeps for (and returns) the delay
+    Args:
+        N/A
+    Return:
+        N/A
+    """
+
+    with mock.patch.object(
+        retry_helpers, "get_backoff_delay", return_value=0.25
+    ), mock.patch.object(retry_helpers.time, "sleep") as mock_sleep:
+        assert retry_helpers.sleep_with_backoff(4) == 0.25
+
+    mock_sleep.assert_called_once_with(0.25)
+
+
+@pytest.mark.parametrize(
+    "code,status_code,retryable",
+    [
+        ("ThrottlingException", 400, True),
+        ("AWS.SimpleQueueService.RequestThrottled", 403, True),
+        ("Throttled", 400, True),
+        ("SlowDown", 503, True),
+        ("InternalError", 500, True),
+        ("Unknown", 429, True),
+        ("AccessDenied", 403, False),
+        ("ValidationException", 400, False),
+    ],
+)
+def test_is_retryable_error(code, status_code, retryable):
+    """
+    Purpose:
+        Test that throttling and server errors are retryable and client
+        errors are not
+    Args:
+        code (String): Error code
+        status_code (Int): HTTP status code
+        retryable (Boolean): Expected result
+    Return:
+        N/A
+    """
+
+    err = ClientError(
+        {
+            "Error": {"Code": code, "Message": code},
+            "ResponseMetadata": {"HTTPStatusCode": status_code},
+        },
+        "Operation",
+    )
+
+    assert retry_helpers.is_retryable_error(err) is retryable
+    assert retry_helpers.is_retryable_error(ValueError("Not a ClientError")) is False
@@ -5,13 +5,17 @@
 """
 
 # Python Library Imports
+import itertools
 import os
 import sys
+import boto3
 import pytest
+from boto3.s3.transfer import TransferConfig
+from moto import mock_aws
 from unittest import mock
 
 # Import File to Test
-from aws_helpers import s3_helpers
+from aws_helpers import cache_helpers, s3_helpers
 
 
 ###
@@ -19,7 +23,57 @@ from aws_helpers import s3_helpers
 ###
 
 
-# None at the Moment (Empty Test Suite)
+@pytest.fixture
+def bucket(monkeypatch):
+    """
+    Purpose:
+        Return an empty bucket in a mocked S3
+    Args:
+        monkeypatch (Fixture): pytest monkeypatch fixture
+    Return:
+        bucket (S3 Bucket Object): Mocked bucket
+    """
+
+    monkeypatch.setenv("AWS_ACCESS_KEY_ID", "testing")
+    monkeypatch.setenv("AWS_SECRET_ACCESS_KEY", "testing")
+    monkeypatch.setenv("AWS_DEFAULT_REGION", "us-east-1")
+
+    with mock_aws():
+        s3 = boto3.resource("s3", region_name="us-east-1")
+        yield s3.create_bucket(Bucket="test-bucket")
+
+
+@pytest.fixture
+def multipart_config():
+    """
+    Purpose:
+        Return a TransferConfig that uploads files of 5 MB and up (the S3
+        minimum part size) as multipart, in 5 MB parts
+    Args:
+        N/A
+    Return:
+        transfer_config (TransferConfig Object): Config of the transfers
+    """
+
+    return TransferConfig(
+        multipart_threshold=MIN_PART_SIZE, multipart_chunksize=MIN_PART_SIZE
+    )
+
+
+@pytest.fixture
+def mock_clock():
+    """
+    Purpose:
+        Replace the monotonic clock of cache_helpers with one the test moves
+    Args:
+        N/A
+    Return:
+        clock (List of Floats): Single-item list holding the current time
+    """
+
+    clock = [1000.0]
+    with mock.patch.object(cache_helpers.time, "monotonic", lambda: clock[0]):
+        yield clock
 
 
 ###
@@ -27,7 +81,7 @@ from aws_helpers import s3_helpers
 ###
 
 
-# None at the Moment (Empty Test Suite)
+# None at the Moment
 
 
 ###
@@ -35,4 +89,739 @@ from aws_helpers import s3_helpers
 ###
 
 
-# None at the Moment (Empty Test Suite)
+MIN_PART_SIZE = 5 * 1024 * 1024
+
+
+def write_file(path, size, fill=b"x"):
+    """
+    Purpose:
+        Write a local file of a given size
+    Args:
+        path (String): Path of the file
+        size (Int): Bytes to write
+        fill (Bytes): Byte to fill the file with
+    Return:
+        path (String): Path of the file
+    """
+
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "wb") as file_obj:
+        file_obj.write(fill * size)
+
+    return str(path)
+
+
+def get_etag(bucket, key):
+    """
+    Purpose:
+        Return the ETag S3 reports for an object (without quotes)
+    Args:
+        bucket (S3 Bucket Object): Bucket of the object
+        key (String): Key of the object
+    Return:
+        etag (String): ETag of the object
+    """
+
+    return bucket.Object(key).e_tag.strip('"')
+
+
+@pytest.mark.parametrize(
+    "size", [1, MIN_PART_SIZE, MIN_PART_SIZE + 1, 2 * MIN_PART_SIZE]
+)
+def test_calculate_etag_matches_multipart_upload(
+    bucket, multipart_config, tmp_path, size
+):
+    """
+    Purpose:
+        Test that calculate_etag matches the ETag S3 computes for multipart
+        uploads, including a single-part multipart upload ("-1")
+    Args:
+        bucket (S3 Bucket Object): Mocked bucket
+        multipart_config (TransferConfig Object): Multipart config
+        tmp_path (Fixture): pytest temporary directory
+        size (Int): Size of the file
+    Return:
+        N/A
+    """
+
+    filename = write_file(os.path.join(tmp_path, "file"), size)
+    bucket.upload_file(filename, "file", Config=multipart_config)
+
+    chunk_size = multipart_config.multipart_chunksize
+    if size < MIN_PART_SIZE:
+        chunk_size = None
+    etag = s3_helpers.calculate_etag(filename, chunk_size=chunk_size)
+
+    assert etag == get_etag(bucket, "file")
+    if size == MIN_PART_SIZE:
+        assert etag.endswith("-1")
+
+
+def test_calculate_etag_single_part_upload(bucket, tmp_path):
+    """
+    Purpose:
+        Test that calculate_etag without a chunk size matches a plain PUT
+    Args:
+        bucket (S3 Bucket Object): Mocked bucket
+        tmp_path (Fixture): pytest temporary directory
+    Return:
+        N/A
+    """
+
+    filename = write_file(os.path.join(tmp_path, "file"), 1000)
+    bucket.upload_file(filename, "file")
+
+    assert s3_helpers.calculate_etag(filename) == get_etag(bucket, "file")
+
+
+def test_calculate_etag_empty_file(tmp_path):
+    """
+    Purpose:
+        Test that an empty file has the MD5 of no bytes with any chunk size
+    Args:
+        tmp_path (Fixture): pytest temporary directory
+    Return:
+        N/A
+    """
+
+    filename = write_file(os.path.join(tmp_path, "file"), 0)
+
+    assert s3_helpers.calculate_etag(filename, chunk_size=10) == (
+        "d41d8cd98f00b204e9800998ecf8427e"
+    )
+
+
+def test_local_file_changed_single_part_multipart_etag(tmp_path):
+    """
+    Purpose:
+        Test that a "-1" ETag is compared as one part holding the whole file,
+        whatever chunk size the sync is configured with
+    Args:
+        tmp_path (Fixture): pytest temporary directory
+    Return:
+        N/A
+    """
+
+    filename = write_file(os.path.join(tmp_path, "file"), 100)
+    remote_object = {
+        "size": 100,
+        "etag": s3_helpers.calculate_etag(filename, chunk_size=100),
+    }
+
+    assert remote_object["etag"].endswith("-1")
+    assert not s3_helpers._local_file_changed(
+        filename, remote_object, compare_etag=True, chunk_size=10
+    )
+    write_file(filename, 100, fill=b"y")
+    assert s3_helpers._local_file_changed(
+        filename, remote_object, compare_etag=True, chunk_size=10
+    )
+
+
+def test_sync_directory_skips_unchanged_files(bucket, multipart_config, tmp_path):
+    """
+    Purpose:
+        Test that a second sync by ETag does not upload anything again,
+        including multipart objects, and that changed files are uploaded
+    Args:
+        bucket (S3 Bucket Object): Mocked bucket
+        multipart_config (TransferConfig Object): Multipart config
+        tmp_path (Fixture): pytest temporary directory
+    Return:
+        N/A
+    """
+
+    local_dir = os.path.join(tmp_path, "local")
+    write_file(os.path.join(local_dir, "small.txt"), 10)
+    write_file(os.path.join(local_dir, "nested", "one_part.bin"), MIN_PART_SIZE)
+    write_file(os.path.join(local_dir, "nested", "two_part.bin"), MIN_PART_SIZE + 1)
+
+    sync_summary = s3_helpers.sync_directory(
+        bucket,
+        local_dir,
+        prefix="backup/",
+        compare_etag=True,
+        transfer_config=multipart_config,
+    )
+    assert sorted(sync_summary["transferred"]) == [
+        "backup/nested/one_part.bin",
+        "backup/nested/two_part.bin",
+        "backup/small.txt",
+    ]
+    assert sync_summary["bytes_transferred"] == 2 * MIN_PART_SIZE + 11
+
+    write_file(os.path.join(local_dir, "small.txt"), 10, fill=b"y")
+    sync_summary = s3_helpers.sync_directory(
+        bucket,
+        local_dir,
+        prefix="backup",
+        compare_etag=True,
+        transfer_config=multipart_config,
+    )
+    assert sync_summary["transferred"] == ["backup/small.txt"]
+    assert len(sync_summary["skipped"]) == 2
+    assert sync_summary["failed"] == {}
+
+
+def test_download_prefix(bucket, tmp_path):
+    """
+    Purpose:
+        Test downloading a prefix, skipping unchanged files on the next run
+        and never writing outside the local directory
+    Args:
+        bucket (S3 Bucket Object): Mocked bucket
+        tmp_path (Fixture): pytest temporary directory
+    Return:
+        N/A
+    """
+
+    bucket.put_object(Key="data/a.txt", Body=b"a")
+    bucket.put_object(Key="data/sub/b.txt", Body=b"bb")
+    bucket.put_object(Key="data/../escape.txt", Body=b"c")
+    local_dir = os.path.join(tmp_path, "local")
+
+    sync_summary = s3_helpers.download_prefix(bucket, "data/", local_dir)
+    assert sorted(sync_summary["transferred"]) == ["data/a.txt", "data/sub/b.txt"]
+    with open(os.path.join(local_dir, "sub", "b.txt"), "rb") as file_obj:
+        assert file_obj.read() == b"bb"
+    assert not os.path.exists(os.path.join(tmp_path, "escape.txt"))
+
+    sync_summary = s3_helpers.download_prefix(
+        bucket, "data/", local_dir, compare_etag=True
+    )
+    assert sync_summary["transferred"] == []
+    assert sorted(sync_summary["skipped"]) == ["data/a.txt", "data/sub/b.txt"]
+
+
+def test_download_prefix_without_trailing_slash(bucket, tmp_path):
+    """
+    Purpose:
+        Test that a prefix given without a trailing "/" only downloads its
+        own folder, not sibling folders sharing the same start
+    Args:
+        bucket (S3 Bucket Object): Mocked bucket
+        tmp_path (Fixture): pytest temporary directory
+    Return:
+        N/A
+    """
+
+    bucket.put_object(Key="data/a.txt", Body=b"a")
+    bucket.put_object(Key="data-old/b.txt", Body=b"b")
+    bucket.put_object(Key="datafile.txt", Body=b"c")
+    local_dir = os.path.join(tmp_path, "local")
+
+    sync_summary = s3_helpers.download_prefix(bucket, "data", local_dir)
+
+    assert sync_summary["transferred"] == ["data/a.txt"]
+    assert sorted(os.listdir(local_dir)) == ["a.txt"]
+
+
+def test_delete_all_files_in_bucket(bucket):
+    """
+    Purpose:
+        Test deleting more objects than fit in one DeleteObjects batch
+    Args:
+        bucket (S3 Bucket Object): Mocked bucket
+    Return:
+        N/A
+    """
+
+    for index in range(1005):
+        bucket.put_object(Key=f"key-{index}", Body=b"")
+
+    delete_summary = s3_helpers.delete_all_files_in_bucket(bucket, max_workers=2)
+
+    assert delete_summary["deleted"] == 1005
+    assert delete_summary["failed"] == []
+    assert list(bucket.objects.all()) == []
+
+
+def test_delete_all_files_in_versioned_bucket(bucket):
+    """
+    Purpose:
+        Test that every version and delete marker of a versioned bucket is
+        deleted, so the bucket can be deleted
+    Args:
+        bucket (S3 Bucket Object): Mocked bucket
+    Return:
+        N/A
+    """
+
+    bucket.Versioning().enable()
+    for body in [b"1", b"2"]:
+        bucket.put_object(Key="key", Body=body)
+    bucket.Object("key").delete()
+
+    delete_summary = s3_helpers.delete_all_files_in_bucket(bucket)
+
+    assert delete_summary["deleted"] == 3
+    assert list(bucket.object_versions.all()) == []
+
+
+def test_delete_objects_batch_retries_failed_keys():
+    """
+    Purpose:
+        Test that only the keys reported in Errors are retried, and keys
+        still failing after max_retries are returned
+    Args:
+        N/A
+    Return:
+        N/A
+    """
+
+    client = mock.Mock()
+    client.delete_objects.side_effect = [
+        {"Errors": [{"Key": "b", "Code": "SlowDown"}]},
+        {"Errors": [{"Key": "b", "VersionId": "v1", "Code": "SlowDown"}]},
+        {"Errors": [{"Key": "b", "VersionId": "v1", "Code": "SlowDown"}]},
+    ]
+
+    with mock.patch.object(s3_helpers.retry_helpers, "sleep_with_backoff"):
+        deleted_count, failed = s3_helpers._delete_objects_batch(
+            client, "bucket", [{"Key": "a"}, {"Key": "b"}], max_retries=2
+        )
+
+    assert deleted_count == 1
+    assert failed == [{"Key": "b", "VersionId": "v1", "Code": "SlowDown"}]
+    retried_objects = client.delete_objects.call_args_list[2][1]["Delete"]["Objects"]
+    assert retried_objects == [{"Key": "b", "VersionId": "v1"}]
+
+
+@pytest.mark.parametrize("size", [MIN_PART_SIZE, 2 * MIN_PART_SIZE + 7])
+def test_download_file_parallel_verifies_multipart_objects(
+    bucket, multipart_config, tmp_path, size
+):
+    """
+    Purpose:
+        Test that parallel downloads of multipart objects (including a
+        single-part "-1" object) pass verification and clean up their state
+    Args:
+        bucket (S3 Bucket Object): Mocked bucket
+        multipart_config (TransferConfig Object): Multipart config
+        tmp_path (Fixture): pytest temporary directory
+        size (Int): Size of the object
+    Return:
+        N/A
+    """
+
+    source = write_file(os.path.join(tmp_path, "source"), size, fill=b"z")
+    bucket.upload_file(source, "key", Config=multipart_config)
+    filename = os.path.join(tmp_path, "download")
+
+    transfer_stats = s3_helpers.download_file_parallel(
+        bucket, "key", filename, part_size=2 * 1024 * 1024, max_workers=4
+    )
+
+    assert transfer_stats["total_bytes"] == size
+    assert transfer_stats["bytes_transferred"] == size
+    assert transfer_stats["parts"] == -(-size // (2 * 1024 * 1024))
+    with open(filename, "rb") as file_obj:
+        assert file_obj.read() == b"z" * size
+    assert not os.path.exists(f"{filename}.parts")
+
+
+def test_download_file_parallel_resumes_missing_ranges(bucket, tmp_path):
+    """
+    Purpose:
+        Test that a failed download keeps its completed ranges, and the next
+        attempt only fetches the missing ones
+    Args:
+        bucket (S3 Bucket Object): Mocked bucket
+        tmp_path (Fixture): pytest temporary directory
+    Return:
+        N/A
+    """
+
+    payload = os.urandom(10 * 1000)
+    bucket.put_object(Key="key", Body=payload)
+    filename = os.path.join(tmp_path, "download")
+    download_range = s3_helpers._download_range
+
+    def fail_last_range(client, bucket_name, key, etag, start, *args):
+        if start == 9000:
+            raise Exception("Connection reset")
+        return download_range(client, bucket_name, key, etag, start, *args)
+
+    with mock.patch.object(s3_helpers, "_download_range", fail_last_range):
+        with pytest.raises(Exception):
+            s3_helpers.download_file_parallel(
+                bucket, "key", filename, part_size=1000, max_workers=1
+            )
+    assert os.path.exists(f"{filename}.parts")
+
+    transfer_stats = s3_helpers.download_file_parallel(
+        bucket, "key", filename, part_size=1000
+    )
+
+    assert transfer_stats["resumed_parts"] > 0
+    assert transfer_stats["bytes_transferred"] < len(payload)
+    with open(filename, "rb") as file_obj:
+        assert file_obj.read() == payload
+
+
+def test_download_file_parallel_keeps_state_when_verification_fails(
+    bucket, tmp_path
+):
+    """
+    Purpose:
+        Test that a download not matching the ETag raises and keeps its state
+        file
+    Args:
+        bucket (S3 Bucket Object): Mocked bucket
+        tmp_path (Fixture): pytest temporary directory
+    Return:
+        N/A
+    """
+
+    bucket.put_object(Key="key", Body=b"data")
+    filename = os.path.join(tmp_path, "download")
+
+    with mock.patch.object(s3_helpers, "calculate_etag", return_value="wrong"):
+        with pytest.raises(Exception, match="does not match"):
+            s3_helpers.download_file_parallel(bucket, "key", filename)
+
+    assert os.path.exists(f"{filename}.parts")
+
+
+@pytest.mark.parametrize(
+    "encryption_headers",
+    [
+        {"ServerSideEncryption": "aws:kms"},
+        {"ServerSideEncryption": "aws:kms:dsse"},
+        {"ServerSideEncryption": "AES256", "SSECustomerAlgorithm": "AES256"},
+    ],
+)
+def test_verify_download_skips_non_md5_etags(tmp_path, encryption_headers):
+    """
+    Purpose:
+        Test that objects whose ETags are not MD5s are not verified
+    Args:
+        tmp_path (Fixture): pytest temporary directory
+        encryption_headers (Dict): Encryption fields of the HeadObject
+    Return:
+        N/A
+    """
+
+    filename = write_file(os.path.join(tmp_path, "file"), 10)
+    head = dict(encryption_headers, ETag='"not-an-md5"', ContentLength=10)
+    client = mock.Mock()
+
+    assert s3_helpers._verify_download(client, "bucket", "key", head, filename)
+    client.head_object.assert_not_called()
+
+
+def test_verify_download_checks_sse_s3_objects(tmp_path):
+    """
+    Purpose:
+        Test that SSE-S3 objects (which keep MD5 ETags) are still verified
+    Args:
+        tmp_path (Fixture): pytest temporary directory
+    Return:
+        N/A
+    """
+
+    filename = write_file(os.path.join(tmp_path, "file"), 10)
+    head = {
+        "ServerSideEncryption": "AES256",
+        "ETag": f'"{s3_helpers.calculate_etag(filename)}"',
+        "ContentLength": 10,
+    }
+
+    assert s3_helpers._verify_download(mock.Mock(), "bucket", "key", head, filename)
+    head["ETag"] = '"0123"'
+    assert not s3_helpers._verify_download(
+        mock.Mock(), "bucket", "key", head, filename
+    )
+
+
+def test_list_objects_parallel(bucket):
+    """
+    Purpose:
+        Test that a parallel listing fanned out over one or two levels of
+        prefixes yields every object once, like the serial listing, and that
+        list_prefixes lists the "folders" under a prefix
+    Args:
+        bucket (S3 Bucket Object): Mocked bucket
+    Return:
+        N/A
+    """
+
+    keys = ["top.txt", "a/1", "a/x/2", "a/x/3", "b/4", "c/d/5", "c/e/6", "c/7"]
+    for key in keys:
+        bucket.put_object(Key=key, Body=b"")
+
+    def list_keys(**list_args):
+        s3_objects = s3_helpers.list_objects(bucket, **list_args)
+        return sorted(s3_object["Key"] for s3_object in s3_objects)
+
+    assert list_keys() == sorted(keys)
+    for fan_out_depth in (1, 2, 3):
+        assert list_keys(
+            parallel=True, fan_out_depth=fan_out_depth, page_size=1, max_workers=2
+        ) == sorted(keys)
+    assert list_keys(prefix="c/", parallel=True) == ["c/7", "c/d/5", "c/e/6"]
+    assert list_keys(prefix="missing/", parallel=True) == []
+    assert list_keys(prefix="a/", delimiter="/") == ["a/1"]
+    with pytest.raises(ValueError):
+        list_keys(parallel=True, delimiter="/")
+
+    assert list(s3_helpers.list_prefixes(bucket)) == ["a/", "b/", "c/"]
+    assert list(s3_helpers.list_prefixes(bucket, "c/")) == ["c/d/", "c/e/"]
+
+
+def test_list_objects_parallel_stops_with_caller(bucket):
+    """
+    Purpose:
+        Test that the listing workers stop once the caller stops reading,
+        instead of listing the rest of the bucket
+    Args:
+        bucket (S3 Bucket Object): Mocked bucket
+    Return:
+        N/A
+    """
+
+    for prefix_index in range(10):
+        for index in range(20):
+            bucket.put_object(Key=f"{prefix_index}/{index}", Body=b"")
+
+    paginate_objects = s3_helpers._paginate_objects
+    listed_pages = []
+
+    def counting_paginate_objects(*args, **kwargs):
+        for page in paginate_objects(*args, **kwargs):
+            if "delimiter" not in kwargs:
+                # A page of a prefix listing, not of the fan-out
+                listed_pages.append(page)
+            yield page
+
+    with mock.patch.object(
+        s3_helpers, "_paginate_objects", counting_paginate_objects
+    ):
+        s3_objects = s3_helpers.list_objects(
+            bucket, parallel=True, page_size=1, max_workers=2, max_buffered_pages=1
+        )
+        assert len(list(itertools.islice(s3_objects, 3))) == 3
+        s3_objects.close()
+
+    # The pages read, the buffered page, and a page per worker waiting for
+    # room in the buffer, out of the 200 pages of the prefixes
+    assert len(listed_pages) <= 3 + 1 + 2
+
+
+def test_list_objects_parallel_raises_worker_errors(bucket):
+    """
+    Purpose:
+        Test that an error listing one of the prefixes reaches the caller
+    Args:
+        bucket (S3 Bucket Object): Mocked bucket
+    Return:
+        N/A
+    """
+
+    for key in ["a/1", "b/2", "c/3"]:
+        bucket.put_object(Key=key, Body=b"")
+
+    paginate_objects = s3_helpers._paginate_objects
+
+    def failing_paginate_objects(client, bucket_name, prefix, **kwargs):
+        if prefix == "b/":
+            raise RuntimeError("Listing failed")
+        return paginate_objects(client, bucket_name, prefix, **kwargs)
+
+    with mock.patch.object(s3_helpers, "_paginate_objects", failing_paginate_objects):
+        with pytest.raises(RuntimeError, match="Listing failed"):
+            list(s3_helpers.list_objects(bucket, parallel=True))
+
+
+def test_generate_presigned_urls_cache(bucket, mock_clock):
+    """
+    Purpose:
+        Test that cached presigned URLs are reused until safety_margin
+        seconds before they expire, then signed again, and that URLs that
+        would expire within the margin are never cached
+    Args:
+        bucket (S3 Bucket Object): Mocked bucket
+        mock_clock (Fixture): Clock of the cache
+    Return:
+        N/A
+    """
+
+    s3 = boto3.resource("s3", region_name="us-east-1")
+    cache = s3_helpers.PresignedUrlCache(safety_margin=60)
+    sign = mock.Mock(wraps=s3.meta.client.generate_presigned_url)
+
+    with mock.patch.object(s3.meta.client, "generate_presigned_url", sign):
+        presigned_urls = s3_helpers.generate_presigned_urls(
+            s3, bucket.name, ["a", "b"], url_expire=900, cache=cache
+        )
+        assert sign.call_count == 2
+        assert "test-bucket" in presigned_urls["a"]
+        assert presigned_urls["a"] != presigned_urls["b"]
+
+        # Hit: reused while valid for longer than the safety margin
+        mock_clock[0] += 900 - 60 - 1
+        cached_urls = s3_helpers.generate_presigned_urls(
+            s3, bucket.name, ["a", "b"], url_expire=900, cache=cache
+        )
+        cached_url = s3_helpers.generate_presigned_url(
+            s3, bucket.name, "a", url_expire=900, cache=cache
+        )
+        assert cached_urls == presigned_urls
+        assert cached_url == presigned_urls["a"]
+        assert sign.call_count == 2
+        assert cache.hits == 3
+
+        # Miss: a URL signed for another lifetime is a separate entry
+        s3_helpers.generate_presigned_url(
+            s3, bucket.name, "a", url_expire=3600, cache=cache
+        )
+        assert sign.call_count == 3
+
+        # Expired: within the safety margin the URL is signed again
+        mock_clock[0] += 1
+        s3_helpers.generate_presigned_url(
+            s3, bucket.name, "a", url_expire=900, cache=cache
+        )
+        assert sign.call_count == 4
+        assert cache.expirations == 1
+
+        # ttl <= 0: a URL expiring within the safety margin is never cached
+        cache_size = len(cache)
+        for _ in range(2):
+            s3_helpers.generate_presigned_url(
+                s3, bucket.name, "b", url_expire=60, cache=cache
+            )
+        assert sign.call_count == 6
+        assert len(cache) == cache_size
+        assert cache.get_url(bucket.name, "b", 60) is None
+
+
+def test_create_transfer_config():
+    """
+    Purpose:
+        Test that the transfer settings are passed to the TransferConfig and
+        parts under the S3 minimum are refused
+    Args:
+        N/A
+    Return:
+        N/A
+    """
+
+    transfer_config = s3_helpers.create_transfer_config(
+        multipart_threshold=MIN_PART_SIZE,
+        multipart_chunksize=2 * MIN_PART_SIZE,
+        max_concurrency=3,
+        use_threads=False,
+        max_bandwidth=1024,
+    )
+
+    assert transfer_config.multipart_threshold == MIN_PART_SIZE
+    assert transfer_config.multipart_chunksize == 2 * MIN_PART_SIZE
+    assert transfer_config.max_request_concurrency == 3
+    assert transfer_config.use_threads is False
+    assert transfer_config.max_bandwidth == 1024
+    with pytest.raises(ValueError):
+        s3_helpers.create_transfer_config(multipart_chunksize=MIN_PART_SIZE - 1)
+
+
+def test_transfer_progress():
+    """
+    Purpose:
+        Test that progress is reported at most once per report_interval and
+        once on finish, with the bytes moved, percent complete, and rate
+    Args:
+        N/A
+    Return:
+        N/A
+    """
+
+    clock = [1000.0]
+    reports = []
+    with mock.patch.object(s3_helpers.time, "monotonic", lambda: clock[0]):
+        progress = s3_helpers.TransferProgress(
+            "key", total_bytes=400, callback=reports.append, report_interval=1.0
+        )
+        progress(100)
+        clock[0] += 0.5
+        progress(100)
+        assert reports == []
+
+        clock[0] += 0.5
+        progress(100)
+        assert len(reports) == 1
+        assert reports[0]["bytes_transferred"] == 300
+        assert reports[0]["percent_complete"] == 75.0
+
+        clock[0] += 1.0
+        progress(100)
+        transfer_stats = progress.finish()
+
+    assert transfer_stats == {
+        "key": "key",
+        "bytes_transferred": 400,
+        "total_bytes": 400,
+        "percent_complete": 100.0,
+        "elapsed_seconds": 2.0,
+        "bytes_per_second": 200.0,
+    }
+    assert reports[-1] == transfer_stats
+    assert len(reports) == 3
+
+
+def test_upload_and_download_file(bucket, tmp_path):
+    """
+    Purpose:
+        Test that multipart uploads and downloads with a transfer config
+        report their progress and return their final stats
+    Args:
+        bucket (S3 Bucket Object): Mocked bucket
+        tmp_path (Fixture): pytest temporary directory
+    Return:
+        N/A
+    """
+
+    size = 2 * MIN_PART_SIZE + 7
+    filename = write_file(os.path.join(tmp_path, "up", "file"), size)
+    transfer_config = s3_helpers.create_transfer_config(
+        multipart_threshold=MIN_PART_SIZE,
+        multipart_chunksize=MIN_PART_SIZE,
+        max_concurrency=2,
+    )
+
+    upload_reports = []
+    upload_stats = s3_helpers.upload_file(
+        bucket,
+        "key",
+        filename,
+        transfer_config=transfer_config,
+        progress_callback=upload_reports.append,
+    )
+
+    assert get_etag(bucket, "key").endswith("-3")
+    assert upload_stats["bytes_transferred"] == size
+    assert upload_stats["total_bytes"] == size
+    assert upload_stats["percent_complete"] == 100.0
+    assert upload_stats["elapsed_seconds"] > 0
+    assert upload_reports[-1] == upload_stats
+
+    download_reports = []
+    download_filename = os.path.join(tmp_path, "down")
+    download_stats = s3_helpers.download_file(
+        bucket,
+        "key",
+        download_filename,
+        transfer_config=transfer_config,
+        progress_callback=download_reports.append,
+    )
+
+    assert os.path.getsize(download_filename) == size
+    assert download_stats["bytes_transferred"] == size
+    assert download_stats["percent_complete"] == 100.0
+    assert download_reports[-1] == download_stats
+
+    # Without a callback the size of a download is not looked up
+    download_stats = s3_helpers.download_file(bucket, "key", download_filename)
+    assert download_stats["bytes_transferred"] == size
+    assert download_stats["total_bytes"] is None
+    with pytest.raises(Exception, match="Does Not Exist"):
+        s3_helpers.download_file(bucket, "missing", download_filename)
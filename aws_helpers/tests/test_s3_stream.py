@@ -0,0 +1,319 @@
+#!/usr/bin/env python3
+"""
+    Purpose:
+        Test File for s3_stream.py
+"""
+
+# Python Library Imports
+import gc
+import io
+import os
+import sys
+import time
+import weakref
+import boto3
+import pytest
+from botocore.exceptions import ClientError
+from moto import mock_aws
+from unittest import mock
+
+# Import File to Test
+from aws_helpers import s3_helpers, s3_stream
+from aws_helpers.s3_stream import S3ObjectReader, S3ObjectWriter
+
+
+###
+# Fixtures
+###
+
+
+@pytest.fixture
+def bucket(monkeypatch):
+    """
+    Purpose:
+        Return an empty bucket in a mocked S3
+    Args:
+        monkeypatch (Fixture): pytest monkeypatch fixture
+    Return:
+        bucket (S3 Bucket Object): Mocked bucket
+    """
+
+    monkeypatch.setenv("AWS_ACCESS_KEY_ID", "testing")
+    monkeypatch.setenv("AWS_SECRET_ACCESS_KEY", "testing")
+    monkeypatch.setenv("AWS_DEFAULT_REGION", "us-east-1")
+
+    with mock_aws():
+        s3 = boto3.resource("s3", region_name="us-east-1")
+        yield s3.create_bucket(Bucket="test-bucket")
+
+
+###
+# Mocked Functions
+###
+
+
+def collect(ref, timeout=10):
+    """
+    Purpose:
+        Collect garbage until a weakly referenced object is freed (objects
+        with uploads in flight are held by the upload threads until done)
+    Args:
+        ref (Weakref): Reference to the object to free
+        timeout (Float): Max seconds to wait
+    Return:
+        freed (Boolean): Whether or not the object was freed
+    """
+
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        gc.collect()
+        if ref() is None:
+            return True
+        time.sleep(0.05)
+    return False
+
+
+###
+# Test Payload
+###
+
+
+PAYLOAD = bytes(range(256)) * 40
+
+
+@pytest.mark.parametrize("prefetch", [True, False])
+def test_reader_reads_sequentially(bucket, prefetch):
+    """
+    Purpose:
+        Test reading an object in small blocks, with and without prefetching
+    Args:
+        bucket (S3 Bucket Object): Mocked bucket
+        prefetch (Boolean): Whether or not to prefetch the next block
+    Return:
+        N/A
+    """
+
+    bucket.put_object(Key="key", Body=PAYLOAD)
+
+    with S3ObjectReader(
+        bucket, "key", read_ahead_size=1000, prefetch=prefetch
+    ) as reader:
+        chunks = [reader.read(700) for _ in range(16)]
+
+    assert b"".join(chunks) == PAYLOAD
+    assert [len(chunk) for chunk in chunks[-2:]] == [440, 0]
+
+
+def test_reader_seek_and_read_to_end(bucket):
+    """
+    Purpose:
+        Test seeking from the start, current position, and end
+    Args:
+        bucket (S3 Bucket Object): Mocked bucket
+    Return:
+        N/A
+    """
+
+    bucket.put_object(Key="key", Body=PAYLOAD)
+
+    with S3ObjectReader(bucket, "key", read_ahead_size=1000) as reader:
+        assert reader.seek(5000) == 5000
+        assert reader.read(10) == PAYLOAD[5000:5010]
+        assert reader.seek(-20, io.SEEK_CUR) == 4990
+        assert reader.read(5) == PAYLOAD[4990:4995]
+        assert reader.seek(-10, io.SEEK_END) == len(PAYLOAD) - 10
+        assert reader.read() == PAYLOAD[-10:]
+        assert reader.tell() == len(PAYLOAD)
+        with pytest.raises(ValueError):
+            reader.seek(-1)
+        with pytest.raises(ValueError):
+            reader.seek(0, 7)
+
+
+def test_reader_large_read_near_end_only_allocates_remaining(bucket):
+    """
+    Purpose:
+        Test that a read larger than the rest of the object only allocates
+        (and returns) the remaining bytes
+    Args:
+        bucket (S3 Bucket Object): Mocked bucket
+    Return:
+        N/A
+    """
+
+    bucket.put_object(Key="key", Body=PAYLOAD)
+
+    with S3ObjectReader(bucket, "key") as reader:
+        reader.seek(-3, io.SEEK_END)
+        assert reader.read(2 ** 40) == PAYLOAD[-3:]
+        assert reader.read(2 ** 40) == b""
+
+
+def test_reader_fails_when_object_is_overwritten(bucket):
+    """
+    Purpose:
+        Test that reads are pinned to the ETag seen when the reader opened
+    Args:
+        bucket (S3 Bucket Object): Mocked bucket
+    Return:
+        N/A
+    """
+
+    bucket.put_object(Key="key", Body=PAYLOAD)
+
+    with S3ObjectReader(bucket, "key", prefetch=False) as reader:
+        bucket.put_object(Key="key", Body=b"other")
+        with pytest.raises(ClientError):
+            reader.read(10)
+
+
+def test_writer_small_object_uses_put_object(bucket):
+    """
+    Purpose:
+        Test that an object smaller than one part is sent with PutObject
+    Args:
+        bucket (S3 Bucket Object): Mocked bucket
+    Return:
+        N/A
+    """
+
+    with s3_helpers.open_object(bucket, "key", mode="wb") as writer:
+        writer.write(b"hello ")
+        writer.write(b"world")
+
+    assert writer.bytes_written == 11
+    assert bucket.Object("key").get()["Body"].read() == b"hello world"
+    assert "-" not in bucket.Object("key").e_tag
+
+
+def test_writer_multipart_upload(bucket):
+    """
+    Purpose:
+        Test that a larger object is uploaded in parts, in order
+    Args:
+        bucket (S3 Bucket Object): Mocked bucket
+    Return:
+        N/A
+    """
+
+    chunk = os.urandom(1024 * 1024)
+    chunks = [chunk] * 11
+
+    bytes_written = s3_helpers.upload_stream(
+        bucket, "key", chunks, part_size=s3_stream.MIN_PART_SIZE
+    )
+
+    assert bytes_written == 11 * len(chunk)
+    assert bucket.Object("key").e_tag.strip('"').endswith("-3")
+    with s3_helpers.open_object(bucket, "key") as reader:
+        assert reader.read() == b"".join(chunks)
+
+
+def test_writer_aborts_on_exception(bucket):
+    """
+    Purpose:
+        Test that an exception in the with block aborts the upload
+    Args:
+        bucket (S3 Bucket Object): Mocked bucket
+    Return:
+        N/A
+    """
+
+    with pytest.raises(RuntimeError):
+        with S3ObjectWriter(bucket, "key", part_size=s3_stream.MIN_PART_SIZE) as writer:
+            writer.write(b"x" * (s3_stream.MIN_PART_SIZE + 1))
+            raise RuntimeError("failed")
+
+    assert writer.closed
+    assert list(bucket.objects.all()) == []
+    assert list(bucket.multipart_uploads.all()) == []
+    with pytest.raises(ValueError):
+        writer.write(b"x")
+
+
+def test_writer_aborts_when_not_closed(bucket):
+    """
+    Purpose:
+        Test that a writer dropped without being closed aborts its upload
+        instead of completing a truncated object
+    Args:
+        bucket (S3 Bucket Object): Mocked bucket
+    Return:
+        N/A
+    """
+
+    writer = S3ObjectWriter(bucket, "key", part_size=s3_stream.MIN_PART_SIZE)
+    writer.write(b"x" * (s3_stream.MIN_PART_SIZE + 1))
+    assert len(list(bucket.multipart_uploads.all())) == 1
+
+    writer_ref = weakref.ref(writer)
+    del writer
+
+    assert collect(writer_ref)
+    assert list(bucket.objects.all()) == []
+    assert list(bucket.multipart_uploads.all()) == []
+
+
+def test_writer_grows_part_size(bucket):
+    """
+    Purpose:
+        Test that the part size doubles every PART_SIZE_GROWTH_INTERVAL parts
+        and the object still reads back whole
+    Args:
+        bucket (S3 Bucket Object): Mocked bucket
+    Return:
+        N/A
+    """
+
+    payload = os.urandom(6 * s3_stream.MIN_PART_SIZE + 1)
+
+    with mock.patch.object(s3_stream, "PART_SIZE_GROWTH_INTERVAL", 2):
+        with S3ObjectWriter(bucket, "key", part_size=s3_stream.MIN_PART_SIZE) as writer:
+            writer.write(payload)
+
+    # Parts of 5 MB, 5 MB, 10 MB, 10 MB and the last byte
+    assert writer.part_size == 4 * s3_stream.MIN_PART_SIZE
+    assert bucket.Object("key").e_tag.strip('"').endswith("-5")
+    with s3_helpers.open_object(bucket, "key") as reader:
+        assert reader.read() == payload
+
+
+def test_writer_raises_before_part_limit(bucket):
+    """
+    Purpose:
+        Test that a stream needing more than MAX_PARTS parts raises a clear
+        error and aborts its upload
+    Args:
+        bucket (S3 Bucket Object): Mocked bucket
+    Return:
+        N/A
+    """
+
+    with mock.patch.object(s3_stream, "MAX_PARTS", 2):
+        with pytest.raises(ValueError, match="more than 2 parts"):
+            with S3ObjectWriter(
+                bucket, "key", part_size=s3_stream.MIN_PART_SIZE
+            ) as writer:
+                writer.write(b"x" * (3 * s3_stream.MIN_PART_SIZE))
+
+    assert writer.closed
+    assert list(bucket.objects.all()) == []
+    assert list(bucket.multipart_uploads.all()) == []
+
+
+def test_writer_validation(bucket):
+    """
+    Purpose:
+        Test invalid part sizes and modes
+    Args:
+        bucket (S3 Bucket Object): Mocked bucket
+    Return:
+        N/A
+    """
+
+    with pytest.raises(ValueError):
+        S3ObjectWriter(bucket, "key", part_size=1024)
+    with pytest.raises(ValueError):
+        S3ObjectWriter(bucket, "key", part_size=s3_stream.MAX_PART_SIZE + 1)
+    with pytest.raises(ValueError):
+        s3_helpers.open_object(bucket, "key", mode="ab")
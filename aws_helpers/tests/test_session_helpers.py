@@ -0,0 +1,233 @@
+#!/usr/bin/env python3
+"""
+    Purpose:
+        Test File for session_helpers.py
+"""
+
+# Python Library Imports
+import os
+import sys
+import threading
+import pytest
+from unittest import mock
+
+# Import File to Test
+from aws_helpers import session_helpers
+
+
+###
+# Fixtures
+###
+
+
+@pytest.fixture(autouse=True)
+def reset_resource_pool():
+    """
+    Purpose:
+        Start every test with an empty resource pool with default settings
+    Args:
+        N/A
+    Return:
+        N/A
+    """
+
+    session_helpers.configure_resource_pool(
+        **session_helpers.DEFAULT_POOL_SETTINGS
+    )
+    yield
+    session_helpers.configure_resource_pool(
+        **session_helpers.DEFAULT_POOL_SETTINGS
+    )
+
+
+###
+# Mocked Functions
+###
+
+
+# None at the Moment
+
+
+###
+# Test Payload
+###
+
+
+def test_get_session_is_cached_per_credentials():
+    """
+    Purpose:
+        Test that Sessions are reused for the same region and credentials and
+        not shared between different credentials
+    Args:
+        N/A
+    Return:
+        N/A
+    """
+
+    session = session_helpers.get_session(region_name="us-east-1")
+
+    assert session_helpers.get_session(region_name="us-east-1") is session
+    assert session_helpers.get_session(
+        region_name="us-east-1", access_key="AKIA1", secret_key="secret1"
+    ) is not session
+    assert session_helpers.get_session(
+        region_name="us-east-1", access_key="AKIA1", secret_key="secret1"
+    ) is session_helpers.get_session(
+        region_name="us-east-1", access_key="AKIA1", secret_key="secret1"
+    )
+
+
+def test_get_session_ignores_partial_credentials():
+    """
+    Purpose:
+        Test that an access key without a secret key uses the default
+        credential chain (the same Session as no credentials)
+    Args:
+        N/A
+    Return:
+        N/A
+    """
+
+    assert session_helpers.get_session(
+        region_name="us-east-1", access_key="AKIA1"
+    ) is session_helpers.get_session(region_name="us-east-1")
+
+
+def test_get_client_is_shared_across_threads():
+    """
+    Purpose:
+        Test that Clients are created once and shared by every thread
+    Args:
+        N/A
+    Return:
+        N/A
+    """
+
+    client = session_helpers.get_client("sqs", region_name="us-east-1")
+
+    thread_clients = []
+    thread = threading.Thread(
+        target=lambda: thread_clients.append(
+            session_helpers.get_client("sqs", region_name="us-east-1")
+        )
+    )
+    thread.start()
+    thread.join()
+
+    assert thread_clients == [client]
+    assert session_helpers.get_client("sqs", region_name="us-west-2") is not client
+
+
+def test_get_resource_is_cached_per_thread():
+    """
+    Purpose:
+        Test that Resources are reused within a thread but never shared
+        between threads (Boto3 Resources are not thread-safe)
+    Args:
+        N/A
+    Return:
+        N/A
+    """
+
+    resource = session_helpers.get_resource("s3", region_name="us-east-1")
+    assert session_helpers.get_resource("s3", region_name="us-east-1") is resource
+
+    thread_resources = []
+
+    def get_thread_resources():
+        for _ in range(2):
+            thread_resources.append(
+                session_helpers.get_resource("s3", region_name="us-east-1")
+            )
+
+    thread = threading.Thread(target=get_thread_resources)
+    thread.start()
+    thread.join()
+
+    assert thread_resources[0] is thread_resources[1]
+    assert thread_resources[0] is not resource
+
+
+def test_configure_resource_pool_drops_cached_objects():
+    """
+    Purpose:
+        Test that reconfiguring the pool applies the new settings and builds
+        new Clients and Resources
+    Args:
+        N/A
+    Return:
+        N/A
+    """
+
+    client = session_helpers.get_client("sns", region_name="us-east-1")
+    resource = session_helpers.get_resource("sns", region_name="us-east-1")
+
+    pool_settings = session_helpers.configure_resource_pool(
+        max_pool_connections=7, read_timeout=3, max_attempts=2, retry_mode="standard"
+    )
+    new_client = session_helpers.get_client("sns", region_name="us-east-1")
+
+    assert pool_settings["max_pool_connections"] == 7
+    assert session_helpers.get_resource_pool_settings() == pool_settings
+    assert new_client is not client
+    assert new_client.meta.config.max_pool_connections == 7
+    assert new_client.meta.config.read_timeout == 3
+    assert new_client.meta.config.retries["mode"] == "standard"
+    assert session_helpers.get_resource("sns", region_name="us-east-1") is not resource
+
+
+def test_invalidate_resources_by_service():
+    """
+    Purpose:
+        Test that invalidating one service only drops that service's Clients
+    Args:
+        N/A
+    Return:
+        N/A
+    """
+
+    s3_client = session_helpers.get_client("s3", region_name="us-east-1")
+    sqs_client = session_helpers.get_client("sqs", region_name="us-east-1")
+
+    assert session_helpers.invalidate_resources(service_name="s3") == 1
+    assert session_helpers.get_client("s3", region_name="us-east-1") is not s3_client
+    assert session_helpers.get_client("sqs", region_name="us-east-1") is sqs_client
+
+
+def test_get_resource_pool_stats():
+    """
+    Purpose:
+        Test the hit/miss counters of the pool
+    Args:
+        N/A
+    Return:
+        N/A
+    """
+
+    for _ in range(3):
+        session_helpers.get_client("sqs", region_name="us-east-1")
+        session_helpers.get_resource("sqs", region_name="us-east-1")
+
+    pool_stats = session_helpers.get_resource_pool_stats()
+
+    assert pool_stats["clients"]["size"] == 1
+    assert pool_stats["clients"]["hits"] == 2
+    assert pool_stats["resources"]["size"] == 1
+    assert pool_stats["resources"]["hits"] == 2
+
+
+def test_get_secret_fingerprint():
+    """
+    Purpose:
+        Test that secrets are fingerprinted rather than kept in cache keys
+    Args:
+        N/A
+    Return:
+        N/A
+    """
+
+    fingerprint = session_helpers._get_secret_fingerprint("secret")
+
+    assert fingerprint != "secret"
+    assert len(fingerprint) == 64
+    assert session_helpers._get_secret_fingerprint(None) is None
@@ -7,7 +7,12 @@
 # Python Library Imports
 import os
 import sys
+import threading
+import time
+import boto3
 import pytest
+from botocore.exceptions import ClientError
+from moto import mock_aws
 from unittest import mock
 
 # Import File to Test
@@ -19,7 +24,42 @@ from aws_helpers import sns_helpers
 ###
 
 
-# None at the Moment (Empty Test Suite)
+@pytest.fixture
+def sns(monkeypatch):
+    """
+    Purpose:
+        Return a mocked SNS Resource
+    Args:
+        monkeypatch (Fixture): pytest monkeypatch fixture
+    Return:
+        sns (SNS Resource Object): Mocked SNS Resource
+    """
+
+    monkeypatch.setenv("AWS_ACCESS_KEY_ID", "testing")
+    monkeypatch.setenv("AWS_SECRET_ACCESS_KEY", "testing")
+    monkeypatch.setenv("AWS_DEFAULT_REGION", "us-east-1")
+
+    with mock_aws():
+        sns_helpers.invalidate_topic_arns()
+        yield boto3.resource("sns", region_name="us-east-1")
+        sns_helpers.invalidate_topic_arns()
+
+
+@pytest.fixture
+def no_backoff():
+    """
+    Purpose:
+        Skip the backoff sleeps between retries
+    Args:
+        N/A
+    Return:
+        sleep_with_backoff (Mock): Patched sleep
+    """
+
+    with mock.patch.object(
+        sns_helpers.message_batch_helpers.retry_helpers, "sleep_with_backoff"
+    ) as sleep_with_backoff:
+        yield sleep_with_backoff
 
 
 ###
@@ -27,7 +67,48 @@ from aws_helpers import sns_helpers
 ###
 
 
-# None at the Moment (Empty Test Suite)
+def subscribe_queue(sns, topic, queue_name):
+    """
+    Purpose:
+        Subscribe a new queue to a topic with raw message delivery
+    Args:
+        sns (SNS Resource Object): Mocked SNS Resource
+        topic (SNS Topic Object): Topic to subscribe to
+        queue_name (String): Name of the queue to create
+    Return:
+        queue (SQS Queue Object): Subscribed queue
+    """
+
+    queue = boto3.resource("sqs", region_name="us-east-1").create_queue(
+        QueueName=queue_name
+    )
+    topic.subscribe(
+        Protocol="sqs",
+        Endpoint=queue.attributes["QueueArn"],
+        Attributes={"RawMessageDelivery": "true"},
+    )
+
+    return queue
+
+
+def receive_bodies(queue):
+    """
+    Purpose:
+        Receive the bodies of every visible message in a queue
+    Args:
+        queue (SQS Queue Object): Queue to drain
+    Return:
+        bodies (List of Strings): Bodies of the received messages
+    """
+
+    bodies = []
+    while True:
+        msgs = queue.receive_messages(MaxNumberOfMessages=10)
+        if not msgs:
+            return bodies
+        bodies.extend(msg.body for msg in msgs)
+        for msg in msgs:
+            msg.delete()
 
 
 ###
@@ -35,4 +116,212 @@ from aws_helpers import sns_helpers
 ###
 
 
-# None at the Moment (Empty Test Suite)
+def test_publish_message(sns):
+    """
+    Purpose:
+        Test that a single message is delivered with its attributes
+    Args:
+        sns (Fixture): Mocked SNS Resource
+    Return:
+        N/A
+    """
+
+    topic = sns.create_topic(Name="single")
+    queue = subscribe_queue(sns, topic, "single-queue")
+
+    message_id = sns_helpers.publish_message(
+        topic,
+        "hello",
+        subject="greeting",
+        message_attributes={"kind": {"DataType": "String", "StringValue": "test"}},
+    )
+
+    assert message_id
+    assert receive_bodies(queue) == ["hello"]
+
+
+def test_publish_messages(sns):
+    """
+    Purpose:
+        Test that batched publishing delivers every message
+    Args:
+        sns (Fixture): Mocked SNS Resource
+    Return:
+        N/A
+    """
+
+    topic = sns.create_topic(Name="batched")
+    queue = subscribe_queue(sns, topic, "batched-queue")
+    msgs = [f"msg {index}" for index in range(25)]
+
+    publish_summary = sns_helpers.publish_messages(topic, iter(msgs), max_workers=2)
+
+    assert publish_summary["published"] == 25
+    assert publish_summary["failed"] == []
+    assert sorted(receive_bodies(queue)) == sorted(msgs)
+
+
+def test_publish_to_topics_reports_oversized_per_topic(sns):
+    """
+    Purpose:
+        Test that fan-out publishes to every topic and reports a message too
+        large to publish once per topic, with its TopicArn
+    Args:
+        sns (Fixture): Mocked SNS Resource
+    Return:
+        N/A
+    """
+
+    topics = [sns.create_topic(Name=f"fan-out-{index}") for index in range(3)]
+    queues = [
+        subscribe_queue(sns, topic, f"fan-out-queue-{index}")
+        for index, topic in enumerate(topics)
+    ]
+    oversized = "x" * (sns_helpers.MAX_BATCH_BYTES + 1)
+
+    publish_summary = sns_helpers.publish_to_topics(
+        sns, [topic.arn for topic in topics], ["a", oversized, "b"]
+    )
+
+    assert publish_summary["published"] == 6
+    assert sorted(entry["TopicArn"] for entry in publish_summary["failed"]) == sorted(
+        topic.arn for topic in topics
+    )
+    assert all(
+        entry["Code"] == "MessageTooLong" for entry in publish_summary["failed"]
+    )
+    for queue in queues:
+        assert sorted(receive_bodies(queue)) == ["a", "b"]
+
+
+def test_publish_to_topics_retries_throttling(no_backoff):
+    """
+    Purpose:
+        Test that throttled PublishBatch requests are retried, and requests
+        that cannot succeed are recorded as failed with their TopicArn
+    Args:
+        no_backoff (Fixture): Patched backoff sleep
+    Return:
+        N/A
+    """
+
+    throttled = ClientError(
+        {
+            "Error": {"Code": "Throttling", "Message": "Rate exceeded"},
+            "ResponseMetadata": {"HTTPStatusCode": 400},
+        },
+        "PublishBatch",
+    )
+    denied = ClientError(
+        {
+            "Error": {"Code": "AuthorizationError", "Message": "Denied"},
+            "ResponseMetadata": {"HTTPStatusCode": 403},
+        },
+        "PublishBatch",
+    )
+
+    def publish_batch(TopicArn, PublishBatchRequestEntries):
+        if TopicArn == "denied":
+            raise denied
+        if not no_backoff.called:
+            raise throttled
+        return {
+            "Successful": [{"Id": entry["Id"]} for entry in PublishBatchRequestEntries]
+        }
+
+    sns = mock.Mock()
+    sns.meta.client.publish_batch.side_effect = publish_batch
+    publish_summary = sns_helpers.publish_to_topics(
+        sns, ["allowed", "denied"], ["a", "b"], max_workers=1
+    )
+
+    assert publish_summary["published"] == 2
+    assert [
+        (entry["TopicArn"], entry["Code"], entry["ErrorMessage"])
+        for entry in publish_summary["failed"]
+    ] == [("denied", "AuthorizationError", "Denied")] * 2
+
+
+def test_get_topic_arn(sns):
+    """
+    Purpose:
+        Test that topic ARNs are looked up by name and cached
+    Args:
+        sns (Fixture): Mocked SNS Resource
+    Return:
+        N/A
+    """
+
+    topic = sns.create_topic(Name="lookup")
+
+    assert sns_helpers.get_topic_arn(sns, "lookup") == topic.arn
+    with mock.patch.object(
+        sns_helpers, "_list_topic_arns", wraps=sns_helpers._list_topic_arns
+    ) as list_topic_arns:
+        assert sns_helpers.get_topic_by_name(sns, "lookup").arn == topic.arn
+    list_topic_arns.assert_not_called()
+
+    with pytest.raises(Exception, match="Not Found"):
+        sns_helpers.get_topic_arn(sns, "missing")
+
+
+def test_get_topic_arn_cached_per_account(sns):
+    """
+    Purpose:
+        Test that clients signing with different access keys (e.g. different
+        accounts) do not share a cached Topic Name to ARN mapping
+    Args:
+        sns (Fixture): Mocked SNS Resource
+    Return:
+        N/A
+    """
+
+    other_sns = boto3.resource(
+        "sns",
+        region_name="us-east-1",
+        aws_access_key_id="other",
+        aws_secret_access_key="other",
+    )
+    topic = sns.create_topic(Name="shared-name")
+    other_arn = "arn:aws:sns:us-east-1:222222222222:shared-name"
+
+    assert sns_helpers.get_topic_arn(sns, "shared-name") == topic.arn
+    other_topic_arns = {
+        "arns": {"shared-name": other_arn},
+        "loaded_at": time.monotonic(),
+    }
+    with mock.patch.object(
+        sns_helpers, "_list_topic_arns", return_value=other_topic_arns
+    ) as list_topic_arns:
+        assert sns_helpers.get_topic_arn(other_sns, "shared-name") == other_arn
+        assert sns_helpers.get_topic_arn(sns, "shared-name") == topic.arn
+    list_topic_arns.assert_called_once()
+
+
+def test_get_topic_arn_loads_outside_cache_lock(sns):
+    """
+    Purpose:
+        Test that ListTopics is paged through without holding the cache
+        lock, so lookups of other mappings are not blocked by the load
+    Args:
+        sns (Fixture): Mocked SNS Resource
+    Return:
+        N/A
+    """
+
+    topic = sns.create_topic(Name="unblocked")
+    list_topic_arns = sns_helpers._list_topic_arns
+
+    def blocking_list_topic_arns(client):
+        lookup = threading.Thread(
+            target=sns_helpers._topic_arns.get, args=("other-mapping",)
+        )
+        lookup.start()
+        lookup.join(timeout=5)
+        assert not lookup.is_alive()
+        return list_topic_arns(client)
+
+    with mock.patch.object(
+        sns_helpers, "_list_topic_arns", side_effect=blocking_list_topic_arns
+    ):
+        assert sns_helpers.get_topic_arn(sns, "unblocked") == topic.arn
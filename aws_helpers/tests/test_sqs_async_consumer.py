@@ -0,0 +1,237 @@
+#!/usr/bin/env python3
+"""
+    Purpose:
+        Test File for sqs_async_consumer.py
+"""
+
+# Python Library Imports
+import asyncio
+import os
+import sys
+import threading
+import time
+import pytest
+from unittest import mock
+
+# Import File to Test
+from aws_helpers import sqs_async_consumer
+from aws_helpers.sqs_async_consumer import AsyncSQSConsumer
+
+
+###
+# Fixtures
+###
+
+
+class FakeQueue(object):
+    """
+        Stand-in for an SQS Queue Object that serves numbered messages
+    """
+
+    def __init__(self, num_msgs):
+        """
+        Purpose:
+            Initilize the FakeQueue Class
+        Args:
+            num_msgs (Int): Number of messages to serve before returning none
+        Return:
+            N/A
+        """
+
+        self.msgs = [mock.Mock(message_id=str(index)) for index in range(num_msgs)]
+        self.deleted = []
+        self.lock = threading.Lock()
+
+    def get_messages(self, queue, max_msgs=10, wait_time=20, attr_names=None):
+        """
+        Purpose:
+            Serve up to max_msgs messages, sleeping briefly when drained
+        Args:
+            queue (FakeQueue): This queue
+            max_msgs (Int): Max messages to return
+            wait_time (Int): Ignored
+            attr_names (List of Strings): Ignored
+        Return:
+            msgs (List of Mock): Served messages
+        """
+
+        with self.lock:
+            msgs, self.msgs = self.msgs[:max_msgs], self.msgs[max_msgs:]
+        if not msgs:
+            time.sleep(0.01)
+        return msgs
+
+    def delete_messages(self, queue, msgs):
+        """
+        Purpose:
+            Record deleted messages
+        Args:
+            queue (FakeQueue): This queue
+            msgs (List of Mock): Messages to delete
+        Return:
+            failed_msgs (List): Always empty
+        """
+
+        with self.lock:
+            self.deleted.extend(msgs)
+        return []
+
+
+@pytest.fixture
+def fake_queue():
+    """
+    Purpose:
+        Return a FakeQueue with 25 messages, patched in for sqs_helpers
+    Args:
+        N/A
+    Return:
+        fake_queue (FakeQueue): Patched fake queue
+    """
+
+    queue = FakeQueue(25)
+    with mock.patch.object(
+        sqs_async_consumer.sqs_helpers, "get_messages", queue.get_messages
+    ), mock.patch.object(
+        sqs_async_consumer.sqs_helpers, "delete_messages", queue.delete_messages
+    ):
+        yield queue
+
+
+###
+# Mocked Functions
+###
+
+
+# None at the Moment
+
+
+###
+# Test Payload
+###
+
+
+def test_stop_does_not_hang_on_full_buffer(fake_queue):
+    """
+    Purpose:
+        Test that stop() returns while pollers wait on a full, unconsumed
+        buffer
+    Args:
+        fake_queue (Fixture): Patched fake queue
+    Return:
+        N/A
+    """
+
+    async def run():
+        consumer = AsyncSQSConsumer(fake_queue, num_pollers=2, max_buffered_msgs=5)
+        await consumer.start()
+        while consumer.get_stats()["buffered"] < 5:
+            await asyncio.sleep(0.01)
+        await asyncio.wait_for(consumer.stop(), timeout=5)
+        return consumer
+
+    consumer = asyncio.run(run())
+
+    assert all(poller.done() for poller in consumer._pollers)
+    assert consumer.get_stats()["buffered"] == 5
+
+
+def test_iterate_and_ack(fake_queue):
+    """
+    Purpose:
+        Test that iterated messages are acknowledged and deleted, and that
+        iteration ends after stop
+    Args:
+        fake_queue (Fixture): Patched fake queue
+    Return:
+        N/A
+    """
+
+    async def run():
+        seen = []
+        async with AsyncSQSConsumer(fake_queue, ack_interval=0.05) as consumer:
+            async for msg in consumer:
+                seen.append(msg)
+                await consumer.ack(msg)
+                if len(seen) == 25:
+                    consumer.request_stop()
+        return consumer, seen
+
+    consumer, seen = asyncio.run(run())
+    stats = consumer.get_stats()
+
+    assert len(seen) == 25
+    assert sorted(msg.message_id for msg in fake_queue.deleted) == sorted(
+        msg.message_id for msg in seen
+    )
+    assert stats["received"] == 25
+    assert stats["deleted"] == 25
+    assert stats["pending_acks"] == 0
+
+
+def test_run_consumes_until_request_stop(fake_queue):
+    """
+    Purpose:
+        Test that run() handles every message, only acks successes, and stops
+        when a handler requests it
+    Args:
+        fake_queue (Fixture): Patched fake queue
+    Return:
+        N/A
+    """
+
+    consumer = AsyncSQSConsumer(fake_queue, max_buffered_msgs=10)
+    handled = []
+
+    async def handler(msg):
+        handled.append(msg)
+        if msg.message_id == "3":
+            raise ValueError("Bad Message")
+        if len(handled) == 25:
+            consumer.request_stop()
+
+    asyncio.run(consumer.run(handler, max_concurrency=4, install_signal_handlers=False))
+    stats = consumer.get_stats()
+
+    assert len(handled) == 25
+    assert stats["handled"] == 24
+    assert stats["failed"] == 1
+    assert stats["deleted"] == 24
+    assert "3" not in [msg.message_id for msg in fake_queue.deleted]
+
+
+def test_start_twice(fake_queue):
+    """
+    Purpose:
+        Test that starting a running consumer raises
+    Args:
+        fake_queue (Fixture): Patched fake queue
+    Return:
+        N/A
+    """
+
+    async def run():
+        consumer = AsyncSQSConsumer(fake_queue)
+        await consumer.start()
+        try:
+            with pytest.raises(Exception):
+                await consumer.start()
+        finally:
+            await consumer.stop()
+
+    asyncio.run(run())
+
+
+def test_iterate_before_start():
+    """
+    Purpose:
+        Test that iterating a consumer that was never started ends at once
+    Args:
+        N/A
+    Return:
+        N/A
+    """
+
+    async def run():
+        return [msg async for msg in AsyncSQSConsumer(mock.Mock())]
+
+    assert asyncio.run(run()) == []
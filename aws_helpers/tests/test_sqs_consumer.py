@@ -7,11 +7,16 @@
 # Python Library Imports
 import os
 import sys
+import threading
+import time
+import boto3
 import pytest
+from moto import mock_aws
 from unittest import mock
 
 # Import File to Test
-from aws_helpers import sqs_consumer
+from aws_helpers import sqs_consumer, sqs_helpers
+from aws_helpers.sqs_consumer import SQSConsumer
 
 
 ###
@@ -19,7 +24,26 @@ from aws_helpers import sqs_consumer
 ###
 
 
-# None at the Moment (Empty Test Suite)
+@pytest.fixture
+def queue(monkeypatch):
+    """
+    Purpose:
+        Return an empty queue in a mocked SQS
+    Args:
+        monkeypatch (Fixture): pytest monkeypatch fixture
+    Return:
+        queue (SQS Queue Object): Mocked queue
+    """
+
+    monkeypatch.setenv("AWS_ACCESS_KEY_ID", "testing")
+    monkeypatch.setenv("AWS_SECRET_ACCESS_KEY", "testing")
+    monkeypatch.setenv("AWS_DEFAULT_REGION", "us-east-1")
+
+    with mock_aws():
+        sqs = boto3.resource("sqs", region_name="us-east-1")
+        yield sqs.create_queue(
+            QueueName="test-queue", Attributes={"VisibilityTimeout": "30"}
+        )
 
 
 ###
@@ -27,7 +51,23 @@ from aws_helpers import sqs_consumer
 ###
 
 
-# None at the Moment (Empty Test Suite)
+def wait_for(condition, timeout=10):
+    """
+    Purpose:
+        Wait until a condition is true
+    Args:
+        condition (Function): Function returning whether or not to stop waiting
+        timeout (Float): Max seconds to wait
+    Return:
+        met (Boolean): Whether or not the condition was met
+    """
+
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(0.05)
+    return False
 
 
 ###
@@ -35,4 +75,129 @@ from aws_helpers import sqs_consumer
 ###
 
 
-# None at the Moment (Empty Test Suite)
+def test_consumer_handles_and_deletes(queue):
+    """
+    Purpose:
+        Test that handled messages are deleted and failed ones are left on the
+        queue
+    Args:
+        queue (Fixture): Mocked queue
+    Return:
+        N/A
+    """
+
+    sqs_helpers.send_messages(queue, [f"msg {index}" for index in range(20)])
+    handled = []
+    handled_lock = threading.Lock()
+
+    def handler(msg):
+        with handled_lock:
+            handled.append(msg.body)
+        if msg.body == "msg 7":
+            raise ValueError("Bad Message")
+
+    consumer = SQSConsumer(queue, handler, num_workers=4, wait_time=1, ack_interval=0.1)
+    consumer.start()
+    assert wait_for(lambda: consumer.get_stats()["handled"] == 19)
+    consumer.stop()
+    stats = consumer.get_stats()
+
+    assert sorted(handled) == sorted(f"msg {index}" for index in range(20))
+    assert stats["failed"] == 1
+    assert stats["deleted"] == 19
+    assert stats["in_flight"] == 0
+    queue.reload()
+    assert queue.attributes["ApproximateNumberOfMessagesNotVisible"] == "1"
+
+
+def test_consumer_extends_visibility(queue):
+    """
+    Purpose:
+        Test that a consumer with extend_visibility tracks messages with a
+        heartbeat using the queue's visibility timeout
+    Args:
+        queue (Fixture): Mocked queue
+    Return:
+        N/A
+    """
+
+    sqs_helpers.send_messages(queue, ["a", "b"])
+    consumer = SQSConsumer(queue, lambda msg: None, wait_time=1, extend_visibility=True)
+    consumer.start()
+    assert consumer._heartbeat.visibility_timeout == 30
+    assert wait_for(lambda: consumer.get_stats()["handled"] == 2)
+    assert consumer._heartbeat.get_stats()["tracked"] == 0
+    consumer.stop()
+
+    assert consumer._heartbeat is None
+
+
+def test_scaler_uses_the_queue_client(queue):
+    """
+    Purpose:
+        Test that the scaler reads the queue depth through the queue's client
+        (with the queue's credentials), without reloading the queue the
+        pollers use, and applies its decision
+    Args:
+        queue (Fixture): Mocked queue
+    Return:
+        N/A
+    """
+
+    sqs_helpers.send_messages(queue, ["a"])
+    consumer = SQSConsumer(
+        queue, lambda msg: None, wait_time=1, max_pollers=3, scale_interval=0.2
+    )
+    get_queue_attributes = mock.Mock(
+        return_value={"Attributes": {"ApproximateNumberOfMessages": "1000"}}
+    )
+
+    with mock.patch.object(type(queue), "reload") as reload, mock.patch.object(
+        queue.meta.client, "get_queue_attributes", get_queue_attributes
+    ), mock.patch.object(consumer._scaler, "evaluate", return_value=3) as evaluate:
+        consumer.start()
+        assert wait_for(lambda: consumer.get_stats()["pollers"] == 3)
+        consumer.stop()
+
+    reload.assert_not_called()
+    assert evaluate.call_args[0] == (1, 1000)
+    get_queue_attributes.assert_called_with(
+        QueueUrl=queue.url, AttributeNames=["ApproximateNumberOfMessages"]
+    )
+
+
+def test_start_twice(queue):
+    """
+    Purpose:
+        Test that starting a running consumer raises
+    Args:
+        queue (Fixture): Mocked queue
+    Return:
+        N/A
+    """
+
+    consumer = SQSConsumer(queue, lambda msg: None, wait_time=1)
+    consumer.start()
+    try:
+        with pytest.raises(Exception):
+            consumer.start()
+    finally:
+        consumer.stop()
+
+
+def test_run_stops_on_request(queue):
+    """
+    Purpose:
+        Test that run() returns after a handler requests a stop
+    Args:
+        queue (Fixture): Mocked queue
+    Return:
+        N/A
+    """
+
+    sqs_helpers.send_messages(queue, ["stop"])
+    consumer = SQSConsumer(queue, lambda msg: consumer.request_stop(), wait_time=1)
+    consumer.run(install_signal_handlers=False)
+
+    assert consumer.get_stats()["handled"] == 1
+    assert consumer.get_stats()["deleted"] == 1
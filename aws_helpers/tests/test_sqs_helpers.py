@@ -7,7 +7,10 @@
 # Python Library Imports
 import os
 import sys
+import boto3
 import pytest
+from botocore.exceptions import ClientError
+from moto import mock_aws
 from unittest import mock
 
 # Import File to Test
@@ -19,7 +22,42 @@ from aws_helpers import sqs_helpers
 ###
 
 
-# None at the Moment (Empty Test Suite)
+@pytest.fixture
+def queue(monkeypatch):
+    """
+    Purpose:
+        Return an empty queue in a mocked SQS
+    Args:
+        monkeypatch (Fixture): pytest monkeypatch fixture
+    Return:
+        queue (SQS Queue Object): Mocked queue
+    """
+
+    monkeypatch.setenv("AWS_ACCESS_KEY_ID", "testing")
+    monkeypatch.setenv("AWS_SECRET_ACCESS_KEY", "testing")
+    monkeypatch.setenv("AWS_DEFAULT_REGION", "us-east-1")
+
+    with mock_aws():
+        sqs = boto3.resource("sqs", region_name="us-east-1")
+        sqs.create_queue(QueueName="test-queue")
+        yield sqs_helpers.get_queue(sqs, "test-queue")
+
+
+@pytest.fixture
+def no_backoff():
+    """
+    Purpose:
+        Skip the backoff sleeps between retries
+    Args:
+        N/A
+    Return:
+        sleep_with_backoff (Mock): Patched sleep
+    """
+
+    with mock.patch.object(
+        sqs_helpers.retry_helpers, "sleep_with_backoff"
+    ) as sleep_with_backoff:
+        yield sleep_with_backoff
 
 
 ###
@@ -27,7 +65,42 @@ from aws_helpers import sqs_helpers
 ###
 
 
-# None at the Moment (Empty Test Suite)
+def get_client_error(code, status_code=400):
+    """
+    Purpose:
+        Return a ClientError with an error code and HTTP status
+    Args:
+        code (String): Error code
+        status_code (Int): HTTP status code
+    Return:
+        err (ClientError): Client error
+    """
+
+    return ClientError(
+        {
+            "Error": {"Code": code, "Message": code},
+            "ResponseMetadata": {"HTTPStatusCode": status_code},
+        },
+        "SendMessageBatch",
+    )
+
+
+def receive_all(queue):
+    """
+    Purpose:
+        Receive every visible message in a queue
+    Args:
+        queue (SQS Queue Object): Queue to drain
+    Return:
+        msgs (List of SQS Message Objects): Received messages
+    """
+
+    msgs = []
+    while True:
+        batch = sqs_helpers.get_messages(queue, wait_time=0)
+        if not batch:
+            return msgs
+        msgs.extend(batch)
 
 
 ###
@@ -35,4 +108,198 @@ from aws_helpers import sqs_helpers
 ###
 
 
-# None at the Moment (Empty Test Suite)
+def test_send_messages(queue):
+    """
+    Purpose:
+        Test that send_messages delivers every message
+    Args:
+        queue (Fixture): Mocked queue
+    Return:
+        N/A
+    """
+
+    msgs = [f"message {index}" for index in range(35)]
+    msgs.append(
+        {
+            "MessageBody": "with attributes",
+            "MessageAttributes": {"key": {"DataType": "String", "StringValue": "v"}},
+        }
+    )
+    send_summary = sqs_helpers.send_messages(queue, iter(msgs), max_workers=2)
+
+    assert send_summary["sent"] == 36
+    assert send_summary["failed"] == []
+    assert sorted(msg.body for msg in receive_all(queue)) == sorted(
+        msgs[:-1] + ["with attributes"]
+    )
+
+
+def test_send_messages_retries_failed_entries(no_backoff):
+    """
+    Purpose:
+        Test that only failed entries are retried and sender faults are not
+    Args:
+        no_backoff (Fixture): Patched backoff sleep
+    Return:
+        N/A
+    """
+
+    queue = mock.Mock()
+    queue.send_messages.side_effect = [
+        {
+            "Successful": [{"Id": "0"}],
+            "Failed": [
+                {"Id": "1", "Code": "InternalError", "SenderFault": False},
+                {"Id": "2", "Code": "InvalidMessageContents", "SenderFault": True},
+            ],
+        },
+        {"Successful": [{"Id": "0"}]},
+    ]
+    send_summary = sqs_helpers.send_messages(queue, ["a", "b", "c"])
+
+    assert send_summary["sent"] == 2
+    assert [entry["MessageBody"] for entry in send_summary["failed"]] == ["c"]
+    assert send_summary["failed"][0]["Code"] == "InvalidMessageContents"
+    retry_entries = queue.send_messages.call_args_list[1][1]["Entries"]
+    assert retry_entries == [{"MessageBody": "b", "Id": "0"}]
+
+
+def test_send_messages_retries_throttled_requests(no_backoff):
+    """
+    Purpose:
+        Test that a throttled request is retried with backoff
+    Args:
+        no_backoff (Fixture): Patched backoff sleep
+    Return:
+        N/A
+    """
+
+    queue = mock.Mock()
+    queue.send_messages.side_effect = [
+        get_client_error("ThrottlingException"),
+        get_client_error("ServiceUnavailable", status_code=503),
+        {"Successful": [{"Id": "0"}, {"Id": "1"}]},
+    ]
+    send_summary = sqs_helpers.send_messages(queue, ["a", "b"])
+
+    assert send_summary["sent"] == 2
+    assert send_summary["failed"] == []
+    assert no_backoff.call_count == 2
+
+
+def test_send_messages_records_failed_requests(no_backoff):
+    """
+    Purpose:
+        Test that a request that keeps failing (or cannot succeed) records
+        its batch as failed instead of raising
+    Args:
+        no_backoff (Fixture): Patched backoff sleep
+    Return:
+        N/A
+    """
+
+    queue = mock.Mock()
+    queue.send_messages.side_effect = get_client_error("ThrottlingException")
+    send_summary = sqs_helpers.send_messages(queue, ["a", "b"], max_retries=2)
+
+    assert send_summary["sent"] == 0
+    assert [entry["Code"] for entry in send_summary["failed"]] == [
+        "ThrottlingException",
+        "ThrottlingException",
+    ]
+    assert queue.send_messages.call_count == 3
+
+    queue.send_messages.reset_mock()
+    queue.send_messages.side_effect = get_client_error("AccessDenied", 403)
+    send_summary = sqs_helpers.send_messages(queue, ["a"])
+
+    assert send_summary["failed"][0]["Code"] == "AccessDenied"
+    assert queue.send_messages.call_count == 1
+
+
+def test_delete_messages(queue):
+    """
+    Purpose:
+        Test that delete_messages deletes received messages in batches
+    Args:
+        queue (Fixture): Mocked queue
+    Return:
+        N/A
+    """
+
+    sqs_helpers.send_messages(queue, [str(index) for index in range(15)])
+    msgs = receive_all(queue)
+
+    assert sqs_helpers.delete_messages(queue, msgs) == []
+    queue.reload()
+    assert queue.attributes["ApproximateNumberOfMessages"] == "0"
+    assert queue.attributes["ApproximateNumberOfMessagesNotVisible"] == "0"
+
+
+def test_delete_messages_retries_failed_entries(no_backoff):
+    """
+    Purpose:
+        Test that delete_messages retries failures without a sender fault
+    Args:
+        no_backoff (Fixture): Patched backoff sleep
+    Return:
+        N/A
+    """
+
+    msgs = [mock.Mock(receipt_handle=str(index)) for index in range(3)]
+    queue = mock.Mock()
+    queue.delete_messages.side_effect = [
+        {
+            "Failed": [
+                {"Id": "1", "Code": "InternalError", "SenderFault": False},
+                {"Id": "2", "Code": "ReceiptHandleIsInvalid", "SenderFault": True},
+            ]
+        },
+        {},
+    ]
+
+    assert sqs_helpers.delete_messages(queue, msgs) == [msgs[2]]
+    retry_entries = queue.delete_messages.call_args_list[1][1]["Entries"]
+    assert retry_entries == [{"Id": "0", "ReceiptHandle": "1"}]
+
+
+def test_change_messages_visibility_and_depth(queue):
+    """
+    Purpose:
+        Test that received messages made visible again count toward the
+        queue depth
+    Args:
+        queue (Fixture): Mocked queue
+    Return:
+        N/A
+    """
+
+    sqs_helpers.send_messages(queue, [str(index) for index in range(12)])
+    assert sqs_helpers.get_queue_depth(queue) == 12
+
+    msgs = receive_all(queue)
+    assert sqs_helpers.get_queue_depth(queue) == 0
+
+    assert sqs_helpers.change_messages_visibility(queue, msgs, 0) == []
+    assert sqs_helpers.get_queue_depth(queue) == 12
+
+
+def test_get_queue_depth_does_not_reload_queue(queue):
+    """
+    Purpose:
+        Test that get_queue_depth reads the depth with a client instead of
+        reloading the shared Queue Object
+    Args:
+        queue (Fixture): Mocked queue
+    Return:
+        N/A
+    """
+
+    sqs_helpers.send_messages(queue, ["a", "b", "c"])
+    sqs_client = boto3.client("sqs", region_name="us-east-1")
+
+    with mock.patch.object(type(queue), "reload") as reload:
+        assert sqs_helpers.get_queue_depth(queue, sqs_client=sqs_client) == 3
+        assert sqs_helpers.get_queue_depth(queue) == 3
+
+    reload.assert_not_called()
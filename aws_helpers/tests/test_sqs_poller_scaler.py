@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""
+    Purpose:
+        Test File for sqs_poller_scaler.py
+"""
+
+# Python Library Imports
+import os
+import sys
+import pytest
+from unittest import mock
+
+# Import File to Test
+from aws_helpers import sqs_poller_scaler
+from aws_helpers.sqs_poller_scaler import SQSPollerScaler
+
+
+###
+# Fixtures
+###
+
+
+@pytest.fixture
+def scaler():
+    """
+    Purpose:
+        Return a scaler allowing 1 to 4 pollers
+    Args:
+        N/A
+    Return:
+        scaler (SQSPollerScaler): Scaler under test
+    """
+
+    return SQSPollerScaler(min_pollers=1, max_pollers=4, backlog_per_poller=100)
+
+
+###
+# Mocked Functions
+###
+
+
+def record_polls(scaler, msg_counts):
+    """
+    Purpose:
+        Record a receive for each message count
+    Args:
+        scaler (SQSPollerScaler): Scaler to record on
+        msg_counts (List of Ints): Messages received per poll
+    Return:
+        N/A
+    """
+
+    for msg_count in msg_counts:
+        scaler.record_poll(msg_count)
+
+
+###
+# Test Payload
+###
+
+
+@pytest.mark.parametrize("min_pollers,max_pollers", [(0, 2), (3, 2)])
+def test_invalid_bounds(min_pollers, max_pollers):
+    """
+    Purpose:
+        Test that invalid poller bounds raise
+    Args:
+        min_pollers (Int): Min number of pollers
+        max_pollers (Int): Max number of pollers
+    Return:
+        N/A
+    """
+
+    with pytest.raises(ValueError):
+        SQSPollerScaler(min_pollers=min_pollers, max_pollers=max_pollers)
+
+
+def test_no_receives_keeps_pollers(scaler):
+    """
+    Purpose:
+        Test that a window without receives keeps the poller count
+    Args:
+        scaler (Fixture): Scaler under test
+    Return:
+        N/A
+    """
+
+    assert scaler.evaluate(2, queue_depth=1000) == 2
+    assert scaler.decisions[-1]["reason"] == "no receives in window"
+
+
+def test_scale_up_on_backlog(scaler):
+    """
+    Purpose:
+        Test that a backlog above the target adds a poller, up to max_pollers
+    Args:
+        scaler (Fixture): Scaler under test
+    Return:
+        N/A
+    """
+
+    record_polls(scaler, [10, 10, 10])
+    assert scaler.evaluate(2, queue_depth=500) == 3
+
+    record_polls(scaler, [10, 10, 10])
+    assert scaler.evaluate(4, queue_depth=5000) == 4
+
+
+def test_scale_down_on_empty_receives(scaler):
+    """
+    Purpose:
+        Test that mostly empty receives remove a poller, down to min_pollers
+    Args:
+        scaler (Fixture): Scaler under test
+    Return:
+        N/A
+    """
+
+    record_polls(scaler, [0, 0, 0, 5])
+    assert scaler.evaluate(3, queue_depth=0) == 2
+    assert scaler.decisions[-1]["empty_receive_ratio"] == 0.75
+
+    record_polls(scaler, [0, 0])
+    assert scaler.evaluate(1, queue_depth=0) == 1
+
+
+def test_hold_when_handlers_saturated(scaler):
+    """
+    Purpose:
+        Test that a backlog does not add pollers when handlers are saturated
+    Args:
+        scaler (Fixture): Scaler under test
+    Return:
+        N/A
+    """
+
+    record_polls(scaler, [10] * 10)
+    with mock.patch.object(
+        sqs_poller_scaler.time, "monotonic", return_value=scaler._window_start + 1
+    ):
+        target_pollers = scaler.evaluate(
+            2, queue_depth=500, avg_handler_seconds=1.0, num_workers=100
+        )
+
+    assert target_pollers == 2
+    assert "handlers saturated" in scaler.decisions[-1]["reason"]
+    assert scaler.decisions[-1]["handler_capacity"] == 100.0
+
+
+def test_decisions_are_capped(scaler):
+    """
+    Purpose:
+        Test that only the last 100 decisions are kept
+    Args:
+        scaler (Fixture): Scaler under test
+    Return:
+        N/A
+    """
+
+    for _ in range(150):
+        scaler.evaluate(1, queue_depth=0)
+
+    assert len(scaler.decisions) == 100
@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+"""
+    Purpose:
+        Test File for sqs_prefetch_buffer.py
+"""
+
+# Python Library Imports
+import os
+import sys
+import time
+import boto3
+import pytest
+from moto import mock_aws
+from unittest import mock
+
+# Import File to Test
+from aws_helpers import sqs_helpers, sqs_prefetch_buffer
+from aws_helpers.sqs_prefetch_buffer import SQSPrefetchBuffer
+
+
+###
+# Fixtures
+###
+
+
+@pytest.fixture
+def queue(monkeypatch):
+    """
+    Purpose:
+        Return a queue holding 30 messages in a mocked SQS
+    Args:
+        monkeypatch (Fixture): pytest monkeypatch fixture
+    Return:
+        queue (SQS Queue Object): Mocked queue
+    """
+
+    monkeypatch.setenv("AWS_ACCESS_KEY_ID", "testing")
+    monkeypatch.setenv("AWS_SECRET_ACCESS_KEY", "testing")
+    monkeypatch.setenv("AWS_DEFAULT_REGION", "us-east-1")
+
+    with mock_aws():
+        sqs = boto3.resource("sqs", region_name="us-east-1")
+        queue = sqs.create_queue(
+            QueueName="test-queue", Attributes={"VisibilityTimeout": "30"}
+        )
+        sqs_helpers.send_messages(queue, [f"msg {index}" for index in range(30)])
+        yield queue
+
+
+###
+# Mocked Functions
+###
+
+
+def wait_for(condition, timeout=10):
+    """
+    Purpose:
+        Wait until a condition is true
+    Args:
+        condition (Function): Function returning whether or not to stop waiting
+        timeout (Float): Max seconds to wait
+    Return:
+        met (Boolean): Whether or not the condition was met
+    """
+
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(0.05)
+    return False
+
+
+###
+# Test Payload
+###
+
+
+def test_get_before_start():
+    """
+    Purpose:
+        Test that getting from a buffer that was never started raises a clear
+        error
+    Args:
+        N/A
+    Return:
+        N/A
+    """
+
+    buffer = SQSPrefetchBuffer(mock.Mock())
+
+    with pytest.raises(Exception, match="not started"):
+        buffer.get(timeout=0)
+    with pytest.raises(Exception, match="not started"):
+        buffer.get_messages(timeout=0)
+
+
+def test_prefetch_respects_capacity(queue):
+    """
+    Purpose:
+        Test that the buffer never holds more than capacity messages and
+        hands them out oldest first
+    Args:
+        queue (Fixture): Mocked queue
+    Return:
+        N/A
+    """
+
+    with SQSPrefetchBuffer(queue, capacity=15, wait_time=1) as buffer:
+        assert wait_for(lambda: buffer.get_stats()["buffered"] == 15)
+        time.sleep(0.2)
+        assert buffer.get_stats()["buffered"] == 15
+
+        msgs = buffer.get_messages(max_msgs=10, timeout=1)
+        assert len(msgs) == 10
+        msg = buffer.get(timeout=1)
+        assert msg is not None
+
+        assert wait_for(lambda: buffer.get_stats()["received"] == 26)
+        assert buffer.get_stats()["delivered"] == 11
+
+    with pytest.raises(Exception, match="already running"):
+        with SQSPrefetchBuffer(queue) as buffer:
+            buffer.start()
+
+
+def test_stop_releases_buffered_messages(queue):
+    """
+    Purpose:
+        Test that stopping makes buffered messages visible again
+    Args:
+        queue (Fixture): Mocked queue
+    Return:
+        N/A
+    """
+
+    with SQSPrefetchBuffer(queue, capacity=10, wait_time=1) as buffer:
+        assert wait_for(lambda: buffer.get_stats()["buffered"] == 10)
+        delivered = buffer.get_messages(max_msgs=4, timeout=1)
+
+    assert len(delivered) == 4
+    assert buffer.get_stats()["buffered"] == 0
+    assert sqs_helpers.get_queue_depth(queue) == 26
+    assert buffer.get(timeout=0) is None
+
+
+def test_stale_messages_are_released(queue):
+    """
+    Purpose:
+        Test that messages held past the max hold time are released instead
+        of handed out
+    Args:
+        queue (Fixture): Mocked queue
+    Return:
+        N/A
+    """
+
+    buffer = SQSPrefetchBuffer(
+        queue, capacity=5, wait_time=1, visibility_timeout=1, max_hold_fraction=0.1
+    )
+    with mock.patch.object(
+        sqs_prefetch_buffer.sqs_helpers, "change_messages_visibility", return_value=[]
+    ) as change_messages_visibility:
+        with buffer:
+            assert wait_for(lambda: buffer.get_stats()["expired"] >= 5)
+        released = [
+            msg
+            for call in change_messages_visibility.call_args_list
+            for msg in call[0][1]
+        ]
+
+    assert len(released) >= 5
+    assert all(call[0][2] == 0 for call in change_messages_visibility.call_args_list)
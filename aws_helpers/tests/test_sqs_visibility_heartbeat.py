@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+"""
+    Purpose:
+        Test File for sqs_visibility_heartbeat.py
+"""
+
+# Python Library Imports
+import os
+import sys
+import time
+import boto3
+import pytest
+from moto import mock_aws
+from unittest import mock
+
+# Import File to Test
+from aws_helpers import sqs_helpers, sqs_visibility_heartbeat
+from aws_helpers.sqs_visibility_heartbeat import VisibilityHeartbeat
+
+
+###
+# Fixtures
+###
+
+
+@pytest.fixture
+def queue(monkeypatch):
+    """
+    Purpose:
+        Return an empty queue in a mocked SQS
+    Args:
+        monkeypatch (Fixture): pytest monkeypatch fixture
+    Return:
+        queue (SQS Queue Object): Mocked queue
+    """
+
+    monkeypatch.setenv("AWS_ACCESS_KEY_ID", "testing")
+    monkeypatch.setenv("AWS_SECRET_ACCESS_KEY", "testing")
+    monkeypatch.setenv("AWS_DEFAULT_REGION", "us-east-1")
+
+    with mock_aws():
+        sqs = boto3.resource("sqs", region_name="us-east-1")
+        yield sqs.create_queue(QueueName="test-queue")
+
+
+@pytest.fixture
+def change_visibility():
+    """
+    Purpose:
+        Patch change_messages_visibility to succeed for every message
+    Args:
+        N/A
+    Return:
+        change_messages_visibility (Mock): Patched function
+    """
+
+    with mock.patch.object(
+        sqs_visibility_heartbeat.sqs_helpers,
+        "change_messages_visibility",
+        return_value=[],
+    ) as change_messages_visibility:
+        yield change_messages_visibility
+
+
+###
+# Mocked Functions
+###
+
+
+def get_msg(index):
+    """
+    Purpose:
+        Return a stand-in SQS Message Object
+    Args:
+        index (Int): Number of the message
+    Return:
+        msg (Mock): Message with a message_id and receipt_handle
+    """
+
+    return mock.Mock(message_id=f"msg-{index}", receipt_handle=f"handle-{index}")
+
+
+###
+# Test Payload
+###
+
+
+def test_extend_expiring_only_extends_due_messages(change_visibility):
+    """
+    Purpose:
+        Test that only messages expiring within two intervals are extended
+    Args:
+        change_visibility (Fixture): Patched change_messages_visibility
+    Return:
+        N/A
+    """
+
+    heartbeat = VisibilityHeartbeat(mock.Mock(), visibility_timeout=30)
+    now = time.monotonic()
+    due_msg, fresh_msg = get_msg(0), get_msg(1)
+    heartbeat.track(due_msg, received_time=now - 20)
+    heartbeat.track(fresh_msg, received_time=now)
+
+    heartbeat._extend_expiring()
+
+    change_visibility.assert_called_once_with(heartbeat.queue, [due_msg], 30)
+    assert heartbeat._tracked["handle-0"]["visible_at"] >= now + 30
+    assert heartbeat.get_stats() == {
+        "tracked": 2,
+        "extended": 1,
+        "extend_failed": 0,
+        "expired": 0,
+    }
+
+
+def test_extend_expiring_drops_failed_and_expired(change_visibility):
+    """
+    Purpose:
+        Test that messages that fail to extend or hit the 12 hour limit are
+        no longer tracked
+    Args:
+        change_visibility (Fixture): Patched change_messages_visibility
+    Return:
+        N/A
+    """
+
+    heartbeat = VisibilityHeartbeat(mock.Mock(), visibility_timeout=30)
+    now = time.monotonic()
+    failed_msg, expired_msg, ok_msg = get_msg(0), get_msg(1), get_msg(2)
+    heartbeat.track(failed_msg, received_time=now - 25)
+    heartbeat.track(
+        expired_msg,
+        received_time=now - sqs_visibility_heartbeat.MAX_VISIBILITY_SECONDS,
+    )
+    heartbeat.track(ok_msg, received_time=now - 25)
+    change_visibility.return_value = [failed_msg]
+
+    heartbeat._extend_expiring()
+
+    change_visibility.assert_called_once_with(
+        heartbeat.queue, [failed_msg, ok_msg], 30
+    )
+    assert list(heartbeat._tracked) == ["handle-2"]
+    assert heartbeat.get_stats() == {
+        "tracked": 1,
+        "extended": 1,
+        "extend_failed": 1,
+        "expired": 1,
+    }
+
+
+def test_release_and_stop(change_visibility):
+    """
+    Purpose:
+        Test that released messages are not extended and that stopping makes
+        the rest visible again
+    Args:
+        change_visibility (Fixture): Patched change_messages_visibility
+    Return:
+        N/A
+    """
+
+    msgs = [get_msg(index) for index in range(3)]
+    with VisibilityHeartbeat(mock.Mock(), visibility_timeout=30) as heartbeat:
+        for msg in msgs:
+            heartbeat.track(msg)
+        heartbeat.release(msgs[1])
+        assert heartbeat.get_stats()["tracked"] == 2
+
+    change_visibility.assert_called_once_with(heartbeat.queue, [msgs[0], msgs[2]], 0)
+    assert heartbeat.get_stats()["tracked"] == 0
+    assert heartbeat._thread is None
+
+
+def test_stop_without_release(change_visibility):
+    """
+    Purpose:
+        Test that release_on_stop=False leaves the messages invisible
+    Args:
+        change_visibility (Fixture): Patched change_messages_visibility
+    Return:
+        N/A
+    """
+
+    heartbeat = VisibilityHeartbeat(mock.Mock(), release_on_stop=False)
+    heartbeat.start()
+    heartbeat.track(get_msg(0))
+    heartbeat.stop()
+
+    change_visibility.assert_not_called()
+
+
+def test_heartbeat_keeps_message_invisible(queue):
+    """
+    Purpose:
+        Test against SQS that a tracked message is not redelivered after its
+        visibility timeout, and is redelivered once the heartbeat stops
+    Args:
+        queue (Fixture): Mocked queue
+    Return:
+        N/A
+    """
+
+    queue.send_message(MessageBody="slow job")
+    msg = queue.receive_messages(VisibilityTimeout=1)[0]
+
+    with VisibilityHeartbeat(
+        queue, visibility_timeout=1, heartbeat_interval=0.2
+    ) as heartbeat:
+        heartbeat.track(msg)
+        time.sleep(1.5)
+        assert sqs_helpers.get_messages(queue, wait_time=0) == []
+        assert heartbeat.get_stats()["extended"] >= 1
+
+    redelivered = sqs_helpers.get_messages(queue, wait_time=0)
+    assert [redelivered_msg.body for redelivered_msg in redelivered] == ["slow job"]